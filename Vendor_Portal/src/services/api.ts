@@ -427,9 +427,29 @@ class ApiService {
     }
   }
 
-  async getVendorNotifications(): Promise<VendorNotificationsResponse> {
+  async getVendorNotifications(cursor?: string | null): Promise<VendorNotificationsResponse> {
     try {
-      const response = await this.api.get('/vendor/notifications');
+      const response = await this.api.get('/vendor/notifications', {
+        params: cursor ? { cursor } : undefined,
+      });
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError);
+    }
+  }
+
+  async getVendorUnreadNotificationCount(): Promise<number> {
+    try {
+      const response = await this.api.get('/vendor/notifications/unread-count');
+      return response.data?.unread_count ?? 0;
+    } catch (error) {
+      throw this.handleError(error as AxiosError);
+    }
+  }
+
+  async markAllVendorNotificationsRead(): Promise<any> {
+    try {
+      const response = await this.api.post('/vendor/notifications/read-all');
       return response.data;
     } catch (error) {
       throw this.handleError(error as AxiosError);
@@ -88,4 +88,6 @@ export interface VendorNotification {
 export interface VendorNotificationsResponse {
   notifications: VendorNotification[];
   unread_count: number;
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
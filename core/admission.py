@@ -0,0 +1,214 @@
+"""
+Admission control for expensive API endpoints.
+
+``@admission_limit(name)`` goes under the router decorator. It caps how many
+requests for ``name`` run at once across every worker process::
+
+    @router.post("/cases/incident-db/{case_id}/ai-case-review-report", ...)
+    @admission_limit('ai_case_review')
+    def generate_ai_case_review_report(request, case_id: int):
+
+Slots are Postgres session advisory locks, keyed
+``(crc32('admission:<name>'), slot)`` on the ``default`` connection. A
+request takes any free slot out of ``limit``. When none is free it waits,
+polling with jittered backoff, for up to ``queue_timeout`` seconds. At most
+``max_queue`` requests per process wait at once. Rejected requests get a
+JSON error with ``Retry-After``:
+- 503 when the endpoint is saturated (wait queue full or wait timed out);
+- 429 when the caller already holds ``per_user`` slots for the endpoint.
+A slot is released when the view returns. If the unlock itself fails, the
+connection is closed, which releases the lock server-side.
+
+Limits come from ``ADMISSION_LIMITS`` below and can be overridden with the
+``ADMISSION_LIMITS`` env var (JSON), e.g. ``{"ai_case_review": {"limit": 4}}``.
+``applies`` (a callable taking the view's arguments) exempts cheap variants
+of an endpoint from the limit.
+
+Metrics in /api/metrics:
+- ``admission_requests_total{endpoint,outcome}``;
+- ``admission_wait_seconds{endpoint}``;
+- ``admission_in_flight{endpoint}`` (per process).
+"""
+import dataclasses
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.db import connections
+from django.http import JsonResponse
+
+from core.metrics import LATENCY_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+DB_ALIAS = 'default'
+
+
+@dataclass(frozen=True)
+class AdmissionLimit:
+    limit: int = 4
+    per_user: Optional[int] = None
+    queue_timeout: float = 5.0
+    max_queue: Optional[int] = None
+    retry_after: int = 5
+
+
+DEFAULT_LIMITS = {
+    'ai_case_review': AdmissionLimit(limit=2, per_user=1, queue_timeout=15.0, retry_after=30),
+    'statement_audio': AdmissionLimit(limit=4, per_user=1, queue_timeout=10.0, retry_after=15),
+    'rto_rti_generation': AdmissionLimit(limit=3, per_user=1, queue_timeout=10.0, retry_after=10),
+    'audit_logs': AdmissionLimit(limit=4, queue_timeout=5.0, retry_after=5),
+    'evidence_upload': AdmissionLimit(limit=8, per_user=2, queue_timeout=10.0, retry_after=5),
+    'batch': AdmissionLimit(limit=16, per_user=2, queue_timeout=2.0, retry_after=2),
+}
+
+
+def _load_limits() -> Dict[str, AdmissionLimit]:
+    limits = dict(DEFAULT_LIMITS)
+    overrides = os.environ.get('ADMISSION_LIMITS', '').strip()
+    if overrides:
+        for name, values in json.loads(overrides).items():
+            limits[name] = dataclasses.replace(limits.get(name, AdmissionLimit()), **values)
+    return limits
+
+
+ADMISSION_LIMITS = _load_limits()
+
+_in_flight: Dict[str, int] = {}
+_waiting: Dict[str, int] = {}
+_counts_lock = threading.Lock()
+
+
+def _lock_key(*parts) -> int:
+    """Stable signed int4 for the first advisory-lock key."""
+    value = zlib.crc32(':'.join(str(part) for part in parts).encode())
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def _try_lock(key: int, slot: int) -> bool:
+    with connections[DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [key, slot])
+        return cursor.fetchone()[0]
+
+
+def _unlock(held) -> None:
+    try:
+        with connections[DB_ALIAS].cursor() as cursor:
+            for key, slot in held:
+                cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [key, slot])
+    except Exception as exc:
+        # Closing the session releases every advisory lock it holds.
+        logger.warning("Admission unlock failed, closing connection: %s", exc)
+        connections[DB_ALIAS].close()
+
+
+def _try_any_slot(key: int, limit: int) -> Optional[tuple]:
+    start = random.randrange(limit)
+    for offset in range(limit):
+        slot = (start + offset) % limit
+        if _try_lock(key, slot):
+            return key, slot
+    return None
+
+
+def _try_user_slot(name: str, user_id: int, per_user: int) -> Optional[tuple]:
+    """Per-user slots are keyed ``(crc32('admission-user:<name>:<slot>'), user_id)``."""
+    for slot in range(per_user):
+        key = _lock_key('admission-user', name, slot)
+        if _try_lock(key, user_id):
+            return key, user_id
+    return None
+
+
+def _adjust(counter: Dict[str, int], name: str, delta: int) -> int:
+    with _counts_lock:
+        counter[name] = counter.get(name, 0) + delta
+        return counter[name]
+
+
+def in_flight() -> Dict[str, int]:
+    with _counts_lock:
+        return dict(_in_flight)
+
+
+def _reject(name: str, status: int, outcome: str, message: str, retry_after: int):
+    registry.inc('admission_requests_total', (('endpoint', name), ('outcome', outcome)))
+    logger.warning("Admission %s rejected (%s)", name, outcome)
+    response = JsonResponse({"error": message}, status=status)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def admission_limit(name: str, applies=None):
+    """Limit concurrent executions of the decorated Ninja view (see module docstring)."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            config = ADMISSION_LIMITS.get(name) or AdmissionLimit()
+            if applies is not None and not applies(request, *args, **kwargs):
+                return view(request, *args, **kwargs)
+
+            held = []
+            try:
+                user_id = getattr(getattr(request, 'user', None), 'pk', None)
+                if config.per_user and user_id is not None:
+                    user_slot = _try_user_slot(name, user_id, config.per_user)
+                    if user_slot is None:
+                        return _reject(
+                            name, 429, 'rejected_user_limit',
+                            "You already have this operation in progress. Please wait for it to finish.",
+                            config.retry_after,
+                        )
+                    held.append(user_slot)
+
+                key = _lock_key('admission', name)
+                started = time.monotonic()
+                slot = _try_any_slot(key, config.limit)
+                if slot is None:
+                    max_queue = config.max_queue if config.max_queue is not None else config.limit * 2
+                    if _adjust(_waiting, name, 1) > max_queue:
+                        _adjust(_waiting, name, -1)
+                        return _reject(
+                            name, 503, 'rejected_queue_full',
+                            "The server is busy with this operation. Please try again shortly.",
+                            config.retry_after,
+                        )
+                    try:
+                        delay = 0.05
+                        while slot is None and time.monotonic() - started < config.queue_timeout:
+                            time.sleep(delay * random.uniform(0.5, 1.5))
+                            delay = min(delay * 2, 0.5)
+                            slot = _try_any_slot(key, config.limit)
+                    finally:
+                        _adjust(_waiting, name, -1)
+                    registry.observe(
+                        'admission_wait_seconds', (('endpoint', name),), time.monotonic() - started, LATENCY_BUCKETS,
+                    )
+                    if slot is None:
+                        return _reject(
+                            name, 503, 'rejected_timeout',
+                            "The server is busy with this operation. Please try again shortly.",
+                            config.retry_after,
+                        )
+                    registry.inc('admission_requests_total', (('endpoint', name), ('outcome', 'admitted_after_wait')))
+                else:
+                    registry.inc('admission_requests_total', (('endpoint', name), ('outcome', 'admitted')))
+                held.append(slot)
+
+                _adjust(_in_flight, name, 1)
+                try:
+                    return view(request, *args, **kwargs)
+                finally:
+                    _adjust(_in_flight, name, -1)
+            finally:
+                if held:
+                    _unlock(held)
+        return wrapper
+    return decorator
@@ -3,8 +3,8 @@ Main API configuration using Django Ninja.
 """
 
 from ninja import NinjaAPI
-from ninja.errors import ValidationError
-from django.http import HttpRequest
+from ninja.errors import HttpError, ValidationError
+from django.http import HttpRequest, HttpResponse
 from pydantic import ValidationError as PydanticValidationError
 
 from users.api.auth import router as auth_router
@@ -17,6 +17,9 @@ from users.api.verifications import router as verifications_router
 from users.api.reports import router as reports_router
 from users.api.notifications import router as notifications_router
 from users.auth import SessionOrTokenAuth
+from core.admission import admission_limit
+from core.batch import BatchError, BatchRequest, run_batch
+from core.renderers import ORJSONRenderer
 
 
 # =============================================================================
@@ -45,6 +48,7 @@ api = NinjaAPI(
     """,
     docs_url="/docs",
     openapi_url="/openapi.json",
+    renderer=ORJSONRenderer(),
 )
 
 
@@ -109,6 +113,40 @@ def health_check(request):
     }
 
 
+@api.get(
+    "/metrics",
+    tags=["System"],
+    summary="Prometheus Metrics",
+    description="Per-route latency, SQL, outbound HTTP and response size metrics in Prometheus text format. "
+                "Requires the METRICS_TOKEN bearer token or a super admin session.",
+    include_in_schema=False,
+)
+def metrics(request):
+    """Prometheus scrape endpoint (see core/metrics.py)."""
+    from core.metrics import metrics_authorized, render_metrics
+    if not metrics_authorized(request):
+        raise HttpError(403, "Access denied")
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@api.post(
+    "/batch",
+    tags=["System"],
+    auth=SessionOrTokenAuth(),
+    summary="Batch Requests",
+    description="Run several API requests in one round trip. Sub-requests share the batch's authentication "
+                "and are answered in order; consecutive GETs run concurrently. See core/batch.py for limits.",
+)
+@admission_limit('batch')
+def batch(request, data: BatchRequest):
+    """Run each sub-request in-process and collect their responses (see core/batch.py)."""
+    try:
+        responses = run_batch(request, data.requests)
+    except BatchError as exc:
+        raise HttpError(400, str(exc))
+    return {"responses": responses}
+
+
 # =============================================================================
 # Register Routers
 # =============================================================================
@@ -0,0 +1,247 @@
+"""
+Tiered response cache for API views with tag-based invalidation.
+
+Tiers:
+1. An in-process LRU (``API_CACHE_L1_SIZE`` entries per worker).
+2. An optional shared tier: the Django cache alias ``api_shared`` when it is
+   configured (Redis or file based, see ``API_CACHE_SHARED`` in settings).
+
+Entries are tagged (``case:{id}``, ``vendor:{id}``, ``report:{id}``,
+``court_details``). Every entry remembers the versions its tags had when it
+was computed, and a lookup is a hit only while those versions are unchanged.
+Tag versions live in Postgres, so a write in any process (or a management
+command) invalidates entries in every worker's L1 and in the shared tier:
+- ``case:{id}`` is ``cases.data_version`` itself (migration 0071);
+- all other tags are counters in ``cache_tag_versions`` (migration 0074),
+  bumped by triggers or by ``invalidate_tags``.
+A lookup therefore costs one indexed query for the tag versions.
+
+Views opt in with ``@cached_endpoint(...)`` placed under the router
+decorator (and under ``@conditional_get`` when both are used). Only plain
+200 results are stored; error tuples and HttpResponse objects pass through.
+A view that answers 200 with a fallback or partial payload (a lookup that
+failed and was swallowed) calls ``skip_caching(request)``: that result is
+served but not stored, so a transient error is not cached for the full TTL.
+Values are pickled, so every hit returns a private copy.
+
+Hit/miss counters per namespace are available from ``cache_metrics()``.
+"""
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+API_CACHE_L1_SIZE = int(os.environ.get('API_CACHE_L1_SIZE', '1024'))
+SHARED_CACHE_ALIAS = 'api_shared'
+CASE_TAG_PREFIX = 'case:'
+
+
+class _LocalTier:
+    """Thread-safe LRU of ``key -> (expires_at, blob)``."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, blob: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local = _LocalTier(API_CACHE_L1_SIZE)
+
+_metrics: Dict[str, Dict[str, int]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _count(namespace: str, counter: str) -> None:
+    with _metrics_lock:
+        bucket = _metrics.setdefault(
+            namespace, {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0},
+        )
+        bucket[counter] += 1
+
+
+def cache_metrics() -> Dict[str, Dict[str, int]]:
+    """Per-namespace counters since process start (or the last reset)."""
+    with _metrics_lock:
+        return {namespace: dict(bucket) for namespace, bucket in _metrics.items()}
+
+
+def reset_api_cache() -> None:
+    """Drop this process's L1 entries and counters (the shared tier is left alone)."""
+    _local.clear()
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _shared_tier():
+    if SHARED_CACHE_ALIAS not in getattr(settings, 'CACHES', {}):
+        return None
+    return caches[SHARED_CACHE_ALIAS]
+
+
+def current_tag_versions(tags: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+    """Sorted ``(tag, version)`` pairs; tags never bumped have version 0."""
+    tags = sorted(set(tags))
+    if not tags:
+        return ()
+    case_ids = [int(tag[len(CASE_TAG_PREFIX):]) for tag in tags if tag.startswith(CASE_TAG_PREFIX)]
+    other_tags = [tag for tag in tags if not tag.startswith(CASE_TAG_PREFIX)]
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT tag, version FROM cache_tag_versions WHERE tag = ANY(%s)
+            UNION ALL
+            SELECT 'case:' || id, data_version FROM cases WHERE id = ANY(%s)
+            """,
+            [other_tags, case_ids],
+        )
+        found = dict(cursor.fetchall())
+    return tuple((tag, found.get(tag, 0)) for tag in tags)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Bump tag versions; entries carrying any of them become misses everywhere.
+
+    ``case:{id}`` tags follow ``cases.data_version`` and cannot be bumped here.
+    """
+    tags = sorted({tag for tag in tags if tag and not tag.startswith(CASE_TAG_PREFIX)})
+    if not tags:
+        return
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT bump_cache_tag(tag) FROM unnest(%s::text[]) AS tag", [tags])
+
+
+def get_or_compute(namespace: str, key: str, compute: Callable, *, tags: Iterable[str] = (),
+                   ttl: int = 60, store: Callable = lambda value: True):
+    """Return the cached value for ``key`` or compute, store and return it.
+
+    ``store(value)`` decides whether a computed value may be cached.
+    """
+    fingerprint = current_tag_versions(tags)
+    full_key = f"api:{namespace}:{key}"
+
+    blob = _local.get(full_key)
+    if blob is not None:
+        cached_fingerprint, value = pickle.loads(blob)
+        if cached_fingerprint == fingerprint:
+            _count(namespace, 'l1_hits')
+            return value
+
+    shared = _shared_tier()
+    if shared is not None:
+        try:
+            blob = shared.get(full_key)
+        except Exception as exc:
+            logger.warning(f"Shared API cache read failed for {namespace}: {exc}")
+            blob = None
+        if blob is not None:
+            cached_fingerprint, value = pickle.loads(blob)
+            if cached_fingerprint == fingerprint:
+                _local.set(full_key, blob, ttl)
+                _count(namespace, 'l2_hits')
+                return value
+
+    _count(namespace, 'misses')
+    value = compute()
+    if not store(value):
+        return value
+
+    try:
+        blob = pickle.dumps((fingerprint, value), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as exc:
+        logger.warning(f"API cache value for {namespace} is not picklable: {exc}")
+        return value
+    _local.set(full_key, blob, ttl)
+    if shared is not None:
+        try:
+            shared.set(full_key, blob, ttl)
+        except Exception as exc:
+            logger.warning(f"Shared API cache write failed for {namespace}: {exc}")
+    _count(namespace, 'stores')
+    return value
+
+
+def _is_success(result) -> bool:
+    if isinstance(result, HttpResponse):
+        return False
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], int):
+        return result[0] == 200
+    return True
+
+
+def skip_caching(request) -> None:
+    """Serve the current result of a ``cached_endpoint`` view without storing it."""
+    request._api_cache_skip = True
+
+
+def cached_endpoint(namespace: str, *, ttl: int = 60, tags=None, per_user: bool = True):
+    """Cache a Ninja view's successful result under ``namespace``.
+
+    ``tags`` is an iterable of tags or a callable taking the view's arguments
+    (``request`` plus path/query parameters) and returning them. A callable
+    returning None bypasses the cache for that request, which is how views
+    skip caching for callers they would reject. The key covers the absolute
+    URL (scheme, host, path and query string) and, when ``per_user``, the
+    requesting user.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                request_tags = tags(request, *args, **kwargs) if callable(tags) else (tags or ())
+            except Exception as exc:
+                logger.warning(f"API cache tag lookup failed for {namespace}: {exc}")
+                request_tags = None
+            if request_tags is None:
+                _count(namespace, 'bypassed')
+                return view(request, *args, **kwargs)
+
+            user = getattr(request, 'auth', None) or getattr(request, 'user', None)
+            raw_key = '|'.join([
+                request.build_absolute_uri(),
+                str(getattr(user, 'pk', '') or '') if per_user else '',
+            ])
+            key = hashlib.sha1(raw_key.encode()).hexdigest()
+            return get_or_compute(
+                namespace,
+                key,
+                lambda: view(request, *args, **kwargs),
+                tags=request_tags,
+                ttl=ttl,
+                store=lambda result: _is_success(result) and not getattr(request, '_api_cache_skip', False),
+            )
+        return wrapper
+    return decorator
@@ -3,6 +3,10 @@ ASGI config for incident management platform project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve this application (e.g. ``uvicorn core.asgi:application``) to enable the
+long-lived ``/api/events/stream`` Server-Sent Events endpoint; under WSGI each
+open stream would pin a worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/stable/howto/deployment/asgi/
 """
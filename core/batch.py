@@ -0,0 +1,228 @@
+"""
+Batched API calls: ``POST /api/batch`` runs several API requests in one round trip.
+
+The body lists sub-requests, answered in the same order::
+
+    {"requests": [
+        {"id": "detail", "method": "GET", "path": "/api/vendor-check-detail/12/claimant"},
+        {"id": "unread", "method": "GET", "path": "/api/notifications?unread=true"},
+        {"method": "POST", "path": "/api/notifications/mark-read", "body": {"ids": [4, 5]}}
+    ]}
+
+Each sub-request is dispatched in-process to the view its path resolves to,
+so it runs through Ninja with the usual parameter parsing, permissions and
+view decorators. Sub-requests do not pass through the middleware stack.
+Authentication happens once, for the batch: sub-requests reuse the resolved
+``request.user``, so SessionOrTokenAuth does not look the token up again.
+
+Ordering:
+- writes (POST, PUT, PATCH, DELETE) run in order on the request thread, on
+  the batch's own DB connection;
+- consecutive GETs between writes are independent reads. They run
+  concurrently on up to ``BATCH_MAX_CONCURRENCY`` threads; each thread takes
+  a connection from the pool and returns it when done. With
+  ``BATCH_MAX_CONCURRENCY=1`` every sub-request shares the batch's connection.
+
+Limits: ``BATCH_MAX_REQUESTS`` sub-requests per batch, JSON bodies of at
+most ``BATCH_MAX_BODY_BYTES`` each, and /api/ paths only (no nested
+batches). At most two batches per user run at once (admission name
+``batch``). Every path is resolved before anything runs: unknown routes get
+a 404 entry and async views (the SSE stream) a 400 entry, without being
+dispatched. Streaming responses (downloads) are answered with a 400 entry.
+
+Each result carries the sub-request's ``id``, ``status``, selected headers
+and its ``body``. JSON bodies are embedded without being parsed again. A
+failed sub-request does not fail the batch: an exception in its view is
+logged and recorded as a 500 entry in its slot.
+"""
+import contextvars
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+from urllib.parse import urlsplit
+
+import orjson
+from asgiref.sync import iscoroutinefunction
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from ninja import Schema
+
+from core.db_routing import UNSAFE_METHODS, pin_to_primary, replica_configured
+from core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH = '/api/batch'
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', '20'))
+BATCH_MAX_BODY_BYTES = int(os.environ.get('BATCH_MAX_BODY_BYTES', '262144'))
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '4'))
+
+ALLOWED_METHODS = ('GET',) + UNSAFE_METHODS
+RESPONSE_HEADERS = ('ETag', 'Retry-After', 'Location')
+# Headers of the batch request that must not leak into its sub-requests.
+_DROPPED_META = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_ACCEPT_ENCODING', 'HTTP_CONTENT_ENCODING')
+
+
+class BatchItem(Schema):
+    id: Optional[str] = None
+    method: str = 'GET'
+    path: str
+    body: Optional[Any] = None
+
+
+class BatchRequest(Schema):
+    requests: List[BatchItem]
+
+
+class BatchError(Exception):
+    """The batch as a whole is invalid (rejected with 400)."""
+
+
+def validate_batch(items: List[BatchItem]) -> None:
+    if not items:
+        raise BatchError("A batch needs at least one request.")
+    if len(items) > BATCH_MAX_REQUESTS:
+        raise BatchError(f"A batch may contain at most {BATCH_MAX_REQUESTS} requests.")
+    for index, item in enumerate(items):
+        method = item.method.upper()
+        path = urlsplit(item.path).path
+        if method not in ALLOWED_METHODS:
+            raise BatchError(f"Request {index}: method {item.method} is not allowed.")
+        if not path.startswith('/api/') or path.rstrip('/') == BATCH_PATH:
+            raise BatchError(f"Request {index}: only /api/ paths other than {BATCH_PATH} can be batched.")
+
+
+def _encode_body(item: BatchItem) -> bytes:
+    if item.body is None:
+        return b''
+    payload = item.body.encode() if isinstance(item.body, str) else orjson.dumps(item.body)
+    if len(payload) > BATCH_MAX_BODY_BYTES:
+        raise BatchError(f"Request body for {item.path} exceeds {BATCH_MAX_BODY_BYTES} bytes.")
+    return payload
+
+
+def _sub_request(parent, method: str, path: str, payload: bytes) -> WSGIRequest:
+    url = urlsplit(path)
+    environ = {key: value for key, value in parent.META.items() if key not in _DROPPED_META}
+    environ.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+    })
+    environ.setdefault('wsgi.url_scheme', parent.scheme)
+    environ.setdefault('SCRIPT_NAME', '')
+    sub = WSGIRequest(environ)
+    sub.user = parent.user
+    if hasattr(parent, 'session'):
+        sub.session = parent.session
+    return sub
+
+
+def _result(item: BatchItem, status: int, body, headers=None) -> dict:
+    return {'id': item.id, 'status': status, 'headers': headers or {}, 'body': body}
+
+
+def _resolve(item: BatchItem):
+    """``(match, None)`` for a dispatchable item, else ``(None, error result)``."""
+    path = urlsplit(item.path).path
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None, _result(item, 404, {'error': f'No route for {path}'})
+    if iscoroutinefunction(match.func):
+        return None, _result(item, 400, {'error': f'{path} is an async or streaming endpoint and cannot be batched'})
+    return match, None
+
+
+def _execute(parent, item: BatchItem, match, payload: bytes) -> dict:
+    method = item.method.upper()
+    sub = _sub_request(parent, method, item.path, payload)
+    sub.resolver_match = match
+
+    labels = (('route', match.route), ('method', method))
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", method, item.path)
+        registry.inc('api_batch_subrequests_total', labels + (('status', '500'),))
+        return _result(item, 500, {'error': 'An unexpected error occurred'})
+    registry.inc('api_batch_subrequests_total', labels + (('status', str(response.status_code)),))
+    if response.streaming:
+        response.close()
+        return _result(item, 400, {'error': 'Streaming responses cannot be batched'})
+
+    headers = {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)}
+    content_type = response.get('Content-Type', '')
+    if content_type.startswith('application/json') and response.content:
+        body = orjson.Fragment(response.content)
+    else:
+        body = response.content.decode(response.charset or 'utf-8', errors='replace')
+    return _result(item, response.status_code, body, headers)
+
+
+def _execute_in_thread(context: contextvars.Context, parent, item: BatchItem, match, payload: bytes) -> dict:
+    try:
+        return context.run(_execute, parent, item, match, payload)
+    finally:
+        # Hand this thread's connections back (to the pool when one is configured).
+        connections.close_all()
+
+
+def _run_reads(parent, items: List[BatchItem], matches: list, payloads: List[bytes]) -> List[dict]:
+    if len(items) == 1 or BATCH_MAX_CONCURRENCY <= 1:
+        return [_execute(parent, item, match, payload) for item, match, payload in zip(items, matches, payloads)]
+    with ThreadPoolExecutor(max_workers=min(BATCH_MAX_CONCURRENCY, len(items))) as pool:
+        futures = [
+            pool.submit(_execute_in_thread, contextvars.copy_context(), parent, item, match, payload)
+            for item, match, payload in zip(items, matches, payloads)
+        ]
+        return [future.result() for future in futures]
+
+
+def run_batch(request, items: List[BatchItem]) -> List[dict]:
+    """Execute ``items`` for ``request.user``; returns one result per item, in order."""
+    validate_batch(items)
+    payloads = [_encode_body(item) for item in items]
+    logger.debug("Running batch of %d requests for user %s", len(items), request.user.pk)
+    results: List[Optional[dict]] = [None] * len(items)
+    matches = []
+    for index, item in enumerate(items):
+        match, results[index] = _resolve(item)
+        matches.append(match)
+    reads: List[int] = []
+
+    def flush_reads():
+        if not reads:
+            return
+        outcomes = _run_reads(
+            request, [items[i] for i in reads], [matches[i] for i in reads], [payloads[i] for i in reads],
+        )
+        for index, result in zip(reads, outcomes):
+            results[index] = result
+        reads.clear()
+
+    wrote = False
+    for index, item in enumerate(items):
+        if matches[index] is None:
+            continue
+        if item.method.upper() == 'GET':
+            reads.append(index)
+            continue
+        flush_reads()
+        results[index] = _execute(request, item, matches[index], payloads[index])
+        if results[index]['status'] < 400:
+            wrote = True
+            if replica_configured():
+                # Later reads in this batch, and the user's next requests, see this write.
+                pin_to_primary(request)
+    flush_reads()
+
+    # The batch is a POST; ReplicaPinMiddleware only pins it when a sub-request wrote.
+    request.replica_pin_needed = wrote
+    return results
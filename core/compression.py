@@ -0,0 +1,102 @@
+"""
+Negotiated response compression (brotli or gzip).
+
+``CompressionMiddleware`` compresses API responses when all of these hold:
+- the client accepts ``br`` or ``gzip``; brotli is preferred when the
+  ``brotli`` package is installed;
+- the body is at least ``COMPRESS_MIN_BYTES`` long (env, default 1024);
+- the content type is text or JSON;
+- the response is not already encoded.
+
+Streaming responses (SSE, file downloads) and paths under
+``COMPRESS_EXEMPT_PATHS`` are left alone. The default exempt path is
+/api/auth/, because those responses carry tokens next to user input (BREACH).
+
+The middleware sits inside RequestMetricsMiddleware, so
+``api_response_size_bytes`` records bytes on the wire.
+"""
+import gzip
+import os
+import re
+
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+COMPRESS_EXEMPT_PATHS = tuple(
+    path.strip() for path in os.environ.get('COMPRESS_EXEMPT_PATHS', '/api/auth/').split(',') if path.strip()
+)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_COMPRESSIBLE = re.compile(r'^(text/|application/(json|javascript|xml)|[^;]*\+json)', re.IGNORECASE)
+
+
+def _accepted_encodings(request) -> set:
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.lower().startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def choose_encoding(request):
+    accepted = _accepted_encodings(request)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compress text and JSON responses above ``COMPRESS_MIN_BYTES``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if request.path.startswith(COMPRESS_EXEMPT_PATHS):
+            return response
+        if not _COMPRESSIBLE.match(response.get('Content-Type', '')):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < COMPRESS_MIN_BYTES:
+            return response
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The representation changed, so a strong validator no longer holds.
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,96 @@
+"""
+Conditional GET (ETag / If-None-Match) for API views backed by versioned rows.
+
+A view opts in with ``@conditional_get(version_func)`` placed under its
+``@router.get(...)`` decorator. ``version_func(request, **path_and_query)``
+runs first and returns a cheap version token (for example
+``cases.data_version``) or None to skip conditional handling. Version
+functions must apply the view's own access rules: a token is only returned
+for requests the view would answer with 200.
+
+When the client's If-None-Match matches, the decorator answers 304 without
+calling the view, so none of the heavy queries or serialization run.
+Otherwise the view runs and ``ConditionalETagMiddleware`` stamps the ETag on
+its 200 response.
+
+ETags are weak (the JSON body is not byte-stable) and include the host,
+full path with query string and the requesting user, so per-user responses
+never share a validator.
+"""
+import functools
+import hashlib
+import logging
+
+from django.http import HttpResponseNotModified
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(request, version) -> str:
+    user = getattr(request, 'auth', None) or getattr(request, 'user', None)
+    raw = '|'.join([
+        request.get_host(),
+        request.get_full_path(),
+        str(getattr(user, 'pk', '') or ''),
+        str(version),
+    ])
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_get(version_func):
+    """Answer If-None-Match with 304 when ``version_func`` reports an unchanged version."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                version = version_func(request, *args, **kwargs)
+            except Exception as exc:
+                logger.warning(f"ETag version lookup failed for {request.path}: {exc}")
+                version = None
+            if version is None:
+                return view(request, *args, **kwargs)
+
+            etag = make_etag(request, version)
+            if _etag_matches(request, etag):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                response['Cache-Control'] = CACHE_CONTROL
+                return response
+
+            request._conditional_etag = etag
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ConditionalETagMiddleware:
+    """Attach the ETag computed by ``conditional_get`` to successful responses."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        etag = getattr(request, '_conditional_etag', None)
+        if etag and response.status_code == 200 and not response.has_header('ETag'):
+            response['ETag'] = etag
+            response['Cache-Control'] = CACHE_CONTROL
+        return response
@@ -0,0 +1,126 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+When a ``replica`` database alias is configured (``DB_REPLICA_HOST``), views
+decorated with ``@replica_read`` run their reads against it:
+- ORM reads go through ``ReplicaRouter.db_for_read``;
+- raw SQL uses ``connections[read_alias()]`` instead of ``'default'``.
+Every other view, and every write, stays on ``default``.
+
+Stickiness: ``ReplicaPinMiddleware`` pins the user to the primary for
+``DB_REPLICA_STICKY_SECONDS`` after any successful unsafe request (POST,
+PUT, PATCH, DELETE). The pin is stored in the shared API cache tier when one
+is configured, in process memory otherwise, and in a ``db_pin`` cookie, so
+a follow-up read never sees data older than the write. A view whose unsafe
+request wrote nothing (a POST /api/batch of reads) sets
+``request.replica_pin_needed = False`` to skip the pin. A write made inside
+a replica-read view also switches the rest of that request to the primary.
+"""
+import contextvars
+import functools
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '10'))
+PIN_COOKIE = 'db_pin'
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def read_alias() -> str:
+    """Alias raw-SQL reads should use in the current context."""
+    return REPLICA_ALIAS if _use_replica.get() and replica_configured() else 'default'
+
+
+def _pin_store():
+    return caches['api_shared'] if 'api_shared' in settings.CACHES else caches['default']
+
+
+def _pin_key(user_id) -> str:
+    return f"db_pin:{user_id}"
+
+
+def pin_to_primary(request, response=None) -> None:
+    """Route this user's replica reads to the primary for the next STICKY_SECONDS."""
+    user = getattr(request, 'user', None)
+    if user is not None and getattr(user, 'is_authenticated', False):
+        try:
+            _pin_store().set(_pin_key(user.pk), time.time() + STICKY_SECONDS, STICKY_SECONDS)
+        except Exception as exc:
+            logger.warning(f"Failed to record primary pin for user {user.pk}: {exc}")
+    if response is not None:
+        response.set_cookie(PIN_COOKIE, '1', max_age=STICKY_SECONDS, httponly=True, samesite='Lax')
+
+
+def is_pinned(request) -> bool:
+    if request.COOKIES.get(PIN_COOKIE):
+        return True
+    user = getattr(request, 'auth', None) or getattr(request, 'user', None)
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return False
+    try:
+        pinned_until = _pin_store().get(_pin_key(user.pk))
+    except Exception:
+        return True
+    return bool(pinned_until and pinned_until > time.time())
+
+
+def replica_read(view):
+    """Serve a read-only view from the replica unless the user recently wrote."""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replica_configured() or is_pinned(request):
+            return view(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send reads inside ``replica_read`` views to the replica; everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        if _use_replica.get():
+            # Read-your-writes within the request: later reads see this write.
+            _use_replica.set(False)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaPinMiddleware:
+    """Pin users to the primary after successful writes (see module docstring)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            replica_configured() and request.method in UNSAFE_METHODS and response.status_code < 400
+            and getattr(request, 'replica_pin_needed', True)
+        ):
+            pin_to_primary(request, response)
+        return response
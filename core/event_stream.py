@@ -0,0 +1,103 @@
+"""
+Server-Sent Events endpoint pushing portal events to connected clients.
+
+Clients open ``GET /api/events/stream`` and receive ``notification``,
+``assignment``, ``check_status`` and ``report_status`` events instead of
+polling. Fan-out across worker processes goes through Postgres
+LISTEN/NOTIFY (see ``users/services/event_bus.py``).
+
+This view is async and holds the connection open; it must be served by an
+ASGI server (``core.asgi:application`` under uvicorn/daphne). Browsers'
+``EventSource`` cannot set headers, so the bearer token may also be passed as
+``?token=``.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from users.services.event_bus import Subscriber, get_event_hub
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 25
+
+
+def _authenticate_stream_user(request):
+    """Resolve the user from the session, the Authorization header or ``?token=``."""
+    from users.models import AuthToken
+
+    if request.user and request.user.is_authenticated:
+        return request.user
+
+    auth_header = request.headers.get('Authorization', '')
+    token = auth_header[7:] if auth_header.startswith('Bearer ') else request.GET.get('token', '')
+    if not token:
+        return None
+
+    try:
+        token_obj = AuthToken.objects.select_related('user').get(token=token)
+    except AuthToken.DoesNotExist:
+        return None
+
+    if not token_obj.is_active or token_obj.is_expired or not token_obj.user.is_active:
+        return None
+
+    token_obj.last_used_at = timezone.now()
+    token_obj.save(update_fields=['last_used_at'])
+    return token_obj.user
+
+
+def _resolve_vendor_id(user):
+    if getattr(user, 'role', None) != 'VENDOR':
+        return None
+    from users.models import Vendor
+    return Vendor.objects.filter(user=user).values_list('id', flat=True).first()
+
+
+def _format_sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(request):
+    """Stream events addressed to the authenticated user until the client disconnects."""
+    user = await sync_to_async(_authenticate_stream_user)(request)
+    if user is None:
+        return JsonResponse({"error": "Not authenticated"}, status=401)
+
+    vendor_id = await sync_to_async(_resolve_vendor_id)(user)
+    hub = get_event_hub()
+    subscriber = Subscriber(
+        user_id=user.id,
+        role=getattr(user, 'role', ''),
+        vendor_id=vendor_id,
+        loop=asyncio.get_running_loop(),
+    )
+    hub.subscribe(subscriber)
+
+    async def _stream():
+        try:
+            yield "retry: 5000\n\n"
+            yield ": connected\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(message.get("type", "message"), message.get("data", {}))
+        finally:
+            hub.unsubscribe(subscriber)
+            if subscriber.dropped:
+                logger.warning(
+                    "Event stream for user %s dropped %d events (slow client)",
+                    subscriber.user_id, subscriber.dropped,
+                )
+
+    response = StreamingHttpResponse(_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
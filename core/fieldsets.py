@@ -0,0 +1,156 @@
+"""
+Sparse fieldsets for list and detail endpoints: ``?fields=`` and ``?include=``.
+
+A view declares a ``Resource`` per table it serves and parses the two query
+parameters with ``parse_fieldset``::
+
+    INCIDENT_CASES = Resource('cases', tables=('cases',), alias='c',
+                              computed=('seq_num',), expansions=('sub_items',))
+
+    selection = parse_fieldset(INCIDENT_CASES, fields, include)
+    cursor.execute(f"SELECT {selection.select_sql()} FROM cases c ...")
+    if selection.expands('sub_items'):
+        ...
+
+- ``fields=a,b,c`` names columns and computed keys. The SQL selects only
+  those columns plus the resource's ``always`` columns (``select_sql``), and
+  ``project`` drops every other key from a row.
+- ``include=x,y`` names expansions: nested data (check sub-items, media
+  arrays) that costs extra queries or processing.
+- With neither parameter the response is unchanged: every column and every
+  expansion, so existing clients keep working. Once either is given,
+  expansions are opt-in.
+
+Field names are validated against the column registry: the live columns of
+the resource's tables, read from ``information_schema`` once per process,
+plus its computed keys. Unknown names are a 400, so only real column names
+reach the SQL, and they are quoted there as well.
+
+A sparse response bypasses the endpoint's response schema, so an endpoint
+with a schema must pass ``allowed`` (usually ``schema_fields(Schema)``).
+Names outside it are rejected the same way as unknown ones, so columns the
+schema withholds can never be requested.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from django.db import connections
+from django.http import HttpResponse
+from ninja.errors import HttpError
+
+from core.renderers import dumps
+
+
+@dataclass(frozen=True)
+class Resource:
+    name: str
+    tables: Tuple[str, ...]
+    alias: str = ''
+    always: Tuple[str, ...] = ('id',)
+    computed: Tuple[str, ...] = ()
+    expansions: Tuple[str, ...] = ()
+    allowed: Tuple[str, ...] = ()
+
+
+def schema_fields(schema) -> Tuple[str, ...]:
+    """Field names a response schema declares, for ``Resource(allowed=...)``."""
+    return tuple(schema.model_fields)
+
+
+_columns: Dict[str, FrozenSet[str]] = {}
+_columns_lock = threading.Lock()
+
+
+def table_columns(table: str) -> FrozenSet[str]:
+    """Column names of ``table`` in the current schema, cached per process."""
+    columns = _columns.get(table)
+    if columns is None:
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+                """,
+                [table],
+            )
+            columns = frozenset(row[0] for row in cursor.fetchall())
+        with _columns_lock:
+            _columns[table] = columns
+    return columns
+
+
+def reset_column_registry() -> None:
+    """Forget cached table columns (tests, after migrations in a long-lived process)."""
+    with _columns_lock:
+        _columns.clear()
+
+
+def _split(value: Optional[str]) -> list:
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    resource: Resource
+    fields: Optional[FrozenSet[str]]
+    includes: FrozenSet[str]
+
+    @property
+    def sparse(self) -> bool:
+        return self.fields is not None
+
+    def wants(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def expands(self, name: str) -> bool:
+        return name in self.includes
+
+    def select_sql(self, table: Optional[str] = None) -> str:
+        """Select list for ``table`` (default: the resource's first table)."""
+        table = table or self.resource.tables[0]
+        prefix = f'{self.resource.alias}.' if self.resource.alias else ''
+        if self.fields is None:
+            return f'{prefix}*'
+        quote = connections['default'].ops.quote_name
+        available = table_columns(table)
+        return ', '.join(f'{prefix}{quote(column)}' for column in sorted(self.fields) if column in available)
+
+    def project(self, row: dict, extra: Iterable[str] = ()) -> dict:
+        """``row`` limited to the selected fields, the included expansions and ``extra``."""
+        if self.fields is None:
+            return row
+        keep = self.fields | self.includes | frozenset(extra)
+        return {key: value for key, value in row.items() if key in keep}
+
+
+def parse_fieldset(resource: Resource, fields: Optional[str] = None, include: Optional[str] = None) -> FieldSelection:
+    """Validate ``fields`` / ``include`` for ``resource``; raises HttpError(400) on unknown names."""
+    expansions = _split(include)
+    unknown = [name for name in expansions if name not in resource.expansions]
+    if unknown:
+        raise HttpError(400, (
+            f"Unknown include for {resource.name}: {', '.join(unknown)}. "
+            f"Valid: {', '.join(resource.expansions) or 'none'}"
+        ))
+    if fields is None and include is None:
+        return FieldSelection(resource, None, frozenset(resource.expansions))
+
+    requested = _split(fields)
+    if not requested:
+        return FieldSelection(resource, None, frozenset(expansions))
+
+    known = set(resource.computed)
+    for table in resource.tables:
+        known |= table_columns(table)
+    if resource.allowed:
+        known &= set(resource.allowed)
+    unknown = [name for name in requested if name not in known]
+    if unknown:
+        raise HttpError(400, f"Unknown fields for {resource.name}: {', '.join(unknown)}")
+    return FieldSelection(resource, frozenset(requested) | frozenset(resource.always), frozenset(expansions))
+
+
+def sparse_response(data):
+    """Render ``data`` as-is, bypassing a response schema that describes the full row."""
+    return HttpResponse(dumps(data), content_type='application/json')
@@ -0,0 +1,326 @@
+"""
+Shared outbound HTTP client for third-party APIs.
+
+Every call to an external service goes through ``http_request(provider,
+method, url, ...)`` or the ``get`` / ``post`` shortcuts::
+
+    response = http_client.post('groq', GROQ_CHAT_URL, json=payload, headers=headers)
+
+Each provider in ``PROVIDERS`` gets:
+- one ``requests.Session`` per process, with a keep-alive connection pool
+  sized to the provider's concurrency limit;
+- default (connect, read) timeouts, which callers may override per call;
+- a concurrency limit: a caller waits up to ``queue_timeout`` seconds for a
+  slot, then gets ``ProviderBusy``;
+- a circuit breaker (below);
+- urllib3 retries for connection errors, plus 429/5xx retries for
+  providers that opt in.
+
+Circuit breaker: after ``failure_threshold`` consecutive failures the
+provider is short-circuited for ``reset_seconds`` and calls raise
+``CircuitOpen`` without touching the network. Failures are connection
+errors, timeouts, 429 and 5xx responses, and any other exception raised
+while sending. The first call after that window is a trial: success closes
+the circuit, failure re-opens it.
+
+Transport errors are re-raised as ``ProviderTimeout`` /
+``ProviderConnectionError``. All of these subclass ``OutboundHTTPError``, so
+callers do not depend on ``requests`` directly. HTTP error responses are
+returned to the caller as usual.
+
+Defaults can be overridden per provider with the ``OUTBOUND_HTTP`` env var
+(JSON), e.g. ``{"nominatim": {"max_concurrency": 1, "read_timeout": 5}}``.
+State is per process. Metrics in /api/metrics:
+- ``outbound_http_requests_total{provider,outcome}``;
+- ``outbound_http_duration_seconds{provider}``;
+- ``outbound_http_circuit_state{provider}`` (0 closed, 1 half-open, 2 open).
+"""
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from core.lazy_imports import lazy_import
+from core.metrics import LATENCY_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+requests = lazy_import('requests')
+
+USER_AGENT = 'IncidentMgmtPlatform/1.0'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class Provider:
+    name: str
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    max_concurrency: int = 4
+    queue_timeout: float = 2.0
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+    connect_retries: int = 1
+    status_retries: int = 0
+    retry_methods: tuple = ('GET',)
+    backoff: float = 0.5
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+DEFAULT_PROVIDERS = {
+    # Groq: STT, translation and AI case review. Long reads; 429/5xx retried
+    # as the speech service always did.
+    'groq': Provider(
+        'groq', connect_timeout=5.0, read_timeout=60.0, max_concurrency=8, queue_timeout=5.0,
+        status_retries=3, retry_methods=('POST',), backoff=1.0,
+    ),
+    'speechmatics': Provider(
+        'speechmatics', connect_timeout=5.0, read_timeout=60.0, max_concurrency=4, queue_timeout=5.0,
+        status_retries=3, retry_methods=('GET', 'POST'), backoff=1.0,
+    ),
+    # Nominatim's usage policy allows about one request per second per client.
+    'nominatim': Provider(
+        'nominatim', read_timeout=10.0, max_concurrency=2, queue_timeout=3.0,
+        failure_threshold=3, reset_seconds=60.0, headers={'User-Agent': USER_AGENT},
+    ),
+    'arcgis': Provider('arcgis', read_timeout=10.0, max_concurrency=4, headers={'User-Agent': USER_AGENT}),
+    'expo': Provider('expo', read_timeout=10.0, max_concurrency=4, failure_threshold=5, reset_seconds=30.0),
+}
+
+
+def _load_providers() -> Dict[str, Provider]:
+    providers = dict(DEFAULT_PROVIDERS)
+    overrides = os.environ.get('OUTBOUND_HTTP', '').strip()
+    if overrides:
+        for name, values in json.loads(overrides).items():
+            base = providers.get(name, Provider(name))
+            providers[name] = dataclasses.replace(base, **values)
+    return providers
+
+
+PROVIDERS = _load_providers()
+
+
+class OutboundHTTPError(Exception):
+    """Base class for failures raised by the shared HTTP client."""
+
+    def __init__(self, provider: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitOpen(OutboundHTTPError):
+    pass
+
+
+class ProviderBusy(OutboundHTTPError):
+    pass
+
+
+class ProviderTimeout(OutboundHTTPError):
+    pass
+
+
+class ProviderConnectionError(OutboundHTTPError):
+    pass
+
+
+# =============================================================================
+# Circuit breaker
+# =============================================================================
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, provider: Provider):
+        self.provider = provider
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.provider.reset_seconds - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpen(self.provider.name, 'circuit open', retry_after=remaining)
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpen(self.provider.name, 'circuit half-open, trial in flight', retry_after=1.0)
+                self._trial_in_flight = True
+
+    def cancel_trial(self) -> None:
+        """The call never reached the provider; let the next caller run the trial."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.provider.failure_threshold:
+                self.opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self.OPEN:
+            logger.warning("Circuit for %s opened after %d failures", self.provider.name, self.failures)
+        elif state == self.CLOSED:
+            logger.info("Circuit for %s closed", self.provider.name)
+        self.state = state
+
+
+# =============================================================================
+# Per-provider state
+# =============================================================================
+
+class _ProviderState:
+    def __init__(self, provider: Provider):
+        self.provider = provider
+        self.breaker = CircuitBreaker(provider)
+        self.slots = threading.BoundedSemaphore(provider.max_concurrency)
+        self.session = self._build_session(provider)
+
+    @staticmethod
+    def _build_session(provider: Provider):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=provider.connect_retries + provider.status_retries,
+            connect=provider.connect_retries,
+            read=0,
+            status=provider.status_retries,
+            status_forcelist=RETRY_STATUSES if provider.status_retries else (),
+            allowed_methods=frozenset(provider.retry_methods),
+            backoff_factor=provider.backoff,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=provider.max_concurrency, pool_block=False, max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(provider.headers)
+        return session
+
+
+_states: Dict[str, _ProviderState] = {}
+_states_lock = threading.Lock()
+_states_pid = None
+
+
+def _state_for(name: str) -> _ProviderState:
+    global _states_pid
+    state = _states.get(name)
+    if state is not None and _states_pid == os.getpid():
+        return state
+    with _states_lock:
+        if _states_pid != os.getpid():
+            # Forked worker: connection pools must not be shared with the parent.
+            _states.clear()
+            _states_pid = os.getpid()
+        state = _states.get(name)
+        if state is None:
+            provider = PROVIDERS.get(name) or Provider(name)
+            state = _states[name] = _ProviderState(provider)
+        return state
+
+
+def reset_http_clients() -> None:
+    """Drop sessions and breaker state (tests, config reloads)."""
+    with _states_lock:
+        for state in _states.values():
+            state.session.close()
+        _states.clear()
+
+
+def circuit_states() -> Dict[str, int]:
+    """``{provider: 0 closed | 1 half-open | 2 open}`` for the metrics endpoint."""
+    return {name: CircuitBreaker.STATE_VALUES[state.breaker.state] for name, state in list(_states.items())}
+
+
+# =============================================================================
+# Requests
+# =============================================================================
+
+def _observe(provider: str, outcome: str, elapsed: Optional[float] = None) -> None:
+    registry.inc('outbound_http_requests_total', (('provider', provider), ('outcome', outcome)))
+    if elapsed is not None:
+        registry.observe('outbound_http_duration_seconds', (('provider', provider),), elapsed, LATENCY_BUCKETS)
+
+
+def http_request(provider: str, method: str, url: str, timeout=None, **kwargs):
+    """Send ``method url`` through ``provider``'s pool, limit and circuit breaker."""
+    state = _state_for(provider)
+    config = state.provider
+    try:
+        state.breaker.before_call()
+    except CircuitOpen:
+        _observe(provider, 'circuit_open')
+        raise
+
+    if not state.slots.acquire(timeout=config.queue_timeout):
+        state.breaker.cancel_trial()
+        _observe(provider, 'busy')
+        raise ProviderBusy(provider, f'{config.max_concurrency} requests already in flight', retry_after=1.0)
+
+    started = time.perf_counter()
+    try:
+        response = state.session.request(
+            method, url, timeout=timeout or (config.connect_timeout, config.read_timeout), **kwargs,
+        )
+    except requests.Timeout as exc:
+        state.breaker.record_failure()
+        _observe(provider, 'timeout', time.perf_counter() - started)
+        raise ProviderTimeout(provider, f'{method} {url} timed out') from exc
+    except requests.RequestException as exc:
+        state.breaker.record_failure()
+        _observe(provider, 'error', time.perf_counter() - started)
+        raise ProviderConnectionError(provider, f'{method} {url} failed: {exc}') from exc
+    except Exception:
+        # Anything else (an unwrapped urllib3 error, a bad argument) must not
+        # leave a half-open trial in flight forever.
+        state.breaker.record_failure()
+        _observe(provider, 'error', time.perf_counter() - started)
+        raise
+    except BaseException:
+        state.breaker.cancel_trial()
+        raise
+    finally:
+        state.slots.release()
+
+    elapsed = time.perf_counter() - started
+    if response.status_code == 429 or response.status_code >= 500:
+        state.breaker.record_failure()
+        _observe(provider, 'http_5xx' if response.status_code >= 500 else 'throttled', elapsed)
+    else:
+        state.breaker.record_success()
+        _observe(provider, 'ok' if response.status_code < 400 else 'http_4xx', elapsed)
+    return response
+
+
+def get(provider: str, url: str, **kwargs):
+    return http_request(provider, 'GET', url, **kwargs)
+
+
+def post(provider: str, url: str, **kwargs):
+    return http_request(provider, 'POST', url, **kwargs)
@@ -0,0 +1,173 @@
+"""
+Import-time budget for worker startup.
+
+``measure_startup()`` runs a fresh interpreter with ``python -X importtime``.
+It imports ``core.wsgi`` (settings, ``django.setup()``, apps and models), then
+``core.urls``. ``core.urls`` pulls in the Ninja API with every router. Django
+would otherwise load it on the first request, so that request pays for it.
+From the importtime report it returns:
+- the cumulative import time of each target;
+- the slowest modules by self time;
+- every module loaded.
+
+``check_budget()`` compares the median of several runs against
+``users/import_budget.json``. The budget file keeps the measurement it was
+recorded from (``measured_ms``, ``runs``, ``python``) next to the limits
+(``targets_ms`` = measured + ``headroom``, checked with a further
+``tolerance``). Timings vary by machine, so it also caps the number of
+modules loaded at startup (``max_modules``): that count does not depend on
+machine speed and catches a new eager import anywhere on the path. It also
+fails when a module in ``LAZY_MODULES`` was loaded at startup. Those are
+heavy or optional libraries that must only be imported on first use, via
+core.lazy_imports.lazy_import or a function-local import.
+
+Checks: ``python manage.py bench_import_time`` (``--record`` rewrites the
+budget from the current tree) and users/tests_import_time.py. The test suite
+always checks the module cap and the lazy modules. It checks the millisecond
+limits only when ``IMPORT_BUDGET_TIMING=1`` is set, because on a loaded
+machine they fail on noise rather than regressions.
+"""
+import json
+import math
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+
+BUDGET_FILE = Path(settings.BASE_DIR) / 'users' / 'import_budget.json'
+TARGETS = ('core.wsgi', 'core.urls')
+STARTUP_SCRIPT = 'import core.wsgi; import core.urls'
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_HEADROOM = 0.15
+MODULE_HEADROOM = 0.05
+
+LAZY_MODULES = (
+    'docx',
+    'fitz',
+    'geopy',
+    'google_auth_oauthlib',
+    'googleapiclient',
+    'openpyxl',
+    'PIL',
+    'requests',
+)
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(output: str) -> list:
+    """``-X importtime`` stderr -> ``[(module, self_us, cumulative_us, depth), ...]``."""
+    rows = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def measure_startup(script: str = STARTUP_SCRIPT) -> dict:
+    """Import the targets in a fresh interpreter and summarize ``-X importtime``."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'))
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=300,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup import failed:\n{completed.stderr[-4000:]}")
+
+    rows = parse_importtime(completed.stderr)
+    cumulative = {module: cumulative_us for module, _, cumulative_us, depth in rows if depth == 0}
+    return {
+        'targets_ms': {target: round(cumulative.get(target, 0) / 1000, 1) for target in TARGETS},
+        'total_ms': round(sum(cumulative_us for _, _, cumulative_us, depth in rows if depth == 0) / 1000, 1),
+        'slowest': [
+            {'module': module, 'self_ms': round(self_us / 1000, 1)}
+            for module, self_us, _, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:25]
+        ],
+        'modules': sorted(module for module, _, _, _ in rows),
+    }
+
+
+def measure_median(runs: int = 5) -> dict:
+    """Median target times over ``runs`` fresh interpreters (first run's module list)."""
+    results = [measure_startup() for _ in range(max(runs, 1))]
+    summary = dict(results[0])
+    summary['runs'] = len(results)
+    summary['targets_ms'] = {
+        target: round(statistics.median(result['targets_ms'][target] for result in results), 1)
+        for target in TARGETS
+    }
+    summary['total_ms'] = round(statistics.median(result['total_ms'] for result in results), 1)
+    return summary
+
+
+def eager_lazy_modules(modules) -> list:
+    """LAZY_MODULES (or their submodules) that were imported at startup."""
+    return sorted({
+        module for module in modules
+        if any(module == name or module.startswith(f'{name}.') for name in LAZY_MODULES)
+    })
+
+
+def load_budget() -> dict:
+    try:
+        with open(BUDGET_FILE) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def record_budget(summary: dict, headroom: float = DEFAULT_HEADROOM) -> dict:
+    module_count = len(summary['modules'])
+    budget = {
+        'tolerance': load_budget().get('tolerance', DEFAULT_TOLERANCE),
+        'headroom': headroom,
+        'runs': summary.get('runs', 1),
+        'python': '.'.join(str(part) for part in sys.version_info[:3]),
+        'measured_ms': summary['targets_ms'],
+        'targets_ms': {
+            target: round(value * (1 + headroom), 1) for target, value in summary['targets_ms'].items()
+        },
+        'module_count': module_count,
+        'max_modules': math.ceil(module_count * (1 + MODULE_HEADROOM)),
+    }
+    with open(BUDGET_FILE, 'w') as handle:
+        json.dump(budget, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+    return budget
+
+
+def check_budget(summary: dict, budget: dict = None, timing: bool = True) -> list:
+    """Return human-readable failures; an empty list means within budget.
+
+    ``timing=False`` skips the millisecond limits and keeps the deterministic
+    checks (module count and lazy modules).
+    """
+    budget = budget if budget is not None else load_budget()
+    failures = []
+    if not budget:
+        return [f"No import budget in {BUDGET_FILE.name}; run `manage.py bench_import_time --record`."]
+    tolerance = budget.get('tolerance', DEFAULT_TOLERANCE)
+    for target, limit in (budget.get('targets_ms', {}) if timing else {}).items():
+        measured = summary['targets_ms'].get(target, 0)
+        if measured > limit * (1 + tolerance):
+            failures.append(
+                f"{target} imports in {measured} ms, budget {limit} ms (+{tolerance:.0%} tolerance)."
+            )
+    max_modules = budget.get('max_modules')
+    if max_modules is not None and len(summary['modules']) > max_modules:
+        failures.append(f"{len(summary['modules'])} modules loaded at startup, budget {max_modules}.")
+    eager = eager_lazy_modules(summary['modules'])
+    if eager:
+        failures.append("Imported at startup but expected to load lazily: " + ', '.join(eager))
+    if failures:
+        failures.append("Slowest modules by self time: " + ', '.join(
+            f"{row['module']} {row['self_ms']} ms" for row in summary['slowest'][:10]
+        ))
+    return failures
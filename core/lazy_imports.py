@@ -0,0 +1,56 @@
+"""
+Deferred imports for heavy or optional third-party modules.
+
+``lazy_import(name)`` returns a stand-in that imports ``name`` on first
+attribute access, so a module can keep ``requests.post(...)`` style call
+sites without paying for the import when a worker boots::
+
+    requests = lazy_import('requests')
+
+The import runs through ``importlib.import_module`` under a lock, so
+concurrent first uses from several threads are safe. (``importlib.util.LazyLoader``
+can expose a half-initialised module to a second thread.) A missing optional
+dependency raises ``ImportError`` at the first use, with ``hint`` appended,
+rather than at startup.
+
+The modules that must stay off the startup path are listed in
+core.import_budget.LAZY_MODULES. The import-time check fails when one of them
+gets imported while ``core.wsgi`` / ``core.urls`` load.
+"""
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str, hint: str = ''):
+        self._name = name
+        self._hint = hint
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as exc:
+                        if not self._hint:
+                            raise
+                        raise ImportError(f"{exc}. {self._hint}") from exc
+                module = self._module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str, hint: str = '') -> LazyModule:
+    return LazyModule(name, hint)
@@ -0,0 +1,342 @@
+"""
+Per-route request instrumentation exposed in Prometheus text format.
+
+``RequestMetricsMiddleware`` records, for every request, labelled by the
+resolved URL route (``api/cases/<int:case_id>/full-details``) and method:
+- request latency and response size histograms, and a status counter;
+- SQL statement count (histogram per request) and total SQL time, via
+  ``execute_wrapper`` on every configured connection;
+- outbound HTTP calls and time to response headers per service (Groq,
+  Nominatim, ArcGIS, Expo, Gmail, Speechmatics). ``http.client`` is patched
+  once, which covers requests/urllib3, urllib, geopy and httplib2 alike.
+Calls made outside a request (scheduler jobs, commands) are counted under
+route ``background``.
+
+Statements slower than ``SLOW_QUERY_MS`` (env, default 250) are logged as
+warnings with their normalized SQL (literals and IN lists collapsed), so
+repeated slow statements share one fingerprint.
+
+``render_metrics()`` serves ``/api/metrics``. Metrics are per process: with
+several workers, scrape each one or aggregate on the Prometheus side.
+"""
+import contextvars
+import hashlib
+import hmac
+import http.client
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Tuple
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '250'))
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+
+OUTBOUND_SERVICES = (
+    ('groq', 'groq.com'),
+    ('nominatim', 'openstreetmap.org'),
+    ('arcgis', 'arcgis.com'),
+    ('expo', 'exp.host'),
+    ('gmail', 'googleapis.com'),
+    ('gmail', 'google.com'),
+    ('speechmatics', 'speechmatics.com'),
+)
+
+BACKGROUND_ROUTE = 'background'
+
+METRIC_HELP = {
+    'api_requests_total': ('counter', 'Requests by route, method and status.'),
+    'api_request_duration_seconds': ('histogram', 'Request latency.'),
+    'api_response_size_bytes': ('histogram', 'Response body size (non-streaming responses).'),
+    'api_db_queries_per_request': ('histogram', 'SQL statements executed per request.'),
+    'api_db_seconds_total': ('counter', 'Time spent executing SQL.'),
+    'api_db_slow_queries_total': ('counter', f'SQL statements slower than {SLOW_QUERY_MS:g} ms.'),
+    'api_outbound_requests_total': ('counter', 'Outbound HTTP requests by service.'),
+    'api_outbound_seconds_total': ('counter', 'Outbound HTTP time to response headers.'),
+    'api_cache_events_total': ('counter', 'API response cache events by namespace.'),
+    'outbound_http_requests_total': ('counter', 'Shared HTTP client calls by provider and outcome.'),
+    'outbound_http_duration_seconds': ('histogram', 'Shared HTTP client call latency by provider.'),
+    'outbound_http_circuit_state': ('gauge', 'Circuit breaker state: 0 closed, 1 half-open, 2 open.'),
+    'admission_requests_total': ('counter', 'Admission-controlled requests by endpoint and outcome.'),
+    'admission_wait_seconds': ('histogram', 'Time spent waiting for an admission slot.'),
+    'admission_in_flight': ('gauge', 'Admitted requests currently running in this process.'),
+    'api_batch_subrequests_total': ('counter', 'Sub-requests run through /api/batch by route, method and status.'),
+}
+
+
+class _RequestStats:
+    __slots__ = ('request', 'queries', 'sql_seconds', 'slow_queries', 'outbound')
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.slow_queries = 0
+        self.outbound: Dict[str, List[float]] = {}
+
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+class _Registry:
+    """Thread-safe counters and cumulative histograms keyed by ``(name, labels)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], list] = {}
+
+    def inc(self, name: str, labels: Tuple, amount: float = 1) -> None:
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Tuple, value: float, buckets: Tuple) -> None:
+        with self._lock:
+            entry = self._histograms.get((name, labels))
+            if entry is None:
+                entry = self._histograms[(name, labels)] = [buckets, [0] * len(buckets), 0.0, 0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[1][index] += 1
+            entry[2] += value
+            entry[3] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return (
+                dict(self._counters),
+                {key: (entry[0], list(entry[1]), entry[2], entry[3]) for key, entry in self._histograms.items()},
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+registry = _Registry()
+
+
+def reset_metrics() -> None:
+    registry.reset()
+
+
+# =============================================================================
+# SQL
+# =============================================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# Django savepoint names embed the thread id ("s140245_x3").
+_SAVEPOINT_NAME = re.compile(r'"s\d+_x\d+"')
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse literals, placeholders and IN lists so similar statements compare equal."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _SAVEPOINT_NAME.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _VALUE_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()[:2000]
+
+
+def _record_sql(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                stats.slow_queries += 1
+                normalized = normalize_sql(sql)
+                logger.warning(
+                    f"Slow SQL {elapsed * 1000:.1f} ms on {route_label(stats.request)} "
+                    f"[{hashlib.sha1(normalized.encode()).hexdigest()[:12]}]: {normalized}"
+                )
+
+
+# =============================================================================
+# Outbound HTTP
+# =============================================================================
+
+_http_installed = False
+_http_install_lock = threading.Lock()
+
+
+def _service_for_host(host: str) -> str:
+    host = (host or '').lower()
+    for service, suffix in OUTBOUND_SERVICES:
+        if host == suffix or host.endswith('.' + suffix):
+            return service
+    return 'other'
+
+
+def _record_outbound(service: str, elapsed: float) -> None:
+    stats = _current.get()
+    if stats is None:
+        registry.inc('api_outbound_requests_total', (('route', BACKGROUND_ROUTE), ('service', service)))
+        registry.inc('api_outbound_seconds_total', (('route', BACKGROUND_ROUTE), ('service', service)), elapsed)
+        return
+    bucket = stats.outbound.setdefault(service, [0, 0.0])
+    bucket[0] += 1
+    bucket[1] += elapsed
+
+
+def install_http_instrumentation() -> None:
+    """Time every ``http.client`` request from ``putrequest`` to response headers."""
+    global _http_installed
+    with _http_install_lock:
+        if _http_installed:
+            return
+        original_putrequest = http.client.HTTPConnection.putrequest
+        original_getresponse = http.client.HTTPConnection.getresponse
+
+        def putrequest(self, *args, **kwargs):
+            self._metrics_started = time.perf_counter()
+            return original_putrequest(self, *args, **kwargs)
+
+        def getresponse(self, *args, **kwargs):
+            try:
+                return original_getresponse(self, *args, **kwargs)
+            finally:
+                started = getattr(self, '_metrics_started', None)
+                if started is not None:
+                    self._metrics_started = None
+                    _record_outbound(_service_for_host(self.host), time.perf_counter() - started)
+
+        http.client.HTTPConnection.putrequest = putrequest
+        http.client.HTTPConnection.getresponse = getresponse
+        _http_installed = True
+
+
+# =============================================================================
+# Middleware
+# =============================================================================
+
+def route_label(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return getattr(match, 'route', None) or 'unmatched'
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL, outbound HTTP and response size per route."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_http_instrumentation()
+
+    def __call__(self, request):
+        stats = _RequestStats(request)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(_record_sql))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, response, stats, elapsed):
+        labels = (('route', route_label(request)), ('method', request.method))
+        registry.inc('api_requests_total', labels + (('status', str(response.status_code)),))
+        registry.observe('api_request_duration_seconds', labels, elapsed, LATENCY_BUCKETS)
+        registry.observe('api_db_queries_per_request', labels, stats.queries, QUERY_COUNT_BUCKETS)
+        registry.inc('api_db_seconds_total', labels, stats.sql_seconds)
+        if stats.slow_queries:
+            registry.inc('api_db_slow_queries_total', labels, stats.slow_queries)
+        if not response.streaming:
+            registry.observe('api_response_size_bytes', labels, len(response.content), SIZE_BUCKETS)
+        for service, (count, seconds) in stats.outbound.items():
+            outbound_labels = (labels[0], ('service', service))
+            registry.inc('api_outbound_requests_total', outbound_labels, count)
+            registry.inc('api_outbound_seconds_total', outbound_labels, seconds)
+
+
+# =============================================================================
+# Exposition
+# =============================================================================
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format 0.0.4."""
+    from core.admission import in_flight
+    from core.api_cache import cache_metrics
+    from core.http_client import circuit_states
+
+    counters, histograms = registry.snapshot()
+    for namespace, events in cache_metrics().items():
+        for event, count in events.items():
+            counters[('api_cache_events_total', (('namespace', namespace), ('event', event)))] = count
+    for provider, state in circuit_states().items():
+        counters[('outbound_http_circuit_state', (('provider', provider),))] = state
+    for endpoint, count in in_flight().items():
+        counters[('admission_in_flight', (('endpoint', endpoint),))] = count
+
+    by_name: Dict[str, list] = {}
+    for (name, labels), value in counters.items():
+        by_name.setdefault(name, []).append(('counter', labels, value))
+    for (name, labels), entry in histograms.items():
+        by_name.setdefault(name, []).append(('histogram', labels, entry))
+
+    lines = []
+    for name in sorted(by_name):
+        kind, help_text = METRIC_HELP.get(name, (by_name[name][0][0], ''))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for _, labels, value in sorted(by_name[name], key=lambda item: item[1]):
+            if kind in ('counter', 'gauge'):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+            buckets, counts, total, count = value
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", _format_value(bound)),))} {bucket_count}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_authorized(request) -> bool:
+    """Scrapers send ``Authorization: Bearer $METRICS_TOKEN``; otherwise require a super admin."""
+    expected = os.environ.get('METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    if expected and header.startswith('Bearer ') and hmac.compare_digest(header[7:], expected):
+        return True
+
+    from users.auth import SessionOrTokenAuth
+    user = SessionOrTokenAuth()(request)
+    return getattr(user, 'role', None) == 'SUPER_ADMIN'
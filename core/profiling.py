@@ -0,0 +1,228 @@
+"""
+On-demand profiling of single live API requests.
+
+A super admin mints a short-lived signed token for one path
+(``POST /api/super-admin/profiles/token``) and sends it with the request to
+profile, either as the ``X-Profile-Token`` header or the ``__profile`` query
+parameter. That request then runs under:
+- cProfile, stored as a marshalled pstats dump (``pstats``/snakeviz) plus a
+  text summary of the top functions by cumulative time;
+- a stack sampler thread (every ``PROFILE_SAMPLE_MS``, default 5) producing
+  collapsed stacks for flame graphs (flamegraph.pl, speedscope);
+- an ``execute_wrapper`` that groups SQL by normalized statement.
+The result is stored in ``request_profiles`` (migration 0075) and its id is
+returned in the ``X-Profile-Id`` response header.
+
+Safety:
+- Unless ``PROFILING_ENABLED=True`` the middleware removes itself from the
+  stack at startup, so requests pay nothing.
+- Tokens are signed with SECRET_KEY, bound to one path and expire after
+  ``max_age`` seconds (default 300).
+- At most ``PROFILE_MAX_PER_MINUTE`` (default 5) profiles are taken per
+  minute across all workers, one at a time per process; requests over the
+  cap are served unprofiled.
+- Only the newest ``PROFILE_RETENTION`` (default 200) profiles are kept.
+"""
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.metrics import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False') == 'True'
+PROFILE_MAX_PER_MINUTE = int(os.environ.get('PROFILE_MAX_PER_MINUTE', '5'))
+PROFILE_SAMPLE_MS = float(os.environ.get('PROFILE_SAMPLE_MS', '5'))
+PROFILE_RETENTION = int(os.environ.get('PROFILE_RETENTION', '200'))
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_PARAM = '__profile'
+TOKEN_SALT = 'core.profiling'
+DEFAULT_TOKEN_MAX_AGE = 300
+
+_profile_lock = threading.Lock()
+
+
+def make_profile_token(path: str, user_id: int, max_age: int = DEFAULT_TOKEN_MAX_AGE) -> str:
+    return signing.dumps({'path': path, 'user': user_id, 'expires': int(time.time()) + max_age}, salt=TOKEN_SALT)
+
+
+def verify_profile_token(token: str, path: str):
+    """Return the id of the admin who minted ``token`` for ``path``, or None."""
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+    if payload.get('path') != path or payload.get('expires', 0) < time.time():
+        return None
+    return payload.get('user')
+
+
+class _SqlBreakdown:
+
+    def __init__(self):
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            entry = self.statements.setdefault(normalize_sql(sql), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+
+    def rows(self, limit: int = 50):
+        rows = [
+            {'sql': sql, 'count': count, 'total_ms': round(total, 2), 'max_ms': round(longest, 2)}
+            for sql, (count, total, longest) in self.statements.items()
+        ]
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows[:limit]
+
+
+class _StackSampler(threading.Thread):
+    """Sample one thread's Python stack at a fixed interval into collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self) -> str:
+        self._stop_event.set()
+        self.join()
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+
+def _under_rate_limit() -> bool:
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM request_profiles WHERE created_at > NOW() - INTERVAL '1 minute'"
+        )
+        return cursor.fetchone()[0] < PROFILE_MAX_PER_MINUTE
+
+
+def _store_profile(request, response, user_id, duration_ms, profiler, sql, collapsed) -> int:
+    profiler.create_stats()
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+    breakdown = sql.rows()
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO request_profiles (
+                method, path, query_string, status_code, duration_ms, requested_by_id,
+                query_count, sql_ms, sql_breakdown, summary, pstats, collapsed_stacks
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s)
+            RETURNING id
+            """,
+            [
+                request.method,
+                request.path,
+                request.META.get('QUERY_STRING', ''),
+                response.status_code,
+                round(duration_ms, 2),
+                user_id,
+                sum(entry[0] for entry in sql.statements.values()),
+                round(sum(entry[1] for entry in sql.statements.values()), 2),
+                json.dumps(breakdown),
+                summary.getvalue(),
+                marshal.dumps(profiler.stats),
+                collapsed,
+            ],
+        )
+        profile_id = cursor.fetchone()[0]
+        cursor.execute(
+            "DELETE FROM request_profiles WHERE id <= ("
+            "SELECT id FROM request_profiles ORDER BY id DESC OFFSET %s LIMIT 1)",
+            [PROFILE_RETENTION],
+        )
+    return profile_id
+
+
+class ProfilingMiddleware:
+    """Profile requests carrying a valid profile token (see module docstring)."""
+
+    def __init__(self, get_response):
+        if not PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_QUERY_PARAM)
+        if not token:
+            return self.get_response(request)
+
+        user_id = verify_profile_token(token, request.path)
+        if user_id is None:
+            logger.warning(f"Ignoring invalid or expired profile token for {request.path}")
+            return self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            logger.info(f"Profile of {request.path} skipped: another profile is running")
+            return self.get_response(request)
+        try:
+            if not _under_rate_limit():
+                logger.info(f"Profile of {request.path} skipped: {PROFILE_MAX_PER_MINUTE}/minute cap reached")
+                return self.get_response(request)
+            return self._profile(request, user_id)
+        finally:
+            _profile_lock.release()
+
+    def _profile(self, request, user_id):
+        sql = _SqlBreakdown()
+        sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_MS / 1000)
+        profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(sql))
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+        finally:
+            collapsed = sampler.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            profile_id = _store_profile(request, response, user_id, duration_ms, profiler, sql, collapsed)
+        except Exception as exc:
+            logger.error(f"Failed to store profile of {request.path}: {exc}")
+            return response
+        logger.info(f"Stored profile {profile_id} of {request.method} {request.path} ({duration_ms:.1f} ms)")
+        response['X-Profile-Id'] = str(profile_id)
+        return response
@@ -0,0 +1,133 @@
+"""
+Query budgets for API tests.
+
+``query_budget(name)`` is a context manager and decorator that captures every
+SQL statement issued on all connections and fails when the count, or the
+number of duplicated statements, exceeds the budget recorded for ``name`` in
+``users/query_budgets.json``::
+
+    with query_budget('full_case_details'):
+        self.client.get(f'/api/cases/incident-db/{case_id}/full-details', **headers)
+
+Duplicates are statements whose normalized SQL (literals and parameters
+collapsed, see core.metrics.normalize_sql) was already issued. A repeated
+lookup per row, the shape of an N+1, shows up there even when the total is
+still under budget. Limits passed explicitly
+(``query_budget('x', max_queries=5)``) take precedence over the file.
+
+On failure the message lists the duplicated statements and a unified diff
+between the statements recorded with the budget and the ones just issued.
+
+Tightening budgets: run the tests with ``QUERY_BUDGET_RECORD=1``. That
+lowers every budget whose endpoint now needs fewer queries and records the
+new statement list; budgets are never raised unless
+``QUERY_BUDGET_RECORD=force``.
+"""
+import difflib
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from core.metrics import normalize_sql
+
+BUDGET_FILE = Path(settings.BASE_DIR) / 'users' / 'query_budgets.json'
+RECORD_MODE = os.environ.get('QUERY_BUDGET_RECORD', '').lower()
+
+_file_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def load_budgets() -> dict:
+    try:
+        with open(BUDGET_FILE) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def _record(name: str, queries: int, duplicates: int, statements) -> None:
+    with _file_lock:
+        budgets = load_budgets()
+        entry = budgets.get(name)
+        force = RECORD_MODE == 'force'
+        if entry and not force and queries > entry['max_queries']:
+            return
+        budgets[name] = {
+            'max_queries': queries if force or not entry else min(queries, entry['max_queries']),
+            'max_duplicates': duplicates if force or not entry else min(duplicates, entry['max_duplicates']),
+            'statements': statements,
+        }
+        with open(BUDGET_FILE, 'w') as handle:
+            json.dump(budgets, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+
+
+class query_budget(ContextDecorator):
+    """Fail when the wrapped block exceeds its query budget (see module docstring)."""
+
+    def __init__(self, name: str, max_queries: int = None, max_duplicates: int = None):
+        self.name = name
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+        self.statements = []
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self._captures = [
+            self._stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections
+        ]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stack.close()
+        if exc_type is not None:
+            return False
+
+        self.statements = [
+            normalize_sql(query['sql']) for capture in self._captures for query in capture.captured_queries
+        ]
+        counts = Counter(self.statements)
+        self.duplicates = sum(count - 1 for count in counts.values())
+
+        # Blocks with explicit limits are ad-hoc checks, not file budgets.
+        if RECORD_MODE and self.max_queries is None and self.max_duplicates is None:
+            _record(self.name, len(self.statements), self.duplicates, self.statements)
+
+        entry = load_budgets().get(self.name, {})
+        max_queries = self.max_queries if self.max_queries is not None else entry.get('max_queries')
+        max_duplicates = self.max_duplicates if self.max_duplicates is not None else entry.get('max_duplicates', 0)
+        if max_queries is None:
+            raise QueryBudgetExceeded(
+                f"No query budget for '{self.name}' in {BUDGET_FILE.name}; "
+                f"run the test with QUERY_BUDGET_RECORD=1 to record one."
+            )
+        if len(self.statements) > max_queries or self.duplicates > max_duplicates:
+            raise QueryBudgetExceeded(self._report(max_queries, max_duplicates, counts, entry.get('statements')))
+        return False
+
+    def _report(self, max_queries, max_duplicates, counts, recorded):
+        lines = [
+            f"Query budget '{self.name}' exceeded: {len(self.statements)} queries (budget {max_queries}), "
+            f"{self.duplicates} duplicates (budget {max_duplicates})."
+        ]
+        repeated = [(sql, count) for sql, count in counts.most_common() if count > 1]
+        if repeated:
+            lines.append("Repeated statements:")
+            lines.extend(f"  {count}x {sql}" for sql, count in repeated)
+        if recorded:
+            lines.append("SQL issued compared with the recorded budget:")
+            lines.extend(difflib.unified_diff(recorded, self.statements, 'budget', 'actual', lineterm='', n=1))
+        else:
+            lines.append("SQL issued:")
+            lines.extend(f"  {index}. {sql}" for index, sql in enumerate(self.statements, 1))
+        return '\n'.join(lines)
@@ -0,0 +1,38 @@
+"""
+orjson renderer for the Ninja API.
+
+orjson serializes datetime, date, time and UUID natively. Datetimes come out
+in ``isoformat()`` form (full microseconds, ``+00:00``), so views return raw
+row values instead of converting them by hand. Anything orjson does not know
+(Decimal, timedelta, lazy translation strings, pydantic models) falls back
+to ``NinjaJSONEncoder.default``, giving the same output as Ninja's default
+renderer. Non-string dict keys are stringified, as ``json.dumps`` does.
+
+Benchmark: ``python manage.py bench_json_rendering``.
+"""
+import decimal
+
+import orjson
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+_fallback_encoder = NinjaJSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+
+    def render(self, request, data, *, response_status):
+        return dumps(data)
@@ -37,6 +37,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.structured_logging.RequestIdMiddleware',
+    'core.metrics.RequestMetricsMiddleware',
+    'core.profiling.ProfilingMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -45,6 +49,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.conditional.ConditionalETagMiddleware',
+    'core.db_routing.ReplicaPinMiddleware',
     'ninja.compatibility.files.fix_request_files_middleware',
 ]
 
@@ -80,6 +86,42 @@ DATABASES = {
     },
 }
 
+# Optional streaming replica for read-heavy endpoints (see core/db_routing.py).
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.environ.get('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+
+
+def _psycopg_pool_installed():
+    from importlib.util import find_spec
+    return find_spec('psycopg') is not None and find_spec('psycopg_pool') is not None
+
+
+# Connection reuse. DB_POOL=auto (default) uses Django's psycopg 3 connection
+# pool when psycopg_pool is installed (it is in requirements.txt), which is
+# also safe under ASGI; otherwise connections persist for DB_CONN_MAX_AGE
+# seconds with health checks.
+DB_POOL = os.environ.get('DB_POOL', 'auto').lower()
+_use_pool = DB_POOL in ('1', 'true', 'yes') or (DB_POOL == 'auto' and _psycopg_pool_installed())
+for _db in DATABASES.values():
+    if _use_pool and _db['ENGINE'] == 'django.db.backends.postgresql':
+        _db.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        }
+        _db['CONN_MAX_AGE'] = 0
+    else:
+        _db['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+        _db['CONN_HEALTH_CHECKS'] = True
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -158,6 +200,40 @@ CORS_ALLOW_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
 ]
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'x-total-count',
+]
+
+# Caches
+# 'default' is per-process memory. 'api_shared' is the optional shared tier of
+# the API response cache (core/api_cache.py): API_CACHE_SHARED=redis uses
+# REDIS_URL (needs the redis package), =file uses API_CACHE_DIR, =locmem is a
+# single-process stand-in for tests; unset disables the shared tier.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+}
+API_CACHE_SHARED = os.environ.get('API_CACHE_SHARED', '').lower()
+if API_CACHE_SHARED == 'redis':
+    CACHES['api_shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        'KEY_PREFIX': 'portal',
+    }
+elif API_CACHE_SHARED == 'file':
+    CACHES['api_shared'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('API_CACHE_DIR', str(BASE_DIR / '.cache' / 'api')),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+elif API_CACHE_SHARED == 'locmem':
+    CACHES['api_shared'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_shared',
+    }
 
 # Email Configuration
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
@@ -206,36 +282,66 @@ SPEECH_STT_MODEL = os.environ.get('SPEECH_STT_MODEL', 'whisper-large-v3')
 SPEECH_TRANSLATION_MODEL = os.environ.get('SPEECH_TRANSLATION_MODEL', 'llama-3.3-70b-versatile')
 
 
+# Logging: records are queued by core.structured_logging.AsyncQueueHandler and
+# written by a background thread (stderr, plus a rotating file when
+# LOG_TO_FILE=True). See that module for the LOG_* variables.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+LOG_SAMPLING = os.environ.get('LOG_SAMPLING', 'users.auth=0.01,users.api.vendor_cases=0.05')
+
+_log_handler = {
+    '()': 'core.structured_logging.AsyncQueueHandler',
+    'level': 'DEBUG',
+    'formatter': 'plain' if LOG_FORMAT == 'plain' else 'json',
+    'filters': ['request_context', 'sampling'],
+    'queue_size': int(os.environ.get('LOG_QUEUE_SIZE', '10000')),
+}
+if os.environ.get('LOG_TO_FILE', 'False') == 'True':
+    _log_handler.update({
+        'filename': str(BASE_DIR / 'logs' / 'django.log'),
+        'max_bytes': int(os.environ.get('LOG_MAX_BYTES', str(50 * 1024 * 1024))),
+        'backup_count': int(os.environ.get('LOG_BACKUP_COUNT', '10')),
+        'when': os.environ.get('LOG_ROTATE_WHEN') or None,
+    })
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'handlers': {
-        'console': {
-            'level': 'INFO',
-            'class': 'logging.StreamHandler',
+    'filters': {
+        'request_context': {
+            '()': 'core.structured_logging.RequestContextFilter',
+        },
+        'sampling': {
+            '()': 'core.structured_logging.SamplingFilter',
+            'rates': LOG_SAMPLING,
         },
     },
+    'formatters': {
+        'json': {
+            '()': 'core.structured_logging.JsonFormatter',
+        },
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s',
+        },
+    },
+    'handlers': {
+        'async': _log_handler,
+    },
     'loggers': {
         'django': {
-            'handlers': ['console'],
+            'handlers': ['async'],
             'level': 'INFO',
-            'propagate': True,
+            'propagate': False,
         },
         'users': {
-            'handlers': ['console'],
-            'level': 'INFO',
+            'handlers': ['async'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        'core': {
+            'handlers': ['async'],
+            'level': LOG_LEVEL,
             'propagate': False,
         },
     },
 }
-
-if os.environ.get('LOG_TO_FILE', 'False') == 'True':
-    log_dir = BASE_DIR / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    LOGGING['handlers']['file'] = {
-        'level': 'INFO',
-        'class': 'logging.FileHandler',
-        'filename': log_dir / 'django.log',
-    }
-    LOGGING['loggers']['django']['handlers'].append('file')
-    LOGGING['loggers']['users']['handlers'].append('file')
@@ -0,0 +1,238 @@
+"""
+Non-blocking, structured logging.
+
+``AsyncQueueHandler`` is the only handler the application loggers write to.
+On the calling thread it runs the filters and puts the record on a bounded
+queue. That is a cheap copy with the message interpolated. A
+``QueueListener`` thread then formats the record and writes it to the
+targets:
+- stderr;
+- a rotating file when ``LOG_TO_FILE=True``. The file rotates by size
+  (``LOG_MAX_BYTES`` / ``LOG_BACKUP_COUNT``), or by time when
+  ``LOG_ROTATE_WHEN`` is set (e.g. ``midnight``).
+When the queue is full, new records are dropped and counted rather than
+blocking the request.
+
+Every record carries ``request_id``. ``RequestIdMiddleware`` takes it from
+the ``X-Request-ID`` header or generates one, and echoes it on the response.
+``JsonFormatter`` writes one JSON object per line. Set ``LOG_FORMAT=plain``
+for human-readable lines.
+
+``SamplingFilter`` keeps only a fraction of the DEBUG records from hot
+loggers (``LOG_SAMPLING="users.auth=0.01,users.api.vendor_cases=0.05"``).
+Warnings and errors are never sampled.
+
+Use %-style arguments (``logger.debug("user %s", name)``) rather than
+f-strings. A disabled level then costs one comparison and no formatting.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_request_id = contextvars.ContextVar('request_id', default='-')
+
+
+def current_request_id() -> str:
+    return _request_id.get()
+
+
+class RequestIdMiddleware:
+    """Bind a request id to every log record emitted while handling a request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        request_id = incoming[:64] if incoming.isprintable() and incoming else uuid.uuid4().hex
+        token = _request_id.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_id.reset(token)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+# =============================================================================
+# Filters
+# =============================================================================
+
+class RequestContextFilter(logging.Filter):
+    """Stamp ``request_id`` on the record; must run on the calling thread."""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = _request_id.get()
+        return True
+
+
+def parse_sampling(spec: str) -> dict:
+    """``"users.auth=0.01, users.api=0.1"`` -> ``{'users.auth': 0.01, 'users.api': 0.1}``."""
+    rates = {}
+    for item in spec.split(','):
+        name, _, rate = item.partition('=')
+        if name.strip() and rate.strip():
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of low-level records per logger (most specific prefix wins)."""
+
+    def __init__(self, rates=None, max_level='DEBUG'):
+        super().__init__()
+        self.rates = parse_sampling(rates) if isinstance(rates, str) else dict(rates or {})
+        self.max_level = logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+        self._resolved = {}
+
+    def _rate(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, prefix = 1.0, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno > self.max_level or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+# =============================================================================
+# Formatters
+# =============================================================================
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'module': record.module,
+            'func': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# =============================================================================
+# Queue handler
+# =============================================================================
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records for a background listener that owns the real handlers.
+
+    The listener starts on first use and is restarted after a fork (gunicorn
+    workers with --preload), so each process gets its own writer thread.
+    """
+
+    def __init__(self, stream=True, filename=None, max_bytes=0, backup_count=5, when=None,
+                 queue_size=10000):
+        super().__init__(None)
+        self.targets = []
+        if stream:
+            self.targets.append(logging.StreamHandler(sys.stderr))
+        if filename:
+            os.makedirs(os.path.dirname(os.fspath(filename)) or '.', exist_ok=True)
+            if when:
+                target = logging.handlers.TimedRotatingFileHandler(
+                    filename, when=when, backupCount=backup_count, encoding='utf-8', delay=True,
+                )
+            else:
+                target = logging.handlers.RotatingFileHandler(
+                    filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True,
+                )
+            self.targets.append(target)
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        self._stop_at_exit = False
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, in the target handlers.
+        super().setFormatter(fmt)
+        for target in self.targets:
+            target.setFormatter(fmt)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            self.listener = logging.handlers.QueueListener(self.queue, *self.targets, respect_handler_level=True)
+            self.listener.start()
+            if not self._stop_at_exit:
+                atexit.register(self.stop)
+                self._stop_at_exit = True
+            self._pid = os.getpid()
+
+    def stop(self):
+        """Flush queued records and stop the listener (called at exit)."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+    def prepare(self, record):
+        # Interpolate the message and render the traceback here: the args and
+        # frames may change once the caller moves on. JSON encoding and the
+        # write stay on the listener thread.
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared = copy.copy(record)
+        prepared.msg = record.message
+        prepared.args = None
+        prepared.exc_info = None
+        return prepared
+
+    def enqueue(self, record):
+        if self.queue.qsize() >= self.queue_size:
+            self.dropped += 1
+        else:
+            self.queue.put_nowait(record)
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def close(self):
+        self.stop()
+        for target in self.targets:
+            target.close()
+        super().close()
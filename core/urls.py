@@ -9,11 +9,13 @@ from django.conf import settings
 from django.conf.urls.static import static
 from core.api import api
 from core.media_serve import serve_media
+from core.event_stream import event_stream
 
 caseManager_path = os.environ.get('DJANGO_ADMIN_PATH', 'caseManager').strip('/') or 'caseManager'
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path('api/events/stream', event_stream),
     path('api/', api.urls),
     re_path(r'^media/(?P<path>.*)$', serve_media, {'document_root': settings.MEDIA_ROOT}),
 ]
@@ -7,8 +7,7 @@ import logging
 import os
 from typing import List, Optional
 from datetime import datetime, timedelta
-from urllib.parse import unquote, urlencode, urlparse
-import urllib.request
+from urllib.parse import unquote, urlparse
 from ninja import Router, Schema, File, Form
 from ninja.files import UploadedFile
 from ninja.errors import HttpError
@@ -18,13 +17,44 @@ from django.http import HttpRequest
 from django.conf import settings
 from django.utils import timezone
 
+from core.admission import admission_limit
+from core.api_cache import cached_endpoint, skip_caching
+from core.conditional import conditional_get
+from core.db_routing import read_alias, replica_read
+from core.fieldsets import Resource, parse_fieldset, schema_fields, sparse_response
 from users.services.ai_case_review_service import AICaseReviewGenerationError, AICaseReviewService
+from users.services.case_aggregate import get_case_version, load_case_aggregate
+from users.services.case_identity import forget_case_identity, get_insurance_case_id, link_case_identity
+from users.services import geocoding
+from users.services.event_bus import publish_check_status
+from users.services.vendor_locator import CHECK_COORDINATE_COLUMNS, haversine_km, rank_vendors
 
 logger = logging.getLogger(__name__)
 
 router = Router(tags=["Cases"])
 _COLUMN_EXISTS_CACHE = {}
 
+# Sparse fieldsets (?fields= / ?include=, see core/fieldsets.py)
+INCIDENT_CASE_FIELDS = Resource(
+    'incident-db cases', tables=('cases',), alias='c', always=('id', 'seq_num'), computed=('seq_num',),
+    expansions=('sub_items',),
+)
+CASE_MEDIA_KEYS = ('policy_document_url', 'petition_document_url', 'other_document_url')
+CHECK_MEDIA_KEYS = ('evidence_photos', 'statement_audio_url', 'documents', 'statement_entries')
+CASE_DETAIL_FIELDS = Resource(
+    'case', tables=('cases',),
+    computed=('claimant_name', 'insured_name', 'driver_name', 'client_code') + CASE_MEDIA_KEYS,
+    expansions=('checks', 'media'),
+)
+CHECK_DETAIL_FIELDS = Resource(
+    'checks',
+    tables=(
+        'claimant_checks', 'insured_checks', 'driver_checks', 'spot_checks',
+        'chargesheets', 'rti_checks', 'rto_checks',
+    ),
+    computed=CHECK_MEDIA_KEYS,
+)
+
 
 def _build_absolute_media_url(request: HttpRequest, raw_url: str) -> str:
     """Build an absolute media URL using the current request host."""
@@ -159,26 +189,9 @@ def _extract_image_exif_metadata(file_path: str) -> dict:
 def _reverse_geocode_to_english(latitude: float, longitude: float) -> Optional[str]:
     """Convert decimal GPS coordinates to a readable English address."""
     try:
-        params = urlencode(
-            {
-                "lat": latitude,
-                "lon": longitude,
-                "format": "jsonv2",
-                "zoom": 18,
-                "addressdetails": 1,
-                "accept-language": "en",
-            }
-        )
-        request = urllib.request.Request(
-            f"https://nominatim.openstreetmap.org/reverse?{params}",
-            headers={"User-Agent": "IncidentMgmtPlatform/1.0"},
-        )
-        with urllib.request.urlopen(request, timeout=10) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-        display_name = payload.get("display_name")
-        return str(display_name).strip() if display_name else None
+        return geocoding.nominatim_reverse(latitude, longitude, language="en")
     except Exception as exc:
-        logger.debug(f"Reverse geocoding failed for ({latitude}, {longitude}): {exc}")
+        logger.debug("Reverse geocoding failed for (%s, %s): %s", latitude, longitude, exc)
         return None
 
 
@@ -312,8 +325,11 @@ def _column_exists(table_name: str, column_name: str) -> bool:
     return exists
 
 
-def _collect_vendor_statements(case_id: int) -> List[dict]:
-    """Collect all vendor statements (including multi-entry statements) for AI case review generation."""
+def _collect_vendor_statements(check_rows: dict) -> List[dict]:
+    """Collect all vendor statements (including multi-entry statements) for AI case review generation.
+
+    ``check_rows`` is the ``checks`` mapping of a case aggregate (table name -> rows).
+    """
     vendor_statements: List[dict] = []
     statement_tables = (
         ("claimant_checks", "statement", "Claimant Check"),
@@ -323,63 +339,38 @@ def _collect_vendor_statements(case_id: int) -> List[dict]:
         ("chargesheets", "statement", "Chargesheet"),
     )
 
-    with connections['default'].cursor() as cursor:
-        for table_name, legacy_column, check_label in statement_tables:
-            if _column_exists(table_name, "statement_entries"):
-                cursor.execute(
-                    f"""
-                    SELECT id,
-                           COALESCE(statement_entries, '[]'::jsonb) AS statement_entries,
-                           COALESCE({legacy_column}, '') AS legacy_statement
-                    FROM {table_name}
-                    WHERE case_id = %s
-                    ORDER BY id
-                    """,
-                    [case_id],
-                )
-            else:
-                cursor.execute(
-                    f"""
-                    SELECT id,
-                           '[]'::jsonb AS statement_entries,
-                           COALESCE({legacy_column}, '') AS legacy_statement
-                    FROM {table_name}
-                    WHERE case_id = %s
-                    ORDER BY id
-                    """,
-                    [case_id],
-                )
-
-            for check_id, raw_entries, legacy_statement in cursor.fetchall():
-                entries = _normalize_statement_entries(raw_entries)
-                if entries:
-                    for entry in entries:
-                        vendor_statements.append(
-                            {
-                                "check_type": check_label,
-                                "check_id": check_id,
-                                "statement_index": entry["index"],
-                                "statement_text": entry["statement_text"],
-                                "transcript_mr": entry["transcript_mr"],
-                                "created_at": entry["created_at"],
-                                "source": entry["source"] or "audio",
-                            }
-                        )
-                    continue
-
-                legacy_text = str(legacy_statement or "").strip()
-                if legacy_text:
+    for table_name, legacy_column, check_label in statement_tables:
+        for check in check_rows.get(table_name, []):
+            check_id = check.get("id")
+            entries = _normalize_statement_entries(check.get("statement_entries"))
+            if entries:
+                for entry in entries:
                     vendor_statements.append(
                         {
                             "check_type": check_label,
                             "check_id": check_id,
-                            "statement_index": 1,
-                            "statement_text": legacy_text,
-                            "transcript_mr": "",
-                            "created_at": "",
-                            "source": "legacy",
+                            "statement_index": entry["index"],
+                            "statement_text": entry["statement_text"],
+                            "transcript_mr": entry["transcript_mr"],
+                            "created_at": entry["created_at"],
+                            "source": entry["source"] or "audio",
                         }
                     )
+                continue
+
+            legacy_text = str(check.get(legacy_column) or "").strip()
+            if legacy_text:
+                vendor_statements.append(
+                    {
+                        "check_type": check_label,
+                        "check_id": check_id,
+                        "statement_index": 1,
+                        "statement_text": legacy_text,
+                        "transcript_mr": "",
+                        "created_at": "",
+                        "source": "legacy",
+                    }
+                )
 
     vendor_statements.sort(
         key=lambda item: (
@@ -543,6 +534,13 @@ class CasesListResponse(Schema):
     total: int
 
 
+# ?fields= for /cases (see core/fieldsets.py); limited to what CaseSchema exposes.
+INSURANCE_CASE_FIELDS = Resource(
+    'cases', tables=('insurance_case',), alias='ic', computed=('assigned_vendor',),
+    allowed=schema_fields(CaseSchema),
+)
+
+
 class CaseStatsSchema(Schema):
     """Case statistics schema."""
     total_cases: int
@@ -736,6 +734,7 @@ def get_cases(
     status: Optional[str] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
+    fields: Optional[str] = None,
 ):
     """
     Get all cases with filtering and pagination.
@@ -744,9 +743,14 @@ def get_cases(
     - status: Filter by case status (OPEN, IN_PROGRESS, RESOLVED, CLOSED)
     - category: Filter by case category
     - search: Search in title, description, case_number, claim_number
+
+    ``fields`` limits each case to the named CaseSchema fields; see
+    core/fieldsets.py.
     """
     if not is_admin_or_super_admin(request.user):
         return {"cases": [], "total": 0}
+
+    selection = parse_fieldset(INSURANCE_CASE_FIELDS, fields)
     
     try:
         with connection.cursor() as cursor:
@@ -780,7 +784,7 @@ def get_cases(
             offset = (page - 1) * page_size
             data_query = f"""
                 SELECT 
-                    ic.*,
+                    {selection.select_sql()},
                     v.company_name as assigned_vendor
                 FROM insurance_case ic
                 LEFT JOIN users_vendor v ON ic.vendor_id = v.id
@@ -791,6 +795,9 @@ def get_cases(
             cursor.execute(data_query, params + [page_size, offset])
             
             cases = dict_fetchall(cursor)
+
+            if selection.sparse:
+                return sparse_response({"cases": [selection.project(c) for c in cases], "total": total})
             
             return {
                 "cases": cases,
@@ -802,11 +809,22 @@ def get_cases(
         return {"cases": [], "total": 0}
 
 
+def _incident_db_list_version(request: HttpRequest, **kwargs):
+    """Watermark over every case's data_version; changes on any insert, delete or case/check write."""
+    if not is_admin_or_super_admin(request.user):
+        return None
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(data_version), 0), COALESCE(MAX(id), 0) FROM cases")
+        return ":".join(str(v) for v in cursor.fetchone())
+
+
 @router.get(
     "/cases/incident-db",
     summary="List Cases from incident_case_db",
     description="Returns all cases from incident_case_db with verification sub-items.",
 )
+@replica_read
+@conditional_get(_incident_db_list_version)
 def get_cases_incident_db(
     request: HttpRequest,
     page: int = 1,
@@ -816,16 +834,23 @@ def get_cases_incident_db(
     investigation_type: Optional[str] = None,
     investigation_report_status: Optional[str] = None,
     assigned_vendor_name: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
 ):
     """
     Returns paginated cases from incident_case_db.cases joined with all 5 check
     tables so the frontend can render expandable sub-items numbered {seq}.{n}.
+
+    ``fields`` limits each case to the named columns; once ``fields`` or
+    ``include`` is given, sub-items are only loaded with ``include=sub_items``.
     """
     if not is_admin_or_super_admin(request.user):
         return {"cases": [], "total": 0}
 
+    selection = parse_fieldset(INCIDENT_CASE_FIELDS, fields, include)
+
     try:
-        with connections['default'].cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             # ── Build WHERE clause ──────────────────────────────────────────
             conditions, params = [], []
 
@@ -870,7 +895,7 @@ def get_cases_incident_db(
             cursor.execute(f"""
                 SELECT
                     ROW_NUMBER() OVER (ORDER BY c.created_at DESC NULLS LAST, c.id DESC) AS seq_num,
-                    c.*
+                    {selection.select_sql()}
                 FROM cases c
                 WHERE {where}
                 ORDER BY c.created_at DESC NULLS LAST, c.id DESC
@@ -883,6 +908,11 @@ def get_cases_incident_db(
             if not rows:
                 return {"cases": [], "total": total}
 
+            if not selection.expands("sub_items"):
+                for row in rows:
+                    row["seq_num"] = int(row["seq_num"])
+                return {"cases": [selection.project(row) for row in rows], "total": total}
+
             case_ids = [r["id"] for r in rows]
             ph = ",".join(["%s"] * len(case_ids))
 
@@ -1180,11 +1210,7 @@ def get_cases_incident_db(
                     })
                 row["sub_items"] = sub_items
                 row["seq_num"] = int(row["seq_num"])
-                # Serialize dates/datetimes to ISO strings
-                for k, v in list(row.items()):
-                    if hasattr(v, "isoformat"):
-                        row[k] = v.isoformat()
-                result.append(row)
+                result.append(selection.project(row))
 
             return {"cases": result, "total": total}
 
@@ -1205,105 +1231,44 @@ def _fetch_ai_case_review_case_context(case_id: int) -> dict:
     - Statements from claimant, insured, and driver checks
     - Vendor evidence photos from all supported checks
     """
-    with connections['default'].cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT
-                c.id,
-                c.case_number,
-                c.claim_number,
-                c.client_name,
-                c.investigation_type,
-                c.investigation_report_status,
-                c.full_case_status,
-                c.special_instructions,
-                c.case_receive_date,
-                c.category,
-                c.policy_document,
-                c.petition_document,
-                c.other_document,
-                -- Incident brief from spot check
-                COALESCE(sc.accident_brief, '') AS incident_brief,
-                -- Incident date/time from spot check
-                COALESCE(sc.time_of_accident, '') AS incident_date,
-                -- Full incident location details
-                CONCAT_WS(', ',
-                    NULLIF(sc.place_of_accident, ''),
-                    NULLIF(sc.city, ''),
-                    NULLIF(sc.district, ''),
-                    NULLIF(sc.police_station, '')
-                ) AS incident_location,
-                -- FIR details
-                COALESCE(sc.fir_number, '') AS fir_number,
-                -- Claimant details
-                COALESCE(
-                    (SELECT claimant_name FROM claimant_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS claimant_name,
-                COALESCE(
-                    (SELECT claimant_address FROM claimant_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS claimant_address,
-                -- Claimant statement
-                COALESCE(
-                    (SELECT statement FROM claimant_checks WHERE case_id = c.id AND statement != '' LIMIT 1),
-                    ''
-                ) AS claimant_statement,
-                -- Insured details
-                COALESCE(
-                    (SELECT insured_name FROM insured_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS insured_name,
-                COALESCE(
-                    (SELECT insured_address FROM insured_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS insured_address,
-                COALESCE(
-                    (SELECT policy_number FROM insured_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS policy_number,
-                -- Insured statement
-                COALESCE(
-                    (SELECT statement FROM insured_checks WHERE case_id = c.id AND statement != '' LIMIT 1),
-                    ''
-                ) AS insured_statement,
-                -- Driver details
-                COALESCE(
-                    (SELECT driver_name FROM driver_checks WHERE case_id = c.id LIMIT 1),
-                    ''
-                ) AS driver_name,
-                -- Driver statement
-                COALESCE(
-                    (SELECT statement FROM driver_checks WHERE case_id = c.id AND statement != '' LIMIT 1),
-                    ''
-                ) AS driver_statement,
-                -- Assigned vendor name (from any check type)
-                COALESCE(
-                    (SELECT uv.company_name FROM claimant_checks cc LEFT JOIN users_vendor uv ON uv.id = cc.assigned_vendor_id WHERE cc.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM insured_checks ic LEFT JOIN users_vendor uv ON uv.id = ic.assigned_vendor_id WHERE ic.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM driver_checks dc LEFT JOIN users_vendor uv ON uv.id = dc.assigned_vendor_id WHERE dc.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM spot_checks sp LEFT JOIN users_vendor uv ON uv.id = sp.assigned_vendor_id WHERE sp.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM chargesheets ch LEFT JOIN users_vendor uv ON uv.id = ch.assigned_vendor_id WHERE ch.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM rti_checks rt LEFT JOIN users_vendor uv ON uv.id = rt.assigned_vendor_id WHERE rt.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    (SELECT uv.company_name FROM rto_checks ro LEFT JOIN users_vendor uv ON uv.id = ro.assigned_vendor_id WHERE ro.case_id = c.id AND uv.company_name IS NOT NULL LIMIT 1),
-                    ''
-                ) AS assigned_vendor_name
-            FROM cases c
-            LEFT JOIN spot_checks sc ON sc.case_id = c.id
-            WHERE c.id = %s
-            """,
-            [case_id],
-        )
-        row = cursor.fetchone()
-
-    if not row:
+    aggregate = load_case_aggregate(case_id)
+    if not aggregate:
         raise HttpError(404, f"Case id={case_id} not found")
 
+    case_row = aggregate["case"]
+    checks = aggregate["checks"]
+
+    def _first(table: str) -> dict:
+        rows = checks.get(table) or []
+        return rows[0] if rows else {}
+
+    def _first_value(table: str, column: str, non_empty: bool = False) -> str:
+        for check in checks.get(table) or []:
+            value = check.get(column)
+            if value is None or (non_empty and value == ''):
+                continue
+            return value
+        return ''
+
     # Format case_receive_date if present
-    case_receive_date = row[8]
+    case_receive_date = case_row.get("case_receive_date")
     if case_receive_date:
         case_receive_date = case_receive_date.strftime('%Y-%m-%d') if hasattr(case_receive_date, 'strftime') else str(case_receive_date)
 
+    spot = _first("spot_checks")
+    incident_location = ", ".join(
+        str(spot.get(column))
+        for column in ("place_of_accident", "city", "district", "police_station")
+        if spot.get(column)
+    )
+
+    # Assigned vendor name (from any check type)
+    assigned_vendor_name = ''
+    for table in _CHECK_TABLE_MAP.values():
+        assigned_vendor_name = _first_value(table, "assigned_vendor_name")
+        if assigned_vendor_name:
+            break
+
     def _parse_jsonb_list(value):
         if not value:
             return []
@@ -1317,13 +1282,24 @@ def _fetch_ai_case_review_case_context(case_id: int) -> dict:
             return parsed if isinstance(parsed, list) else []
         return []
 
+    def _collect_unique(items, seen: set, into: list) -> None:
+        for item in _parse_jsonb_list(items):
+            if isinstance(item, str):
+                item = {"url": item}
+            elif not isinstance(item, dict):
+                continue
+            url = (item.get("url") or "").strip()
+            if url and url not in seen:
+                seen.add(url)
+                into.append(item)
+
     vendor_evidence = []
     case_documents = []
     vendor_documents = []
     seen_evidence_urls = set()
     seen_case_doc_urls = set()
     seen_vendor_doc_urls = set()
-    
+
     evidence_tables = (
         "claimant_checks",
         "insured_checks",
@@ -1331,50 +1307,13 @@ def _fetch_ai_case_review_case_context(case_id: int) -> dict:
         "spot_checks",
         "chargesheets",
     )
-    try:
-        with connections['default'].cursor() as cursor:
-            for table in evidence_tables:
-                cursor.execute(
-                    f"SELECT vendor_evidence, case_documents, vendor_documents FROM {table} WHERE case_id = %s",
-                    [case_id],
-                )
-                for (raw_evidence, raw_case_docs, raw_vendor_docs) in cursor.fetchall():
-                    # Parse vendor evidence
-                    if raw_evidence:
-                        for item in _parse_jsonb_list(raw_evidence):
-                            if isinstance(item, str): evidence_item = {"url": item}
-                            elif isinstance(item, dict): evidence_item = item
-                            else: continue
-                            evidence_url = (evidence_item.get("url") or "").strip()
-                            if evidence_url and evidence_url not in seen_evidence_urls:
-                                seen_evidence_urls.add(evidence_url)
-                                vendor_evidence.append(evidence_item)
-                                
-                    # Parse case documents
-                    if raw_case_docs:
-                        for item in _parse_jsonb_list(raw_case_docs):
-                            if isinstance(item, str): doc_item = {"url": item}
-                            elif isinstance(item, dict): doc_item = item
-                            else: continue
-                            doc_url = (doc_item.get("url") or "").strip()
-                            if doc_url and doc_url not in seen_case_doc_urls:
-                                seen_case_doc_urls.add(doc_url)
-                                case_documents.append(doc_item)
-                                
-                    # Parse vendor documents
-                    if raw_vendor_docs:
-                        for item in _parse_jsonb_list(raw_vendor_docs):
-                            if isinstance(item, str): doc_item = {"url": item}
-                            elif isinstance(item, dict): doc_item = item
-                            else: continue
-                            doc_url = (doc_item.get("url") or "").strip()
-                            if doc_url and doc_url not in seen_vendor_doc_urls:
-                                seen_vendor_doc_urls.add(doc_url)
-                                vendor_documents.append(doc_item)
-    except Exception as exc:
-        logger.warning(f"Failed to fetch vendor evidence for case {case_id}: {exc}")
+    for table in evidence_tables:
+        for check in checks.get(table) or []:
+            _collect_unique(check.get("vendor_evidence"), seen_evidence_urls, vendor_evidence)
+            _collect_unique(check.get("case_documents"), seen_case_doc_urls, case_documents)
+            _collect_unique(check.get("vendor_documents"), seen_vendor_doc_urls, vendor_documents)
 
-    vendor_statements = _collect_vendor_statements(case_id)
+    vendor_statements = _collect_vendor_statements(checks)
     vendor_statement_text = "\n\n".join(
         [
             f"[{item.get('check_type')} - Statement {item.get('statement_index')}] {item.get('statement_text')}"
@@ -1384,33 +1323,33 @@ def _fetch_ai_case_review_case_context(case_id: int) -> dict:
     )
 
     return {
-        "case_id": row[0],
-        "case_number": row[1],
-        "claim_number": row[2],
-        "client_name": row[3],
-        "investigation_type": row[4],
-        "investigation_report_status": row[5],
-        "full_case_status": row[6],
-        "special_instructions": row[7],
+        "case_id": case_row.get("id"),
+        "case_number": case_row.get("case_number"),
+        "claim_number": case_row.get("claim_number"),
+        "client_name": case_row.get("client_name"),
+        "investigation_type": case_row.get("investigation_type"),
+        "investigation_report_status": case_row.get("investigation_report_status"),
+        "full_case_status": case_row.get("full_case_status"),
+        "special_instructions": case_row.get("special_instructions"),
         "case_receive_date": case_receive_date or "",
-        "category": row[9],
-        "policy_document": row[10],
-        "petition_document": row[11],
-        "other_document": row[12],
-        "incident_brief": row[13],
-        "incident_date": row[14],
-        "incident_location": row[15],
-        "fir_number": row[16],
-        "claimant_name": row[17],
-        "claimant_address": row[18],
-        "claimant_statement": row[19],
-        "insured_name": row[20],
-        "insured_address": row[21],
-        "policy_number": row[22],
-        "insured_statement": row[23],
-        "driver_name": row[24],
-        "driver_statement": row[25],
-        "assigned_vendor_name": row[26],
+        "category": case_row.get("category"),
+        "policy_document": case_row.get("policy_document"),
+        "petition_document": case_row.get("petition_document"),
+        "other_document": case_row.get("other_document"),
+        "incident_brief": spot.get("accident_brief") or '',
+        "incident_date": spot.get("time_of_accident") or '',
+        "incident_location": incident_location,
+        "fir_number": spot.get("fir_number") or '',
+        "claimant_name": _first_value("claimant_checks", "claimant_name"),
+        "claimant_address": _first_value("claimant_checks", "claimant_address"),
+        "claimant_statement": _first_value("claimant_checks", "statement", non_empty=True),
+        "insured_name": _first_value("insured_checks", "insured_name"),
+        "insured_address": _first_value("insured_checks", "insured_address"),
+        "policy_number": _first_value("insured_checks", "policy_number"),
+        "insured_statement": _first_value("insured_checks", "statement", non_empty=True),
+        "driver_name": _first_value("driver_checks", "driver_name"),
+        "driver_statement": _first_value("driver_checks", "statement", non_empty=True),
+        "assigned_vendor_name": assigned_vendor_name,
         "vendor_evidence": vendor_evidence,
         "vendor_documents": vendor_documents,
         "case_documents": case_documents,
@@ -1425,6 +1364,7 @@ def _fetch_ai_case_review_case_context(case_id: int) -> dict:
     summary="Generate AI case review report",
     description="Generate an AI case review report from vendor statements stored in check tables for an incident-db case.",
 )
+@admission_limit('ai_case_review')
 def generate_ai_case_review_report(
     request: HttpRequest,
     case_id: int,
@@ -1536,20 +1476,16 @@ def delete_case_from_incident_db(request: HttpRequest, case_id: int):
         from users.models import InsuranceCase, Report
         from users.incident_case_db import delete_case
 
-        case_number = None
-        with connections['default'].cursor() as cursor:
-            cursor.execute("SELECT case_number FROM cases WHERE id = %s", [case_id])
-            row = cursor.fetchone()
-            if row:
-                case_number = row[0]
+        insurance_case_id = get_insurance_case_id(case_id)
 
         result = delete_case(case_id)
-        if case_number:
-            orm_cases = InsuranceCase.objects.filter(case_number=case_number)
+        forget_case_identity(incident_case_id=case_id, insurance_case_id=insurance_case_id)
+        if insurance_case_id:
+            orm_cases = InsuranceCase.objects.filter(id=insurance_case_id)
             deleted_reports, _ = Report.objects.filter(case__in=orm_cases).delete()
             deleted_cases, _ = orm_cases.delete()
             logger.info(
-                f"[API] Deleted {deleted_reports} report row(s) and {deleted_cases} ORM case row(s) for {case_number}"
+                f"[API] Deleted {deleted_reports} report row(s) and {deleted_cases} ORM case row(s) for case {case_id}"
             )
         logger.info(f"[API] Case {case_id} deleted by user {request.user.username}")
         return result
@@ -1581,21 +1517,17 @@ def update_case_status(request: HttpRequest, case_id: int, payload: UpdateCaseSt
 
         with connections['default'].cursor() as cursor:
             # Check if case exists and update cases table
-            cursor.execute("SELECT case_number FROM cases WHERE id = %s", [case_id])
-            row = cursor.fetchone()
-            if not row:
-                raise HttpError(404, "Case not found")
-                
-            case_number = row[0]
-            
             cursor.execute(
                 "UPDATE cases SET full_case_status = %s, updated_at = NOW() WHERE id = %s",
                 [status, case_id]
             )
+            if cursor.rowcount == 0:
+                raise HttpError(404, "Case not found")
 
         # Update ORM if exists
-        if case_number:
-            InsuranceCase.objects.filter(case_number=case_number).update(
+        insurance_case_id = get_insurance_case_id(case_id)
+        if insurance_case_id:
+            InsuranceCase.objects.filter(id=insurance_case_id).update(
                 full_case_status=status
             )
             
@@ -1648,10 +1580,6 @@ def get_check_detail(request: HttpRequest, case_id: int, check_type: str):
             if not case_row:
                 raise HttpError(404, f"Case id={case_id} not found")
             case_data = dict(zip(col_names, case_row))
-            # Serialize dates
-            for k, v in list(case_data.items()):
-                if hasattr(v, 'isoformat'):
-                    case_data[k] = v.isoformat()
 
             # Fetch check row
             cursor.execute(f"SELECT * FROM {table} WHERE case_id = %s", [case_id])
@@ -1660,9 +1588,6 @@ def get_check_detail(request: HttpRequest, case_id: int, check_type: str):
             check_data = {}
             if check_row:
                 check_data = dict(zip(col_names2, check_row))
-                for k, v in list(check_data.items()):
-                    if hasattr(v, 'isoformat'):
-                        check_data[k] = v.isoformat()
 
                 # Normalize evidence photos
                 import json as _json
@@ -1772,63 +1697,182 @@ def get_check_detail(request: HttpRequest, case_id: int, check_type: str):
         raise HttpError(500, str(exc))
 
 
+def _full_case_details_version(request: HttpRequest, case_id: int, **kwargs):
+    if not is_admin_or_super_admin(request.user):
+        return None
+    return get_case_version(case_id)
+
+
+def _full_case_details_tags(request: HttpRequest, case_id: int, **kwargs):
+    return [f"case:{case_id}"] if is_admin_or_super_admin(request.user) else None
+
+
+# Raw media columns of check rows, replaced by normalized arrays when include=media.
+CHECK_MEDIA_COLUMNS = frozenset({
+    'vendor_evidence', 'evidence', 'vendor_documents', 'case_documents', 'documents',
+    'statement_entries', 'statement_audio', 'statement_audio_path', 'dispatched_photos', 'applied_cs_photos',
+})
+
+
+def _normalize_check_media(request: HttpRequest, ch_data: dict) -> None:
+    """Add absolute-URL evidence_photos, statement_audio_url, documents and statement_entries to a check row."""
+    # Evidence photos
+    evidence_raw = ch_data.get('vendor_evidence') or ch_data.get('evidence')
+    evidence_photos = []
+    if evidence_raw:
+        if isinstance(evidence_raw, str):
+            try:
+                evidence_photos = json.loads(evidence_raw)
+            except Exception:
+                evidence_photos = []
+        elif isinstance(evidence_raw, list):
+            evidence_photos = evidence_raw
+
+    normalized_photos = []
+    for p in evidence_photos:
+        if not p:
+            continue
+        enriched = _enrich_evidence_metadata(request, p)
+        if enriched:
+            if 'preview_url' in enriched:
+                enriched['url'] = enriched['preview_url']
+            if enriched.get('url'):
+                normalized_photos.append(enriched)
+    ch_data['evidence_photos'] = normalized_photos
+
+    # Audio recording URL
+    sa = ch_data.get('statement_audio') or ch_data.get('statement_audio_path')
+    sa_url = ""
+    if sa:
+        sa_url = _build_absolute_media_url(request, str(sa))
+        ch_data['statement_audio_url'] = sa_url
+
+    # Documents
+    doc_raw = ch_data.get('vendor_documents') or ch_data.get('case_documents') or ch_data.get('documents')
+    documents = []
+    if doc_raw:
+        if isinstance(doc_raw, str):
+            try:
+                documents = json.loads(doc_raw)
+            except Exception:
+                documents = []
+        elif isinstance(doc_raw, list):
+            documents = doc_raw
+
+    normalized_docs = []
+    for d in documents:
+        if not d:
+            continue
+        item = dict(d) if isinstance(d, dict) else {"url": d}
+        raw_url = item.get("url") or item.get("file_url") or ""
+        if raw_url:
+            item["url"] = _build_absolute_media_url(request, raw_url)
+            if not item.get("filename"):
+                item["filename"] = os.path.basename(str(raw_url)) or "document"
+            normalized_docs.append(item)
+    ch_data['documents'] = normalized_docs
+
+    # Statement entries
+    statement_raw = ch_data.get('statement_entries')
+    entries = []
+    if statement_raw:
+        if isinstance(statement_raw, str):
+            try:
+                entries = json.loads(statement_raw)
+            except Exception:
+                entries = []
+        elif isinstance(statement_raw, list):
+            entries = statement_raw
+
+    normalized_entries = []
+    for se in entries:
+        if not se:
+            continue
+        item = dict(se) if isinstance(se, dict) else {"url": se}
+        raw_url = item.get("url") or item.get("audio_url") or item.get("audio_path") or item.get("statement_audio_path") or ""
+        if not raw_url and sa_url:
+            raw_url = sa_url
+
+        if raw_url:
+            abs_url = _build_absolute_media_url(request, raw_url)
+            item["url"] = abs_url
+            item["audio_url"] = abs_url
+            if not item.get("filename"):
+                item["filename"] = os.path.basename(str(raw_url)) or "Vendor Statement Recording"
+            normalized_entries.append(item)
+
+    if not normalized_entries and sa_url:
+        normalized_entries = [{
+            "url": sa_url,
+            "audio_url": sa_url,
+            "filename": os.path.basename(str(sa)) or "Vendor Statement Recording",
+            "statement_text": ch_data.get("statement") or "",
+            "created_at": ch_data.get("updated_at")
+        }]
+
+    ch_data['statement_entries'] = normalized_entries
+
+
 @router.get(
     "/cases/incident-db/{case_id}/full-details",
     summary="Get Full Case Details + All Verification Checks",
     description="Returns complete details for a case including all 7 verification check tables, evidence, media, recordings, and documents.",
 )
-def get_full_case_details(request: HttpRequest, case_id: int):
-    """Return full case row + all 7 check rows with normalized media from incident_case_db."""
+@conditional_get(_full_case_details_version)
+@cached_endpoint('case_full_details', ttl=300, tags=_full_case_details_tags, per_user=False)
+def get_full_case_details(
+    request: HttpRequest,
+    case_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    check_fields: Optional[str] = None,
+):
+    """Return full case row + all 7 check rows with normalized media from incident_case_db.
+
+    ``fields`` / ``check_fields`` limit the case and check rows to the named
+    columns. Once ``fields`` or ``include`` is given, checks and normalized
+    media are only returned with ``include=checks`` and ``include=checks,media``.
+    """
     if not is_admin_or_super_admin(request.user):
         raise HttpError(403, "Admin access required")
 
+    selection = parse_fieldset(CASE_DETAIL_FIELDS, fields, include)
+    check_selection = parse_fieldset(CHECK_DETAIL_FIELDS, check_fields)
+
     try:
-        with connections['default'].cursor() as cursor:
-            # 1. Fetch case row
-            cursor.execute("SELECT * FROM cases WHERE id = %s", [case_id])
-            col_names = [d[0] for d in cursor.description]
-            case_row = cursor.fetchone()
-            if not case_row:
-                raise HttpError(404, f"Case id={case_id} not found")
-            case_data = dict(zip(col_names, case_row))
+        # 1. Case row, linked insurance_case fields and every check row (cached per case version)
+        aggregate = load_case_aggregate(case_id)
+        if not aggregate:
+            raise HttpError(404, f"Case id={case_id} not found")
+        case_data = aggregate["case"]
+        insurance_case = aggregate["insurance_case"]
+        check_rows = aggregate["checks"]
+
+        def _first_check(table_name: str) -> dict:
+            rows = check_rows.get(table_name) or []
+            return rows[0] if rows else {}
 
-            # 1.5 Fetch missing fields from insurance_case, check tables, and insurance_client
-            cursor.execute("SELECT client_code, insured_name, claimant_name FROM insurance_case WHERE case_number = %s", [case_data.get('case_number')])
-            ic_row = cursor.fetchone() or ('', '', '')
-
-            # Claimant Name fallback
-            claimant_name = case_data.get('claimant_name')
-            if not claimant_name:
-                cursor.execute("SELECT claimant_name FROM claimant_checks WHERE case_id = %s", [case_id])
-                ch_row = cursor.fetchone()
-                if ch_row and ch_row[0]:
-                    claimant_name = ch_row[0]
-            if not claimant_name and ic_row[2]:
-                claimant_name = ic_row[2]
+        with connections['default'].cursor() as cursor:
+            # 1.5 Fill missing fields from check tables, insurance_case and insurance_client
+            claimant_name = (
+                case_data.get('claimant_name')
+                or _first_check('claimant_checks').get('claimant_name')
+                or insurance_case['claimant_name']
+            )
             case_data['claimant_name'] = claimant_name or ''
 
-            # Insured Name fallback
-            insured_name = case_data.get('insured_name')
-            if not insured_name:
-                cursor.execute("SELECT insured_name FROM insured_checks WHERE case_id = %s", [case_id])
-                in_row = cursor.fetchone()
-                if in_row and in_row[0]:
-                    insured_name = in_row[0]
-            if not insured_name and ic_row[1]:
-                insured_name = ic_row[1]
+            insured_name = (
+                case_data.get('insured_name')
+                or _first_check('insured_checks').get('insured_name')
+                or insurance_case['insured_name']
+            )
             case_data['insured_name'] = insured_name or ''
 
-            # Driver Name fallback
-            driver_name = case_data.get('driver_name')
-            if not driver_name:
-                cursor.execute("SELECT driver_name FROM driver_checks WHERE case_id = %s", [case_id])
-                dr_row = cursor.fetchone()
-                if dr_row and dr_row[0]:
-                    driver_name = dr_row[0]
+            driver_name = case_data.get('driver_name') or _first_check('driver_checks').get('driver_name')
             case_data['driver_name'] = driver_name or ''
 
             # Client Code fallback
-            client_code = case_data.get('client_code') or ic_row[0]
+            client_code = case_data.get('client_code') or insurance_case['client_code']
             if not client_code and case_data.get('client_name'):
                 c_name = case_data['client_name']
                 if '–' in c_name:
@@ -1842,24 +1886,21 @@ def get_full_case_details(request: HttpRequest, case_id: int):
                         client_code = cl_row[0]
             case_data['client_code'] = client_code or ''
 
-            for k, v in list(case_data.items()):
-                if hasattr(v, 'isoformat'):
-                    case_data[k] = v.isoformat()
-
             # Normalize case level documents
-            for doc_key in ['policy_document', 'petition_document', 'other_document']:
-                raw_val = case_data.get(doc_key)
-                if raw_val:
-                    if isinstance(raw_val, str) and raw_val.startswith('[') and raw_val.endswith(']'):
-                        try:
-                            urls = json.loads(raw_val)
-                            case_data[f"{doc_key}_url"] = [_build_absolute_media_url(request, str(u)) for u in urls]
-                        except json.JSONDecodeError:
+            if selection.expands('media'):
+                for doc_key in ['policy_document', 'petition_document', 'other_document']:
+                    raw_val = case_data.get(doc_key)
+                    if raw_val:
+                        if isinstance(raw_val, str) and raw_val.startswith('[') and raw_val.endswith(']'):
+                            try:
+                                urls = json.loads(raw_val)
+                                case_data[f"{doc_key}_url"] = [_build_absolute_media_url(request, str(u)) for u in urls]
+                            except json.JSONDecodeError:
+                                case_data[f"{doc_key}_url"] = _build_absolute_media_url(request, str(raw_val))
+                        else:
                             case_data[f"{doc_key}_url"] = _build_absolute_media_url(request, str(raw_val))
                     else:
-                        case_data[f"{doc_key}_url"] = _build_absolute_media_url(request, str(raw_val))
-                else:
-                    case_data[f"{doc_key}_url"] = None
+                        case_data[f"{doc_key}_url"] = None
 
             # 2. Fetch all check tables
             check_label_map = {
@@ -1872,133 +1913,29 @@ def get_full_case_details(request: HttpRequest, case_id: int):
                 'rto': 'RTO Check',
             }
 
+            case_extra = CASE_MEDIA_KEYS if selection.expands('media') else ()
+            check_extra = CHECK_MEDIA_KEYS if selection.expands('media') else ()
+            if not selection.expands('checks'):
+                return {"case": selection.project(case_data, case_extra)}
+
             all_checks = []
             for slug, table_name in _CHECK_TABLE_MAP.items():
-                cursor.execute(f"SELECT * FROM {table_name} WHERE case_id = %s", [case_id])
-                col_names_ch = [d[0] for d in cursor.description]
-                ch_row = cursor.fetchone()
-                if not ch_row:
+                ch_data = _first_check(table_name)
+                if not ch_data:
                     continue
 
-                ch_data = dict(zip(col_names_ch, ch_row))
-                for k, v in list(ch_data.items()):
-                    if hasattr(v, 'isoformat'):
-                        ch_data[k] = v.isoformat()
-
-                # Get vendor name
-                vendor_id = ch_data.get('assigned_vendor_id') or ch_data.get('vendor_id')
-                vendor_name = None
-                if vendor_id:
-                    cursor.execute("SELECT company_name FROM users_vendor WHERE id = %s", [vendor_id])
-                    v_row = cursor.fetchone()
-                    if v_row:
-                        vendor_name = v_row[0]
-                ch_data['assigned_vendor_name'] = vendor_name
-
-                # Evidence photos
-                import json as _json
-                evidence_raw = ch_data.get('vendor_evidence') or ch_data.get('evidence')
-                evidence_photos = []
-                if evidence_raw:
-                    if isinstance(evidence_raw, str):
-                        try:
-                            evidence_photos = _json.loads(evidence_raw)
-                        except Exception:
-                            evidence_photos = []
-                    elif isinstance(evidence_raw, list):
-                        evidence_photos = evidence_raw
-
-                normalized_photos = []
-                for p in evidence_photos:
-                    if not p:
-                        continue
-                    enriched = _enrich_evidence_metadata(request, p)
-                    if enriched:
-                        if 'preview_url' in enriched:
-                            enriched['url'] = enriched['preview_url']
-                        if enriched.get('url'):
-                            normalized_photos.append(enriched)
-                ch_data['evidence_photos'] = normalized_photos
-
-                # Audio recording URL
-                sa = ch_data.get('statement_audio') or ch_data.get('statement_audio_path')
-                sa_url = ""
-                if sa:
-                    sa_url = _build_absolute_media_url(request, str(sa))
-                    ch_data['statement_audio_url'] = sa_url
-
-                # Documents
-                doc_raw = ch_data.get('vendor_documents') or ch_data.get('case_documents') or ch_data.get('documents')
-                documents = []
-                if doc_raw:
-                    if isinstance(doc_raw, str):
-                        try:
-                            documents = _json.loads(doc_raw)
-                        except Exception:
-                            documents = []
-                    elif isinstance(doc_raw, list):
-                        documents = doc_raw
-
-                normalized_docs = []
-                for d in documents:
-                    if not d:
-                        continue
-                    item = dict(d) if isinstance(d, dict) else {"url": d}
-                    raw_url = item.get("url") or item.get("file_url") or ""
-                    if raw_url:
-                        item["url"] = _build_absolute_media_url(request, raw_url)
-                        if not item.get("filename"):
-                            item["filename"] = os.path.basename(str(raw_url)) or "document"
-                        normalized_docs.append(item)
-                ch_data['documents'] = normalized_docs
-
-                # Statement entries
-                statement_raw = ch_data.get('statement_entries')
-                entries = []
-                if statement_raw:
-                    if isinstance(statement_raw, str):
-                        try:
-                            entries = _json.loads(statement_raw)
-                        except Exception:
-                            entries = []
-                    elif isinstance(statement_raw, list):
-                        entries = statement_raw
-
-                normalized_entries = []
-                for se in entries:
-                    if not se:
-                        continue
-                    item = dict(se) if isinstance(se, dict) else {"url": se}
-                    raw_url = item.get("url") or item.get("audio_url") or item.get("audio_path") or item.get("statement_audio_path") or ""
-                    if not raw_url and sa_url:
-                        raw_url = sa_url
-
-                    if raw_url:
-                        abs_url = _build_absolute_media_url(request, raw_url)
-                        item["url"] = abs_url
-                        item["audio_url"] = abs_url
-                        if not item.get("filename"):
-                            item["filename"] = os.path.basename(str(raw_url)) or "Vendor Statement Recording"
-                        normalized_entries.append(item)
-
-                if not normalized_entries and sa_url:
-                    normalized_entries = [{
-                        "url": sa_url,
-                        "audio_url": sa_url,
-                        "filename": os.path.basename(str(sa)) or "Vendor Statement Recording",
-                        "statement_text": ch_data.get("statement") or "",
-                        "created_at": ch_data.get("updated_at")
-                    }]
-
-                ch_data['statement_entries'] = normalized_entries
+                if selection.expands('media'):
+                    _normalize_check_media(request, ch_data)
+                elif not check_selection.sparse:
+                    ch_data = {k: v for k, v in ch_data.items() if k not in CHECK_MEDIA_COLUMNS}
 
                 all_checks.append({
                     "slug": slug,
                     "check_type_label": check_label_map.get(slug, slug.title()),
-                    "check": ch_data
+                    "check": check_selection.project(ch_data, check_extra),
                 })
 
-            return {"case": case_data, "checks": all_checks}
+            return {"case": selection.project(case_data, case_extra), "checks": all_checks}
 
     except HttpError:
         raise
@@ -2591,6 +2528,7 @@ def create_case(request: HttpRequest, payload: CreateCaseSchema):
                 chk_income=payload.chk_income,
             )
             orm_case_id = case.id
+            link_case_identity(incident_case_db_id, orm_case_id)
             logger.info(f"[ORM] InsuranceCase created case_number={case_number} id={orm_case_id}")
         except Exception as orm_err:
             logger.error(f"[ORM] InsuranceCase.objects.create() failed (non-fatal): {orm_err}")
@@ -2618,6 +2556,7 @@ def create_case(request: HttpRequest, payload: CreateCaseSchema):
     summary="Get Dashboard Statistics",
     description="Get case statistics for the dashboard.",
 )
+@replica_read
 def get_dashboard_stats(request: HttpRequest):
     """Get dashboard statistics - counts from incident_case_db.cases (source of truth)."""
     if not is_admin_or_super_admin(request.user):
@@ -2629,7 +2568,7 @@ def get_dashboard_stats(request: HttpRequest):
         }
     
     try:
-        with connections['default'].cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             # Total cases — the single authoritative count
             cursor.execute("SELECT COUNT(*) FROM cases")
             total_cases = cursor.fetchone()[0]
@@ -2648,14 +2587,9 @@ def get_dashboard_stats(request: HttpRequest):
             cursor.execute(
                 """
                 SELECT COUNT(*)
-                FROM reports r
-                JOIN insurance_case ic ON ic.id = r.case_id
-                JOIN cases c ON c.case_number = ic.case_number
-                INNER JOIN (
-                    SELECT case_id, MAX(id) AS latest_id
-                    FROM reports
-                    GROUP BY case_id
-                ) latest_reports ON latest_reports.latest_id = r.id
+                FROM case_latest_report lr
+                JOIN reports r ON r.id = lr.latest_report_id
+                JOIN cases c ON c.insurance_case_id = lr.case_id
                 WHERE r.status = 'ACCEPTED'
                 """
             )
@@ -2703,13 +2637,14 @@ def get_dashboard_stats(request: HttpRequest):
     summary="Get Case Volume Data",
     description="Get case volume trend data for charts.",
 )
+@replica_read
 def get_case_volume(request: HttpRequest):
     """Get case volume data for the last 6 months."""
     if not is_admin_or_super_admin(request.user):
         return []
     
     try:
-        with connection.cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             # Get case counts per month for the last 6 months
             cursor.execute("""
                 SELECT 
@@ -2757,13 +2692,14 @@ def get_case_volume(request: HttpRequest):
     summary="Get Case Status Distribution",
     description="Get case counts by status for pie chart.",
 )
+@replica_read
 def get_case_status_distribution(request: HttpRequest):
     """Get case status distribution."""
     if not is_admin_or_super_admin(request.user):
         return []
     
     try:
-        with connection.cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             cursor.execute("""
                 SELECT 
                     CASE status
@@ -2794,13 +2730,14 @@ def get_case_status_distribution(request: HttpRequest):
     summary="Get Recent Activity",
     description="Get recent case activities.",
 )
+@replica_read
 def get_recent_activity(request: HttpRequest):
     """Get recent activity from cases."""
     if not is_admin_or_super_admin(request.user):
         return []
     
     try:
-        with connection.cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             # Get most recent cases
             cursor.execute("""
                 SELECT 
@@ -2855,12 +2792,18 @@ def get_recent_activity(request: HttpRequest):
         return []
 
 
+def _is_large_audit_log_request(request, limit: int = 500, **kwargs) -> bool:
+    return (limit or 500) > 500
+
+
 @router.get(
     "/audit-logs",
     response=List[AuditLogEntrySchema],
     summary="Get Audit Logs",
     description="Get project-wide audit activity logs (case creation, assignments, AI report generation).",
 )
+@admission_limit('audit_logs', applies=_is_large_audit_log_request)
+@replica_read
 def get_audit_logs(
     request: HttpRequest,
     event_type: Optional[str] = None,
@@ -2924,7 +2867,7 @@ def get_audit_logs(
         )
 
     try:
-        with connections['default'].cursor() as cursor:
+        with connections[read_alias()].cursor() as cursor:
             # Case creation events
             if cm_user_id:
                 cursor.execute(
@@ -3074,7 +3017,7 @@ def get_audit_logs(
                             FROM {table_name} t
                             JOIN cases c ON c.id = t.case_id
                             JOIN users_vendor uv ON uv.id = t.assigned_vendor_id
-                            LEFT JOIN insurance_case ic ON ic.case_number = c.case_number
+                            LEFT JOIN insurance_case ic ON ic.id = c.insurance_case_id
                             LEFT JOIN users_customuser cu ON cu.id = ic.created_by_id
                             WHERE t.assigned_vendor_id IS NOT NULL
                               AND t.{event_time_column} IS NOT NULL
@@ -3095,7 +3038,7 @@ def get_audit_logs(
                             FROM {table_name} t
                             JOIN cases c ON c.id = t.case_id
                             JOIN users_vendor uv ON uv.id = t.assigned_vendor_id
-                            LEFT JOIN insurance_case ic ON ic.case_number = c.case_number
+                            LEFT JOIN insurance_case ic ON ic.id = c.insurance_case_id
                             LEFT JOIN users_customuser cu ON cu.id = ic.created_by_id
                             WHERE t.assigned_vendor_id IS NOT NULL
                               AND t.{event_time_column} IS NOT NULL
@@ -3319,19 +3262,7 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     Returns distance in kilometers.
     Uses OpenStreetMap coordinate system (WGS84).
     """
-    from math import radians, cos, sin, asin, sqrt
-    
-    # Convert decimal degrees to radians
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    
-    # Haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    r = 6371  # Radius of earth in kilometers
-    
-    return c * r
+    return haversine_km(lat1, lon1, lat2, lon2)
 
 
 class AutoAssignResponseSchema(Schema):
@@ -3350,8 +3281,10 @@ class AutoAssignResponseSchema(Schema):
 )
 def auto_assign_vendor(request: HttpRequest, case_id: int):
     """
-    Auto-assign a case to the closest vendor based on location.
-    Uses OpenStreetMap coordinates and Haversine distance calculation.
+    Auto-assign a case to the best nearby vendor.
+    Candidates come from the in-memory vendor spatial index, with no distance
+    cap, and are scored by distance plus each vendor's current open-check
+    workload.
     """
     if not is_admin_or_super_admin(request.user):
         return {
@@ -3361,8 +3294,6 @@ def auto_assign_vendor(request: HttpRequest, case_id: int):
         }
     
     try:
-        from users.models import Vendor
-        
         with connection.cursor() as cursor:
             # Get case details
             cursor.execute("""
@@ -3398,43 +3329,17 @@ def auto_assign_vendor(request: HttpRequest, case_id: int):
                     "message": "Case does not have valid location coordinates."
                 }
             
-            # Get all active vendors with locations
-            vendors = Vendor.objects.filter(
-                is_active=True,
-                latitude__isnull=False,
-                longitude__isnull=False
-            ).values('id', 'company_name', 'latitude', 'longitude', 'city', 'state')
-            
-            if not vendors.exists():
+            # Nearest vendors from the spatial index, re-ranked by current workload.
+            # No distance cap: a remote case still gets its nearest vendors.
+            ranked = rank_vendors(float(case_lat), float(case_lon), max_distance_km=None)
+            if not ranked:
                 return {
                     "success": False,
                     "error": "No vendors available",
                     "message": "No active vendors with location data are available."
                 }
-            
-            # Calculate distances and find closest vendor
-            closest_vendor = None
-            min_distance = float('inf')
-            
-            for vendor in vendors:
-                distance = calculate_distance(
-                    float(case_lat),
-                    float(case_lon),
-                    float(vendor['latitude']),
-                    float(vendor['longitude'])
-                )
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_vendor = vendor
-            
-            if not closest_vendor:
-                return {
-                    "success": False,
-                    "error": "No vendor found",
-                    "message": "Could not find a suitable vendor for assignment."
-                }
-            
+            closest_vendor = ranked[0]
+
             # Update case with assigned vendor
             cursor.execute("""
                 UPDATE insurance_case 
@@ -3445,13 +3350,7 @@ def auto_assign_vendor(request: HttpRequest, case_id: int):
             return {
                 "success": True,
                 "message": f"Case #{case_number} assigned to {closest_vendor['company_name']}",
-                "assigned_vendor": {
-                    "id": closest_vendor['id'],
-                    "company_name": closest_vendor['company_name'],
-                    "distance_km": round(min_distance, 2),
-                    "city": closest_vendor['city'],
-                    "state": closest_vendor['state'],
-                }
+                "assigned_vendor": closest_vendor,
             }
     
     except Exception as e:
@@ -3463,6 +3362,192 @@ def auto_assign_vendor(request: HttpRequest, case_id: int):
         }
 
 
+class VendorCandidatesResponse(Schema):
+    """Response schema for ranked vendor candidates of a check."""
+    case_id: int
+    check_type: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    candidates: List[dict]
+
+
+def _get_check_coordinates(cursor, table: str, check_type: str, case_id: int):
+    """Return (lat, lng) for a check row, falling back to the linked insurance case location."""
+    coord_cols = CHECK_COORDINATE_COLUMNS.get(check_type)
+    if coord_cols:
+        lat_col, lng_col = coord_cols
+        cursor.execute(f"SELECT {lat_col}, {lng_col} FROM {table} WHERE case_id = %s", [case_id])
+        row = cursor.fetchone()
+        if row and row[0] is not None and row[1] is not None:
+            return float(row[0]), float(row[1])
+
+    # case_id is a cases.id; the legacy location lives on the paired insurance_case.
+    insurance_case_id = get_insurance_case_id(case_id)
+    if insurance_case_id is None:
+        return None, None
+    cursor.execute("SELECT latitude, longitude FROM insurance_case WHERE id = %s", [insurance_case_id])
+    row = cursor.fetchone()
+    if row and row[0] is not None and row[1] is not None:
+        return float(row[0]), float(row[1])
+    return None, None
+
+
+@router.get(
+    "/cases/incident-db/{case_id}/check/{check_type}/vendor-candidates",
+    response=VendorCandidatesResponse,
+    summary="Rank Vendor Candidates for a Check",
+    description="Nearest vendors for the check location, scored by distance and current open-check workload.",
+)
+def get_check_vendor_candidates(request: HttpRequest, case_id: int, check_type: str, limit: int = 10):
+    """Return ranked vendor candidates for a sub-check."""
+    if not is_admin_or_super_admin(request.user):
+        raise HttpError(403, "Admin access required")
+
+    check_type = check_type.lower()
+    table = _CHECK_TABLE_MAP.get(check_type)
+    if not table:
+        raise HttpError(400, f"Unknown check type '{check_type}'. Valid: claimant, insured, driver, spot, chargesheet, rti, rto")
+
+    with connections['default'].cursor() as cursor:
+        lat, lng = _get_check_coordinates(cursor, table, check_type, case_id)
+
+    if lat is None:
+        return {"case_id": case_id, "check_type": check_type, "candidates": []}
+
+    limit = max(1, min(limit, 50))
+    return {
+        "case_id": case_id,
+        "check_type": check_type,
+        "latitude": lat,
+        "longitude": lng,
+        "candidates": rank_vendors(lat, lng, check_type=check_type)[:limit],
+    }
+
+
+@router.post(
+    "/cases/incident-db/{case_id}/check/{check_type}/auto-assign-vendor",
+    response=AutoAssignResponseSchema,
+    summary="Auto-Assign Check to Best Vendor",
+    description="Assign an unassigned sub-check to the best-scored nearby vendor (distance + workload).",
+)
+def auto_assign_check_vendor(request: HttpRequest, case_id: int, check_type: str):
+    """Auto-assign a sub-check using the vendor spatial index and workload scoring."""
+    if not is_admin_or_super_admin(request.user):
+        raise HttpError(403, "Admin access required")
+
+    check_type = check_type.lower()
+    table = _CHECK_TABLE_MAP.get(check_type)
+    if not table:
+        raise HttpError(400, f"Unknown check type '{check_type}'. Valid: claimant, insured, driver, spot, chargesheet, rti, rto")
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(f"SELECT assigned_vendor_id FROM {table} WHERE case_id = %s", [case_id])
+        row = cursor.fetchone()
+        if row is None:
+            raise HttpError(404, f"No {check_type} check found for case {case_id}")
+        if row[0]:
+            return {
+                "success": False,
+                "error": "Check already assigned",
+                "message": "This check is already assigned to a vendor.",
+            }
+
+        lat, lng = _get_check_coordinates(cursor, table, check_type, case_id)
+        if lat is None:
+            return {
+                "success": False,
+                "error": "Missing coordinates",
+                "message": "Neither the check nor the case has location coordinates.",
+            }
+
+        ranked = rank_vendors(lat, lng, check_type=check_type)
+        if not ranked:
+            return {
+                "success": False,
+                "error": "No vendors available",
+                "message": "No active vendors with location data are within range.",
+            }
+        best = ranked[0]
+
+        cursor.execute(
+            f"""
+            UPDATE {table}
+            SET assigned_vendor_id = %s, check_status = 'WIP', updated_at = NOW()
+            WHERE case_id = %s AND assigned_vendor_id IS NULL
+            """,
+            [best["id"], case_id],
+        )
+        if cursor.rowcount == 0:
+            return {
+                "success": False,
+                "error": "Check already assigned",
+                "message": "This check was assigned concurrently.",
+            }
+
+        cursor.execute("SELECT case_number FROM cases WHERE id = %s", [case_id])
+        case_row = cursor.fetchone()
+        case_number = case_row[0] if case_row and case_row[0] else str(case_id)
+
+    from users.services.notification_service import notify_reassignment
+    notify_reassignment(
+        case_id=case_id,
+        check_type=check_type,
+        old_vendor_id=None,
+        new_vendor_id=best["id"],
+        case_number=case_number,
+    )
+
+    return {
+        "success": True,
+        "message": f"{check_type.title()} check for case #{case_number} assigned to {best['company_name']}",
+        "assigned_vendor": best,
+    }
+
+
+class BatchAssignSchema(Schema):
+    """Request schema for batch vendor assignment."""
+    dry_run: bool = True
+    check_types: Optional[List[str]] = None
+    max_open_checks: int = 25
+    max_distance_km: float = 300.0
+    solver: str = "exact"
+
+
+@router.post(
+    "/cases/incident-db/checks/batch-assign-vendors",
+    response=dict,
+    summary="Batch-Assign Vendors to Unassigned Checks",
+    description=(
+        "Plans a capacity-constrained assignment of every unassigned check to nearby vendors, "
+        "scored on distance and workload. solver=exact (default) places as many checks as capacity "
+        "allows at minimum total cost; solver=greedy is a faster approximate fallback. "
+        "With dry_run=true (default) returns the preview without writing."
+    ),
+)
+def batch_assign_vendors(request: HttpRequest, payload: BatchAssignSchema):
+    """Preview or apply a batch vendor assignment across all check tables."""
+    if not is_admin_or_super_admin(request.user):
+        raise HttpError(403, "Admin access required")
+
+    from users.services.batch_assignment import SOLVERS, run_batch_assignment
+
+    if payload.solver not in SOLVERS:
+        raise HttpError(400, f"Unknown solver '{payload.solver}'. Valid: {', '.join(SOLVERS)}")
+    check_types = [ct.lower() for ct in payload.check_types] if payload.check_types else None
+    if check_types:
+        unknown = [ct for ct in check_types if ct not in _CHECK_TABLE_MAP]
+        if unknown:
+            raise HttpError(400, f"Unknown check type(s): {', '.join(unknown)}")
+
+    return run_batch_assignment(
+        dry_run=payload.dry_run,
+        check_types=check_types,
+        max_open_checks=max(1, payload.max_open_checks),
+        max_distance_km=max(1.0, payload.max_distance_km),
+        solver=payload.solver,
+    )
+
+
 # =============================================================================
 # Client & Vendor List Endpoints
 # =============================================================================
@@ -3817,6 +3902,7 @@ def list_vendors_for_cases(request):
     summary="Get all cities from court_details",
     description="Returns distinct city names for dropdowns.",
 )
+@cached_endpoint('court_details', ttl=3600, tags=('court_details',), per_user=False)
 def get_court_cities(request: HttpRequest):
     """Return distinct cities from court_details table."""
     try:
@@ -3828,6 +3914,7 @@ def get_court_cities(request: HttpRequest):
         return {"cities": cities}
     except Exception as e:
         logger.error(f"Failed to fetch court cities: {e}")
+        skip_caching(request)
         return {"cities": []}
 
 
@@ -3836,6 +3923,7 @@ def get_court_cities(request: HttpRequest):
     summary="Get police stations by city",
     description="Returns police stations filtered by city.",
 )
+@cached_endpoint('court_details', ttl=3600, tags=('court_details',), per_user=False)
 def get_police_stations(request: HttpRequest, city: str):
     """Return police stations for a given city."""
     try:
@@ -3850,6 +3938,7 @@ def get_police_stations(request: HttpRequest, city: str):
         return {"police_stations": stations}
     except Exception as e:
         logger.error(f"Failed to fetch police stations for city={city}: {e}")
+        skip_caching(request)
         return {"police_stations": []}
 
 
@@ -3858,6 +3947,7 @@ def get_police_stations(request: HttpRequest, city: str):
     summary="Get court names by city",
     description="Returns taluka court names filtered by city.",
 )
+@cached_endpoint('court_details', ttl=3600, tags=('court_details',), per_user=False)
 def get_court_names(request: HttpRequest, city: str):
     """Return court names for a given city."""
     try:
@@ -3872,45 +3962,8 @@ def get_court_names(request: HttpRequest, city: str):
         return {"courts": courts}
     except Exception as e:
         logger.error(f"Failed to fetch courts for city={city}: {e}")
+        skip_caching(request)
         return {"courts": []}
-def get_police_stations(request: HttpRequest, city: str):
-    """Return police stations for a given city."""
-    try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute(
-                "SELECT DISTINCT jurisdiction_police_station FROM court_details "
-                "WHERE city = %s AND jurisdiction_police_station IS NOT NULL "
-                "ORDER BY jurisdiction_police_station",
-                [city],
-            )
-            stations = [r[0] for r in cursor.fetchall()]
-        return {"police_stations": stations}
-    except Exception as e:
-        logger.error(f"Failed to fetch police stations for city={city}: {e}")
-        return {"police_stations": []}
-
-
-@router.get(
-    "/court-details/courts",
-    summary="Get court names by city",
-    description="Returns taluka court names filtered by city.",
-)
-def get_court_names(request: HttpRequest, city: str):
-    """Return court names for a given city."""
-    try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute(
-                "SELECT DISTINCT taluka_court FROM court_details "
-                "WHERE city = %s AND taluka_court IS NOT NULL "
-                "ORDER BY taluka_court",
-                [city],
-            )
-            courts = [r[0] for r in cursor.fetchall()]
-        return {"courts": courts}
-    except Exception as e:
-        logger.error(f"Failed to fetch courts for city={city}: {e}")
-        return {"courts": []}
-
 
 # =============================================================================
 # Vendor Reassignment Endpoint
@@ -4036,7 +4089,12 @@ def review_check(request: HttpRequest, case_id: int, check_type: str, payload: A
     try:
         with connections['default'].cursor() as cursor:
             if action == 'accept':
-                cursor.execute(f"UPDATE {table} SET check_status = 'Verified' WHERE case_id = %s", [case_id])
+                cursor.execute(
+                    f"UPDATE {table} SET check_status = 'Verified' WHERE case_id = %s RETURNING assigned_vendor_id",
+                    [case_id],
+                )
+                updated = cursor.fetchone()
+                publish_check_status(case_id, check_type.lower(), 'Verified', vendor_id=updated[0] if updated else None)
                 return {"success": True, "message": "Check accepted"}
                 
             elif action == 'reject':
@@ -4057,10 +4115,12 @@ def review_check(request: HttpRequest, case_id: int, check_type: str, payload: A
                     update_sql += ", assigned_vendor_id = %s"
                     params.append(new_vendor_id)
                     
-                update_sql += " WHERE case_id = %s"
+                update_sql += " WHERE case_id = %s RETURNING assigned_vendor_id"
                 params.append(case_id)
                 
                 cursor.execute(update_sql, params)
+                updated = cursor.fetchone()
+                publish_check_status(case_id, check_type.lower(), 'Reassigned', vendor_id=updated[0] if updated else None)
                 return {"success": True, "message": "Check rejected and reassigned"}
             
             else:
@@ -4456,7 +4516,13 @@ class GenerateRTORTIRequest(Schema):
     email_id: str = ""
 
 
+def _is_bulk_rto_rti_request(request, case_id: int, data: GenerateRTORTIRequest) -> bool:
+    """Only the ``all`` bundle (every document type, zipped) goes through admission control."""
+    return (data.doc_type or "").strip().lower() == "all"
+
+
 @router.post('/cases/incident-db/{case_id}/generate-rto-rti', tags=["Cases"], summary="Generate RTO RTI Document(s)")
+@admission_limit('rto_rti_generation', applies=_is_bulk_rto_rti_request)
 def generate_rto_rti_form(request, case_id: int, data: GenerateRTORTIRequest):
     import os
     import io
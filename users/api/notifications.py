@@ -2,18 +2,28 @@
 Vendor Notifications API endpoints.
 """
 
+import base64
 import logging
 from datetime import datetime, timezone as datetime_timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from django.db import connections
+from django.db import connections, transaction
 from django.http import HttpRequest
 from ninja import Router, Schema
 
+from users.services.notification_service import (
+    adjust_unread_count,
+    get_unread_count,
+    reset_unread_count,
+)
+
 logger = logging.getLogger(__name__)
 
 router = Router(tags=["Vendor Notifications"])
 
+DEFAULT_NOTIFICATIONS_PAGE_SIZE = 50
+MAX_NOTIFICATIONS_PAGE_SIZE = 200
+
 
 # =============================================================================
 # Schemas
@@ -36,6 +46,20 @@ class NotificationsListResponse(Schema):
     """Response schema for listing vendor notifications."""
     notifications: List[NotificationItemSchema]
     unread_count: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class UnreadCountResponse(Schema):
+    """Response schema for the lightweight unread-count poll."""
+    unread_count: int
+
+
+class MarkAllReadResponse(Schema):
+    """Response schema for bulk mark-all-read."""
+    success: bool
+    marked_count: int
+    unread_count: int
 
 
 class ErrorSchema(Schema):
@@ -90,18 +114,43 @@ def _format_created_at(value) -> str:
     return str(value)
 
 
+def _encode_cursor(created_at, notification_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{notification_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor produced by ``_encode_cursor``. Returns None if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at_raw, id_raw = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at_raw), int(id_raw)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
 @router.get(
     "/vendor/notifications",
-    response={200: NotificationsListResponse, 401: ErrorSchema, 403: ErrorSchema},
+    response={200: NotificationsListResponse, 400: ErrorSchema, 401: ErrorSchema, 403: ErrorSchema},
     summary="List Vendor Notifications",
-    description="Returns all notifications for the authenticated vendor, newest first, plus an unread count.",
+    description=(
+        "Returns a page of notifications for the authenticated vendor, newest first, "
+        "plus the maintained unread count. Pass the returned `next_cursor` as `cursor` "
+        "to fetch the next (older) page."
+    ),
 )
-def list_notifications(request: HttpRequest):
-    """Fetch all notifications for the authenticated vendor."""
+def list_notifications(
+    request: HttpRequest,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_NOTIFICATIONS_PAGE_SIZE,
+):
+    """Fetch one cursor-paginated page of notifications for the authenticated vendor."""
     if not request.user.is_authenticated:
         return 401, {"error": "Not authenticated"}
 
@@ -109,27 +158,50 @@ def list_notifications(request: HttpRequest):
     if vendor_id is None:
         return 403, {"error": "Vendor access required"}
 
-    with connections['default'].cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT vn.id, vn.notification_type, vn.check_type, vn.case_id, vn.case_number,
+    limit = max(1, min(int(limit or DEFAULT_NOTIFICATIONS_PAGE_SIZE), MAX_NOTIFICATIONS_PAGE_SIZE))
+
+    position = None
+    if cursor:
+        position = _decode_cursor(cursor)
+        if position is None:
+            return 400, {"error": "Invalid cursor"}
+
+    keyset_clause = ""
+    params: list = [vendor_id]
+    if position is not None:
+        keyset_clause = "AND (vn.created_at, vn.id) < (%s, %s)"
+        params.extend(position)
+    # Fetch one extra row to know whether another page exists.
+    params.append(limit + 1)
+
+    with connections['default'].cursor() as db_cursor:
+        # Page first, then join only the page's rows for claim numbers.
+        db_cursor.execute(
+            f"""
+            WITH page AS (
+                SELECT vn.id, vn.notification_type, vn.check_type, vn.case_id, vn.case_number,
+                       vn.message, vn.is_read, vn.created_at
+                FROM vendor_notifications vn
+                WHERE vn.vendor_id = %s
+                  {keyset_clause}
+                ORDER BY vn.created_at DESC, vn.id DESC
+                LIMIT %s
+            )
+            SELECT page.id, page.notification_type, page.check_type, page.case_id, page.case_number,
                    COALESCE(NULLIF(ic.claim_number, ''), NULLIF(c.claim_number, ''), '') AS claim_number,
-                   vn.message, vn.is_read, vn.created_at
-            FROM vendor_notifications vn
-            LEFT JOIN insurance_case ic ON ic.id = vn.case_id
-            LEFT JOIN cases c ON c.id = vn.case_id
-            WHERE vn.vendor_id = %s
-            ORDER BY vn.created_at DESC
+                   page.message, page.is_read, page.created_at
+            FROM page
+            LEFT JOIN insurance_case ic ON ic.id = page.case_id
+            LEFT JOIN cases c ON c.id = page.case_id
+            ORDER BY page.created_at DESC, page.id DESC
             """,
-            [vendor_id],
+            params,
         )
-        rows = cursor.fetchall()
+        rows = db_cursor.fetchall()
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM vendor_notifications WHERE vendor_id = %s AND is_read = FALSE",
-            [vendor_id],
-        )
-        unread_count = cursor.fetchone()[0]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1][8], rows[-1][0]) if has_more and rows else None
 
     notifications = [
         {
@@ -146,7 +218,61 @@ def list_notifications(request: HttpRequest):
         for r in rows
     ]
 
-    return 200, {"notifications": notifications, "unread_count": unread_count}
+    return 200, {
+        "notifications": notifications,
+        "unread_count": get_unread_count(vendor_id),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+@router.get(
+    "/vendor/notifications/unread-count",
+    response={200: UnreadCountResponse, 401: ErrorSchema, 403: ErrorSchema},
+    summary="Get Vendor Unread Notification Count",
+    description="Cheap poll endpoint that reads the maintained per-vendor unread counter.",
+)
+def get_notifications_unread_count(request: HttpRequest):
+    """Return the maintained unread counter for the authenticated vendor."""
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated"}
+
+    vendor_id = _get_vendor_id(request)
+    if vendor_id is None:
+        return 403, {"error": "Vendor access required"}
+
+    return 200, {"unread_count": get_unread_count(vendor_id)}
+
+
+@router.post(
+    "/vendor/notifications/read-all",
+    response={200: MarkAllReadResponse, 401: ErrorSchema, 403: ErrorSchema},
+    summary="Mark All Notifications as Read",
+    description="Marks every unread notification of the authenticated vendor as read in one statement.",
+)
+def mark_all_notifications_read(request: HttpRequest):
+    """Bulk mark-all-read for the authenticated vendor."""
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated"}
+
+    vendor_id = _get_vendor_id(request)
+    if vendor_id is None:
+        return 403, {"error": "Vendor access required"}
+
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE vendor_notifications
+                SET is_read = TRUE
+                WHERE vendor_id = %s AND is_read = FALSE
+                """,
+                [vendor_id],
+            )
+            marked_count = cursor.rowcount or 0
+            reset_unread_count(cursor, vendor_id)
+
+    return 200, {"success": True, "marked_count": marked_count, "unread_count": 0}
 
 
 @router.post(
@@ -181,14 +307,25 @@ def mark_notification_read(request: HttpRequest, notification_id: int):
         if row[0] != vendor_id:
             return 403, {"error": "Access denied"}
 
-        # Idempotent update — set is_read regardless of current value
+        # Idempotent update — only an unread -> read transition touches the counter
+        with transaction.atomic(using='default'):
+            cursor.execute(
+                """
+                UPDATE vendor_notifications
+                SET is_read = TRUE
+                WHERE id = %s AND is_read = FALSE
+                """,
+                [notification_id],
+            )
+            if cursor.rowcount:
+                adjust_unread_count(cursor, vendor_id, -1)
+
         cursor.execute(
             """
-            UPDATE vendor_notifications
-            SET is_read = TRUE
+            SELECT id, notification_type, check_type, case_id, case_number,
+                   message, is_read, created_at
+            FROM vendor_notifications
             WHERE id = %s
-            RETURNING id, notification_type, check_type, case_id, case_number,
-                      message, is_read, created_at
             """,
             [notification_id],
         )
@@ -10,11 +10,16 @@ from ninja import Router, Schema
 from ninja.errors import HttpError
 from django.http import HttpRequest
 from django.utils import timezone
-from django.db import connections
-from django.db.models import Max, Subquery
+from django.db import connections, transaction
 
+from core.api_cache import cached_endpoint
+from core.conditional import conditional_get
+from core.db_routing import replica_read
 from users.api.cases import _enrich_evidence_metadata
 from users.models import Report, InsuranceCase, CustomUser
+from users.services import qc_queue, report_analytics
+from users.services.case_identity import get_incident_case_id, get_insurance_case_id
+from users.services.event_bus import DASHBOARD_ROLES, EVENT_REPORT_STATUS, publish_event
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +68,7 @@ class ReportSchema(Schema):
     created_at: datetime
     updated_at: datetime
     assigned_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
     reviewed_at: Optional[datetime] = None
     evidence_photos: Optional[List[dict]] = None
     vendor_documents: Optional[List[dict]] = None
@@ -125,6 +131,40 @@ class ReportStatsSchema(Schema):
     rejected: int
 
 
+class LeaseRequestSchema(Schema):
+    """Optional lease length when claiming or renewing a queued report."""
+    lease_minutes: Optional[int] = None
+
+
+class LeaseResponseSchema(Schema):
+    """Lease state of a queued report."""
+    report_id: int
+    lease_expires_at: Optional[datetime] = None
+
+
+class QCThroughputSchema(Schema):
+    """Per-reviewer load and throughput over the stats window."""
+    qc_id: int
+    name: str
+    open_reports: int
+    claimed: int
+    reviewed: int
+    released: int
+    expired: int
+    reviews_per_day: float
+    avg_review_minutes: Optional[float] = None
+
+
+class QCQueueStatsSchema(Schema):
+    """QC work queue depth and reviewer throughput."""
+    queued: int
+    leased: int
+    expired_leases: int
+    max_open_reports_per_qc: int
+    window_days: int
+    reviewers: List[QCThroughputSchema]
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
@@ -208,12 +248,9 @@ def _collect_report_evidence_photos(
 
 
 def _resolve_incident_case_id(case: InsuranceCase) -> Optional[int]:
-    """Resolve incident-db case id using case_number when ORM id differs."""
+    """Resolve the incident-db case id paired with an ORM case."""
     try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute("SELECT id FROM cases WHERE case_number = %s", [case.case_number])
-            row = cursor.fetchone()
-            return row[0] if row else None
+        return get_incident_case_id(case.id)
     except Exception as exc:
         logger.debug(f"Failed to resolve incident case id for {case.case_number}: {exc}")
         return None
@@ -223,7 +260,11 @@ def _get_fallback_location_name(
     case: InsuranceCase,
     incident_case_id: Optional[int],
 ) -> str:
-    """Fetch a fallback location string from incident-db or ORM fields."""
+    """Fetch a fallback location string from incident-db or ORM fields.
+
+    Each lookup is best-effort and runs in its own savepoint, so a failed
+    query does not abort an enclosing transaction.
+    """
     def _clean_location(value: Optional[str]) -> str:
         text = str(value or "").strip()
         if not text:
@@ -234,7 +275,7 @@ def _get_fallback_location_name(
 
     row = None
     try:
-        with connections['default'].cursor() as cursor:
+        with transaction.atomic(using='default'), connections['default'].cursor() as cursor:
             if incident_case_id:
                 cursor.execute(
                     """
@@ -268,7 +309,7 @@ def _get_fallback_location_name(
 
     if incident_case_id:
         try:
-            with connections['default'].cursor() as cursor:
+            with transaction.atomic(using='default'), connections['default'].cursor() as cursor:
                 cursor.execute(
                     """
                     SELECT place_of_accident, district, spot_city, police_station
@@ -290,7 +331,7 @@ def _get_fallback_location_name(
                 return ', '.join(parts)
 
         try:
-            with connections['default'].cursor() as cursor:
+            with transaction.atomic(using='default'), connections['default'].cursor() as cursor:
                 cursor.execute(
                     """
                     SELECT claimant_address
@@ -313,7 +354,7 @@ def _get_fallback_location_name(
                 return claimant_address
 
         try:
-            with connections['default'].cursor() as cursor:
+            with transaction.atomic(using='default'), connections['default'].cursor() as cursor:
                 cursor.execute(
                     """
                     SELECT insured_address
@@ -423,6 +464,7 @@ def report_to_schema(report: Report, request: Optional[HttpRequest] = None) -> d
         'created_at': report.created_at,
         'updated_at': report.updated_at,
         'assigned_at': report.assigned_at,
+        'lease_expires_at': report.lease_expires_at,
         'reviewed_at': report.reviewed_at,
         'evidence_photos': evidence_photos if evidence_photos else None,
         'vendor_documents': vendor_documents if vendor_documents else None,
@@ -430,121 +472,21 @@ def report_to_schema(report: Report, request: Optional[HttpRequest] = None) -> d
     }
 
 
-def report_to_list_schema(report: Report) -> dict:
-    """Convert Report model to list response dict."""
-    case = report.case
-    qc = report.assigned_qc
-    return {
-        'id': report.id,
-        'case_number': case.case_number,
-        'case_title': case.title,
-        'claim_number': case.claim_number,
-        'client_name': case.client_name,
-        'category': case.category,
-        'status': report.status,
-        'assigned_qc_name': f"{qc.first_name} {qc.last_name}".strip() or qc.username if qc else None,
-        'created_at': report.created_at,
-        'assigned_at': report.assigned_at,
-        'reviewed_at': report.reviewed_at,
-    }
-
-
-def _latest_reports_per_case_queryset():
-    """Return queryset with only the latest report for each case."""
-    active_case_numbers = _verified_incident_case_numbers()
-    if not active_case_numbers:
-        return Report.objects.none()
-
-    latest_report_ids = Report.objects.values('case_id').annotate(
-        latest_id=Max('id')
-    ).values('latest_id')
-
-    return Report.objects.select_related('case', 'assigned_qc').filter(
-        id__in=Subquery(latest_report_ids),
-        case__case_number__in=active_case_numbers,
+def _publish_report_status(report: Report) -> None:
+    """Push a report status change to dashboards and the assigned qc."""
+    publish_event(
+        EVENT_REPORT_STATUS,
+        {
+            'report_id': report.id,
+            'case_number': report.case.case_number,
+            'status': report.status,
+            'assigned_qc_id': report.assigned_qc_id,
+        },
+        user_ids=[report.assigned_qc_id] if report.assigned_qc_id else None,
+        roles=DASHBOARD_ROLES,
     )
 
 
-def _active_incident_case_numbers() -> List[str]:
-    """Case numbers currently present in the incident cases table."""
-    try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute("SELECT case_number FROM cases")
-            return [row[0] for row in cursor.fetchall() if row and row[0]]
-    except Exception as exc:
-        logger.error(f"Failed to fetch active incident case numbers: {exc}")
-        return []
-
-
-def _verified_incident_case_numbers() -> List[str]:
-    """Case numbers where ALL vendor checks have status 'Verified'.
-
-    This mirrors the AI Case Review page filter so that the Legal Review page
-    only displays cases whose AI reports are genuinely generated.
-    """
-    check_tables = [
-        'claimant_checks',
-        'insured_checks',
-        'driver_checks',
-        'spot_checks',
-        'chargesheets',
-    ]
-
-    try:
-        with connections['default'].cursor() as cursor:
-            # Get all case ids and their case_numbers
-            cursor.execute("SELECT id, case_number FROM cases")
-            all_cases = {row[0]: row[1] for row in cursor.fetchall() if row and row[0]}
-
-            if not all_cases:
-                return []
-
-            case_ids = list(all_cases.keys())
-            ph = ",".join(["%s"] * len(case_ids))
-
-            verified_case_ids = set(case_ids)
-
-            for table in check_tables:
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT DISTINCT case_id
-                        FROM {table}
-                        WHERE case_id IN ({ph})
-                          AND (
-                              check_status IS NULL
-                              OR check_status NOT IN ('Verified')
-                          )
-                        """,
-                        case_ids,
-                    )
-                    non_verified = {row[0] for row in cursor.fetchall()}
-                    verified_case_ids -= non_verified
-                except Exception:
-                    pass
-
-            # Also exclude cases that have NO checks at all
-            cases_with_checks = set()
-            for table in check_tables:
-                try:
-                    cursor.execute(
-                        f"SELECT DISTINCT case_id FROM {table} WHERE case_id IN ({ph})",
-                        case_ids,
-                    )
-                    cases_with_checks.update(row[0] for row in cursor.fetchall())
-                except Exception:
-                    pass
-
-            verified_case_ids &= cases_with_checks
-
-            return [all_cases[cid] for cid in verified_case_ids if cid in all_cases]
-
-    except Exception as exc:
-        logger.error(f"Failed to fetch verified incident case numbers: {exc}")
-        return []
-
-
-
 # =============================================================================
 # CaseManager Endpoints
 # =============================================================================
@@ -555,6 +497,7 @@ def _verified_incident_case_numbers() -> List[str]:
     summary="List all reports",
     description="Get all AI-generated reports for legal review (CaseManager only)."
 )
+@replica_read
 def list_reports(request: HttpRequest, status: Optional[str] = None):
     """List all reports with optional status filter."""
     user = request.auth
@@ -563,14 +506,14 @@ def list_reports(request: HttpRequest, status: Optional[str] = None):
     if user.role not in [CustomUser.Role.CASE_MANAGER, CustomUser.Role.SUPER_ADMIN]:
         raise HttpError(403, "Access denied")
 
-    queryset = _latest_reports_per_case_queryset()
+    queryset = report_analytics.latest_verified_reports()
 
     if status:
         queryset = queryset.filter(status=status.upper())
 
     queryset = queryset.order_by('-created_at', '-id')
 
-    return [report_to_list_schema(r) for r in queryset]
+    return report_analytics.list_rows(queryset)
 
 
 @router.get(
@@ -579,6 +522,7 @@ def list_reports(request: HttpRequest, status: Optional[str] = None):
     summary="Get report statistics",
     description="Get statistics about reports (CaseManager only)."
 )
+@replica_read
 def get_report_stats(request: HttpRequest):
     """Get report statistics."""
     user = request.auth
@@ -586,21 +530,49 @@ def get_report_stats(request: HttpRequest):
     if user.role not in [CustomUser.Role.CASE_MANAGER, CustomUser.Role.SUPER_ADMIN]:
         raise HttpError(403, "Access denied")
 
-    base_queryset = _latest_reports_per_case_queryset()
+    return report_analytics.status_counts(report_analytics.latest_verified_reports())
 
-    total = base_queryset.count()
-    pending = base_queryset.filter(status=Report.Status.PENDING).count()
-    assigned = base_queryset.filter(status=Report.Status.ASSIGNED).count()
-    accepted = base_queryset.filter(status=Report.Status.ACCEPTED).count()
-    rejected = base_queryset.filter(status=Report.Status.REJECTED).count()
 
-    return {
-        'total': total,
-        'pending': pending,
-        'assigned': assigned,
-        'accepted': accepted,
-        'rejected': rejected,
-    }
+def _report_detail_version(request: HttpRequest, report_id: int):
+    """Report updated_at plus the linked incident case's data_version, for readers allowed to see it."""
+    user = request.auth
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT r.updated_at, r.assigned_qc_id, c.data_version
+            FROM reports r
+            LEFT JOIN cases c ON c.insurance_case_id = r.case_id
+            WHERE r.id = %s
+            """,
+            [report_id],
+        )
+        row = cursor.fetchone()
+    if not row:
+        return None
+    updated_at, assigned_qc_id, case_version = row
+    if user.role == CustomUser.Role.QC and assigned_qc_id != user.id:
+        return None
+    if user.role not in [CustomUser.Role.CASE_MANAGER, CustomUser.Role.SUPER_ADMIN, CustomUser.Role.QC]:
+        return None
+    return f"{updated_at.isoformat()}:{assigned_qc_id}:{case_version}"
+
+
+def _report_detail_tags(request: HttpRequest, report_id: int):
+    """The report and its incident case; the view enforces access per user."""
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.id
+            FROM reports r
+            LEFT JOIN cases c ON c.insurance_case_id = r.case_id
+            WHERE r.id = %s
+            """,
+            [report_id],
+        )
+        row = cursor.fetchone()
+    if not row:
+        return None
+    return [f"report:{report_id}"] + ([f"case:{row[0]}"] if row[0] else [])
 
 
 @router.get(
@@ -609,6 +581,8 @@ def get_report_stats(request: HttpRequest):
     summary="Get report details",
     description="Get a specific report by ID."
 )
+@conditional_get(_report_detail_version)
+@cached_endpoint('report_detail', ttl=300, tags=_report_detail_tags)
 def get_report(request: HttpRequest, report_id: int):
     """Get a specific report."""
     user = request.auth
@@ -633,25 +607,21 @@ def get_report(request: HttpRequest, report_id: int):
 def _get_insurance_case_by_incident_case_id(incident_case_id: int) -> Optional[InsuranceCase]:
     """
     Find InsuranceCase for a given incident-db cases table ID.
-    Always maps via case_number in cases table first to avoid ID collision between tables.
+    Always maps via cases.insurance_case_id first to avoid ID collision between tables.
     """
-    case_number = None
+    insurance_case_id = None
     try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute("SELECT case_number FROM cases WHERE id = %s", [incident_case_id])
-            res = cursor.fetchone()
-            if res and res[0]:
-                case_number = res[0]
+        insurance_case_id = get_insurance_case_id(incident_case_id)
     except Exception as e:
-        logger.warning(f"Error querying cases table for ID {incident_case_id}: {e}")
+        logger.warning(f"Error resolving insurance case for incident case {incident_case_id}: {e}")
 
-    if case_number:
+    if insurance_case_id:
         try:
-            return InsuranceCase.objects.get(case_number=case_number)
+            return InsuranceCase.objects.get(id=insurance_case_id)
         except InsuranceCase.DoesNotExist:
-            logger.warning(f"InsuranceCase not found for case_number {case_number}")
+            logger.warning(f"InsuranceCase {insurance_case_id} linked to case {incident_case_id} not found")
 
-    # Fallback to direct ID lookup if no case_number match found
+    # Fallback to direct ID lookup if the case has no linked ORM row
     try:
         return InsuranceCase.objects.get(id=incident_case_id)
     except InsuranceCase.DoesNotExist:
@@ -802,10 +772,12 @@ def assign_qc(request: HttpRequest, report_id: int, payload: AssignQCSchema):
     # Assign qc
     report.assigned_qc = qc
     report.assigned_at = timezone.now()
+    report.lease_expires_at = None
     report.status = Report.Status.ASSIGNED
     report.save()
 
     logger.info(f"Report {report.id} assigned to qc {qc.username} by {user.username}")
+    _publish_report_status(report)
 
     return report_to_schema(report, request)
 
@@ -877,12 +849,14 @@ def reassign_report(request: HttpRequest, report_id: int, payload: ReassignRepor
     previous_qc = report.assigned_qc
     report.assigned_qc = qc
     report.assigned_at = timezone.now()
+    report.lease_expires_at = None
     report.reviewed_at = None  # Reset review timestamp
     report.review_notes = ''  # Clear previous review notes
     report.status = Report.Status.ASSIGNED
     report.save()
 
     logger.info(f"Report {report.id} reassigned from {previous_qc.username if previous_qc else 'None'} to {qc.username} by {user.username}")
+    _publish_report_status(report)
 
     return report_to_schema(report, request)
 
@@ -897,6 +871,7 @@ def reassign_report(request: HttpRequest, report_id: int, payload: ReassignRepor
     summary="Get qc's assigned reports",
     description="Get all reports assigned to the current qc."
 )
+@replica_read
 def get_qc_reports(request: HttpRequest, status: Optional[str] = None):
     """Get reports assigned to the current qc."""
     user = request.auth
@@ -904,19 +879,12 @@ def get_qc_reports(request: HttpRequest, status: Optional[str] = None):
     if user.role != CustomUser.Role.QC:
         raise HttpError(403, "Access denied")
 
-    active_case_numbers = _active_incident_case_numbers()
-    if not active_case_numbers:
-        return []
-
-    queryset = Report.objects.select_related('case', 'assigned_qc').filter(
-        assigned_qc=user,
-        case__case_number__in=active_case_numbers,
-    )
+    queryset = report_analytics.active_qc_reports(user.id)
 
     if status:
         queryset = queryset.filter(status=status.upper())
 
-    return [report_to_list_schema(r) for r in queryset]
+    return report_analytics.list_rows(queryset)
 
 
 @router.get(
@@ -925,6 +893,7 @@ def get_qc_reports(request: HttpRequest, status: Optional[str] = None):
     summary="Get qc's report statistics",
     description="Get statistics about the qc's assigned reports."
 )
+@replica_read
 def get_qc_report_stats(request: HttpRequest):
     """Get qc's report statistics."""
     user = request.auth
@@ -932,25 +901,10 @@ def get_qc_report_stats(request: HttpRequest):
     if user.role != CustomUser.Role.QC:
         raise HttpError(403, "Access denied")
 
-    active_case_numbers = _active_incident_case_numbers()
-    base_queryset = Report.objects.filter(
-        assigned_qc=user,
-        case__case_number__in=active_case_numbers,
-    ) if active_case_numbers else Report.objects.none()
-
-    total = base_queryset.count()
-    pending = base_queryset.filter(status=Report.Status.PENDING).count()
-    assigned = base_queryset.filter(status=Report.Status.ASSIGNED).count()
-    accepted = base_queryset.filter(status=Report.Status.ACCEPTED).count()
-    rejected = base_queryset.filter(status=Report.Status.REJECTED).count()
-
-    return {
-        'total': total,
-        'pending': pending + assigned,  # Combine pending and assigned for "pending review"
-        'assigned': assigned,
-        'accepted': accepted,
-        'rejected': rejected,
-    }
+    counts = report_analytics.status_counts(report_analytics.active_qc_reports(user.id))
+    # Combine pending and assigned for "pending review"
+    counts['pending'] += counts['assigned']
+    return counts
 
 
 @router.post(
@@ -985,14 +939,101 @@ def review_report(request: HttpRequest, report_id: int, payload: ReviewReportSch
     report.status = Report.Status.ACCEPTED if action == 'accept' else Report.Status.REJECTED
     report.reviewed_at = timezone.now()
     report.review_notes = notes
-    report.save()
+    report.lease_expires_at = None
+    with transaction.atomic(using='default'):
+        report.save()
+        qc_queue.record_review(user.id, report.assigned_at, report.reviewed_at)
 
     action_label = "approved" if action == 'accept' else 'rejected'
     logger.info(f"Report {report.id} {action_label} by qc {user.username}")
+    _publish_report_status(report)
 
     return report_to_schema(report, request)
 
 
+@router.post(
+    "/qc/queue/next",
+    response={200: ReportSchema, 204: None},
+    summary="Claim the next report",
+    description="Lease the oldest unclaimed report from the QC work queue. Returns 204 when the queue is empty."
+)
+def claim_next_queued_report(request: HttpRequest, payload: LeaseRequestSchema = None):
+    """Claim the next report from the work queue."""
+    user = request.auth
+
+    if user.role != CustomUser.Role.QC:
+        raise HttpError(403, "Access denied")
+
+    lease_minutes = payload.lease_minutes if payload else None
+    try:
+        report_id = qc_queue.claim_next_report(user.id, lease_minutes=lease_minutes)
+    except qc_queue.LeaseLimitReached as exc:
+        raise HttpError(409, str(exc))
+
+    if report_id is None:
+        return 204, None
+
+    report = Report.objects.select_related('case', 'assigned_qc').get(id=report_id)
+    _publish_report_status(report)
+    return 200, report_to_schema(report, request)
+
+
+@router.post(
+    "/qc/queue/{report_id}/renew",
+    response=LeaseResponseSchema,
+    summary="Renew a report lease",
+    description="Extend the lease on a report claimed from the work queue."
+)
+def renew_queued_report(request: HttpRequest, report_id: int, payload: LeaseRequestSchema = None):
+    """Extend the lease on a claimed report."""
+    user = request.auth
+
+    if user.role != CustomUser.Role.QC:
+        raise HttpError(403, "Access denied")
+
+    expires_at = qc_queue.renew_lease(report_id, user.id, payload.lease_minutes if payload else None)
+    if expires_at is None:
+        raise HttpError(409, "Lease not held or already expired")
+
+    return {'report_id': report_id, 'lease_expires_at': expires_at}
+
+
+@router.post(
+    "/qc/queue/{report_id}/release",
+    response=LeaseResponseSchema,
+    summary="Release a report lease",
+    description="Return a claimed report to the work queue without reviewing it."
+)
+def release_queued_report(request: HttpRequest, report_id: int):
+    """Hand a claimed report back to the queue."""
+    user = request.auth
+
+    if user.role != CustomUser.Role.QC:
+        raise HttpError(403, "Access denied")
+
+    if not qc_queue.release_lease(report_id, user.id):
+        raise HttpError(404, "No lease held on this report")
+
+    logger.info(f"Report {report_id} released back to the QC queue by {user.username}")
+    return {'report_id': report_id, 'lease_expires_at': None}
+
+
+@router.get(
+    "/qc/queue/stats",
+    response=QCQueueStatsSchema,
+    summary="QC work queue statistics",
+    description="Queue depth, open reports per QC and per-reviewer throughput (CaseManager only)."
+)
+def get_qc_queue_stats(request: HttpRequest, days: int = 7):
+    """Get queue depth and reviewer throughput."""
+    user = request.auth
+
+    if user.role not in [CustomUser.Role.CASE_MANAGER, CustomUser.Role.SUPER_ADMIN]:
+        raise HttpError(403, "Access denied")
+
+    return qc_queue.queue_snapshot(days=min(max(days, 1), 90))
+
+
 class LogEntrySchema(Schema):
     """Schema for activity log entries."""
     id: int
@@ -2,16 +2,19 @@
 Super Admin Dashboard API endpoints.
 """
 
+import json
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.db import connections
+from django.http import HttpResponse
 from django.utils import timezone
 from ninja import Router, Schema
 from ninja.errors import HttpError
 
 from users.schemas import ErrorSchema
+from users.services.dashboard_snapshot import get_dashboard_snapshot, refresh_dashboard_snapshot
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -61,6 +64,7 @@ class SuperAdminDashboardSchema(Schema):
     case_managers: List[Dict[str, Any]] = []
     activity_logs: List[Dict[str, Any]] = []
     deletion_logs: List[Dict[str, Any]] = []
+    snapshot_computed_at: Optional[datetime] = None
 
 
 # =============================================================================
@@ -75,267 +79,43 @@ def is_super_admin(user) -> bool:
     )
 
 
-def get_dashboard_logs_data() -> Dict[str, Any]:
-    """Fetch real case manager activity logs, TAT logs, deletion logs, and case managers."""
-    from users.models import ActivityLog, CaseDeletionRequest, Report
-    from django.db import connection
-    
-    # 1. Fetch Case Managers list
-    case_managers = list(User.objects.filter(role='CASE_MANAGER').values('id', 'first_name', 'last_name', 'email', 'sub_role'))
-    for cm in case_managers:
-        cm['name'] = f"{cm['first_name'] or ''} {cm['last_name'] or ''}".strip() or cm['email']
-
-    default_cm = case_managers[0] if case_managers else None
-
-    # 2. Case Manager Activity Logs (Exclude LOGIN, LOGOUT, FORCE_LOGOUT)
-    activity_logs = []
-    
-    # A) ActivityLog table entries (profile updates, user edits, password changes, etc.)
-    try:
-        excluded_actions = ['LOGIN', 'LOGOUT', 'FORCE_LOGOUT']
-        act_qs = ActivityLog.objects.exclude(action__in=excluded_actions).select_related('user').order_by('-created_at')[:30]
-        for act in act_qs:
-            actor_name = f"{act.user.first_name or ''} {act.user.last_name or ''}".strip() or act.user.email if act.user else "Case Manager"
-            activity_logs.append({
-                "id": f"act-{act.id}",
-                "user_id": act.user_id,
-                "actor": actor_name,
-                "role": act.user.role if act.user else "CASE_MANAGER",
-                "action": act.action,
-                "details": act.details or f"{act.action} by {actor_name}",
-                "created_at": act.created_at.isoformat() if act.created_at else None,
-            })
-    except Exception as e:
-        logger.warning(f"Failed to load ActivityLog: {e}")
-
-    # B) Report Generation & QC Assignment events from reports table
-    try:
-        reports_qs = Report.objects.select_related('created_by', 'assigned_qc').order_by('-created_at')[:20]
-        for r in reports_qs:
-            cm_user = r.created_by or default_cm
-            cm_id = cm_user.id if hasattr(cm_user, 'id') else (cm_user['id'] if isinstance(cm_user, dict) else None)
-            actor_name = (f"{r.created_by.first_name or ''} {r.created_by.last_name or ''}".strip() or r.created_by.email) if r.created_by else (default_cm['name'] if default_cm else "Case Manager")
-            
-            if r.assigned_qc:
-                qc_name = f"{r.assigned_qc.first_name or ''} {r.assigned_qc.last_name or ''}".strip() or r.assigned_qc.email
-                desc = f"Assigned Quality Analyst '{qc_name}' for case #{r.case_id}"
-                action_name = "QC_ASSIGNED"
-            else:
-                desc = f"Generated investigation report for case #{r.case_id} ({r.status})"
-                action_name = "REPORT_GENERATED"
-
-            activity_logs.append({
-                "id": f"rep-{r.id}",
-                "user_id": cm_id,
-                "actor": actor_name,
-                "role": "CASE_MANAGER",
-                "action": action_name,
-                "details": desc,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-            })
-    except Exception as e:
-        logger.warning(f"Failed to load report activity: {e}")
-
-    # C) Case creation events from cases table
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT id, case_number, claim_number, client_name, created_at FROM cases ORDER BY created_at DESC LIMIT 15")
-            for c_id, case_num, claim_num, client_name, c_created_at in cursor.fetchall():
-                cm_id = default_cm['id'] if default_cm else None
-                actor_name = default_cm['name'] if default_cm else "Case Manager"
-                clean_client = (client_name or "").split(" - ")[0].strip() or "Client"
-                activity_logs.append({
-                    "id": f"case-create-{c_id}",
-                    "user_id": cm_id,
-                    "actor": actor_name,
-                    "role": "CASE_MANAGER",
-                    "action": "CASE_CREATED",
-                    "details": f"Created case #{case_num or c_id} (Claim: {claim_num or 'N/A'}) for {clean_client}",
-                    "created_at": c_created_at.isoformat() if c_created_at else None,
-                })
-    except Exception as e:
-        logger.warning(f"Failed to load case creation activity: {e}")
-
-    # D) Business Partner assignment from claimant_checks
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT cc.case_id, cc.claimant_name, u.first_name, u.last_name, u.email, cc.created_at
-                FROM claimant_checks cc
-                JOIN users_customuser u ON cc.assigned_vendor_id = u.id
-                WHERE cc.assigned_vendor_id IS NOT NULL
-                ORDER BY cc.created_at DESC LIMIT 15
-            """)
-            for case_id, claimant_name, v_first, v_last, v_email, v_created_at in cursor.fetchall():
-                cm_id = default_cm['id'] if default_cm else None
-                actor_name = default_cm['name'] if default_cm else "Case Manager"
-                v_name = f"{v_first or ''} {v_last or ''}".strip() or v_email or "Business Partner"
-                activity_logs.append({
-                    "id": f"vendor-assign-{case_id}-{v_name}",
-                    "user_id": cm_id,
-                    "actor": actor_name,
-                    "role": "CASE_MANAGER",
-                    "action": "VENDOR_ASSIGNED",
-                    "details": f"Assigned Business Partner '{v_name}' to verify claimant for case #{case_id}",
-                    "created_at": v_created_at.isoformat() if v_created_at else None,
-                })
-    except Exception as e:
-        logger.warning(f"Failed to load vendor assignment activity: {e}")
-
-    # Sort all activity logs chronologically descending
-    def _parse_time(t):
-        if not t:
-            return 0
-        try:
-            return datetime.fromisoformat(t).timestamp()
-        except Exception:
-            return 0
-
-    activity_logs.sort(key=lambda x: _parse_time(x['created_at']), reverse=True)
-
-    # TAT Change Logs removed
-
-    # 4. Case Deletion Change Logs
-    deletion_logs = []
-    try:
-        del_qs = CaseDeletionRequest.objects.select_related('requested_by', 'reviewed_by').order_by('-requested_at')[:10]
-        for dr in del_qs:
-            req_name = f"{dr.requested_by.first_name or ''} {dr.requested_by.last_name or ''}".strip() if dr.requested_by else "Case Manager"
-            rev_name = f"{dr.reviewed_by.first_name or ''} {dr.reviewed_by.last_name or ''}".strip() if dr.reviewed_by else None
-            deletion_logs.append({
-                "id": dr.id,
-                "case_id": dr.case_id,
-                "case_number": getattr(dr, 'case_number', None) or dr.case_id,
-                "requested_by": req_name,
-                "reason": dr.reason or "N/A",
-                "status": dr.status,
-                "reviewed_by": rev_name,
-                "requested_at": dr.requested_at.isoformat() if dr.requested_at else None,
-                "reviewed_at": dr.reviewed_at.isoformat() if dr.reviewed_at else None,
-            })
-    except Exception as e:
-        logger.warning(f"Failed to load deletion logs: {e}")
-
-    return {
-        "case_managers": case_managers,
-        "activity_logs": activity_logs,
-        "deletion_logs": deletion_logs,
-    }
-
-
-def get_user_statistics() -> Dict[str, Any]:
-    """Get comprehensive user statistics."""
-    now = timezone.now()
-    thirty_days_ago = now - timedelta(days=30)
-    seven_days_ago = now - timedelta(days=7)
-    
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    inactive_users = total_users - active_users
-    
-    # Count users by role
-    users_by_role = {}
-    role_counts = User.objects.values('role').annotate(count=Count('role'))
-    for item in role_counts:
-        users_by_role[item['role']] = item['count']
-    
-    # Count users by sub_role (for caseManagers)
-    users_by_sub_role = {}
-    sub_role_counts = User.objects.filter(
-        role='CASE_MANAGER',
-        sub_role__isnull=False
-    ).values('sub_role').annotate(count=Count('sub_role'))
-    for item in sub_role_counts:
-        users_by_sub_role[item['sub_role']] = item['count']
-    
-    # New users
-    new_users_30 = User.objects.filter(date_joined__gte=thirty_days_ago).count()
-    new_users_7 = User.objects.filter(date_joined__gte=seven_days_ago).count()
-
-    try:
-        from users.models import Client
-        total_clients = Client.objects.count() or users_by_role.get('CLIENT', 0)
-        active_clients = Client.objects.filter(is_active=True).count() if Client.objects.exists() else User.objects.filter(role='CLIENT', is_active=True).count()
-    except Exception:
-        total_clients = users_by_role.get('CLIENT', 0)
-        active_clients = User.objects.filter(role='CLIENT', is_active=True).count()
-
-    return {
-        'total_users': total_users,
-        'active_users': active_users,
-        'inactive_users': inactive_users,
-        'users_by_role': users_by_role,
-        'users_by_sub_role': users_by_sub_role,
-        'new_users_last_30_days': new_users_30,
-        'new_users_last_7_days': new_users_7,
-        'total_clients': total_clients,
-        'active_clients': active_clients,
-    }
+def _resolve_target_users(targets) -> Dict[str, Any]:
+    """Map each activity target (email, username or name) to the user it refers to.
 
+    One query for all targets. Each target resolves to the lowest-id user whose
+    email or username equals it (case-insensitively) or whose first name
+    contains its first word.
+    """
+    from django.db.models import Q
 
-def get_vendor_statistics() -> Dict[str, Any]:
-    """Get comprehensive vendor statistics."""
-    total_vendors = User.objects.filter(role='VENDOR').count()
-    active_vendors = User.objects.filter(role='VENDOR', is_active=True).count()
-    inactive_vendors = total_vendors - active_vendors
-    
-    return {
-        'total_vendors': total_vendors,
-        'active_vendors': active_vendors,
-        'inactive_vendors': inactive_vendors,
-        'vendors_by_specialty': {},
-    }
-
+    conditions = Q()
+    for target in targets:
+        conditions |= Q(email__iexact=target) | Q(username__iexact=target)
+        words = target.split()
+        if words:
+            conditions |= Q(first_name__icontains=words[0])
+    if not conditions:
+        return {}
 
-def get_system_statistics() -> Dict[str, Any]:
-    """Get overall system statistics."""
-    from django.db import connection
-    
-    # Query cases from insurance_case using raw SQL
-    total_cases = 0
-    cases_last_30_days = 0
-    
     try:
-        with connection.cursor() as cursor:
-            # Get total cases
-            cursor.execute("SELECT COUNT(*) FROM insurance_case")
-            total_cases = cursor.fetchone()[0]
-            
-            # Get cases from last 30 days
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            cursor.execute(
-                "SELECT COUNT(*) FROM insurance_case WHERE created_at >= %s",
-                [thirty_days_ago]
-            )
-            cases_last_30_days = cursor.fetchone()[0]
+        candidates = list(User.objects.filter(conditions).order_by('id'))
     except Exception as e:
-        logger.error(f"Failed to get case statistics: {e}")
-    
-    return {
-        'total_cases': total_cases,
-        'cases_last_30_days': cases_last_30_days,
-        'total_documents': 0,
-        'total_emails_processed': 0,
-    }
-
-
-def get_recent_users(limit: int = 10) -> List[Dict[str, Any]]:
-    """Get most recently created users."""
-    recent_users = User.objects.all().order_by('-date_joined')[:limit]
-    
-    return [
-        {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
-            'role': user.role,
-            'sub_role': user.sub_role,
-            'is_active': user.is_active,
-            'date_joined': user.date_joined.isoformat(),
-        }
-        for user in recent_users
-    ]
+        logger.warning(f"Failed to resolve notification targets: {e}")
+        return {}
+
+    resolved = {}
+    for target in targets:
+        lowered = target.lower()
+        words = lowered.split()
+        for user in candidates:
+            if (
+                (user.email or '').lower() == lowered
+                or (user.username or '').lower() == lowered
+                or (words and words[0] in (user.first_name or '').lower())
+            ):
+                resolved[target] = user
+                break
+    return resolved
 
 
 # =============================================================================
@@ -346,9 +126,12 @@ def get_recent_users(limit: int = 10) -> List[Dict[str, Any]]:
     "/super-admin/dashboard",
     response={200: SuperAdminDashboardSchema, 401: ErrorSchema, 403: ErrorSchema},
     summary="Get Super Admin Dashboard Data",
-    description="Get comprehensive statistics for super admin dashboard. Super Admin only.",
+    description=(
+        "Get comprehensive statistics for super admin dashboard from the stored snapshot. "
+        "Pass refresh=true to recompute it first. Super Admin only."
+    ),
 )
-def get_super_admin_dashboard(request):
+def get_super_admin_dashboard(request, refresh: bool = False):
     """
     Get comprehensive dashboard data for super admin.
     
@@ -357,6 +140,9 @@ def get_super_admin_dashboard(request):
     - Vendor statistics (total, active, by specialty)
     - System statistics (cases, documents, emails)
     - Recent users list
+
+    Served from the precomputed snapshot (see users/services/dashboard_snapshot.py);
+    snapshot_computed_at tells the client how old the numbers are.
     """
     if not request.user.is_authenticated:
         return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
@@ -368,23 +154,32 @@ def get_super_admin_dashboard(request):
         }
     
     try:
-        logs_data = get_dashboard_logs_data()
-        dashboard_data = {
-            'user_statistics': get_user_statistics(),
-            'vendor_statistics': get_vendor_statistics(),
-            'system_statistics': get_system_statistics(),
-            'recent_users': get_recent_users(),
-            'case_managers': logs_data['case_managers'],
-            'activity_logs': logs_data['activity_logs'],
-            'deletion_logs': logs_data['deletion_logs'],
-        }
-        
-        return 200, dashboard_data
+        return 200, get_dashboard_snapshot(force_refresh=refresh)
     except Exception as e:
         logger.error(f"Failed to get super admin dashboard: {e}")
         return 500, {"error": "Failed to get dashboard data", "code": "DASHBOARD_ERROR"}
 
 
+@router.post(
+    "/super-admin/dashboard/refresh",
+    response={200: SuperAdminDashboardSchema, 401: ErrorSchema, 403: ErrorSchema},
+    summary="Refresh Super Admin Dashboard Snapshot",
+    description="Recompute the dashboard statistics snapshot now and return it. Super Admin only.",
+)
+def refresh_super_admin_dashboard(request):
+    """Recompute the stored dashboard snapshot on demand."""
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
+    
+    if not is_super_admin(request.user):
+        return 403, {
+            "error": "Super admin access required",
+            "code": "SUPER_ADMIN_REQUIRED"
+        }
+    
+    return 200, refresh_dashboard_snapshot()
+
+
 @router.get(
     "/super-admin/users/statistics",
     response={200: UserStatisticsSchema, 401: ErrorSchema, 403: ErrorSchema},
@@ -402,7 +197,7 @@ def get_user_statistics_endpoint(request):
             "code": "SUPER_ADMIN_REQUIRED"
         }
     
-    return 200, get_user_statistics()
+    return 200, get_dashboard_snapshot()['user_statistics']
 
 
 @router.get(
@@ -422,7 +217,7 @@ def get_vendor_statistics_endpoint(request):
             "code": "SUPER_ADMIN_REQUIRED"
         }
     
-    return 200, get_vendor_statistics()
+    return 200, get_dashboard_snapshot()['vendor_statistics']
 
 
 @router.get(
@@ -479,39 +274,31 @@ def get_super_admin_notifications_endpoint(request, limit: int = 50):
         except Exception:
             pass
 
-    for act in activity_logs:
+    def _target_of(act):
+        if act.action.startswith('CLIENT_'):
+            return None
+        if act.details:
+            email_match = re.search(r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", act.details)
+            if email_match:
+                return email_match.group(1)
+            quote_match = re.search(r"'([^']+)'", act.details)
+            if quote_match:
+                return quote_match.group(1)
+        if act.user and act.action not in ['USER_CREATED', 'USER_UPDATED', 'USER_DELETED']:
+            return act.user.email
+        return None
+
+    act_targets = [_target_of(act) for act in activity_logs]
+    target_users = _resolve_target_users({t for t in act_targets if t})
+
+    for act, target_email in zip(activity_logs, act_targets):
         actor_name = f"{act.user.first_name} {act.user.last_name}".strip() or act.user.email or act.user.username if act.user else "System"
-        
-        target_email = None
-        if not act.action.startswith('CLIENT_'):
-            if act.details:
-                email_match = re.search(r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", act.details)
-                if email_match:
-                    target_email = email_match.group(1)
-                else:
-                    quote_match = re.search(r"'([^']+)'", act.details)
-                    if quote_match:
-                        target_email = quote_match.group(1)
-
-            if not target_email and act.user and act.action not in ['USER_CREATED', 'USER_UPDATED', 'USER_DELETED']:
-                target_email = act.user.email
 
         target_name = None
-        if target_email:
-            try:
-                from django.contrib.auth import get_user_model
-                from django.db.models import Q
-                UserModel = get_user_model()
-                t_user = UserModel.objects.filter(
-                    Q(email__iexact=target_email) |
-                    Q(username__iexact=target_email) |
-                    Q(first_name__icontains=target_email.split()[0])
-                ).first()
-                if t_user:
-                    target_email = t_user.email
-                    target_name = f"{t_user.first_name} {t_user.last_name}".strip() or t_user.username or t_user.email
-            except Exception:
-                pass
+        t_user = target_users.get(target_email) if target_email else None
+        if t_user:
+            target_email = t_user.email
+            target_name = f"{t_user.first_name} {t_user.last_name}".strip() or t_user.username or t_user.email
 
         desc = act.details or f"{act.action} by {actor_name}"
         if act.action in ['USER_UPDATED', 'CLIENT_UPDATED'] and act.details:
@@ -611,3 +398,171 @@ def get_super_admin_notifications_endpoint(request, limit: int = 50):
 
     unique_logs.sort(key=lambda x: _parse_time(x["event_time"]), reverse=True)
     return 200, unique_logs[:limit]
+
+
+# =============================================================================
+# Request Profiling (see core/profiling.py)
+# =============================================================================
+
+class ProfileTokenRequestSchema(Schema):
+    """Path (as in request.path, e.g. /api/cases/12/full-details) to profile."""
+    path: str
+    max_age: int = 300
+
+
+class ProfileTokenSchema(Schema):
+    token: str
+    header: str
+    query_param: str
+    expires_in: int
+
+
+class RequestProfileSchema(Schema):
+    id: int
+    created_at: datetime
+    method: str
+    path: str
+    query_string: str
+    status_code: int
+    duration_ms: float
+    requested_by_id: Optional[int] = None
+    query_count: int
+    sql_ms: float
+
+
+class RequestProfileDetailSchema(RequestProfileSchema):
+    sql_breakdown: List[Dict[str, Any]]
+    summary: str
+
+
+PROFILE_COLUMNS = (
+    "id, created_at, method, path, query_string, status_code, duration_ms, "
+    "requested_by_id, query_count, sql_ms"
+)
+
+
+def _profile_rows(cursor) -> List[Dict[str, Any]]:
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+@router.post(
+    "/super-admin/profiles/token",
+    response={200: ProfileTokenSchema, 400: ErrorSchema, 401: ErrorSchema, 403: ErrorSchema},
+    summary="Create Request Profiling Token",
+    description=(
+        "Mint a signed token that profiles the next requests to one path. Send it as the "
+        "X-Profile-Token header or the __profile query parameter. Super Admin only."
+    ),
+)
+def create_profile_token(request, payload: ProfileTokenRequestSchema):
+    from core import profiling
+
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
+
+    if not is_super_admin(request.user):
+        return 403, {
+            "error": "Super admin access required",
+            "code": "SUPER_ADMIN_REQUIRED"
+        }
+
+    if not profiling.PROFILING_ENABLED:
+        return 400, {"error": "Profiling is disabled (set PROFILING_ENABLED=True)", "code": "PROFILING_DISABLED"}
+
+    max_age = min(max(payload.max_age, 1), 3600)
+    return 200, {
+        "token": profiling.make_profile_token(payload.path, request.user.id, max_age),
+        "header": profiling.PROFILE_HEADER,
+        "query_param": profiling.PROFILE_QUERY_PARAM,
+        "expires_in": max_age,
+    }
+
+
+@router.get(
+    "/super-admin/profiles",
+    response={200: List[RequestProfileSchema], 401: ErrorSchema, 403: ErrorSchema},
+    summary="List Request Profiles",
+    description="List stored request profiles, newest first. Super Admin only.",
+)
+def list_request_profiles(request, limit: int = 50):
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
+
+    if not is_super_admin(request.user):
+        return 403, {
+            "error": "Super admin access required",
+            "code": "SUPER_ADMIN_REQUIRED"
+        }
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            f"SELECT {PROFILE_COLUMNS} FROM request_profiles ORDER BY id DESC LIMIT %s",
+            [min(max(limit, 1), 200)],
+        )
+        return 200, _profile_rows(cursor)
+
+
+@router.get(
+    "/super-admin/profiles/{profile_id}",
+    response={200: RequestProfileDetailSchema, 401: ErrorSchema, 403: ErrorSchema, 404: ErrorSchema},
+    summary="Get Request Profile",
+    description="Get one profile with its SQL breakdown and top functions. Super Admin only.",
+)
+def get_request_profile(request, profile_id: int):
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
+
+    if not is_super_admin(request.user):
+        return 403, {
+            "error": "Super admin access required",
+            "code": "SUPER_ADMIN_REQUIRED"
+        }
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            f"SELECT {PROFILE_COLUMNS}, sql_breakdown, summary FROM request_profiles WHERE id = %s",
+            [profile_id],
+        )
+        rows = _profile_rows(cursor)
+    if not rows:
+        return 404, {"error": "Profile not found", "code": "PROFILE_NOT_FOUND"}
+    row = rows[0]
+    if isinstance(row['sql_breakdown'], str):
+        row['sql_breakdown'] = json.loads(row['sql_breakdown'])
+    return 200, row
+
+
+@router.get(
+    "/super-admin/profiles/{profile_id}/download",
+    response={401: ErrorSchema, 403: ErrorSchema, 404: ErrorSchema},
+    summary="Download Request Profile",
+    description=(
+        "Download a profile as a pstats dump (format=pstats, open with pstats or snakeviz) "
+        "or as collapsed stacks for flame graphs (format=collapsed). Super Admin only."
+    ),
+)
+def download_request_profile(request, profile_id: int, format: str = "pstats"):
+    if not request.user.is_authenticated:
+        return 401, {"error": "Not authenticated", "code": "NOT_AUTHENTICATED"}
+
+    if not is_super_admin(request.user):
+        return 403, {
+            "error": "Super admin access required",
+            "code": "SUPER_ADMIN_REQUIRED"
+        }
+
+    column = "collapsed_stacks" if format == "collapsed" else "pstats"
+    with connections['default'].cursor() as cursor:
+        cursor.execute(f"SELECT {column} FROM request_profiles WHERE id = %s", [profile_id])
+        row = cursor.fetchone()
+    if row is None:
+        return 404, {"error": "Profile not found", "code": "PROFILE_NOT_FOUND"}
+
+    if column == "pstats":
+        response = HttpResponse(bytes(row[0]), content_type="application/octet-stream")
+        response['Content-Disposition'] = f'attachment; filename="profile_{profile_id}.prof"'
+    else:
+        response = HttpResponse(row[0], content_type="text/plain; charset=utf-8")
+        response['Content-Disposition'] = f'attachment; filename="profile_{profile_id}.folded"'
+    return response
@@ -3,13 +3,12 @@ User management API endpoints.
 """
 
 import logging
-from datetime import timedelta
 from typing import List, Optional
 from django.contrib.auth import get_user_model
 from django.db import connection, transaction
 from django.db.models import ProtectedError
 from django.db.utils import DatabaseError, ProgrammingError
-from django.utils import timezone
+from django.http import HttpResponse
 from ninja import Router
 from ninja.errors import HttpError
 
@@ -24,6 +23,7 @@ from users.schemas import (
 )
 from core.permissions import is_admin
 from users.models import AuthToken, ActivityLog
+from users.services.session_summary import deactivate_dead_sessions, session_summary, with_live_sessions
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -160,11 +160,22 @@ def is_super_admin(user) -> bool:
     "/users",
     response={200: List[AdminUserWithSessionSchema], 401: ErrorSchema, 403: ErrorSchema},
     summary="List All Users",
-    description="Get list of all users. Super Admin only.",
+    description=(
+        "Get list of users with their live sessions. Super Admin only. "
+        "Pass page_size to paginate (the total is returned in X-Total-Count); "
+        "role and is_active filter the list."
+    ),
 )
-def list_users(request):
+def list_users(
+    request,
+    response: HttpResponse,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+):
     """
-    Get list of all users.
+    Get list of users with session info.
     Only accessible by super admin users.
     """
     if not request.user.is_authenticated:
@@ -173,62 +184,25 @@ def list_users(request):
     if not is_super_admin(request.user):
         return 403, {"error": "Super admin access required", "code": "SUPER_ADMIN_REQUIRED"}
     
-    users = User.objects.all().order_by('-date_joined')
-    
-    # Build enriched response with session info
+    users = User.objects.all().order_by('-date_joined', '-id')
+    if role:
+        users = users.filter(role=role.upper())
+    if is_active is not None:
+        users = users.filter(is_active=is_active)
+
+    if page_size:
+        page_size = min(max(page_size, 1), 200)
+        page = max(page, 1)
+        response['X-Total-Count'] = str(users.count())
+        users = users[(page - 1) * page_size:page * page_size]
+
+    # Close expired and non-heartbeating sessions so they don't count toward device limit
+    deactivate_dead_sessions()
+
     result = []
-    for user in users:
+    for user in with_live_sessions(users):
         user_data = AdminUserResponseSchema.model_validate(user).model_dump()
-        
-        # Get active session info
-        active_tokens = AuthToken.objects.filter(
-            user=user, is_active=True
-        ).order_by('-created_at')
-        
-        # Filter out expired and stale sessions (last_used_at > 15 sec ago)
-        # and auto-deactivate them so they don't count toward device limit
-        stale_cutoff = timezone.now() - timedelta(seconds=15)
-        valid_tokens = []
-        for t in active_tokens:
-            if t.is_expired:
-                t.is_active = False
-                t.save(update_fields=['is_active'])
-            elif t.last_used_at and t.last_used_at < stale_cutoff:
-                # Session hasn't sent a heartbeat in 3+ minutes — consider dead
-                t.is_active = False
-                t.save(update_fields=['is_active'])
-            else:
-                valid_tokens.append(t)
-        
-        if valid_tokens:
-            user_data['is_online'] = True
-            # For backward compatibility, populate main fields from the most recent one
-            first_token = valid_tokens[0]
-            user_data['session_ip'] = first_token.ip_address or ''
-            user_data['session_device'] = first_token.device_info or ''
-            user_data['session_created_at'] = first_token.created_at.isoformat() if first_token.created_at else None
-            user_data['session_last_used'] = first_token.last_used_at.isoformat() if first_token.last_used_at else None
-            
-            # Populate array for modal display
-            user_data['active_sessions'] = []
-            for t in valid_tokens:
-                user_data['active_sessions'].append({
-                    'session_id': t.id,
-                    'token_created_at': t.created_at,
-                    'last_used_at': t.last_used_at,
-                    'ip_address': t.ip_address or '',
-                    'device_info': t.device_info or '',
-                    'device_name': t.device_name or '',
-                    'is_active': t.is_active
-                })
-        else:
-            user_data['is_online'] = False
-            user_data['session_ip'] = ''
-            user_data['session_device'] = ''
-            user_data['session_created_at'] = None
-            user_data['session_last_used'] = None
-            user_data['active_sessions'] = []
-        
+        user_data.update(session_summary(user))
         result.append(user_data)
     
     return 200, result
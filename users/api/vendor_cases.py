@@ -15,6 +15,12 @@ from django.http import HttpRequest
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
+from core.admission import admission_limit
+from core.api_cache import cached_endpoint, skip_caching
+from core.conditional import conditional_get
+from core.fieldsets import Resource, parse_fieldset, schema_fields, sparse_response
+from users.services import geocoding
+from users.services.event_bus import publish_check_status
 from users.services.speech_statement_service import get_speech_service
 
 logger = logging.getLogger(__name__)
@@ -22,7 +28,6 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 router = Router(tags=["Vendor Cases"])
 
-
 # =============================================================================
 # Schemas
 # =============================================================================
@@ -68,6 +73,13 @@ class VendorCasesListResponse(Schema):
     statistics: dict
 
 
+# Sparse fieldsets (?fields=, see core/fieldsets.py); limited to what CaseSchema exposes.
+VENDOR_CASE_FIELDS = Resource(
+    'vendor cases', tables=('insurance_case',), alias='ic', computed=('assigned_vendor_id', 'assigned_vendor'),
+    allowed=schema_fields(CaseSchema),
+)
+
+
 class ApiErrorSchema(Schema):
     """Generic API error response."""
     error: str
@@ -120,6 +132,14 @@ def get_vendor_ids_from_user(user):
     return tuple(ids)
 
 
+def _vendor_cache_tags(request: HttpRequest, **kwargs):
+    """One tag per vendor id of the requesting vendor user; None (no caching) for anyone else."""
+    if not request.user.is_authenticated or request.user.role not in ('VENDOR', 'ADVOCATE'):
+        return None
+    vendor_ids = get_vendor_ids_from_user(request.user)
+    return [f"vendor:{vendor_id}" for vendor_id in vendor_ids] or None
+
+
 def _vendor_assignment_where_clause(vendor_ids, column_name: str = "assigned_vendor_id"):
     """Build a SQL WHERE fragment for one or more vendor identifiers."""
     if not vendor_ids:
@@ -156,7 +176,7 @@ def get_vendor_assigned_case_numbers(cursor, vendor_ids) -> List[str]:
             SELECT COALESCE(c.case_number, icase.case_number) AS case_number
             FROM {table} t
             LEFT JOIN cases c ON c.id = t.case_id
-            LEFT JOIN insurance_case icase ON icase.id = t.case_id
+            LEFT JOIN insurance_case icase ON icase.id = c.insurance_case_id
             WHERE {where_clause}
               AND COALESCE(c.case_number, icase.case_number) IS NOT NULL
               AND COALESCE(c.case_number, icase.case_number) <> ''
@@ -187,7 +207,7 @@ def vendor_has_case_assignment(cursor, vendor_ids, case_number: str) -> bool:
             SELECT 1
             FROM {table} t
             LEFT JOIN cases c ON c.id = t.case_id
-            LEFT JOIN insurance_case icase ON icase.id = t.case_id
+            LEFT JOIN insurance_case icase ON icase.id = c.insurance_case_id
             WHERE {where_clause}
               AND (c.case_number = %s OR icase.case_number = %s)
             LIMIT 1
@@ -454,6 +474,7 @@ def get_vendor_cases(
     page_size: int = 20,
     status: Optional[str] = None,
     search: Optional[str] = None,
+    fields: Optional[str] = None,
 ):
     """
     Get all cases assigned to the authenticated vendor.
@@ -461,6 +482,9 @@ def get_vendor_cases(
     Filters:
     - status: Filter by case status (OPEN, IN_PROGRESS, RESOLVED, CLOSED)
     - search: Search in title, description, case_number, claim_number
+
+    ``fields`` limits each case to the named CaseSchema fields; see
+    core/fieldsets.py.
     """
     if not request.user.is_authenticated:
         return 401, {"error": "Not authenticated"}
@@ -471,6 +495,8 @@ def get_vendor_cases(
     vendor_ids = get_vendor_ids_from_user(request.user)
     if not vendor_ids:
         return 403, {"error": "Vendor profile not found"}
+
+    selection = parse_fieldset(VENDOR_CASE_FIELDS, fields)
     
     try:
         with connection.cursor() as cursor:
@@ -516,7 +542,7 @@ def get_vendor_cases(
             offset = (page - 1) * page_size
             data_query = f"""
                 SELECT
-                    ic.*,
+                    {selection.select_sql()},
                     ic.vendor_id AS assigned_vendor_id,
                     v.company_name AS assigned_vendor
                 FROM insurance_case ic
@@ -549,6 +575,13 @@ def get_vendor_cases(
                 'closed': stats_row[4] or 0,
             }
             
+            if selection.sparse:
+                return sparse_response({
+                    "cases": [selection.project(case) for case in cases],
+                    "total": total,
+                    "statistics": statistics,
+                })
+            
             return {
                 "cases": cases,
                 "total": total,
@@ -713,15 +746,16 @@ _CHECK_TYPE_LABELS = {
     summary="Get Vendor's Assigned Checks",
     description="Get all sub-checks assigned to the authenticated vendor across all cases.",
 )
+@cached_endpoint('vendor_assigned_checks', ttl=120, tags=_vendor_cache_tags)
 def get_vendor_assigned_checks(request: HttpRequest):
     """Return all sub-check rows where assigned_vendor_id matches the logged-in vendor."""
-    logger.info(f"vendor-assigned-checks called, user authenticated: {request.user.is_authenticated}")
+    logger.debug("vendor-assigned-checks called, user authenticated: %s", request.user.is_authenticated)
     if not request.user.is_authenticated:
         logger.warning("vendor-assigned-checks: User not authenticated")
         return 401, {"error": "Not authenticated"}
-    logger.info(f"vendor-assigned-checks: User role = {request.user.role}")
+    logger.debug("vendor-assigned-checks: User role = %s", request.user.role)
     if request.user.role not in ('VENDOR', 'ADVOCATE'):
-        logger.warning(f"vendor-assigned-checks: Non-vendor/advocate role: {request.user.role}")
+        logger.warning("vendor-assigned-checks: Non-vendor/advocate role: %s", request.user.role)
         return 403, {"error": "Vendor access required"}
 
     vendor_ids = get_vendor_ids_from_user(request.user)
@@ -754,7 +788,7 @@ def get_vendor_assigned_checks(request: HttpRequest):
                                {adv_select}
                         FROM {table} {alias}
                         LEFT JOIN cases c ON c.id = {alias}.case_id
-                        LEFT JOIN insurance_case icase ON icase.id = {alias}.case_id
+                        LEFT JOIN insurance_case icase ON icase.id = c.insurance_case_id
                         WHERE {where_clause}
                         ORDER BY {alias}.id DESC
                     """, where_params)
@@ -781,6 +815,7 @@ def get_vendor_assigned_checks(request: HttpRequest):
                         })
                 except Exception as table_err:
                     logger.warning(f"Skipping table '{table}' in vendor-assigned-checks: {table_err}")
+                    skip_caching(request)
                     continue
 
         # Sort all checks by updated_at / created_at descending (latest first)
@@ -802,12 +837,44 @@ def get_vendor_assigned_checks(request: HttpRequest):
         return 500, {"error": "Failed to fetch assigned checks"}
 
 
+def _vendor_check_version(request: HttpRequest, key_column: str, key: int, check_type: str):
+    """data_version of the case owning a check assigned to the requesting vendor, else None."""
+    if not request.user.is_authenticated or request.user.role not in ('VENDOR', 'ADVOCATE'):
+        return None
+    table = _CHECK_TABLE_MAP.get(check_type.lower())
+    vendor_ids = get_vendor_ids_from_user(request.user)
+    if not table or not vendor_ids:
+        return None
+    where_vendor, vendor_params = _vendor_assignment_where_clause(vendor_ids, "t.assigned_vendor_id")
+    with connections['default'].cursor() as cursor:
+        cursor.execute(f"""
+            SELECT c.data_version
+            FROM {table} t
+            JOIN cases c ON c.id = t.case_id
+            WHERE t.{key_column} = %s AND {where_vendor}
+            ORDER BY t.id
+            LIMIT 1
+        """, [key, *vendor_params])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _vendor_check_detail_version(request: HttpRequest, case_id: int, check_type: str):
+    return _vendor_check_version(request, "case_id", case_id, check_type)
+
+
+def _vendor_check_detail_by_id_version(request: HttpRequest, check_id: int, check_type: str):
+    return _vendor_check_version(request, "id", check_id, check_type)
+
+
 @router.get(
     "/vendor-check-detail/{case_id}/{check_type}",
     response={200: dict, 400: ApiErrorSchema, 401: ApiErrorSchema, 403: ApiErrorSchema, 404: ApiErrorSchema, 500: ApiErrorSchema},
     summary="Get Vendor Check Detail",
     description="Get case details + specific check details for a vendor-assigned check.",
 )
+@conditional_get(_vendor_check_detail_version)
+@cached_endpoint('vendor_check_detail', ttl=300, tags=_vendor_cache_tags)
 def get_vendor_check_detail(request: HttpRequest, case_id: int, check_type: str):
     """Return case info + check row detail for a specific assigned check."""
     if not request.user.is_authenticated:
@@ -881,9 +948,7 @@ def get_vendor_check_detail(request: HttpRequest, case_id: int, check_type: str)
             check_detail = {}
             for i, field in enumerate(meta['fields']):
                 val = check_row[i]
-                if hasattr(val, 'isoformat'):
-                    val = val.isoformat()
-                
+
                 # Parse questionnaire if it's a string
                 if field == 'questionnaire' and isinstance(val, str):
                     try:
@@ -991,6 +1056,8 @@ def get_vendor_check_detail(request: HttpRequest, case_id: int, check_type: str)
     summary="Get Vendor Check Detail By Check ID",
     description="Get case details + specific check details for a vendor-assigned check using check_id.",
 )
+@conditional_get(_vendor_check_detail_by_id_version)
+@cached_endpoint('vendor_check_detail_by_id', ttl=300, tags=_vendor_cache_tags)
 def get_vendor_check_detail_by_id(request: HttpRequest, check_id: int, check_type: str):
     """Return case info + check row detail for a specific assigned check using check_id."""
     if not request.user.is_authenticated:
@@ -1035,8 +1102,6 @@ def get_vendor_check_detail_by_id(request: HttpRequest, check_id: int, check_typ
             check_detail = {}
             for i, field in enumerate(meta['fields']):
                 val = check_row[i]
-                if hasattr(val, 'isoformat'):
-                    val = val.isoformat()
                 if field == 'questionnaire' and isinstance(val, str):
                     try:
                         val = json.loads(val)
@@ -1220,7 +1285,13 @@ def _evaluate_and_update_check_status(cursor, table: str, check_id: int, check_t
     if has_evidence and statement_done and not has_mismatch:
         new_status = 'Closed'
         
-    cursor.execute(f"UPDATE {table} SET check_status = %s, updated_at = NOW() WHERE id = %s", [new_status, check_id])
+    cursor.execute(
+        f"UPDATE {table} SET check_status = %s, updated_at = NOW() WHERE id = %s RETURNING case_id, assigned_vendor_id",
+        [new_status, check_id],
+    )
+    updated = cursor.fetchone()
+    if updated:
+        publish_check_status(updated[0], check_type, new_status, vendor_id=updated[1])
 
 @router.post(
     "/vendor-check-upload/{case_id}/{check_type}",
@@ -1228,6 +1299,7 @@ def _evaluate_and_update_check_status(cursor, table: str, check_id: int, check_t
     summary="Upload Evidence to Check",
     description="Upload evidence photo and store path in the check's vendor_evidence column.",
 )
+@admission_limit('evidence_upload')
 def vendor_check_upload_evidence(request: HttpRequest, case_id: int, check_type: str):
     """Upload evidence photo for a vendor-assigned check."""
     if not request.user.is_authenticated:
@@ -1343,20 +1415,15 @@ def vendor_check_upload_evidence(request: HttpRequest, case_id: int, check_type:
         photo_url = f'/media/{relative_path}'
         address_text = f"{latitude}, {longitude}"
         try:
-            from geopy.geocoders import ArcGIS, Nominatim
-            # Try ArcGIS first for high accuracy
-            geolocator = ArcGIS(timeout=5)
-            location = geolocator.reverse((latitude, longitude))
-            if location and location.address:
-                address_text = f"{location.address} ({latitude}, {longitude})"
-            else:
-                # Fallback to Nominatim
-                nom = Nominatim(user_agent="IncidentMgmtPlatform/1.0", timeout=5)
-                location = nom.reverse((latitude, longitude))
-                if location and location.address:
-                    address_text = f"{location.address} ({latitude}, {longitude})"
+            # Try ArcGIS first for high accuracy, then fall back to Nominatim
+            address = (
+                geocoding.arcgis_reverse(latitude, longitude, timeout=5)
+                or geocoding.nominatim_reverse(latitude, longitude, timeout=5)
+            )
+            if address:
+                address_text = f"{address} ({latitude}, {longitude})"
         except Exception as e:
-            logger.warning(f"Reverse geocode failed: {e}")
+            logger.warning("Reverse geocode failed: %s", e)
 
         evidence_entry = {
             "filename": filename,
@@ -1553,7 +1620,7 @@ def vendor_check_status_update(request: HttpRequest, case_id: int, check_type: s
         with connections['default'].cursor() as cursor:
             where_vendor, vendor_params = _vendor_assignment_where_clause(vendor_ids, "assigned_vendor_id")
             cursor.execute(
-                f"SELECT id FROM {table} WHERE case_id = %s AND {where_vendor}",
+                f"SELECT id, assigned_vendor_id FROM {table} WHERE case_id = %s AND {where_vendor}",
                 [case_id, *vendor_params],
             )
             row = cursor.fetchone()
@@ -1571,6 +1638,7 @@ def vendor_check_status_update(request: HttpRequest, case_id: int, check_type: s
                     f"UPDATE {table} SET check_status = %s, updated_at = NOW() WHERE id = %s",
                     [db_status, check_id],
                 )
+            publish_check_status(case_id, check_type.lower(), db_status, vendor_id=row[1])
     except Exception as e:
         logger.error(f"Failed to update check_status for case_id={case_id} check_type={check_type}: {e}", exc_info=True)
         return 500, {"error": "Failed to update check status"}
@@ -2570,6 +2638,7 @@ def _update_final_statement_column(
     summary="Preview Statement Audio Transcription",
     description="Upload Marathi audio, transcribe, and translate to English. Does NOT update the final statement.",
 )
+@admission_limit('statement_audio')
 def vendor_check_statement_audio_preview(request: HttpRequest, case_id: int, check_type: str):
     """
     Process audio recording and return preview of transcript/translation.
@@ -2685,6 +2754,7 @@ def vendor_check_statement_audio_preview(request: HttpRequest, case_id: int, che
     summary="Apply Statement Audio Transcription",
     description="Upload Marathi audio, transcribe, translate, and save to the case statement field.",
 )
+@admission_limit('statement_audio')
 def vendor_check_statement_audio_apply(request: HttpRequest, case_id: int, check_type: str):
     """
     Process audio recording and apply translation to the case statement.
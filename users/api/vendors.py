@@ -20,6 +20,7 @@ from users.schemas import (
     MessageSchema,
 )
 from core.permissions import is_super_admin
+from users.services.vendor_locator import invalidate_vendor_locator
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -173,6 +174,7 @@ def create_vendor(request, payload: VendorCreateSchema):
             )
             
             logger.info(f"New vendor '{vendor.company_name}' created by Super Admin {request.user.username}")
+            invalidate_vendor_locator()
             
             return 201, VendorResponseSchema.from_orm_with_user(vendor)
             
@@ -285,6 +287,7 @@ def update_vendor(request, vendor_id: int, payload: VendorUpdateSchema):
                 user.save()
             
             logger.info(f"Vendor '{vendor.company_name}' updated by Super Admin {request.user.username}")
+            invalidate_vendor_locator()
             
             return 200, VendorResponseSchema.from_orm_with_user(vendor)
             
@@ -325,6 +328,7 @@ def activate_vendor(request, vendor_id: int):
         vendor.user.save(update_fields=['is_active'])
     
     logger.info(f"Vendor '{vendor.company_name}' activated by Super Admin {request.user.username}")
+    invalidate_vendor_locator()
     
     return 200, VendorResponseSchema.from_orm_with_user(vendor)
 
@@ -362,6 +366,7 @@ def deactivate_vendor(request, vendor_id: int):
         vendor.user.save(update_fields=['is_active'])
     
     logger.info(f"Vendor '{vendor.company_name}' deactivated by Super Admin {request.user.username}")
+    invalidate_vendor_locator()
     
     return 200, VendorResponseSchema.from_orm_with_user(vendor)
 
@@ -396,5 +401,6 @@ def delete_vendor(request, vendor_id: int):
         user.delete()
     
     logger.info(f"Vendor '{company_name}' deleted by Super Admin {request.user.username}")
+    invalidate_vendor_locator()
     
     return 200, {"message": f"Vendor '{company_name}' deleted successfully"}
@@ -22,6 +22,7 @@ from users.models_verification import (
     ClaimantDependent
 )
 from users.models import InsuranceCase
+from users.services.case_identity import get_incident_case_id, get_insurance_case_id, link_case_identity
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +51,7 @@ def _resolve_insurance_case(case_id: int, incident_case_db_id: Optional[int], re
 
     Case creation writes the incident `cases` row first. If the secondary
     `insurance_case` write fails, the API can still return the incident id; this
-    resolver maps that id back by case_number and recreates the minimal ORM row
+    resolver maps that id back through cases.insurance_case_id and recreates the minimal ORM row
     so verification rows can be created instead of losing the selected checks.
     """
     try:
@@ -105,12 +106,13 @@ def _resolve_insurance_case(case_id: int, incident_case_db_id: Optional[int], re
             special_instructions,
         ) = row
 
-        case = InsuranceCase.objects.filter(case_number=case_number).first()
+        linked_id = get_insurance_case_id(incident_id)
+        case = InsuranceCase.objects.filter(id=linked_id).first() if linked_id else None
         if case:
             return case
 
         try:
-            return InsuranceCase.objects.create(
+            case = InsuranceCase.objects.create(
                 case_number=case_number,
                 title=f"Case {claim_number or case_number} - {client_name or 'New Case'}",
                 description="",
@@ -135,6 +137,8 @@ def _resolve_insurance_case(case_id: int, incident_case_db_id: Optional[int], re
                 workflow_type="STANDARD",
                 investigation_progress=0,
             )
+            link_case_identity(incident_id, case.id)
+            return case
         except Exception as create_err:
             logger.error(
                 f"Failed to recreate ORM case for incident case {incident_id} ({case_number}): {create_err}",
@@ -637,15 +641,14 @@ def upload_verification_documents(
         table = _TYPE_TO_TABLE.get(verification.verification_type)
         if table and uploaded_docs:
             try:
-                case_number = verification.case.case_number
+                incident_case_id = get_incident_case_id(verification.case_id)
                 with connections['default'].cursor() as cursor:
                     cursor.execute(f"""
                         SELECT ct.id, ct.case_documents
                         FROM {table} ct
-                        JOIN cases c ON c.id = ct.case_id
-                        WHERE c.case_number = %s
+                        WHERE ct.case_id = %s
                         LIMIT 1
-                    """, [case_number])
+                    """, [incident_case_id])
                     row = cursor.fetchone()
                     if row:
                         check_id = row[0]
@@ -66,30 +66,30 @@ class SessionOrTokenAuth:
     def __call__(self, request: HttpRequest) -> Optional[Any]:
         # First check if user is authenticated via session
         if request.user and request.user.is_authenticated:
-            logger.info(f"Session auth success for user: {request.user.username}")
+            logger.debug("Session auth success for user: %s", request.user.username)
             return request.user
 
         # Then check for Bearer token
         auth_header = request.headers.get('Authorization', '')
         if auth_header.startswith('Bearer '):
             token = auth_header[7:]
-            logger.info(f"Bearer token received, length: {len(token)}")
+            logger.debug("Bearer token received, length: %d", len(token))
             try:
                 token_obj = AuthToken.objects.select_related('user').get(token=token)
 
                 # Check if token is deactivated (logged out)
                 if not token_obj.is_active:
-                    logger.warning(f"Token deactivated for user: {token_obj.user.username}")
+                    logger.warning("Token deactivated for user: %s", token_obj.user.username)
                     return None
 
                 if token_obj.is_expired:
-                    logger.warning(f"Token expired for user: {token_obj.user.username}")
+                    logger.warning("Token expired for user: %s", token_obj.user.username)
                     token_obj.is_active = False
                     token_obj.save(update_fields=['is_active'])
                     return None
 
                 if not token_obj.user.is_active:
-                    logger.warning(f"User inactive: {token_obj.user.username}")
+                    logger.warning("User inactive: %s", token_obj.user.username)
                     return None
 
                 # Update last used
@@ -97,14 +97,14 @@ class SessionOrTokenAuth:
                 token_obj.save(update_fields=['last_used_at'])
 
                 request.user = token_obj.user
-                logger.info(f"Token auth success for user: {token_obj.user.username}, role: {token_obj.user.role}")
+                logger.debug("Token auth success for user: %s, role: %s", token_obj.user.username, token_obj.user.role)
                 return token_obj.user
 
             except AuthToken.DoesNotExist:
-                logger.warning(f"Token not found in database: {token[:8]}...")
+                logger.warning("Token not found in database: %s...", token[:8])
                 return None
         else:
-            logger.info(f"No Bearer token in Authorization header: '{auth_header[:30] if auth_header else 'empty'}'")
+            logger.debug("No Bearer token in Authorization header: '%s'", auth_header[:30] or 'empty')
 
         return None
 
@@ -24,10 +24,10 @@ import json
 import logging
 import re
 import threading
-import urllib.request
-import urllib.parse
 from django.db import connections
 
+from users.services import geocoding
+
 logger = logging.getLogger(__name__)
 
 DB_ALIAS = 'default'
@@ -54,18 +54,16 @@ def _get_cursor():
 
 def _arcgis_query(query: str):
     """
-    Single ArcGIS API call via geopy. Returns (lat, lng) or (None, None).
+    Single ArcGIS API call. Returns (lat, lng) or (None, None).
     """
     if not query or not query.strip():
         return None, None
     try:
-        from geopy.geocoders import ArcGIS
-        geolocator = ArcGIS(timeout=10)
-        location = geolocator.geocode(query.strip())
-        if location:
-            return location.latitude, location.longitude
+        coordinates = geocoding.arcgis_geocode(query.strip())
+        if coordinates:
+            return coordinates
     except Exception as e:
-        logger.debug(f'[geocode] ArcGIS call failed for "{query[:60]}": {e}')
+        logger.debug('[geocode] ArcGIS call failed for "%s": %s', query[:60], e)
     return None, None
 
 
@@ -76,21 +74,12 @@ def _nominatim_query(query: str):
     """
     if not query or not query.strip():
         return None, None
-    params = urllib.parse.urlencode({
-        'q': query.strip(),
-        'format': 'json',
-        'limit': 1,
-        'countrycodes': 'in',
-    })
-    url = f'https://nominatim.openstreetmap.org/search?{params}'
-    req = urllib.request.Request(url, headers={'User-Agent': 'IncidentMgmtPlatform/1.0'})
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-        if data:
-            return float(data[0]['lat']), float(data[0]['lon'])
+        coordinates = geocoding.nominatim_search(query.strip(), country_codes='in')
+        if coordinates:
+            return coordinates
     except Exception as e:
-        logger.debug(f'[geocode] Nominatim call failed for "{query[:60]}": {e}')
+        logger.debug('[geocode] Nominatim call failed for "%s": %s', query[:60], e)
     return None, None
 
 
@@ -108,13 +97,13 @@ def _geocode(address: str):
     # --- Strategy 0: ArcGIS High-Accuracy --------------------------------------
     lat, lng = _arcgis_query(address)
     if lat is not None:
-        logger.info(f'[geocode] Strategy-ArcGIS success: ({lat},{lng}) for "{address[:60]}"')
+        logger.debug('[geocode] Strategy-ArcGIS success: (%s,%s) for "%s"', lat, lng, address[:60])
         return lat, lng
 
     # --- Strategy 1: Nominatim full address ------------------------------------
     lat, lng = _nominatim_query(address)
     if lat is not None:
-        logger.info(f'[geocode] Strategy-1 (Nominatim) success: ({lat},{lng}) for "{address[:60]}"')
+        logger.debug('[geocode] Strategy-1 (Nominatim) success: (%s,%s) for "%s"', lat, lng, address[:60])
         return lat, lng
 
     # --- Strategy 2: strip Indian address noise --------------------------------
@@ -133,7 +122,7 @@ def _geocode(address: str):
     if cleaned and cleaned != address:
         lat, lng = _nominatim_query(cleaned)
         if lat is not None:
-            logger.info(f'[geocode] Strategy-2 (cleaned) success: ({lat},{lng})')
+            logger.debug('[geocode] Strategy-2 (cleaned) success: (%s,%s)', lat, lng)
             return lat, lng
 
     # --- Strategy 3 & 4: last N comma-separated parts -------------------------
@@ -143,7 +132,7 @@ def _geocode(address: str):
             candidate = ', '.join(parts[-n:])
             lat, lng = _nominatim_query(candidate)
             if lat is not None:
-                logger.info(f'[geocode] Strategy-last{n} success: ({lat},{lng}) for "{candidate}"')
+                logger.debug('[geocode] Strategy-last%d success: (%s,%s) for "%s"', n, lat, lng, candidate)
                 return lat, lng
 
     # --- Strategy 5: Indian 6-digit PIN code ----------------------------------
@@ -151,7 +140,7 @@ def _geocode(address: str):
     if pincode_match:
         lat, lng = _nominatim_query(f'{pincode_match.group()}, India')
         if lat is not None:
-            logger.info(f'[geocode] Strategy-pincode success: ({lat},{lng}) for pin={pincode_match.group()}')
+            logger.debug('[geocode] Strategy-pincode success: (%s,%s) for pin=%s', lat, lng, pincode_match.group())
             return lat, lng
 
     # --- Strategy 6: last 2 parts (city + state) ------------------------------
@@ -159,10 +148,10 @@ def _geocode(address: str):
         candidate = ', '.join(parts[-2:])
         lat, lng = _nominatim_query(candidate)
         if lat is not None:
-            logger.info(f'[geocode] Strategy-last2 success: ({lat},{lng}) for "{candidate}"')
+            logger.debug('[geocode] Strategy-last2 success: (%s,%s) for "%s"', lat, lng, candidate)
             return lat, lng
 
-    logger.warning(f'[geocode] All strategies failed for: "{address[:80]}"')
+    logger.warning('[geocode] All strategies failed for: "%s"', address[:80])
     return None, None
 
 
@@ -184,9 +173,9 @@ def _geocode_and_update(table: str, row_id: int, lat_col: str, lng_col: str, add
                     f'UPDATE {table} SET {lat_col}=%s, {lng_col}=%s WHERE id=%s',
                     [lat, lng, row_id]
                 )
-            logger.info(f'[geocode] Updated {table} id={row_id} → ({lat},{lng})')
+            logger.info('[geocode] Updated %s id=%s → (%s,%s)', table, row_id, lat, lng)
         except Exception as e:
-            logger.warning(f'[geocode] Failed to update {table} id={row_id}: {e}')
+            logger.warning('[geocode] Failed to update %s id=%s: %s', table, row_id, e)
 
     t = threading.Thread(target=_worker, daemon=True, name=f'geocode-{table}-{row_id}')
     t.start()
@@ -0,0 +1,34 @@
+"""
+Management command to move old, read vendor notifications out of the hot table.
+Run with: python manage.py archive_vendor_notifications --days 90
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.services.notification_service import archive_read_notifications
+
+
+class Command(BaseCommand):
+    help = 'Archive read vendor notifications older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Archive read notifications older than this many days (default: 90)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows moved per transaction (default: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        days = max(options['days'], 1)
+        batch_size = max(options['batch_size'], 1)
+
+        self.stdout.write(f"Archiving read notifications older than {days} days...")
+        moved = archive_read_notifications(older_than_days=days, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"\nDone. Archived {moved} notifications."))
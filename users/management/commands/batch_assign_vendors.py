@@ -0,0 +1,58 @@
+"""
+Management command to batch-assign vendors to every unassigned check.
+Run with: python manage.py batch_assign_vendors [--apply]
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from users.services.batch_assignment import (
+    DEFAULT_MAX_DISTANCE_KM,
+    DEFAULT_MAX_OPEN_CHECKS,
+    DEFAULT_SOLVER,
+    SOLVERS,
+    run_batch_assignment,
+)
+
+
+class Command(BaseCommand):
+    help = 'Plan (and optionally apply) a batch vendor assignment for unassigned checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--apply',
+            action='store_true',
+            help='Write the assignments and send notifications (default: dry run preview)'
+        )
+        parser.add_argument(
+            '--check-type',
+            action='append',
+            dest='check_types',
+            help='Restrict to a check type (repeatable): claimant, insured, driver, spot, chargesheet, rti, rto'
+        )
+        parser.add_argument('--max-open-checks', type=int, default=DEFAULT_MAX_OPEN_CHECKS)
+        parser.add_argument('--max-distance-km', type=float, default=DEFAULT_MAX_DISTANCE_KM)
+        parser.add_argument(
+            '--solver',
+            choices=SOLVERS,
+            default=DEFAULT_SOLVER,
+            help='exact min-cost assignment (default) or the faster greedy fallback'
+        )
+
+    def handle(self, *args, **options):
+        result = run_batch_assignment(
+            dry_run=not options['apply'],
+            check_types=options.get('check_types'),
+            max_open_checks=options['max_open_checks'],
+            max_distance_km=options['max_distance_km'],
+            solver=options['solver'],
+        )
+        preview = result.pop('preview', None)
+        self.stdout.write(json.dumps(result, indent=2))
+        if preview is not None:
+            self.stdout.write(self.style.WARNING(
+                f"\nDry run: {len(preview)} assignments planned, nothing written. Use --apply to commit."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\nDone. Applied {result.get('applied', 0)} assignments."))
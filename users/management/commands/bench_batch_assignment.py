@@ -0,0 +1,91 @@
+"""
+Benchmark for the batch assignment solvers on synthetic data (no database writes).
+Solves the same instance with the exact min-cost flow and the greedy fallback
+and reports each solver's time, plan summary and the gap between them.
+Run with: python manage.py bench_batch_assignment --checks 5000 --vendors 500
+"""
+
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services.batch_assignment import SOLVERS, PendingCheck, solve_assignment
+from users.services.vendor_locator import CHECK_TABLES, VendorLocator, VendorPoint
+
+
+class Command(BaseCommand):
+    help = 'Time index build and both solvers for N synthetic checks x M synthetic vendors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=5000)
+        parser.add_argument('--vendors', type=int, default=500)
+        parser.add_argument('--max-open-checks', type=int, default=25)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Points spread over India's bounding box.
+        vendors = [
+            VendorPoint(i, f'Vendor {i}', rng.uniform(8.0, 35.0), rng.uniform(68.0, 97.0), '', '')
+            for i in range(1, options['vendors'] + 1)
+        ]
+        check_types = list(CHECK_TABLES)
+        checks = [
+            PendingCheck(
+                check_type=rng.choice(check_types),
+                check_id=i,
+                case_id=i // 7 + 1,
+                case_number=f'BENCH-{i // 7 + 1:05d}',
+                latitude=rng.uniform(8.0, 35.0),
+                longitude=rng.uniform(68.0, 97.0),
+            )
+            for i in range(1, options['checks'] + 1)
+        ]
+        current_load = {
+            vendor.id: {rng.choice(check_types): rng.randint(0, 5)} for vendor in vendors
+        }
+
+        build_times = []
+        solve_times = {solver: [] for solver in SOLVERS}
+        plans = {}
+        for _ in range(max(options['repeat'], 1)):
+            started = time.perf_counter()
+            locator = VendorLocator(vendors)
+            build_times.append(time.perf_counter() - started)
+
+            for solver in SOLVERS:
+                started = time.perf_counter()
+                plans[solver] = solve_assignment(
+                    checks, locator, current_load, max_open_checks=options['max_open_checks'], solver=solver,
+                )
+                solve_times[solver].append(time.perf_counter() - started)
+
+        summaries = {solver: plan.summary() for solver, plan in plans.items()}
+        exact, greedy = summaries['exact'], summaries['greedy']
+        result = {
+            'checks': len(checks),
+            'vendors': len(vendors),
+            'index_build_ms_best': round(min(build_times) * 1000, 2),
+            **{
+                solver: {
+                    'solve_ms_best': round(min(solve_times[solver]) * 1000, 2),
+                    'solve_ms_worst': round(max(solve_times[solver]) * 1000, 2),
+                    **summaries[solver],
+                }
+                for solver in SOLVERS
+            },
+            # Greedy relative to the exact optimum: fewer checks placed, and extra cost when
+            # both place the same number (costs of different-sized plans are not comparable).
+            'greedy_gap': {
+                'fewer_assigned': exact['assigned'] - greedy['assigned'],
+                'extra_cost': round(greedy['total_cost'] - exact['total_cost'], 3),
+                'extra_cost_pct': (
+                    round(100 * (greedy['total_cost'] - exact['total_cost']) / exact['total_cost'], 2)
+                    if exact['total_cost'] and exact['assigned'] == greedy['assigned'] else None
+                ),
+            },
+        }
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,149 @@
+"""
+Benchmark for database connection reuse and read-replica offloading.
+
+Two phases, each with --threads threads running --queries queries:
+1. connect: a cheap query on a fresh connection every time (connection
+   closed after each query) versus a reused connection (persistent or pooled,
+   whatever the settings configure for 'default').
+2. contention: a heavy reporting read (the dashboard status aggregate) while
+   --writers threads keep bumping case rows on the primary. Runs once against
+   'default' and, when DB_REPLICA_HOST is configured, once against 'replica'.
+
+The only writes are data_version bumps on existing cases (and the cache tag
+versions their triggers bump). Prints latency percentiles as JSON.
+
+Run with: python manage.py bench_db_connections --threads 8 --queries 200 --writers 4
+"""
+
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.db_routing import REPLICA_ALIAS, replica_configured
+
+HEAVY_READ_SQL = """
+    SELECT c.status, COUNT(*), COUNT(DISTINCT c.client_name)
+    FROM cases c
+    LEFT JOIN claimant_checks cc ON cc.case_id = c.id
+    GROUP BY c.status
+"""
+
+
+def _summary(latencies, wall):
+    ordered = sorted(latencies)
+
+    def _pct(pct):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2) if ordered else None
+
+    return {
+        'queries': len(ordered),
+        'wall_seconds': round(wall, 3),
+        'queries_per_second': round(len(ordered) / wall, 1) if wall else None,
+        'ms_p50': _pct(0.50),
+        'ms_p95': _pct(0.95),
+        'ms_p99': _pct(0.99),
+        'ms_mean': round(statistics.mean(ordered) * 1000, 2) if ordered else None,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare fresh versus reused connections and primary versus replica reads under write load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--queries', type=int, default=200, help='Queries per thread (default: 200)')
+        parser.add_argument('--writers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        threads = max(options['threads'], 1)
+        queries = max(options['queries'], 1)
+        writers = max(options['writers'], 0)
+
+        results = {
+            'connect': {
+                'fresh': self._run_readers('default', threads, queries, 'SELECT 1', reconnect=True),
+                'reused': self._run_readers('default', threads, queries, 'SELECT 1', reconnect=False),
+            },
+            'contention': {},
+        }
+        heavy_queries = max(queries // 10, 1)
+        aliases = ['default'] + ([REPLICA_ALIAS] if replica_configured() else [])
+        for alias in aliases:
+            results['contention'][alias] = self._with_writers(
+                writers, lambda: self._run_readers(alias, threads, heavy_queries, HEAVY_READ_SQL, reconnect=False),
+            )
+
+        self.stdout.write(json.dumps(results, indent=2))
+        connect = results['connect']
+        self.stdout.write(self.style.SUCCESS(
+            f"\nSELECT 1 p50: fresh {connect['fresh']['ms_p50']} ms, reused {connect['reused']['ms_p50']} ms. "
+            + ', '.join(
+                f"heavy read p95 on {alias}: {summary['ms_p95']} ms"
+                for alias, summary in results['contention'].items()
+            )
+        ))
+        if not replica_configured():
+            self.stdout.write("Set DB_REPLICA_HOST to include the replica in the contention phase.")
+
+    def _run_readers(self, alias, threads, queries, sql, reconnect):
+        latencies = []
+        lock = threading.Lock()
+
+        def _reader():
+            local = []
+            try:
+                for _ in range(queries):
+                    started = time.perf_counter()
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute(sql)
+                        cursor.fetchall()
+                    if reconnect:
+                        connections[alias].close()
+                    local.append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+            with lock:
+                latencies.extend(local)
+
+        workers = [threading.Thread(target=_reader) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return _summary(latencies, time.perf_counter() - started)
+
+    def _with_writers(self, writers, run):
+        done = threading.Event()
+        writes = 0
+        lock = threading.Lock()
+
+        def _writer():
+            nonlocal writes
+            try:
+                with connections['default'].cursor() as cursor:
+                    while not done.is_set():
+                        cursor.execute(
+                            "UPDATE cases SET data_version = data_version + 1 "
+                            "WHERE id = (SELECT id FROM cases ORDER BY random() LIMIT 1)"
+                        )
+                        with lock:
+                            writes += 1
+            finally:
+                connections['default'].close()
+
+        threads = [threading.Thread(target=_writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        try:
+            summary = run()
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+        summary['concurrent_writes'] = writes
+        return summary
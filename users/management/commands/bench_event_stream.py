@@ -0,0 +1,148 @@
+"""
+Load test for the Server-Sent Events stream.
+
+Opens N idle connections to /api/events/stream against a running ASGI worker,
+holds them for --duration seconds, then publishes one event through
+Postgres NOTIFY and measures how many connections received it and how fast.
+
+Run with:
+    python manage.py bench_event_stream --token <bearer> --connections 2000 \
+        --url http://127.0.0.1:8000/api/events/stream
+"""
+
+import asyncio
+import json
+import resource
+import statistics
+import time
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import AuthToken
+from users.services.event_bus import EVENT_NOTIFICATION, publish_event
+
+
+class Command(BaseCommand):
+    help = 'Measure how many idle SSE connections one worker can hold and fan-out latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/events/stream')
+        parser.add_argument('--token', required=True, help='Bearer token of the user to subscribe as')
+        parser.add_argument('--connections', type=int, default=500)
+        parser.add_argument('--ramp', type=int, default=200, help='Connections opened concurrently per wave')
+        parser.add_argument('--duration', type=int, default=30, help='Seconds to hold connections idle')
+        parser.add_argument('--timeout', type=float, default=15.0, help='Seconds to wait for the probe event')
+
+    def handle(self, *args, **options):
+        try:
+            token_obj = AuthToken.objects.select_related('user').get(token=options['token'])
+        except AuthToken.DoesNotExist:
+            raise CommandError('Token not found')
+
+        # Each connection needs one file descriptor on this side too.
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = options['connections'] + 100
+        if soft < wanted:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+        results = asyncio.run(self._run(options, token_obj.user_id))
+
+        self.stdout.write(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"\nHeld {results['held_after_idle']}/{options['connections']} idle connections; "
+            f"{results['received_probe']} received the probe event."
+        ))
+
+    async def _run(self, options, user_id):
+        parsed = urlparse(options['url'])
+        host = parsed.hostname
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        path = parsed.path or '/api/events/stream'
+        request_bytes = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Authorization: Bearer {options['token']}\r\n"
+            f"Accept: text/event-stream\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        ).encode('ascii')
+
+        streams = []
+        failures = 0
+        connect_times = []
+
+        async def _open():
+            started = time.perf_counter()
+            reader, writer = await asyncio.open_connection(host, port, ssl=parsed.scheme == 'https')
+            writer.write(request_bytes)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), timeout=10)
+            if b' 200 ' not in status_line:
+                writer.close()
+                raise ConnectionError(status_line.decode(errors='replace').strip())
+            # Skip headers and wait for the ": connected" comment.
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=10)
+                if b'connected' in line:
+                    break
+            connect_times.append(time.perf_counter() - started)
+            return reader, writer
+
+        total = options['connections']
+        ramp = max(options['ramp'], 1)
+        for offset in range(0, total, ramp):
+            batch = await asyncio.gather(
+                *[_open() for _ in range(min(ramp, total - offset))],
+                return_exceptions=True,
+            )
+            for item in batch:
+                if isinstance(item, Exception):
+                    failures += 1
+                else:
+                    streams.append(item)
+
+        await asyncio.sleep(options['duration'])
+        alive = [(r, w) for r, w in streams if not r.at_eof() and not w.is_closing()]
+
+        probe_id = f"bench-{time.time_ns()}"
+        published_at = time.perf_counter()
+        await asyncio.to_thread(
+            publish_event, EVENT_NOTIFICATION, {"probe": probe_id}, user_ids=[user_id],
+        )
+
+        async def _await_probe(reader):
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return None
+                if probe_id.encode() in line:
+                    return time.perf_counter() - published_at
+
+        latencies = await asyncio.gather(
+            *[asyncio.wait_for(_await_probe(r), timeout=options['timeout']) for r, _ in alive],
+            return_exceptions=True,
+        )
+        latencies = [l for l in latencies if isinstance(l, float)]
+
+        for _, writer in streams:
+            writer.close()
+
+        def _pct(values, pct):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2)
+
+        return {
+            'requested': total,
+            'opened': len(streams),
+            'failed_to_open': failures,
+            'held_after_idle': len(alive),
+            'idle_seconds': options['duration'],
+            'connect_ms_p50': _pct(connect_times, 0.50),
+            'connect_ms_p95': _pct(connect_times, 0.95),
+            'received_probe': len(latencies),
+            'fanout_ms_p50': _pct(latencies, 0.50),
+            'fanout_ms_p99': _pct(latencies, 0.99),
+            'fanout_ms_mean': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+        }
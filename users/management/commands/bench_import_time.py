@@ -0,0 +1,53 @@
+"""
+Startup import-time benchmark (core/import_budget.py).
+
+Imports core.wsgi and core.urls in --runs fresh interpreters under
+``python -X importtime``. Prints the median per target, the slowest modules
+by self time and any module that should load lazily, then checks the result
+against users/import_budget.json. Exits non-zero on a regression so CI can
+run it directly.
+
+Run with:        python manage.py bench_import_time --runs 5
+Re-baseline:     python manage.py bench_import_time --record
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.import_budget import (
+    DEFAULT_HEADROOM, check_budget, eager_lazy_modules, measure_median, record_budget,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure core.wsgi / core.urls import time and check it against the import budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--record', action='store_true', help='Rewrite the budget from this measurement')
+        parser.add_argument('--headroom', type=float, default=DEFAULT_HEADROOM, help='Headroom added when recording')
+
+    def handle(self, *args, **options):
+        summary = measure_median(options['runs'])
+        report = {
+            'runs': summary['runs'],
+            'targets_ms': summary['targets_ms'],
+            'total_ms': summary['total_ms'],
+            'module_count': len(summary['modules']),
+            'eager_lazy_modules': eager_lazy_modules(summary['modules']),
+            'slowest': summary['slowest'][:15],
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+        if options['record']:
+            budget = record_budget(summary, options['headroom'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Recorded import budget: {budget['targets_ms']}, max {budget['max_modules']} modules"
+            ))
+            return
+
+        failures = check_budget(summary)
+        if failures:
+            raise CommandError('Import budget exceeded:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Startup imports within budget.'))
@@ -0,0 +1,156 @@
+"""
+Benchmark for JSON rendering and response compression.
+
+Two phases:
+1. serialization: the CPU cost of rendering a case-list shaped payload
+   (``cases`` rows from Postgres, each with its check rows attached, raw
+   datetime/Decimal values), --iterations times per mode:
+   - json_isoformat: the old path, with every row converted with
+     ``isoformat()`` by hand, then ``json.dumps`` with Ninja's encoder;
+   - json: ``json.dumps`` with Ninja's encoder on the raw rows;
+   - orjson: core.renderers.dumps, as the API now renders.
+2. wire: in-process GETs of each --path with ``Accept-Encoding`` set to
+   identity, gzip and br. Records the body size and latency through the full
+   middleware stack.
+
+Prints results as JSON: CPU milliseconds per render and bytes per response.
+
+Run with: python manage.py bench_json_rendering --cases 500 --username admin1
+"""
+
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from ninja.responses import NinjaJSONEncoder
+
+from core import compression, renderers
+from users.models import AuthToken, CustomUser
+
+DEFAULT_PATHS = ('/api/cases/incident-db', '/api/audit-logs?limit=2000')
+CHECK_TABLES = ('claimant_checks', 'insured_checks', 'driver_checks', 'spot_checks')
+
+
+def _fetch_rows(cursor, sql, params):
+    cursor.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _isoformat_rows(rows):
+    for row in rows:
+        for key, value in list(row.items()):
+            if hasattr(value, 'isoformat'):
+                row[key] = value.isoformat()
+            elif isinstance(value, list):
+                _isoformat_rows(item for item in value if isinstance(item, dict))
+
+
+def _ms_summary(samples):
+    ordered = sorted(samples)
+    return {
+        'ms_p50': round(ordered[len(ordered) // 2] * 1000, 3),
+        'ms_mean': round(statistics.mean(ordered) * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure JSON serialization CPU time and compressed response sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cases', type=int, default=500, help='Case rows in the serialization payload')
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=20, help='Requests per path and encoding')
+        parser.add_argument('--path', action='append', dest='paths', help='Repeatable; defaults to the case list and audit logs')
+        parser.add_argument('--username', help='Authenticate the wire phase as this user')
+        parser.add_argument('--skip-wire', action='store_true')
+
+    def handle(self, *args, **options):
+        results = {'serialization': self._bench_serialization(options['cases'], options['iterations'])}
+        if not options['skip_wire']:
+            results['wire'] = self._bench_wire(options)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    # ------------------------------------------------------------------
+    # Phase 1: serialization
+    # ------------------------------------------------------------------
+
+    def _payload(self, case_count):
+        with connections['default'].cursor() as cursor:
+            cases = _fetch_rows(cursor, "SELECT * FROM cases ORDER BY id DESC LIMIT %s", [case_count])
+            by_id = {row['id']: row for row in cases}
+            for row in cases:
+                row['checks'] = []
+            for table in CHECK_TABLES:
+                for check in _fetch_rows(cursor, f"SELECT * FROM {table} WHERE case_id = ANY(%s)", [list(by_id)]):
+                    by_id[check['case_id']]['checks'].append(check)
+        if not cases:
+            raise CommandError("No cases found; run generate_bench_data first.")
+        return {'cases': cases, 'total': len(cases)}
+
+    def _bench_serialization(self, case_count, iterations):
+        payload = self._payload(case_count)
+
+        def json_isoformat():
+            rows = [dict(row, checks=[dict(check) for check in row['checks']]) for row in payload['cases']]
+            _isoformat_rows(rows)
+            return json.dumps({'cases': rows, 'total': payload['total']}, cls=NinjaJSONEncoder).encode()
+
+        modes = (
+            ('json_isoformat', json_isoformat),
+            ('json', lambda: json.dumps(payload, cls=NinjaJSONEncoder).encode()),
+            ('orjson', lambda: renderers.dumps(payload)),
+        )
+        results = {'cases': len(payload['cases'])}
+        for name, render in modes:
+            samples = []
+            for _ in range(iterations):
+                started = time.process_time()
+                body = render()
+                samples.append(time.process_time() - started)
+            results[name] = dict(_ms_summary(samples), bytes=len(body))
+        results['speedup_vs_json_isoformat'] = round(
+            results['json_isoformat']['ms_mean'] / max(results['orjson']['ms_mean'], 1e-6), 2,
+        )
+        return results
+
+    # ------------------------------------------------------------------
+    # Phase 2: wire
+    # ------------------------------------------------------------------
+
+    def _bench_wire(self, options):
+        headers = {}
+        token = None
+        if options['username']:
+            user = CustomUser.objects.filter(username=options['username']).first()
+            if user is None:
+                raise CommandError(f"User '{options['username']}' not found")
+            token = AuthToken.objects.create(user=user)
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token.token}'
+
+        encodings = ['identity', 'gzip'] + (['br'] if compression.brotli is not None else [])
+        client = Client(SERVER_NAME='localhost')
+        results = {}
+        try:
+            for path in options['paths'] or DEFAULT_PATHS:
+                results[path] = {}
+                for encoding in encodings:
+                    samples = []
+                    for _ in range(options['requests']):
+                        started = time.perf_counter()
+                        response = client.get(path, HTTP_ACCEPT_ENCODING=encoding, **headers)
+                        samples.append(time.perf_counter() - started)
+                    if response.status_code >= 400:
+                        raise CommandError(f"GET {path} returned {response.status_code}")
+                    results[path][encoding] = dict(
+                        _ms_summary(samples),
+                        bytes=len(response.content),
+                        content_encoding=response.get('Content-Encoding', 'identity'),
+                    )
+        finally:
+            if token is not None:
+                token.delete()
+        return results
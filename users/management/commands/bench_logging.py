@@ -0,0 +1,198 @@
+"""
+Benchmark for the logging pipeline (core/structured_logging.py).
+
+Two phases:
+1. handlers: the caller-side cost of the log calls a typical authenticated
+   vendor request makes (auth lines, the per-call vendor lines, one INFO
+   line), for --iterations simulated requests, under these modes:
+   - off: logger above every level;
+   - fstring_off: the same lines written as f-strings, logger above every
+     level (the cost of eager formatting for records nobody reads);
+   - sync_file: a FileHandler with the JSON formatter on the request thread;
+   - async_file: AsyncQueueHandler writing the same file from its listener;
+   - async_sampled: async_file plus the LOG_SAMPLING filter.
+2. requests: --requests in-process GETs of --path with logging as
+   configured (at --level for the users/core loggers) and with logging
+   disabled.
+
+Files go to a temporary directory that is removed afterwards. Prints latency
+summaries in microseconds as JSON.
+
+Run with: python manage.py bench_logging --iterations 20000 --path /api/vendor-assigned-checks --username vendor1
+"""
+
+import json
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core.structured_logging import AsyncQueueHandler, JsonFormatter, RequestContextFilter, SamplingFilter
+from users.models import AuthToken, CustomUser
+
+BENCH_LOGGER = 'users.bench_logging'
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+
+    def _pct(pct):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1e6, 2) if ordered else None
+
+    return {
+        'samples': len(ordered),
+        'us_p50': _pct(0.50),
+        'us_p95': _pct(0.95),
+        'us_p99': _pct(0.99),
+        'us_mean': round(statistics.mean(ordered) * 1e6, 2) if ordered else None,
+    }
+
+
+def _request_lines(auth_log, vendor_log, username, index):
+    auth_log.debug("Bearer token received, length: %d", 40)
+    auth_log.debug("Token auth success for user: %s, role: %s", username, 'VENDOR')
+    vendor_log.debug("vendor-assigned-checks called, user authenticated: %s", True)
+    vendor_log.debug("vendor-assigned-checks: User role = %s", 'VENDOR')
+    vendor_log.info("Returned %d assigned checks for request %d", 12, index)
+
+
+def _request_lines_fstring(auth_log, vendor_log, username, index):
+    auth_log.debug(f"Bearer token received, length: {40}")
+    auth_log.debug(f"Token auth success for user: {username}, role: {'VENDOR'}")
+    vendor_log.debug(f"vendor-assigned-checks called, user authenticated: {True}")
+    vendor_log.debug(f"vendor-assigned-checks: User role = {'VENDOR'}")
+    vendor_log.info(f"Returned {12} assigned checks for request {index}")
+
+
+class Command(BaseCommand):
+    help = 'Measure request overhead of logging: handlers, formatting style and logging on/off'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000, help='Simulated requests per handler mode')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per mode in the requests phase')
+        parser.add_argument('--path', default='/api/health')
+        parser.add_argument('--username', help='Authenticate the requests phase as this user')
+        parser.add_argument('--level', default='DEBUG', help='users/core logger level while logging is on')
+        parser.add_argument('--skip-requests', action='store_true')
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='bench_logging_')
+        try:
+            results = {'handlers': self._bench_handlers(workdir, options['iterations'])}
+            if not options['skip_requests']:
+                results['requests'] = self._bench_requests(options)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    # ------------------------------------------------------------------
+    # Phase 1: handlers
+    # ------------------------------------------------------------------
+
+    def _bench_handlers(self, workdir, iterations):
+        auth_log = logging.getLogger(f'{BENCH_LOGGER}.auth')
+        vendor_log = logging.getLogger(f'{BENCH_LOGGER}.vendor_cases')
+        root = logging.getLogger(BENCH_LOGGER)
+        root.propagate = False
+        sampling = {f'{BENCH_LOGGER}.auth': 0.01, f'{BENCH_LOGGER}.vendor_cases': 0.05}
+
+        def sync_file(path):
+            handler = logging.FileHandler(path, encoding='utf-8')
+            handler.setFormatter(JsonFormatter())
+            return handler
+
+        def async_file(path):
+            handler = AsyncQueueHandler(stream=False, filename=path, queue_size=iterations * 5 + 1)
+            handler.setFormatter(JsonFormatter())
+            return handler
+
+        def async_sampled(path):
+            handler = async_file(path)
+            handler.addFilter(SamplingFilter(sampling))
+            return handler
+
+        modes = [
+            ('off', None, _request_lines),
+            ('fstring_off', None, _request_lines_fstring),
+            ('sync_file', sync_file, _request_lines),
+            ('async_file', async_file, _request_lines),
+            ('async_sampled', async_sampled, _request_lines),
+        ]
+        results = {}
+        for name, make_handler, emit in modes:
+            handler = make_handler(os.path.join(workdir, f'{name}.log')) if make_handler else None
+            if handler:
+                handler.addFilter(RequestContextFilter())
+                root.addHandler(handler)
+                root.setLevel(logging.DEBUG)
+            else:
+                root.setLevel(logging.CRITICAL + 1)
+
+            samples = []
+            try:
+                for index in range(iterations):
+                    started = time.perf_counter()
+                    emit(auth_log, vendor_log, 'bench_vendor', index)
+                    samples.append(time.perf_counter() - started)
+                flush_started = time.perf_counter()
+            finally:
+                if handler:
+                    root.removeHandler(handler)
+                    handler.close()
+            results[name] = _summary(samples)
+            if handler:
+                results[name]['flush_seconds'] = round(time.perf_counter() - flush_started, 3)
+            if isinstance(handler, AsyncQueueHandler):
+                results[name]['dropped'] = handler.dropped
+        return results
+
+    # ------------------------------------------------------------------
+    # Phase 2: requests
+    # ------------------------------------------------------------------
+
+    def _bench_requests(self, options):
+        headers = {}
+        token = None
+        if options['username']:
+            user = CustomUser.objects.filter(username=options['username']).first()
+            if user is None:
+                raise CommandError(f"User '{options['username']}' not found")
+            token = AuthToken.objects.create(user=user)
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token.token}'
+
+        client = Client(SERVER_NAME='localhost')
+        app_loggers = [logging.getLogger(name) for name in ('users', 'core')]
+        saved_levels = [logger.level for logger in app_loggers]
+        results = {}
+        try:
+            response = client.get(options['path'], **headers)
+            if response.status_code >= 400:
+                raise CommandError(f"GET {options['path']} returned {response.status_code}")
+
+            for name in ('logging_on', 'logging_off'):
+                if name == 'logging_on':
+                    for logger in app_loggers:
+                        logger.setLevel(options['level'].upper())
+                else:
+                    logging.disable(logging.CRITICAL)
+                samples = []
+                for _ in range(options['requests']):
+                    started = time.perf_counter()
+                    client.get(options['path'], **headers)
+                    samples.append(time.perf_counter() - started)
+                results[name] = _summary(samples)
+        finally:
+            logging.disable(logging.NOTSET)
+            for logger, level in zip(app_loggers, saved_levels):
+                logger.setLevel(level)
+            if token is not None:
+                token.delete()
+
+        on, off = results['logging_on']['us_p50'], results['logging_off']['us_p50']
+        results['p50_overhead_us'] = round(on - off, 2)
+        return results
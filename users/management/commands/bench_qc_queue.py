@@ -0,0 +1,149 @@
+"""
+Concurrency benchmark for the QC work queue.
+
+Seeds --reports synthetic fully verified cases with one PENDING report each,
+then runs --workers threads (one database connection each) that repeatedly
+claim the next report and immediately accept it, until the queue is empty.
+A monitor thread samples pg_stat_activity for backends waiting on a lock.
+Everything seeded is deleted afterwards.
+
+Run with: python manage.py bench_qc_queue --reports 2000 --workers 16
+"""
+
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from users.models import CustomUser, InsuranceCase, Report
+from users.services import qc_queue
+from users.services.case_identity import forget_case_identity, link_case_identity
+
+BENCH_PREFIX = 'BENCH-QCQ-'
+
+
+class Command(BaseCommand):
+    help = 'Measure claim throughput and lock waits with concurrent QC work-queue claimers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reports', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=8)
+
+    def handle(self, *args, **options):
+        qcs = [
+            CustomUser.objects.create_user(
+                username=f'bench_qc_{index}_{time.time_ns()}', password=None, role=CustomUser.Role.QC,
+            )
+            for index in range(max(options['workers'], 1))
+        ]
+        case_ids = self._seed(options['reports'])
+        try:
+            results = self._run(qcs)
+        finally:
+            self._cleanup(case_ids, qcs)
+
+        self.stdout.write(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"\n{results['claims']} claims by {len(qcs)} workers at {results['claims_per_second']}/s; "
+            f"duplicates={results['duplicate_claims']}, lock-wait samples={results['lock_wait_samples']}."
+        ))
+
+    def _seed(self, count):
+        seeded = []
+        with connections['default'].cursor() as cursor:
+            for index in range(count):
+                case_number = f'{BENCH_PREFIX}{time.time_ns()}-{index}'
+                cursor.execute(
+                    "INSERT INTO cases (claim_number, client_name, category, case_number) "
+                    "VALUES (%s, 'Bench', 'MACT', %s) RETURNING id",
+                    [case_number, case_number],
+                )
+                incident_case_id = cursor.fetchone()[0]
+                cursor.execute(
+                    "INSERT INTO claimant_checks (case_id, check_status, claimant_name) VALUES (%s, 'Verified', 'Bench')",
+                    [incident_case_id],
+                )
+                case = InsuranceCase.objects.create(case_number=case_number, title='Bench case')
+                link_case_identity(incident_case_id, case.id)
+                Report.objects.create(case=case, report_content='bench', status=Report.Status.PENDING)
+                seeded.append((incident_case_id, case.id))
+        return seeded
+
+    def _cleanup(self, case_ids, qcs):
+        with connections['default'].cursor() as cursor:
+            for incident_case_id, insurance_case_id in case_ids:
+                cursor.execute("DELETE FROM claimant_checks WHERE case_id = %s", [incident_case_id])
+                cursor.execute("DELETE FROM cases WHERE id = %s", [incident_case_id])
+                forget_case_identity(incident_case_id=incident_case_id, insurance_case_id=insurance_case_id)
+        InsuranceCase.objects.filter(id__in=[pair[1] for pair in case_ids]).delete()
+        CustomUser.objects.filter(id__in=[qc.id for qc in qcs]).delete()
+
+    def _run(self, qcs):
+        claimed = []
+        latencies = []
+        lock_wait_samples = 0
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def _worker(qc):
+            try:
+                while True:
+                    started = time.perf_counter()
+                    report_id = qc_queue.claim_next_report(qc.id)
+                    elapsed = time.perf_counter() - started
+                    if report_id is None:
+                        return
+                    Report.objects.filter(id=report_id).update(
+                        status=Report.Status.ACCEPTED, lease_expires_at=None,
+                    )
+                    with lock:
+                        claimed.append(report_id)
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        def _monitor():
+            nonlocal lock_wait_samples
+            try:
+                with connections['default'].cursor() as cursor:
+                    while not done.is_set():
+                        cursor.execute(
+                            "SELECT COUNT(*) FROM pg_stat_activity "
+                            "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                        )
+                        lock_wait_samples += cursor.fetchone()[0]
+                        time.sleep(0.01)
+            finally:
+                connection.close()
+
+        monitor = threading.Thread(target=_monitor)
+        workers = [threading.Thread(target=_worker, args=(qc,)) for qc in qcs]
+        started = time.perf_counter()
+        monitor.start()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        wall = time.perf_counter() - started
+        done.set()
+        monitor.join()
+
+        ordered = sorted(latencies)
+
+        def _pct(pct):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2) if ordered else None
+
+        return {
+            'workers': len(qcs),
+            'claims': len(claimed),
+            'duplicate_claims': len(claimed) - len(set(claimed)),
+            'wall_seconds': round(wall, 3),
+            'claims_per_second': round(len(claimed) / wall, 1) if wall else None,
+            'claim_ms_p50': _pct(0.50),
+            'claim_ms_p99': _pct(0.99),
+            'claim_ms_mean': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+            'lock_wait_samples': lock_wait_samples,
+        }
@@ -0,0 +1,18 @@
+"""
+Management command to return reports with expired QC leases to the work queue.
+Claims already take over expired leases; run this periodically (e.g. every
+5 minutes from cron) so QC listings and queue stats stay accurate.
+Run with: python manage.py expire_qc_leases
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.services.qc_queue import expire_leases
+
+
+class Command(BaseCommand):
+    help = 'Return reports with expired QC work-queue leases to the queue'
+
+    def handle(self, *args, **options):
+        expired = expire_leases()
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} report leases."))
@@ -0,0 +1,259 @@
+"""
+Synthetic data generator for the API benchmark suite (run_api_benchmark).
+
+Creates --clients insurers, --vendors vendor accounts and --cases cases with
+the seven check types, vendor evidence JSON, reports and vendor
+notifications. Distributions are skewed the way production data is:
+- a few large insurers receive most cases;
+- a minority of vendors carry most assignments;
+- most cases are open;
+- claimant and insured checks are nearly universal, RTI/RTO checks rare.
+Every row is tagged with the BENCH prefix and generation is seeded (--seed),
+so the same arguments always produce the same dataset.
+
+Run with:   python manage.py generate_bench_data --cases 5000 --vendors 60
+Remove it:  python manage.py generate_bench_data --purge
+"""
+
+import json
+import os
+import random
+import shutil
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from users.models import Client, CustomUser, InsuranceCase, Report, Vendor
+from users.services.case_identity import clear_case_identity_cache, link_case_identity
+
+CASE_PREFIX = 'BENCH-'
+CLIENT_PREFIX = 'BENCH'
+VENDOR_PREFIX = 'bench_vendor_'
+CHUNK = 500
+
+# table -> (notification check_type, name column, coordinate column prefix, share of cases with the check)
+CHECK_SPECS = {
+    'claimant_checks': ('claimant', 'claimant_name', 'claimant', 0.95),
+    'insured_checks': ('insured', 'insured_name', 'insured', 0.90),
+    'driver_checks': ('driver', 'driver_name', 'driver', 0.75),
+    'spot_checks': ('spot', 'place_of_accident', 'spot', 0.60),
+    'chargesheets': ('chargesheet', 'court_name', 'chargesheet', 0.50),
+    'rti_checks': ('rti', 'remarks', None, 0.25),
+    'rto_checks': ('rto', 'rto_name', 'rto', 0.25),
+}
+
+FULL_CASE_STATUS_WEIGHTS = {
+    'WIP': 45, 'Completed': 20, 'IR-Writing': 8, 'QC-1': 7, 'Pending CS': 6,
+    'Pending Additional Docs': 5, 'Portal Upload': 4, 'NI': 3, 'Withdraw': 2,
+}
+CHECK_STATUS_WEIGHTS = {'Not Initiated': 20, 'WIP': 40, 'Completed': 20, 'Verified': 15, 'Stop': 5}
+REPORT_STATUS_WEIGHTS = {
+    Report.Status.PENDING: 40, Report.Status.ACCEPTED: 45, Report.Status.REJECTED: 15,
+}
+INVESTIGATION_TYPE_WEIGHTS = {'Full Case': 70, 'Partial Case': 15, 'Reassessment': 10, 'Connected Case': 5}
+CITIES = [
+    ('Mumbai', 19.076, 72.8777), ('Delhi', 28.7041, 77.1025), ('Bengaluru', 12.9716, 77.5946),
+    ('Hyderabad', 17.385, 78.4867), ('Chennai', 13.0827, 80.2707), ('Pune', 18.5204, 73.8567),
+    ('Jaipur', 26.9124, 75.7873), ('Lucknow', 26.8467, 80.9462),
+]
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class Command(BaseCommand):
+    help = 'Generate (or --purge) a reproducible synthetic dataset for API benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=15)
+        parser.add_argument('--vendors', type=int, default=40)
+        parser.add_argument('--cases', type=int, default=2000)
+        parser.add_argument('--report-share', type=float, default=0.35, help='Share of cases with a report')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--purge', action='store_true', help='Delete previously generated data and exit')
+
+    def handle(self, *args, **options):
+        self._purge()
+        if options['purge']:
+            self.stdout.write(self.style.SUCCESS("Removed generated benchmark data."))
+            return
+
+        rng = random.Random(options['seed'])
+        clients = self._create_clients(options['clients'])
+        vendors = self._create_vendors(max(options['vendors'], 1), rng)
+        counts = self._create_cases(rng, clients, vendors, max(options['cases'], 0), options['report_share'])
+
+        self.stdout.write(json.dumps(counts, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"\nGenerated {counts['cases']} cases, {counts['checks']} checks and {counts['reports']} reports."
+        ))
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def _create_clients(self, count):
+        Client.objects.bulk_create([
+            Client(client_code=f'{CLIENT_PREFIX}{index:03d}', client_name=f'Bench Insurance {index:03d}')
+            for index in range(max(count, 1))
+        ])
+        return list(Client.objects.filter(client_code__startswith=CLIENT_PREFIX).order_by('client_code'))
+
+    def _create_vendors(self, count, rng):
+        vendors = []
+        for index in range(count):
+            city, lat, lng = rng.choice(CITIES)
+            user = CustomUser.objects.create_user(
+                username=f'{VENDOR_PREFIX}{index}',
+                email=f'{VENDOR_PREFIX}{index}@bench.invalid',
+                password=None,
+                role=CustomUser.Role.VENDOR,
+            )
+            vendors.append(Vendor.objects.create(
+                user=user, company_name=f'Bench Vendor {index}', city=city,
+                latitude=round(lat, 6), longitude=round(lng, 6),
+            ))
+        return vendors
+
+    def _create_cases(self, rng, clients, vendors, count, report_share):
+        # Zipf-like skew: client i gets weight 1/(i+1), vendor i weight 1/(i+1)^0.8.
+        client_weights = [1 / (index + 1) for index in range(len(clients))]
+        vendor_weights = [1 / (index + 1) ** 0.8 for index in range(len(vendors))]
+        counts = {'cases': 0, 'checks': 0, 'evidence_photos': 0, 'reports': 0, 'notifications': 0}
+        today = date.today()
+
+        for start in range(0, count, CHUNK):
+            batch = range(start, min(start + CHUNK, count))
+            with transaction.atomic(using='default'), connections['default'].cursor() as cursor:
+                case_rows = []
+                for index in batch:
+                    client = rng.choices(clients, weights=client_weights)[0]
+                    case_rows.append([
+                        f'{CASE_PREFIX}{index:07d}', client.client_name, 'MACT', f'{CASE_PREFIX}{index:07d}',
+                        today - timedelta(days=int(rng.expovariate(1 / 60))),
+                        _weighted(rng, INVESTIGATION_TYPE_WEIGHTS), _weighted(rng, FULL_CASE_STATUS_WEIGHTS),
+                    ])
+                cursor.execute(
+                    "INSERT INTO cases (claim_number, client_name, category, case_number, case_receive_date, "
+                    "investigation_type, full_case_status) VALUES "
+                    + ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(case_rows))
+                    + " RETURNING id, case_number",
+                    [value for row in case_rows for value in row],
+                )
+                cases = cursor.fetchall()
+                counts['cases'] += len(cases)
+
+                notifications = []
+                for table, (check_type, name_column, coord_prefix, share) in CHECK_SPECS.items():
+                    rows = []
+                    for case_id, case_number in cases:
+                        if rng.random() >= share:
+                            continue
+                        vendor = rng.choices(vendors, weights=vendor_weights)[0] if rng.random() < 0.8 else None
+                        evidence = self._evidence(rng, case_id, check_type) if vendor else []
+                        _, lat, lng = rng.choice(CITIES)
+                        row = [
+                            case_id, f'Bench {check_type} {case_id}', _weighted(rng, CHECK_STATUS_WEIGHTS),
+                            vendor.id if vendor else None, json.dumps(evidence),
+                        ]
+                        if coord_prefix:
+                            row += [lat + rng.uniform(-0.1, 0.1), lng + rng.uniform(-0.1, 0.1)]
+                        rows.append(row)
+                        counts['evidence_photos'] += len(evidence)
+                        if vendor:
+                            notifications.append([
+                                vendor.id, check_type, case_id, case_number,
+                                f'{check_type.title()} check assigned for case {case_number}', rng.random() < 0.6,
+                            ])
+                    if not rows:
+                        continue
+                    columns = ['case_id', name_column, 'check_status', 'assigned_vendor_id', 'vendor_evidence']
+                    if coord_prefix:
+                        columns += [f'{coord_prefix}_lat', f'{coord_prefix}_lng']
+                    placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+                    cursor.execute(
+                        f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([placeholders] * len(rows)),
+                        [value for row in rows for value in row],
+                    )
+                    counts['checks'] += len(rows)
+
+                if notifications:
+                    cursor.execute(
+                        "INSERT INTO vendor_notifications (vendor_id, notification_type, check_type, case_id, "
+                        "case_number, message, is_read, created_at) VALUES "
+                        + ', '.join(["(%s, 'CHECK_ASSIGNED', %s, %s, %s, %s, %s, NOW())"] * len(notifications)),
+                        [value for row in notifications for value in row],
+                    )
+                    counts['notifications'] += len(notifications)
+
+            counts['reports'] += self._create_reports(rng, [case for case in cases if rng.random() < report_share])
+
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO vendor_notification_counters (vendor_id, unread_count, updated_at)
+                SELECT vendor_id, COUNT(*) FILTER (WHERE NOT is_read), NOW()
+                FROM vendor_notifications WHERE vendor_id = ANY(%s)
+                GROUP BY vendor_id
+                ON CONFLICT (vendor_id) DO UPDATE SET
+                    unread_count = EXCLUDED.unread_count, updated_at = NOW()
+                """,
+                [[vendor.id for vendor in vendors]],
+            )
+        return counts
+
+    def _evidence(self, rng, case_id, check_type):
+        photos = min(int(rng.expovariate(1 / 2)), 8)
+        uploaded_at = timezone.now() - timedelta(days=rng.randint(0, 30))
+        return [
+            {
+                'filename': f'bench_{case_id}_{check_type}_{photo}.jpg',
+                'url': f'/media/evidence_photos/case_{case_id}/{check_type}/bench_{case_id}_{check_type}_{photo}.jpg',
+                'uploaded_at': (uploaded_at + timedelta(minutes=photo)).isoformat(),
+                'location_name': 'Bench location',
+                'location_mismatch': False,
+            }
+            for photo in range(photos)
+        ]
+
+    def _create_reports(self, rng, cases):
+        if not cases:
+            return 0
+        insurance_cases = InsuranceCase.objects.bulk_create([
+            InsuranceCase(case_number=case_number, title=f'Bench case {case_number}')
+            for _, case_number in cases
+        ])
+        for (incident_case_id, _), insurance_case in zip(cases, insurance_cases):
+            link_case_identity(incident_case_id, insurance_case.id)
+        Report.objects.bulk_create([
+            Report(
+                case=insurance_case,
+                report_content=f'Bench report for {insurance_case.case_number}',
+                status=_weighted(rng, REPORT_STATUS_WEIGHTS),
+            )
+            for insurance_case in insurance_cases
+        ])
+        return len(insurance_cases)
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def _purge(self):
+        like = f'{CASE_PREFIX}%'
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT id FROM cases WHERE claim_number LIKE %s", [like])
+            case_ids = [row[0] for row in cursor.fetchall()]
+            if case_ids:
+                cursor.execute("DELETE FROM vendor_notifications WHERE case_id = ANY(%s)", [case_ids])
+                cursor.execute("DELETE FROM cases WHERE id = ANY(%s)", [case_ids])
+        InsuranceCase.objects.filter(case_number__startswith=CASE_PREFIX).delete()
+        CustomUser.objects.filter(username__startswith=VENDOR_PREFIX).delete()
+        Client.objects.filter(client_code__startswith=CLIENT_PREFIX).delete()
+        clear_case_identity_cache()
+        for case_id in case_ids:
+            shutil.rmtree(os.path.join(settings.MEDIA_ROOT, 'evidence_photos', f'case_{case_id}'), ignore_errors=True)
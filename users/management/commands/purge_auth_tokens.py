@@ -0,0 +1,35 @@
+"""
+Management command to delete dead API tokens (logged out, superseded or
+expired) once they are past the retention window.
+Run daily with: python manage.py purge_auth_tokens --days 7
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.services.session_summary import purge_auth_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete inactive or expired auth tokens older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Delete dead tokens whose last activity is older than this many days (default: 7)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tokens deleted per transaction (default: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        days = max(options['days'], 1)
+        batch_size = max(options['batch_size'], 1)
+
+        self.stdout.write(f"Deleting dead auth tokens older than {days} days...")
+        deleted = purge_auth_tokens(older_than_days=days, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"\nDone. Deleted {deleted} tokens."))
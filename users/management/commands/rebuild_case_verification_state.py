@@ -0,0 +1,43 @@
+"""
+Management command to recompute case_verification_state from the check tables.
+The rollup is normally kept current by triggers (migration 0068); run this after
+bulk loads done with triggers disabled or if the counts are suspected to drift.
+Run with: python manage.py rebuild_case_verification_state
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+ROLLUP_TABLES = ("claimant_checks", "insured_checks", "driver_checks", "spot_checks", "chargesheets")
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-case verification rollup used by the Legal Review page'
+
+    def handle(self, *args, **options):
+        union_sql = " UNION ALL ".join(
+            f"SELECT case_id, check_status FROM {table}" for table in ROLLUP_TABLES
+        )
+        with transaction.atomic(using='default'):
+            with connections['default'].cursor() as cursor:
+                # Block check writers (their triggers would race the rebuild); readers are unaffected.
+                cursor.execute(f"LOCK TABLE {', '.join(ROLLUP_TABLES)} IN SHARE MODE")
+                cursor.execute("DELETE FROM case_verification_state")
+                cursor.execute(
+                    f"""
+                    INSERT INTO case_verification_state (case_id, total_checks, verified_checks)
+                    SELECT checks.case_id,
+                           COUNT(*),
+                           COUNT(*) FILTER (WHERE checks.check_status = 'Verified')
+                    FROM ({union_sql}) checks
+                    JOIN cases c ON c.id = checks.case_id
+                    GROUP BY checks.case_id
+                    """
+                )
+                rebuilt = cursor.rowcount
+                cursor.execute("SELECT COUNT(*) FROM case_verification_state WHERE all_verified")
+                verified = cursor.fetchone()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt verification state for {rebuilt} cases ({verified} fully verified)."
+        ))
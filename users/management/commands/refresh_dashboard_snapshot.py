@@ -0,0 +1,20 @@
+"""
+Management command to recompute the Super Admin dashboard statistics snapshot.
+Run periodically (e.g. every 5 minutes from cron) so dashboard loads always
+read a fresh precomputed row.
+Run with: python manage.py refresh_dashboard_snapshot
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.services.dashboard_snapshot import refresh_dashboard_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored Super Admin dashboard statistics snapshot'
+
+    def handle(self, *args, **options):
+        snapshot = refresh_dashboard_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Dashboard snapshot refreshed at {snapshot['snapshot_computed_at'].isoformat()}."
+        ))
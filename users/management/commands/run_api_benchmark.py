@@ -0,0 +1,380 @@
+"""
+API benchmark scenarios against the generate_bench_data dataset.
+
+Each scenario issues real requests through the full Django stack in-process
+(django.test.Client: middleware, auth, Ninja, Postgres), so results do not
+depend on a web server or the network. The scenarios are:
+- admin_dashboard
+- case_dashboard_stats
+- case_list
+- full_details
+- vendor_sync (vendor-assigned-checks)
+- evidence_upload
+- report_listing
+
+For every scenario it records:
+- p50/p95/p99/mean latency and the SQL query count per request, from a
+  sequential pass;
+- throughput, from a --concurrency pass (read scenarios only);
+- outbound HTTP calls, counted via core.metrics so network time can be told
+  apart from our own.
+
+evidence_upload reverse-geocodes every photo. By default the geocoding
+providers are replaced with a fixed address for the run, so the scenario
+neither depends on nor hammers the public ArcGIS/Nominatim services. Pass
+--live-geocoding to include the real calls. Each upload is undone afterwards:
+the stored files, any evidence_photo rows, and the check's evidence and status.
+
+By default the in-process API cache is cleared before every request, so the
+numbers describe the uncached path. Pass --warm to measure with caching.
+
+Write a baseline:  python manage.py run_api_benchmark --output benchmarks/baseline.json
+Compare a commit:  python manage.py run_api_benchmark --compare benchmarks/baseline.json
+--compare exits non-zero when a scenario's p95 grows beyond --tolerance or
+its median query count grows at all.
+"""
+
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from unittest import mock
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import api_cache, metrics
+from users.management.commands.generate_bench_data import CASE_PREFIX, VENDOR_PREFIX
+from users.models import AuthToken, CustomUser, EvidencePhoto, Vendor
+from users.services import geocoding
+
+RUNNER_PREFIX = 'bench_runner_'
+SCENARIOS = (
+    'admin_dashboard', 'case_dashboard_stats', 'case_list', 'full_details',
+    'vendor_sync', 'evidence_upload', 'report_listing',
+)
+WRITE_SCENARIOS = {'evidence_upload'}
+BENCH_ADDRESS = 'Benchmark Road, Mumbai, Maharashtra, India'
+
+
+def _percentile(ordered, pct):
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2) if ordered else None
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _jpeg_bytes():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), (120, 140, 160)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = 'Run the API benchmark scenarios and write or compare a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Requests per scenario (default: 30)')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--concurrency', type=int, default=4, help='Threads for the throughput pass')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated subset')
+        parser.add_argument('--warm', action='store_true', help='Keep the API cache between requests')
+        parser.add_argument(
+            '--live-geocoding',
+            action='store_true',
+            help='Call the real reverse-geocoding providers during evidence_upload'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Baseline JSON to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p95 growth (default: 0.25)')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        self.rng = random.Random(options['seed'])
+        self.warm = options['warm']
+        self._load_dataset()
+        try:
+            with ExitStack() as stack:
+                if not options['live_geocoding']:
+                    for name in ('arcgis_reverse', 'nominatim_reverse'):
+                        stack.enter_context(mock.patch.object(geocoding, name, return_value=BENCH_ADDRESS))
+                results = {
+                    'meta': self._meta(options),
+                    'scenarios': {
+                        name: self._run_scenario(
+                            name, options['iterations'], options['warmup'], options['concurrency'],
+                        )
+                        for name in names
+                    },
+                }
+        finally:
+            CustomUser.objects.filter(username__startswith=RUNNER_PREFIX).delete()
+            AuthToken.objects.filter(user__username__startswith=VENDOR_PREFIX).delete()
+
+        self.stdout.write(json.dumps(results, indent=2))
+        if options['output']:
+            os.makedirs(os.path.dirname(os.path.abspath(options['output'])), exist_ok=True)
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nWrote {options['output']}"))
+        if options['compare']:
+            self._compare(results, options['compare'], options['tolerance'])
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def _load_dataset(self):
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT id FROM cases WHERE claim_number LIKE %s ORDER BY id", [f'{CASE_PREFIX}%'])
+            self.case_ids = [row[0] for row in cursor.fetchall()]
+            if not self.case_ids:
+                raise CommandError("No benchmark data found. Run: python manage.py generate_bench_data")
+            cursor.execute(
+                """
+                SELECT cc.id, cc.case_id, cc.assigned_vendor_id, cc.claimant_lat, cc.claimant_lng
+                FROM claimant_checks cc
+                WHERE cc.case_id = ANY(%s) AND cc.assigned_vendor_id IS NOT NULL AND cc.claimant_lat IS NOT NULL
+                ORDER BY cc.id
+                """,
+                [self.case_ids],
+            )
+            self.upload_targets = cursor.fetchall()
+
+        assignments = Counter(row[2] for row in self.upload_targets)
+        busiest_vendor_id = assignments.most_common(1)[0][0] if assignments else None
+        vendor = Vendor.objects.filter(id=busiest_vendor_id, user__username__startswith=VENDOR_PREFIX).first()
+        if vendor is None:
+            raise CommandError("Benchmark vendors are missing. Re-run generate_bench_data.")
+        self.upload_targets = [row for row in self.upload_targets if row[2] == vendor.id]
+
+        CustomUser.objects.filter(username__startswith=RUNNER_PREFIX).delete()
+        self.headers = {
+            'vendor': self._token_headers(vendor.user),
+            'case_manager': self._token_headers(self._runner_user(CustomUser.Role.CASE_MANAGER)),
+            'super_admin': self._token_headers(self._runner_user(CustomUser.Role.SUPER_ADMIN)),
+        }
+
+    def _runner_user(self, role):
+        return CustomUser.objects.create_user(
+            username=f'{RUNNER_PREFIX}{role.lower()}', email=f'{RUNNER_PREFIX}{role.lower()}@bench.invalid',
+            password=None, role=role,
+        )
+
+    def _token_headers(self, user):
+        token = AuthToken.objects.create(user=user, last_used_at=timezone.now())
+        return {'HTTP_AUTHORIZATION': f'Bearer {token.token}'}
+
+    def _meta(self, options):
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM reports r JOIN insurance_case ic ON ic.id = r.case_id "
+                           "WHERE ic.case_number LIKE %s", [f'{CASE_PREFIX}%'])
+            reports = cursor.fetchone()[0]
+        return {
+            'commit': _git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': {'cases': len(self.case_ids), 'reports': reports},
+            'iterations': options['iterations'],
+            'concurrency': options['concurrency'],
+            'warm_cache': self.warm,
+            'live_geocoding': options['live_geocoding'],
+        }
+
+    # ------------------------------------------------------------------
+    # Scenarios
+    # ------------------------------------------------------------------
+
+    def _request(self, client, name):
+        """Issue one request for scenario ``name``; returns (response, cleanup or None)."""
+        if name == 'admin_dashboard':
+            return client.get('/api/super-admin/dashboard', **self.headers['super_admin']), None
+        if name == 'case_dashboard_stats':
+            return client.get('/api/dashboard/stats', **self.headers['case_manager']), None
+        if name == 'case_list':
+            return client.get('/api/cases/incident-db', **self.headers['case_manager']), None
+        if name == 'full_details':
+            case_id = self.rng.choice(self.case_ids)
+            return client.get(f'/api/cases/incident-db/{case_id}/full-details', **self.headers['case_manager']), None
+        if name == 'vendor_sync':
+            return client.get('/api/vendor-assigned-checks', **self.headers['vendor']), None
+        if name == 'evidence_upload':
+            return self._upload(client)
+        if name == 'report_listing':
+            return client.get('/api/reports', **self.headers['case_manager']), None
+        raise CommandError(f"Unknown scenario {name}")
+
+    def _upload(self, client):
+        check_id, case_id, _, lat, lng = self.rng.choice(self.upload_targets)
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "SELECT vendor_evidence, check_status, updated_at FROM claimant_checks WHERE id = %s", [check_id],
+            )
+            previous, previous_status, previous_updated_at = cursor.fetchone()
+        last_photo_id = EvidencePhoto.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        photo = io.BytesIO(_jpeg_bytes())
+        photo.name = 'bench.jpg'
+        response = client.post(
+            f'/api/vendor-check-upload/{case_id}/claimant',
+            {'photos': [photo], 'latitudes': [str(lat)], 'longitudes': [str(lng)]},
+            **self.headers['vendor'],
+        )
+
+        def _restore():
+            from django.conf import settings
+
+            for entry in (response.json().get('uploaded') or []) if response.status_code == 200 else []:
+                path = os.path.join(settings.MEDIA_ROOT, entry['url'][len('/media/'):])
+                if os.path.exists(path):
+                    os.remove(path)
+            for photo in EvidencePhoto.objects.filter(case_id=case_id, id__gt=last_photo_id):
+                photo.photo.delete(save=False)
+                photo.delete()
+            with connections['default'].cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE claimant_checks SET vendor_evidence = %s, check_status = %s, updated_at = %s
+                    WHERE id = %s
+                    """,
+                    [
+                        previous if isinstance(previous, str) else json.dumps(previous or []),
+                        previous_status, previous_updated_at, check_id,
+                    ],
+                )
+        return response, _restore
+
+    def _timed(self, client, name):
+        if not self.warm:
+            api_cache.reset_api_cache()
+        with ExitStack() as stack:
+            captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            started = time.perf_counter()
+            response, cleanup = self._request(client, name)
+            elapsed = time.perf_counter() - started
+        if cleanup:
+            cleanup()
+        return elapsed, sum(len(capture.captured_queries) for capture in captures), response.status_code
+
+    def _run_scenario(self, name, iterations, warmup, concurrency):
+        client = Client(SERVER_NAME='localhost')
+        for _ in range(max(warmup, 0)):
+            self._timed(client, name)
+
+        metrics.reset_metrics()
+        latencies, query_counts, statuses = [], [], {}
+        started = time.perf_counter()
+        for _ in range(max(iterations, 1)):
+            elapsed, queries, status = self._timed(client, name)
+            latencies.append(elapsed)
+            query_counts.append(queries)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        sequential_wall = time.perf_counter() - started
+        outbound_calls, outbound_seconds = self._outbound_totals()
+
+        ordered = sorted(latencies)
+        result = {
+            'p50_ms': _percentile(ordered, 0.50),
+            'p95_ms': _percentile(ordered, 0.95),
+            'p99_ms': _percentile(ordered, 0.99),
+            'mean_ms': round(statistics.mean(ordered) * 1000, 2),
+            'queries_median': statistics.median(query_counts),
+            'queries_max': max(query_counts),
+            'status_codes': statuses,
+            'outbound_calls': outbound_calls,
+            'outbound_ms': round(outbound_seconds * 1000, 2),
+        }
+        if name in WRITE_SCENARIOS or concurrency <= 1:
+            result['throughput_rps'] = round(len(ordered) / sequential_wall, 1)
+        else:
+            result['throughput_rps'] = self._throughput(name, iterations, concurrency)
+        self.stderr.write(f"{name}: p95 {result['p95_ms']} ms, {result['queries_median']} queries")
+        return result
+
+    def _throughput(self, name, iterations, concurrency):
+        completed = []
+        lock = threading.Lock()
+
+        def _worker():
+            client = Client(SERVER_NAME='localhost')
+            done = 0
+            try:
+                for _ in range(max(iterations, 1)):
+                    if not self.warm:
+                        api_cache.reset_api_cache()
+                    self._request(client, name)
+                    done += 1
+            finally:
+                connections.close_all()
+            with lock:
+                completed.append(done)
+
+        threads = [threading.Thread(target=_worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        return round(sum(completed) / wall, 1) if wall else None
+
+    def _outbound_totals(self):
+        counters, _ = metrics.registry.snapshot()
+        calls = sum(value for (metric, _), value in counters.items() if metric == 'api_outbound_requests_total')
+        seconds = sum(value for (metric, _), value in counters.items() if metric == 'api_outbound_seconds_total')
+        return calls, seconds
+
+    # ------------------------------------------------------------------
+    # Comparison
+    # ------------------------------------------------------------------
+
+    def _compare(self, results, baseline_path, tolerance):
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)
+
+        regressions = []
+        self.stdout.write(f"\nComparison with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+        for name, current in results['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+            if not previous:
+                self.stdout.write(f"  {name}: not in baseline")
+                continue
+            p95_ratio = current['p95_ms'] / previous['p95_ms'] if previous['p95_ms'] else 1
+            line = (
+                f"  {name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms ({p95_ratio - 1:+.0%}), "
+                f"queries {previous['queries_median']} -> {current['queries_median']}"
+            )
+            if p95_ratio > 1 + tolerance or current['queries_median'] > previous['queries_median']:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line + '  REGRESSION'))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressed scenarios: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions."))
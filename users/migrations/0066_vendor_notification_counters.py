@@ -0,0 +1,71 @@
+"""
+Migration 0066: Maintained unread counters and archive table for vendor notifications.
+
+- vendor_notification_counters keeps one row per vendor with the current
+  unread count so the mobile app can poll it without scanning
+  vendor_notifications.
+- vendor_notifications_archive receives old, already-read notifications
+  moved out of the hot table by the archive_vendor_notifications command.
+- A (vendor_id, created_at DESC, id DESC) index backs cursor pagination.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0065_delete_tatchangerequest"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS vendor_notification_counters (
+                vendor_id       INTEGER PRIMARY KEY
+                                    REFERENCES users_vendor(id) ON DELETE CASCADE,
+                unread_count    INTEGER NOT NULL DEFAULT 0 CHECK (unread_count >= 0),
+                updated_at      TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW()
+            );
+
+            INSERT INTO vendor_notification_counters (vendor_id, unread_count, updated_at)
+            SELECT vendor_id, COUNT(*), NOW()
+            FROM vendor_notifications
+            WHERE is_read = FALSE
+            GROUP BY vendor_id
+            ON CONFLICT (vendor_id) DO UPDATE SET
+                unread_count = EXCLUDED.unread_count,
+                updated_at = NOW();
+
+            CREATE INDEX IF NOT EXISTS vendor_notifications_vendor_cursor_idx
+                ON vendor_notifications(vendor_id, created_at DESC, id DESC);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS vendor_notifications_vendor_cursor_idx;
+            DROP TABLE IF EXISTS vendor_notification_counters;
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS vendor_notifications_archive (
+                id                  BIGINT PRIMARY KEY,
+                vendor_id           INTEGER NOT NULL
+                                        REFERENCES users_vendor(id) ON DELETE CASCADE,
+                notification_type   VARCHAR(20) NOT NULL,
+                check_type          VARCHAR(20) NOT NULL,
+                case_id             INTEGER NOT NULL,
+                case_number         VARCHAR(100) NOT NULL DEFAULT '',
+                message             TEXT NOT NULL DEFAULT '',
+                is_read             BOOLEAN NOT NULL DEFAULT TRUE,
+                created_at          TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                archived_at         TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW()
+            );
+
+            CREATE INDEX IF NOT EXISTS vendor_notifications_archive_vendor_idx
+                ON vendor_notifications_archive(vendor_id, created_at DESC);
+            """,
+            reverse_sql="""
+            DROP TABLE IF EXISTS vendor_notifications_archive;
+            """,
+        ),
+    ]
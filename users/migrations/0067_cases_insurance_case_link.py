@@ -0,0 +1,54 @@
+"""
+Migration 0067: Canonical link between the raw 'cases' table and 'insurance_case'.
+
+Every case exists twice: once in the raw incident 'cases' table and once as
+the ORM InsuranceCase row. Until now the two were matched by comparing
+case_number strings. This adds cases.insurance_case_id, a nullable FK to
+insurance_case(id), backfills it from the existing case_number pairs and
+enforces one-to-one with a unique partial index, so cross-table lookups can
+join on integers.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0066_vendor_notification_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE cases
+                ADD COLUMN IF NOT EXISTS insurance_case_id BIGINT
+                    REFERENCES insurance_case(id) ON DELETE SET NULL;
+
+            -- If a case_number was ever duplicated on the ORM side, link the
+            -- oldest row so the unique index below can be built.
+            UPDATE cases c
+            SET insurance_case_id = ic.id
+            FROM (
+                SELECT DISTINCT ON (case_number) id, case_number
+                FROM insurance_case
+                WHERE case_number IS NOT NULL AND case_number <> ''
+                ORDER BY case_number, id
+            ) ic
+            WHERE c.insurance_case_id IS NULL
+              AND c.case_number = ic.case_number
+              AND NOT EXISTS (
+                  SELECT 1 FROM cases other
+                  WHERE other.case_number = c.case_number AND other.id < c.id
+              );
+
+            CREATE UNIQUE INDEX IF NOT EXISTS cases_insurance_case_id_uniq
+                ON cases (insurance_case_id)
+                WHERE insurance_case_id IS NOT NULL;
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS cases_insurance_case_id_uniq;
+            ALTER TABLE cases DROP COLUMN IF EXISTS insurance_case_id;
+            """,
+        ),
+    ]
@@ -0,0 +1,119 @@
+"""
+Migration 0068: Maintained per-case verification rollup.
+
+case_verification_state holds, for every case that has vendor checks, the
+number of checks and how many of them are 'Verified' across the five checks
+that gate Legal Review (claimant, insured, driver, spot, chargesheet).
+all_verified is a generated column with a partial index so the report
+listings can join against it instead of rescanning every check table.
+
+Row-level triggers on those five tables apply +/- deltas on INSERT, DELETE
+and UPDATE of check_status / case_id, so every writer (API, batch
+assignment, email ingestion, manual SQL) keeps the rollup current inside its
+own transaction. The table is backfilled here; rebuild_case_verification_state
+recomputes it if it ever drifts (e.g. triggers disabled for a bulk load).
+"""
+
+from django.db import migrations
+
+ROLLUP_TABLES = ("claimant_checks", "insured_checks", "driver_checks", "spot_checks", "chargesheets")
+
+CREATE_TRIGGERS = "\n".join(
+    f"""
+            DROP TRIGGER IF EXISTS trg_{table}_verification_state ON {table};
+            CREATE TRIGGER trg_{table}_verification_state
+                AFTER INSERT OR DELETE OR UPDATE OF check_status, case_id ON {table}
+                FOR EACH ROW EXECUTE FUNCTION apply_case_verification_delta();
+    """
+    for table in ROLLUP_TABLES
+)
+
+DROP_TRIGGERS = "\n".join(
+    f"DROP TRIGGER IF EXISTS trg_{table}_verification_state ON {table};"
+    for table in ROLLUP_TABLES
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0067_cases_insurance_case_link"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS case_verification_state (
+                case_id          INTEGER PRIMARY KEY
+                                     REFERENCES cases(id) ON DELETE CASCADE,
+                total_checks     INTEGER NOT NULL DEFAULT 0,
+                verified_checks  INTEGER NOT NULL DEFAULT 0,
+                all_verified     BOOLEAN GENERATED ALWAYS AS
+                                     (total_checks > 0 AND verified_checks = total_checks) STORED,
+                updated_at       TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW()
+            );
+
+            CREATE INDEX IF NOT EXISTS case_verification_state_all_verified_idx
+                ON case_verification_state (case_id)
+                WHERE all_verified;
+
+            CREATE OR REPLACE FUNCTION bump_case_verification_state(
+                p_case_id INTEGER, p_total INTEGER, p_verified INTEGER
+            ) RETURNS VOID AS $$
+            BEGIN
+                -- Skip cases that are being deleted in the same statement
+                -- (check rows cascade from cases).
+                INSERT INTO case_verification_state (case_id, total_checks, verified_checks)
+                SELECT p_case_id, GREATEST(p_total, 0), GREATEST(p_verified, 0)
+                WHERE EXISTS (SELECT 1 FROM cases WHERE id = p_case_id)
+                ON CONFLICT (case_id) DO UPDATE
+                SET total_checks = GREATEST(case_verification_state.total_checks + p_total, 0),
+                    verified_checks = GREATEST(case_verification_state.verified_checks + p_verified, 0),
+                    updated_at = NOW();
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION apply_case_verification_delta()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM bump_case_verification_state(
+                        OLD.case_id, -1,
+                        -(CASE WHEN OLD.check_status = 'Verified' THEN 1 ELSE 0 END)
+                    );
+                END IF;
+                IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                    PERFORM bump_case_verification_state(
+                        NEW.case_id, 1,
+                        CASE WHEN NEW.check_status = 'Verified' THEN 1 ELSE 0 END
+                    );
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """ + CREATE_TRIGGERS + """
+            INSERT INTO case_verification_state (case_id, total_checks, verified_checks)
+            SELECT checks.case_id,
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE checks.check_status = 'Verified')
+            FROM (
+                SELECT case_id, check_status FROM claimant_checks
+                UNION ALL SELECT case_id, check_status FROM insured_checks
+                UNION ALL SELECT case_id, check_status FROM driver_checks
+                UNION ALL SELECT case_id, check_status FROM spot_checks
+                UNION ALL SELECT case_id, check_status FROM chargesheets
+            ) checks
+            JOIN cases c ON c.id = checks.case_id
+            GROUP BY checks.case_id
+            ON CONFLICT (case_id) DO UPDATE
+            SET total_checks = EXCLUDED.total_checks,
+                verified_checks = EXCLUDED.verified_checks,
+                updated_at = NOW();
+            """,
+            reverse_sql=DROP_TRIGGERS + """
+            DROP FUNCTION IF EXISTS apply_case_verification_delta();
+            DROP FUNCTION IF EXISTS bump_case_verification_state(INTEGER, INTEGER, INTEGER);
+            DROP TABLE IF EXISTS case_verification_state;
+            """,
+        ),
+    ]
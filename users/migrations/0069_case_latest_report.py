@@ -0,0 +1,89 @@
+"""
+Migration 0069: Latest-report pointer per case.
+
+case_latest_report maps each insurance_case to the id of its newest report.
+A trigger on reports advances the pointer on INSERT and moves it back to the
+previous report on DELETE (or when a report changes case), so "latest report
+per case" is a primary-key lookup instead of MAX(id) GROUP BY case_id.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0068_case_verification_state"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS case_latest_report (
+                case_id           BIGINT PRIMARY KEY
+                                      REFERENCES insurance_case(id) ON DELETE CASCADE,
+                latest_report_id  BIGINT NOT NULL,
+                updated_at        TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW()
+            );
+
+            CREATE UNIQUE INDEX IF NOT EXISTS case_latest_report_report_uniq
+                ON case_latest_report (latest_report_id);
+
+            CREATE OR REPLACE FUNCTION refresh_case_latest_report(p_case_id BIGINT)
+            RETURNS VOID AS $$
+            DECLARE
+                v_latest BIGINT;
+            BEGIN
+                SELECT MAX(id) INTO v_latest FROM reports WHERE case_id = p_case_id;
+                IF v_latest IS NULL THEN
+                    DELETE FROM case_latest_report WHERE case_id = p_case_id;
+                ELSE
+                    -- Skip cases deleted in the same statement (reports cascade).
+                    INSERT INTO case_latest_report (case_id, latest_report_id)
+                    SELECT p_case_id, v_latest
+                    WHERE EXISTS (SELECT 1 FROM insurance_case WHERE id = p_case_id)
+                    ON CONFLICT (case_id) DO UPDATE
+                    SET latest_report_id = EXCLUDED.latest_report_id,
+                        updated_at = NOW();
+                END IF;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION track_case_latest_report()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO case_latest_report (case_id, latest_report_id)
+                    VALUES (NEW.case_id, NEW.id)
+                    ON CONFLICT (case_id) DO UPDATE
+                    SET latest_report_id = GREATEST(case_latest_report.latest_report_id, EXCLUDED.latest_report_id),
+                        updated_at = NOW();
+                ELSIF TG_OP = 'DELETE' THEN
+                    PERFORM refresh_case_latest_report(OLD.case_id);
+                ELSIF NEW.case_id IS DISTINCT FROM OLD.case_id THEN
+                    PERFORM refresh_case_latest_report(OLD.case_id);
+                    PERFORM refresh_case_latest_report(NEW.case_id);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_reports_latest_report ON reports;
+            CREATE TRIGGER trg_reports_latest_report
+                AFTER INSERT OR DELETE OR UPDATE OF case_id ON reports
+                FOR EACH ROW EXECUTE FUNCTION track_case_latest_report();
+
+            INSERT INTO case_latest_report (case_id, latest_report_id)
+            SELECT case_id, MAX(id) FROM reports GROUP BY case_id
+            ON CONFLICT (case_id) DO UPDATE
+            SET latest_report_id = EXCLUDED.latest_report_id,
+                updated_at = NOW();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS trg_reports_latest_report ON reports;
+            DROP FUNCTION IF EXISTS track_case_latest_report();
+            DROP FUNCTION IF EXISTS refresh_case_latest_report(BIGINT);
+            DROP TABLE IF EXISTS case_latest_report;
+            """,
+        ),
+    ]
@@ -0,0 +1,59 @@
+"""
+Migration 0070: QC review work queue.
+
+- reports.lease_expires_at marks reports claimed through the queue; an
+  expired lease puts the report back up for claiming.
+- Partial indexes cover the two queue probes (unclaimed PENDING reports in
+  FIFO order, and ASSIGNED reports with an expiring lease).
+- qc_review_throughput keeps per-reviewer, per-day counters of claims,
+  reviews, releases and expiries plus total claim-to-review time.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0069_case_latest_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='lease_expires_at',
+            field=models.DateTimeField(
+                blank=True,
+                null=True,
+                help_text='Set when claimed from the QC work queue; the report returns to the queue after this time',
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS reports_queue_pending_idx
+                ON reports (created_at, id)
+                WHERE status = 'PENDING' AND assigned_qc_id IS NULL;
+
+            CREATE INDEX IF NOT EXISTS reports_queue_lease_idx
+                ON reports (lease_expires_at)
+                WHERE status = 'ASSIGNED' AND lease_expires_at IS NOT NULL;
+
+            CREATE TABLE IF NOT EXISTS qc_review_throughput (
+                qc_id           BIGINT NOT NULL
+                                    REFERENCES users_customuser(id) ON DELETE CASCADE,
+                day             DATE NOT NULL,
+                claimed         INTEGER NOT NULL DEFAULT 0,
+                reviewed        INTEGER NOT NULL DEFAULT 0,
+                released        INTEGER NOT NULL DEFAULT 0,
+                expired         INTEGER NOT NULL DEFAULT 0,
+                review_seconds  BIGINT  NOT NULL DEFAULT 0,
+                PRIMARY KEY (qc_id, day)
+            );
+            """,
+            reverse_sql="""
+            DROP TABLE IF EXISTS qc_review_throughput;
+            DROP INDEX IF EXISTS reports_queue_lease_idx;
+            DROP INDEX IF EXISTS reports_queue_pending_idx;
+            """,
+        ),
+    ]
@@ -0,0 +1,107 @@
+"""
+Migration 0071: Per-case data version.
+
+cases.data_version is bumped on every write that changes what a case looks
+like to readers:
+- any UPDATE of the cases row itself;
+- INSERT / UPDATE / DELETE on any of the seven check tables;
+- UPDATE of the linked insurance_case row.
+
+The case aggregate cache (users/services/case_aggregate.py) keys cached
+entries on this version, so a cached aggregate is served only while nothing
+about the case has changed.
+"""
+
+from django.db import migrations
+
+CHECK_TABLES = (
+    "claimant_checks",
+    "insured_checks",
+    "driver_checks",
+    "spot_checks",
+    "chargesheets",
+    "rti_checks",
+    "rto_checks",
+)
+
+CREATE_CHECK_TRIGGERS = "\n".join(
+    f"""
+            DROP TRIGGER IF EXISTS trg_{table}_case_data_version ON {table};
+            CREATE TRIGGER trg_{table}_case_data_version
+                AFTER INSERT OR UPDATE OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION touch_case_data_version();
+    """
+    for table in CHECK_TABLES
+)
+
+DROP_CHECK_TRIGGERS = "\n".join(
+    f"DROP TRIGGER IF EXISTS trg_{table}_case_data_version ON {table};"
+    for table in CHECK_TABLES
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0070_report_lease_qc_queue"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE cases ADD COLUMN IF NOT EXISTS data_version BIGINT NOT NULL DEFAULT 1;
+
+            -- Direct writes to cases: bump unless the writer already did.
+            CREATE OR REPLACE FUNCTION bump_case_data_version()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF NEW.data_version IS NOT DISTINCT FROM OLD.data_version THEN
+                    NEW.data_version := OLD.data_version + 1;
+                END IF;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_cases_data_version ON cases;
+            CREATE TRIGGER trg_cases_data_version
+                BEFORE UPDATE ON cases
+                FOR EACH ROW EXECUTE FUNCTION bump_case_data_version();
+
+            -- Writes to check rows bump the owning case.
+            CREATE OR REPLACE FUNCTION touch_case_data_version()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE cases SET data_version = data_version + 1 WHERE id = OLD.case_id;
+                END IF;
+                IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.case_id IS DISTINCT FROM OLD.case_id) THEN
+                    UPDATE cases SET data_version = data_version + 1 WHERE id = NEW.case_id;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """ + CREATE_CHECK_TRIGGERS + """
+            -- Writes to the linked ORM case bump the incident case.
+            CREATE OR REPLACE FUNCTION touch_case_data_version_from_insurance_case()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE cases SET data_version = data_version + 1 WHERE insurance_case_id = NEW.id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_insurance_case_case_data_version ON insurance_case;
+            CREATE TRIGGER trg_insurance_case_case_data_version
+                AFTER UPDATE ON insurance_case
+                FOR EACH ROW EXECUTE FUNCTION touch_case_data_version_from_insurance_case();
+            """,
+            reverse_sql=DROP_CHECK_TRIGGERS + """
+            DROP TRIGGER IF EXISTS trg_insurance_case_case_data_version ON insurance_case;
+            DROP TRIGGER IF EXISTS trg_cases_data_version ON cases;
+            DROP FUNCTION IF EXISTS touch_case_data_version_from_insurance_case();
+            DROP FUNCTION IF EXISTS touch_case_data_version();
+            DROP FUNCTION IF EXISTS bump_case_data_version();
+            ALTER TABLE cases DROP COLUMN IF EXISTS data_version;
+            """,
+        ),
+    ]
@@ -0,0 +1,29 @@
+"""
+Migration 0072: Partial index on live auth tokens.
+
+The user-management page prefetches active tokens for a page of users and
+closes dead ones with a single UPDATE; both only touch is_active rows, which
+stay a small fraction of the table once purge_auth_tokens runs.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0071_case_data_version"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS users_authtoken_active_idx
+                ON users_authtoken (user_id, created_at DESC)
+                WHERE is_active;
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS users_authtoken_active_idx;
+            """,
+        ),
+    ]
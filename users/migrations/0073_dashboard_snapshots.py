@@ -0,0 +1,57 @@
+"""
+Migration 0073: Stored dashboard statistics snapshots.
+
+dashboard_snapshots holds one precomputed JSON payload per dashboard with
+the time it was computed. Statement-level triggers on users_customuser and
+insurance_client mark the Super Admin snapshot stale, so the next dashboard
+load recomputes it. last_login updates are not counted as user changes.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0072_authtoken_active_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS dashboard_snapshots (
+                name        TEXT PRIMARY KEY,
+                payload     JSONB NOT NULL,
+                computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                stale       BOOLEAN NOT NULL DEFAULT FALSE
+            );
+
+            CREATE OR REPLACE FUNCTION mark_super_admin_dashboard_stale()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE dashboard_snapshots SET stale = TRUE
+                WHERE name = 'super_admin' AND NOT stale;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_users_dashboard_stale ON users_customuser;
+            CREATE TRIGGER trg_users_dashboard_stale
+                AFTER INSERT OR DELETE
+                   OR UPDATE OF role, sub_role, is_active, first_name, last_name, email, username
+                ON users_customuser
+                FOR EACH STATEMENT EXECUTE FUNCTION mark_super_admin_dashboard_stale();
+
+            DROP TRIGGER IF EXISTS trg_insurance_client_dashboard_stale ON insurance_client;
+            CREATE TRIGGER trg_insurance_client_dashboard_stale
+                AFTER INSERT OR UPDATE OR DELETE ON insurance_client
+                FOR EACH STATEMENT EXECUTE FUNCTION mark_super_admin_dashboard_stale();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS trg_insurance_client_dashboard_stale ON insurance_client;
+            DROP TRIGGER IF EXISTS trg_users_dashboard_stale ON users_customuser;
+            DROP FUNCTION IF EXISTS mark_super_admin_dashboard_stale();
+            DROP TABLE IF EXISTS dashboard_snapshots;
+            """,
+        ),
+    ]
@@ -0,0 +1,144 @@
+"""
+Migration 0074: Tag versions for the tiered API cache (core/api_cache.py).
+
+cache_tag_versions holds one counter per cache tag. Cached API responses
+remember the versions of their tags and are discarded once any of them
+moves. Triggers bump the tags so every writer invalidates, ORM or raw SQL:
+- court_details: any write to court_details (statement level);
+- vendor:{assigned_vendor_id}: any update of a case with that vendor on one
+  of its checks (check writes reach cases through the data_version
+  triggers of 0071), and the previous vendor when a check is reassigned or
+  deleted;
+- report:{id}: any update or delete of the report.
+
+case:{id} tags need no counter: the cache reads cases.data_version.
+"""
+
+from django.db import migrations
+
+CHECK_TABLES = (
+    "claimant_checks",
+    "insured_checks",
+    "driver_checks",
+    "spot_checks",
+    "chargesheets",
+    "rti_checks",
+    "rto_checks",
+)
+
+CASE_VENDORS_SQL = "\n                    UNION\n".join(
+    f"                    SELECT assigned_vendor_id FROM {table} WHERE case_id = NEW.id"
+    for table in CHECK_TABLES
+)
+
+CREATE_CHECK_TRIGGERS = "\n".join(
+    f"""
+            DROP TRIGGER IF EXISTS trg_{table}_vendor_cache_tag ON {table};
+            CREATE TRIGGER trg_{table}_vendor_cache_tag
+                AFTER UPDATE OF assigned_vendor_id OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION bump_previous_vendor_cache_tag();
+    """
+    for table in CHECK_TABLES
+)
+
+DROP_CHECK_TRIGGERS = "\n".join(
+    f"DROP TRIGGER IF EXISTS trg_{table}_vendor_cache_tag ON {table};"
+    for table in CHECK_TABLES
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0073_dashboard_snapshots"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS cache_tag_versions (
+                tag        TEXT PRIMARY KEY,
+                version    BIGINT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+
+            CREATE OR REPLACE FUNCTION bump_cache_tag(p_tag TEXT)
+            RETURNS VOID AS $$
+                INSERT INTO cache_tag_versions (tag, version, updated_at)
+                VALUES (p_tag, 1, NOW())
+                ON CONFLICT (tag) DO UPDATE
+                SET version = cache_tag_versions.version + 1, updated_at = NOW();
+            $$ LANGUAGE sql;
+
+            -- court_details is only ever bulk-reloaded; one bump per statement.
+            CREATE OR REPLACE FUNCTION bump_court_details_cache_tag()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM bump_cache_tag('court_details');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_court_details_cache_tag ON court_details;
+            CREATE TRIGGER trg_court_details_cache_tag
+                AFTER INSERT OR UPDATE OR DELETE ON court_details
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_court_details_cache_tag();
+
+            -- A case changed: every vendor holding one of its checks sees it.
+            -- Vendors are bumped in id order so concurrent writers lock tag rows consistently.
+            CREATE OR REPLACE FUNCTION bump_case_vendor_cache_tags()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM bump_cache_tag('vendor:' || v.assigned_vendor_id)
+                FROM (
+""" + CASE_VENDORS_SQL + """
+                ) v
+                WHERE v.assigned_vendor_id IS NOT NULL
+                ORDER BY v.assigned_vendor_id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_cases_vendor_cache_tags ON cases;
+            CREATE TRIGGER trg_cases_vendor_cache_tags
+                AFTER UPDATE ON cases
+                FOR EACH ROW EXECUTE FUNCTION bump_case_vendor_cache_tags();
+
+            -- A check left its vendor (reassigned or deleted).
+            CREATE OR REPLACE FUNCTION bump_previous_vendor_cache_tag()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF OLD.assigned_vendor_id IS NOT NULL
+                   AND (TG_OP = 'DELETE' OR NEW.assigned_vendor_id IS DISTINCT FROM OLD.assigned_vendor_id) THEN
+                    PERFORM bump_cache_tag('vendor:' || OLD.assigned_vendor_id);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """ + CREATE_CHECK_TRIGGERS + """
+            CREATE OR REPLACE FUNCTION bump_report_cache_tag()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM bump_cache_tag('report:' || OLD.id);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_reports_cache_tag ON reports;
+            CREATE TRIGGER trg_reports_cache_tag
+                AFTER UPDATE OR DELETE ON reports
+                FOR EACH ROW EXECUTE FUNCTION bump_report_cache_tag();
+            """,
+            reverse_sql=DROP_CHECK_TRIGGERS + """
+            DROP TRIGGER IF EXISTS trg_reports_cache_tag ON reports;
+            DROP TRIGGER IF EXISTS trg_cases_vendor_cache_tags ON cases;
+            DROP TRIGGER IF EXISTS trg_court_details_cache_tag ON court_details;
+            DROP FUNCTION IF EXISTS bump_report_cache_tag();
+            DROP FUNCTION IF EXISTS bump_previous_vendor_cache_tag();
+            DROP FUNCTION IF EXISTS bump_case_vendor_cache_tags();
+            DROP FUNCTION IF EXISTS bump_court_details_cache_tag();
+            DROP FUNCTION IF EXISTS bump_cache_tag(TEXT);
+            DROP TABLE IF EXISTS cache_tag_versions;
+            """,
+        ),
+    ]
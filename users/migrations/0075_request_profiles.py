@@ -0,0 +1,45 @@
+"""
+Migration 0075: Stored request profiles.
+
+request_profiles keeps the output of on-demand request profiling
+(core/profiling.py): the marshalled cProfile stats, collapsed stacks from
+the sampler, a text summary and the per-statement SQL breakdown.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0074_cache_tag_versions"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS request_profiles (
+                id               BIGSERIAL PRIMARY KEY,
+                created_at       TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                method           VARCHAR(10) NOT NULL,
+                path             TEXT NOT NULL,
+                query_string     TEXT NOT NULL DEFAULT '',
+                status_code      INTEGER NOT NULL,
+                duration_ms      DOUBLE PRECISION NOT NULL,
+                requested_by_id  BIGINT REFERENCES users_customuser(id) ON DELETE SET NULL,
+                query_count      INTEGER NOT NULL DEFAULT 0,
+                sql_ms           DOUBLE PRECISION NOT NULL DEFAULT 0,
+                sql_breakdown    JSONB NOT NULL DEFAULT '[]'::jsonb,
+                summary          TEXT NOT NULL DEFAULT '',
+                pstats           BYTEA NOT NULL,
+                collapsed_stacks TEXT NOT NULL DEFAULT ''
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_request_profiles_created_at
+                ON request_profiles (created_at DESC);
+            """,
+            reverse_sql="""
+            DROP TABLE IF EXISTS request_profiles;
+            """,
+        ),
+    ]
@@ -0,0 +1,95 @@
+"""
+Migration 0076: Rename completion/case-type columns to their current names.
+
+The models and the raw SQL read closure_date, closure_month and
+investigation_type, but the migrations still created completion_date,
+completion_month and case_type on both insurance_case and cases.
+Databases whose columns were already renamed by hand are left as they are;
+fresh databases (and the test database) get the current names.
+"""
+
+from django.db import migrations, models
+
+RENAMES = (
+    ('completion_date', 'closure_date'),
+    ('completion_month', 'closure_month'),
+    ('case_type', 'investigation_type'),
+)
+
+
+def _rename_sql(table, pairs):
+    statements = []
+    for old, new in pairs:
+        statements.append(f"""
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = '{table}' AND column_name = '{old}')
+           AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                           WHERE table_schema = current_schema() AND table_name = '{table}' AND column_name = '{new}')
+        THEN
+            ALTER TABLE {table} RENAME COLUMN {old} TO {new};
+        END IF;""")
+    return "DO $$ BEGIN" + "".join(statements) + "\nEND $$;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0075_request_profiles"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=_rename_sql('cases', RENAMES),
+            reverse_sql=_rename_sql('cases', [(new, old) for old, new in RENAMES]),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=_rename_sql('insurance_case', RENAMES),
+                    reverse_sql=_rename_sql('insurance_case', [(new, old) for old, new in RENAMES]),
+                ),
+            ],
+            state_operations=[
+                migrations.RenameField(
+                    model_name='insurancecase',
+                    old_name='completion_date',
+                    new_name='closure_date',
+                ),
+                migrations.RenameField(
+                    model_name='insurancecase',
+                    old_name='completion_month',
+                    new_name='closure_month',
+                ),
+                migrations.RenameField(
+                    model_name='insurancecase',
+                    old_name='case_type',
+                    new_name='investigation_type',
+                ),
+                migrations.AlterField(
+                    model_name='insurancecase',
+                    name='closure_date',
+                    field=models.DateField(blank=True, help_text='Date case was closed', null=True),
+                ),
+                migrations.AlterField(
+                    model_name='insurancecase',
+                    name='closure_month',
+                    field=models.CharField(blank=True, help_text='Month of closure', max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='insurancecase',
+                    name='investigation_type',
+                    field=models.CharField(
+                        blank=True,
+                        choices=[
+                            ('Full Case', 'Full Case'),
+                            ('Partial Case', 'Partial Case'),
+                            ('Reassessment', 'Reassessment'),
+                            ('Connected Case', 'Connected Case'),
+                        ],
+                        help_text='Full Case / Partial / Reassessment / Connected',
+                        max_length=50,
+                    ),
+                ),
+            ],
+        ),
+    ]
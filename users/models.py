@@ -894,6 +894,11 @@ class Report(models.Model):
         limit_choices_to={'role': CustomUser.Role.QC},
     )
     assigned_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Set when claimed from the QC work queue; the report returns to the queue after this time'
+    )
     reviewed_at = models.DateTimeField(null=True, blank=True)
     review_notes = models.TextField(
         blank=True,
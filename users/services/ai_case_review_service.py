@@ -6,7 +6,7 @@ import base64
 import os
 from typing import Any, Dict
 
-import requests
+from core import http_client
 
 
 class AICaseReviewGenerationError(Exception):
@@ -232,8 +232,7 @@ class AICaseReviewService:
 
     def _call_text_model(self, prompt: str) -> str:
         """Call Groq with the text-only model."""
-        response = requests.post(
-            self.api_url,
+        response = self._post(
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
@@ -270,8 +269,7 @@ class AICaseReviewService:
                 }
             )
 
-        response = requests.post(
-            self.api_url,
+        response = self._post(
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
@@ -287,7 +285,13 @@ class AICaseReviewService:
         )
         return self._parse_response(response)
 
-    def _parse_response(self, response: requests.Response) -> str:
+    def _post(self, **kwargs):
+        try:
+            return http_client.post("groq", self.api_url, **kwargs)
+        except http_client.OutboundHTTPError as exc:
+            raise AICaseReviewGenerationError(f"Groq request failed: {exc}") from exc
+
+    def _parse_response(self, response) -> str:
         """Parse the Groq API response and return the report text."""
         if response.status_code >= 400:
             raise AICaseReviewGenerationError(
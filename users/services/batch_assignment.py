@@ -0,0 +1,484 @@
+"""Batch vendor assignment for unassigned checks.
+
+Collects every unassigned, still-open row across the seven check tables,
+plans a capacity-constrained assignment against active vendors and applies
+it with one set-based UPDATE per check table plus a single batched
+notification fan-out.
+
+Cost model
+----------
+For each check only the ``candidates_per_check`` nearest vendors (from the
+in-memory ``VendorLocator``) within ``max_distance_km`` are considered, so a
+check has at most ``k`` candidate edges rather than one per vendor. Giving a
+vendor its n-th check (m-th of that type) costs
+``score_vendor(distance, n, m)``: distance plus a workload penalty that grows
+with every check the vendor already holds, counting this batch. A plan's
+cost is the sum over its assignments. It does not depend on the order
+checks are handed out, because each vendor's penalties add up to the same
+total whichever check gets which slot.
+
+Solvers
+-------
+``exact`` (default) assigns as many checks as capacity allows and, among
+those plans, returns one of minimum total cost. It is a min-cost max-flow on
+the sparse graph check -> (vendor, check type) -> vendor -> sink. The
+workload terms are convex per-unit costs on the last two arcs and
+``max_open_checks`` caps the vendor -> sink arc. Checks are added one at a
+time, and each is routed along the cheapest augmenting path in the residual
+graph. That path may move earlier checks to other vendors to free a slot, or
+leave one unassigned when the new check uses the slot more cheaply. Leaving
+a check unassigned is an arc straight to the sink that costs more than any
+complete plan, so every search has a target. The search is Dijkstra on
+potential-reduced costs and stops there, so it mostly explores the
+neighbourhood of the new check. Costs are rounded to whole metres so the
+potentials stay exact integers. The solver is pure Python: NumPy/SciPy are
+not dependencies of this project, and a dense cost matrix would not fit
+the sparse k-candidate graph anyway.
+
+``greedy`` is the earlier lazy-greedy heuristic, kept as an explicit
+fallback: it takes the cheapest open edge from a heap and never reassigns a
+check, so it may assign fewer checks or pay more. On synthetic data
+(``bench_batch_assignment``, which reports the gap between the two), 5,000
+checks over 500 vendors take about 1 s exact versus 0.5 s greedy. With
+20,000 checks, far more than the vendors' capacity, exact takes about 40 s
+versus 2.7 s greedy.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connections, transaction
+
+from users.services.vendor_locator import (
+    CHECK_COORDINATE_COLUMNS,
+    CHECK_TABLES,
+    CLOSED_CHECK_STATUSES,
+    LOAD_PENALTY_KM,
+    TYPE_LOAD_PENALTY_KM,
+    VendorLocator,
+    get_open_check_counts,
+    get_vendor_locator,
+    score_vendor,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_OPEN_CHECKS = 25
+DEFAULT_CANDIDATES_PER_CHECK = 8
+DEFAULT_MAX_DISTANCE_KM = 300.0
+UPDATE_CHUNK_SIZE = 1000
+
+SOLVERS = ('exact', 'greedy')
+DEFAULT_SOLVER = 'exact'
+# The exact solver works in integer metres.
+_COST_SCALE = 1000
+
+
+@dataclass
+class PendingCheck:
+    check_type: str
+    check_id: int
+    case_id: int
+    case_number: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+@dataclass
+class PlannedAssignment:
+    check_type: str
+    check_id: int
+    case_id: int
+    case_number: str
+    vendor_id: int
+    distance_km: float
+    cost: float
+
+
+@dataclass
+class AssignmentPlan:
+    assignments: List[PlannedAssignment] = field(default_factory=list)
+    unassigned: List[Tuple[PendingCheck, str]] = field(default_factory=list)
+    vendor_load: Dict[int, int] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        by_type: Dict[str, int] = {}
+        for item in self.assignments:
+            by_type[item.check_type] = by_type.get(item.check_type, 0) + 1
+        reasons: Dict[str, int] = {}
+        for _, reason in self.unassigned:
+            reasons[reason] = reasons.get(reason, 0) + 1
+        total_km = sum(item.distance_km for item in self.assignments)
+        return {
+            "total_cost": round(sum(item.cost for item in self.assignments), 3),
+            "assigned": len(self.assignments),
+            "unassigned": len(self.unassigned),
+            "assigned_by_check_type": by_type,
+            "unassigned_reasons": reasons,
+            "vendors_used": len({item.vendor_id for item in self.assignments}),
+            "mean_distance_km": round(total_km / len(self.assignments), 2) if self.assignments else None,
+        }
+
+
+def load_unassigned_checks(check_types: Optional[Iterable[str]] = None) -> List[PendingCheck]:
+    """Load every unassigned, open check row with its geocoded coordinates in one query."""
+    requested = set(check_types) if check_types is not None else None
+    wanted = [ct for ct in CHECK_TABLES if requested is None or ct in requested]
+    if not wanted:
+        return []
+
+    status_placeholders = ", ".join(["%s"] * len(CLOSED_CHECK_STATUSES))
+    parts = []
+    params: list = []
+    for check_type in wanted:
+        table = CHECK_TABLES[check_type]
+        coord_cols = CHECK_COORDINATE_COLUMNS.get(check_type)
+        lat_expr, lng_expr = (
+            (f"t.{coord_cols[0]}::float", f"t.{coord_cols[1]}::float") if coord_cols
+            else ("NULL::float", "NULL::float")
+        )
+        parts.append(
+            f"SELECT %s AS check_type, t.id, t.case_id, COALESCE(c.case_number, '') AS case_number, "
+            f"{lat_expr} AS lat, {lng_expr} AS lng "
+            f"FROM {table} t LEFT JOIN cases c ON c.id = t.case_id "
+            f"WHERE t.assigned_vendor_id IS NULL AND t.check_status NOT IN ({status_placeholders})"
+        )
+        params.extend([check_type, *CLOSED_CHECK_STATUSES])
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(" UNION ALL ".join(parts) + " ORDER BY 3, 1", params)
+        return [PendingCheck(*row) for row in cursor.fetchall()]
+
+
+def solve_assignment(
+    checks: Sequence[PendingCheck],
+    locator: VendorLocator,
+    current_load: Dict[int, Dict[str, int]],
+    max_open_checks: int = DEFAULT_MAX_OPEN_CHECKS,
+    candidates_per_check: int = DEFAULT_CANDIDATES_PER_CHECK,
+    max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+    solver: str = DEFAULT_SOLVER,
+) -> AssignmentPlan:
+    """Capacity-constrained assignment of ``checks`` (pure function, no I/O; see module docstring)."""
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}'. Valid: {', '.join(SOLVERS)}")
+
+    plan = AssignmentPlan()
+    load_total: Dict[int, int] = {vid: sum(by_type.values()) for vid, by_type in current_load.items()}
+    load_by_type: Dict[Tuple[int, str], int] = {
+        (vid, ct): count for vid, by_type in current_load.items() for ct, count in by_type.items()
+    }
+
+    # index -> [(vendor_id, distance_km), ...] for checks with at least one vendor in range.
+    candidates: Dict[int, List[Tuple[int, float]]] = {}
+    for index, check in enumerate(checks):
+        if check.latitude is None or check.longitude is None:
+            plan.unassigned.append((check, "missing_coordinates"))
+            continue
+        nearest = locator.nearest(
+            check.latitude, check.longitude, k=candidates_per_check, max_distance_km=max_distance_km,
+        )
+        if not nearest:
+            plan.unassigned.append((check, "no_vendor_in_range"))
+            continue
+        candidates[index] = [(vendor.id, distance) for distance, vendor in nearest]
+
+    if solver == 'greedy':
+        chosen = _solve_greedy(checks, candidates, load_total, load_by_type, max_open_checks)
+    else:
+        chosen = _solve_min_cost_flow(checks, candidates, load_total, load_by_type, max_open_checks)
+
+    # Cost each assignment at the load it lands on; the total is the plan's cost either way.
+    for index in candidates:
+        if index not in chosen:
+            plan.unassigned.append((checks[index], "capacity_exhausted"))
+            continue
+        check = checks[index]
+        vendor_id, distance = chosen[index]
+        plan.assignments.append(PlannedAssignment(
+            check_type=check.check_type,
+            check_id=check.check_id,
+            case_id=check.case_id,
+            case_number=check.case_number,
+            vendor_id=vendor_id,
+            distance_km=round(distance, 2),
+            cost=round(score_vendor(
+                distance, load_total.get(vendor_id, 0), load_by_type.get((vendor_id, check.check_type), 0),
+            ), 3),
+        ))
+        load_total[vendor_id] = load_total.get(vendor_id, 0) + 1
+        load_by_type[(vendor_id, check.check_type)] = load_by_type.get((vendor_id, check.check_type), 0) + 1
+
+    plan.vendor_load = load_total
+    return plan
+
+
+def _solve_greedy(
+    checks: Sequence[PendingCheck],
+    candidates: Dict[int, List[Tuple[int, float]]],
+    load_total: Dict[int, int],
+    load_by_type: Dict[Tuple[int, str], int],
+    max_open_checks: int,
+) -> Dict[int, Tuple[int, float]]:
+    """Lazy-greedy heuristic: cheapest open edge first, never reassigned. Returns index -> (vendor, km)."""
+    load_total = dict(load_total)
+    load_by_type = dict(load_by_type)
+
+    def _cost(distance: float, vendor_id: int, check_type: str) -> float:
+        return score_vendor(
+            distance, load_total.get(vendor_id, 0), load_by_type.get((vendor_id, check_type), 0)
+        )
+
+    heap: List[Tuple[float, int, int, float]] = [
+        (_cost(distance, vendor_id, checks[index].check_type), index, vendor_id, distance)
+        for index, edges in candidates.items()
+        for vendor_id, distance in edges
+    ]
+    heapq.heapify(heap)
+
+    chosen: Dict[int, Tuple[int, float]] = {}
+    while heap:
+        cost, index, vendor_id, distance = heapq.heappop(heap)
+        if index in chosen:
+            continue
+        if load_total.get(vendor_id, 0) >= max_open_checks:
+            continue
+        check_type = checks[index].check_type
+        current_cost = _cost(distance, vendor_id, check_type)
+        if current_cost > cost + 1e-9:
+            # Vendor received work since this edge was costed; retry at its true cost.
+            heapq.heappush(heap, (current_cost, index, vendor_id, distance))
+            continue
+        chosen[index] = (vendor_id, distance)
+        load_total[vendor_id] = load_total.get(vendor_id, 0) + 1
+        load_by_type[(vendor_id, check_type)] = load_by_type.get((vendor_id, check_type), 0) + 1
+    return chosen
+
+
+def _solve_min_cost_flow(
+    checks: Sequence[PendingCheck],
+    candidates: Dict[int, List[Tuple[int, float]]],
+    load_total: Dict[int, int],
+    load_by_type: Dict[Tuple[int, str], int],
+    max_open_checks: int,
+) -> Dict[int, Tuple[int, float]]:
+    """Exact min-cost max-flow by successive shortest paths. Returns index -> (vendor, km)."""
+    # Nodes: checks 0..C-1, then (vendor, type) slots, then vendors, then the sink.
+    # Any routing order gives the optimum; nearest-first needs the fewest reroutes.
+    order = sorted(candidates, key=lambda index: candidates[index][0][1])
+    check_count = len(order)
+    slot_ids: Dict[Tuple[int, str], int] = {}
+    vendor_ids: Dict[int, int] = {}
+    for index in order:
+        check_type = checks[index].check_type
+        for vendor_id, _ in candidates[index]:
+            slot_ids.setdefault((vendor_id, check_type), 0)
+            vendor_ids.setdefault(vendor_id, 0)
+    first_vendor = check_count + len(slot_ids)
+    for offset, key in enumerate(slot_ids):
+        slot_ids[key] = check_count + offset
+    for offset, vendor_id in enumerate(vendor_ids):
+        vendor_ids[vendor_id] = first_vendor + offset
+    sink = first_vendor + len(vendor_ids)
+
+    # check node -> {slot node: cost}; slot/vendor arcs carry convex per-unit costs.
+    check_edges: List[Dict[int, int]] = [
+        {
+            slot_ids[(vendor_id, checks[index].check_type)]: round(distance * _COST_SCALE)
+            for vendor_id, distance in candidates[index]
+        }
+        for index in order
+    ]
+    slot_vendor: Dict[int, int] = {slot: vendor_ids[vendor_id] for (vendor_id, _), slot in slot_ids.items()}
+    slot_base = {slot: load_by_type.get(key, 0) for key, slot in slot_ids.items()}
+    slot_flow = dict.fromkeys(slot_ids.values(), 0)
+    slot_members: Dict[int, set] = {slot: set() for slot in slot_ids.values()}
+    vendor_slots: Dict[int, List[int]] = {node: [] for node in vendor_ids.values()}
+    for slot, vendor in slot_vendor.items():
+        vendor_slots[vendor].append(slot)
+    vendor_base = {node: load_total.get(vendor_id, 0) for vendor_id, node in vendor_ids.items()}
+    vendor_cap = {node: max(0, max_open_checks - base) for node, base in vendor_base.items()}
+    vendor_flow = dict.fromkeys(vendor_ids.values(), 0)
+    type_step = round(TYPE_LOAD_PENALTY_KM * _COST_SCALE)
+    load_step = round(LOAD_PENALTY_KM * _COST_SCALE)
+
+    # Every check may also go straight to the sink, unassigned. That arc costs more
+    # than any complete plan, so the flow places as many checks as possible first.
+    # It also gives every search a target, so none has to exhaust a full region.
+    max_edge = max((cost for edges in check_edges for cost in edges.values()), default=0)
+    drop_cost = 1 + check_count * (
+        max_edge
+        + type_step * (max(slot_base.values(), default=0) + check_count)
+        + load_step * max(max_open_checks, 0)
+    )
+    UNROUTED, DROPPED = -1, -2
+    assigned_slot = [UNROUTED] * check_count
+    potential = [0] * (sink + 1)
+
+    def _arcs(node) -> list:
+        """Residual arcs out of ``node`` as [(head, cost), ...]."""
+        if node < check_count:
+            current = assigned_slot[node]
+            arcs = [(slot, cost) for slot, cost in check_edges[node].items() if slot != current]
+            if current != DROPPED:
+                arcs.append((sink, drop_cost))
+            return arcs
+        if node < first_vendor:
+            arcs = [(member, -check_edges[member][node]) for member in slot_members[node]]
+            arcs.append((slot_vendor[node], type_step * (slot_base[node] + slot_flow[node])))
+            return arcs
+        arcs = [
+            (slot, -type_step * (slot_base[slot] + slot_flow[slot] - 1))
+            for slot in vendor_slots[node] if slot_flow[slot]
+        ]
+        if vendor_flow[node] < vendor_cap[node]:
+            arcs.append((sink, load_step * (vendor_base[node] + vendor_flow[node])))
+        return arcs
+
+    for start in range(check_count):
+        # A new check has no incoming residual arcs; any potential that keeps its arcs non-negative works.
+        potential[start] = max(
+            potential[sink] - drop_cost,
+            *(potential[slot] - cost for slot, cost in check_edges[start].items()),
+        )
+
+        # Dijkstra on reduced costs, stopping at the sink (always reachable via the drop arc).
+        distance = {start: 0}
+        previous = {}
+        settled = set()
+        heap = [(0, start)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == sink:
+                break
+            base = dist + potential[node]
+            for head, cost in _arcs(node):
+                if head in settled:
+                    continue
+                candidate = base + cost - potential[head]
+                known = distance.get(head)
+                if known is None or candidate < known:
+                    distance[head] = candidate
+                    previous[head] = node
+                    heapq.heappush(heap, (candidate, head))
+
+        # Keep reduced costs non-negative: pi += min(d, d(sink)) for every node.
+        reach = distance[sink]
+        for node in settled:
+            potential[node] += distance[node] - reach
+
+        node = sink
+        while node != start:
+            tail = previous[node]
+            if tail < check_count:
+                if node == sink:
+                    assigned_slot[tail] = DROPPED
+                else:
+                    assigned_slot[tail] = node
+                    slot_members[node].add(tail)
+            elif tail < first_vendor:
+                if node < check_count:
+                    slot_members[tail].discard(node)
+                else:
+                    slot_flow[tail] += 1
+            elif node == sink:
+                vendor_flow[tail] += 1
+            else:
+                slot_flow[node] -= 1
+            node = tail
+
+    slot_keys = {slot: key for key, slot in slot_ids.items()}
+    chosen: Dict[int, Tuple[int, float]] = {}
+    for position, slot in enumerate(assigned_slot):
+        if slot < 0:
+            continue
+        index = order[position]
+        vendor_id = slot_keys[slot][0]
+        chosen[index] = (vendor_id, next(km for vid, km in candidates[index] if vid == vendor_id))
+    return chosen
+
+
+def apply_assignment(plan: AssignmentPlan) -> List[PlannedAssignment]:
+    """Write the plan with one set-based UPDATE per check table (chunked).
+
+    Rows assigned concurrently since the plan was computed are skipped by the
+    ``assigned_vendor_id IS NULL`` guard. Returns the assignments actually applied.
+    """
+    by_table: Dict[str, List[PlannedAssignment]] = {}
+    for item in plan.assignments:
+        by_table.setdefault(CHECK_TABLES[item.check_type], []).append(item)
+
+    applied: List[PlannedAssignment] = []
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            for table, items in by_table.items():
+                lookup = {item.check_id: item for item in items}
+                for offset in range(0, len(items), UPDATE_CHUNK_SIZE):
+                    chunk = items[offset:offset + UPDATE_CHUNK_SIZE]
+                    values_sql = ", ".join(["(%s, %s)"] * len(chunk))
+                    params: list = []
+                    for item in chunk:
+                        params.extend([item.check_id, item.vendor_id])
+                    cursor.execute(
+                        f"""
+                        UPDATE {table} AS t
+                        SET assigned_vendor_id = v.vendor_id,
+                            check_status = 'WIP',
+                            updated_at = NOW()
+                        FROM (VALUES {values_sql}) AS v(id, vendor_id)
+                        WHERE t.id = v.id AND t.assigned_vendor_id IS NULL
+                        RETURNING t.id
+                        """,
+                        params,
+                    )
+                    applied.extend(lookup[row[0]] for row in cursor.fetchall())
+    return applied
+
+
+def run_batch_assignment(
+    dry_run: bool = True,
+    check_types: Optional[Iterable[str]] = None,
+    max_open_checks: int = DEFAULT_MAX_OPEN_CHECKS,
+    candidates_per_check: int = DEFAULT_CANDIDATES_PER_CHECK,
+    max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+    solver: str = DEFAULT_SOLVER,
+) -> dict:
+    """Plan (and unless ``dry_run``, apply and notify) a batch vendor assignment."""
+    checks = load_unassigned_checks(check_types)
+    locator = get_vendor_locator()
+    current_load = get_open_check_counts([vendor.id for vendor in locator.vendors])
+    plan = solve_assignment(
+        checks,
+        locator,
+        current_load,
+        max_open_checks=max_open_checks,
+        candidates_per_check=candidates_per_check,
+        max_distance_km=max_distance_km,
+        solver=solver,
+    )
+
+    result = {"dry_run": dry_run, "solver": solver, "pending_checks": len(checks), **plan.summary()}
+    if dry_run:
+        result["preview"] = [item.__dict__ for item in plan.assignments]
+        return result
+
+    applied = apply_assignment(plan)
+    result["applied"] = len(applied)
+    result["skipped_concurrently_assigned"] = len(plan.assignments) - len(applied)
+
+    from users.services.notification_service import notify_assignments_bulk
+    notify_assignments_bulk(
+        [(item.vendor_id, item.check_type, item.case_id, item.case_number) for item in applied]
+    )
+    logger.info(
+        "Batch assignment applied %d of %d planned assignments across %d vendors",
+        len(applied), len(plan.assignments), result["vendors_used"],
+    )
+    return result
@@ -0,0 +1,155 @@
+"""Cached loader for a case together with all of its check rows.
+
+``load_case_aggregate`` returns the raw ``cases`` row, the linked
+``insurance_case`` fallback fields and every row of the seven check tables
+(with the assigned vendor's company name) in two queries:
+
+1. the ``cases`` row LEFT JOINed to ``insurance_case`` via
+   ``cases.insurance_case_id``;
+2. one ``UNION ALL`` over the check tables returning ``row_to_json`` of each
+   row, so tables with different columns share one result set.
+
+Aggregates are cached in process memory keyed on ``cases.data_version``
+(migration 0071), which triggers bump on any write to the case, its checks
+or its insurance_case row. A cache hit therefore costs one primary-key
+lookup of the version. Vendor renames are not versioned and show up on the
+next write to the case.
+
+Callers receive a deep copy and may mutate it freely.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+CASE_AGGREGATE_CACHE_SIZE = int(os.environ.get('CASE_AGGREGATE_CACHE_SIZE', '256'))
+
+# Same order as cases._CHECK_TABLE_MAP; the order matters for "first vendor" fallbacks.
+CHECK_TABLES: Tuple[str, ...] = (
+    "claimant_checks",
+    "insured_checks",
+    "driver_checks",
+    "spot_checks",
+    "chargesheets",
+    "rti_checks",
+    "rto_checks",
+)
+
+_cache: "OrderedDict[int, Tuple[int, dict]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(case_id: int, version: int) -> Optional[dict]:
+    with _cache_lock:
+        entry = _cache.get(case_id)
+        if entry is None or entry[0] != version:
+            return None
+        _cache.move_to_end(case_id)
+        return entry[1]
+
+
+def _cache_put(case_id: int, version: int, aggregate: dict) -> None:
+    with _cache_lock:
+        current = _cache.get(case_id)
+        if current is not None and current[0] > version:
+            return
+        _cache[case_id] = (version, aggregate)
+        _cache.move_to_end(case_id)
+        while len(_cache) > CASE_AGGREGATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate_case_aggregate(case_id: int) -> None:
+    with _cache_lock:
+        _cache.pop(case_id, None)
+
+
+def get_case_version(case_id: int) -> Optional[int]:
+    """Current ``cases.data_version`` or None if the case does not exist."""
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT data_version FROM cases WHERE id = %s", [case_id])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _fetch_aggregate(case_id: int) -> Optional[dict]:
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.*,
+                   ic.client_code   AS ic_client_code,
+                   ic.insured_name  AS ic_insured_name,
+                   ic.claimant_name AS ic_claimant_name
+            FROM cases c
+            LEFT JOIN insurance_case ic ON ic.id = c.insurance_case_id
+            WHERE c.id = %s
+            """,
+            [case_id],
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        columns = [d[0] for d in cursor.description]
+        case_row = dict(zip(columns, row))
+        insurance_case = {
+            "client_code": case_row.pop("ic_client_code", None) or "",
+            "insured_name": case_row.pop("ic_insured_name", None) or "",
+            "claimant_name": case_row.pop("ic_claimant_name", None) or "",
+        }
+
+        union_sql = " UNION ALL ".join(
+            f"""
+            SELECT %s AS table_name, t.id, row_to_json(t) AS data, uv.company_name
+            FROM {table} t
+            LEFT JOIN users_vendor uv ON uv.id = t.assigned_vendor_id
+            WHERE t.case_id = %s
+            """
+            for table in CHECK_TABLES
+        )
+        params: list = []
+        for table in CHECK_TABLES:
+            params.extend([table, case_id])
+        cursor.execute(f"{union_sql} ORDER BY 1, 2", params)
+
+        checks: Dict[str, List[dict]] = {table: [] for table in CHECK_TABLES}
+        for table_name, _, data, company_name in cursor.fetchall():
+            data = dict(data or {})
+            data["assigned_vendor_name"] = company_name
+            checks[table_name].append(data)
+
+    return {
+        "version": case_row.get("data_version"),
+        "case": case_row,
+        "insurance_case": insurance_case,
+        "checks": checks,
+    }
+
+
+def load_case_aggregate(case_id: int) -> Optional[dict]:
+    """Return ``{"version", "case", "insurance_case", "checks"}`` for a case, or None.
+
+    ``checks`` maps each check table name to its rows (ordered by id) as
+    JSON-decoded dicts carrying an extra ``assigned_vendor_name`` key.
+    """
+    version = get_case_version(case_id)
+    if version is None:
+        invalidate_case_aggregate(case_id)
+        return None
+
+    cached = _cache_get(case_id, version)
+    if cached is None:
+        cached = _fetch_aggregate(case_id)
+        if cached is None:
+            return None
+        _cache_put(case_id, cached["version"], cached)
+
+    return copy.deepcopy(cached)
@@ -0,0 +1,186 @@
+"""Canonical identity between raw ``cases`` rows and ORM ``insurance_case`` rows.
+
+Each case is written twice (``insert_case`` then ``InsuranceCase.objects.create``
+in ``create_case``). ``cases.insurance_case_id`` (migration 0067) links the
+pair so SQL can join on integers instead of ``case_number`` strings.
+
+The resolve helpers below are called on hot paths (report creation, report
+listing, case detail) and go through a small in-process LRU cache. Ids are
+never reused, so a cached pair can only go stale when a case is deleted;
+delete paths call ``forget_case_identity``. Rows created before the link
+existed, or by writers that do not link, are matched by ``case_number`` once
+and linked on the spot.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_CACHE_SIZE = 10000
+
+
+class _IdentityCache:
+    """Bounded, thread-safe bidirectional map incident id <-> insurance case id."""
+
+    def __init__(self, max_size: int = IDENTITY_CACHE_SIZE):
+        self.max_size = max_size
+        self._by_incident: "OrderedDict[int, int]" = OrderedDict()
+        self._by_insurance: "OrderedDict[int, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_insurance(self, incident_case_id: int) -> Optional[int]:
+        with self._lock:
+            value = self._by_incident.get(incident_case_id)
+            if value is not None:
+                self._by_incident.move_to_end(incident_case_id)
+            return value
+
+    def get_incident(self, insurance_case_id: int) -> Optional[int]:
+        with self._lock:
+            value = self._by_insurance.get(insurance_case_id)
+            if value is not None:
+                self._by_insurance.move_to_end(insurance_case_id)
+            return value
+
+    def put(self, incident_case_id: int, insurance_case_id: int) -> None:
+        with self._lock:
+            self._by_incident[incident_case_id] = insurance_case_id
+            self._by_incident.move_to_end(incident_case_id)
+            self._by_insurance[insurance_case_id] = incident_case_id
+            self._by_insurance.move_to_end(insurance_case_id)
+            while len(self._by_incident) > self.max_size:
+                self._by_incident.popitem(last=False)
+            while len(self._by_insurance) > self.max_size:
+                self._by_insurance.popitem(last=False)
+
+    def discard(self, incident_case_id: Optional[int] = None, insurance_case_id: Optional[int] = None) -> None:
+        with self._lock:
+            if incident_case_id is not None:
+                paired = self._by_incident.pop(incident_case_id, None)
+                if paired is not None and self._by_insurance.get(paired) == incident_case_id:
+                    self._by_insurance.pop(paired, None)
+            if insurance_case_id is not None:
+                paired = self._by_insurance.pop(insurance_case_id, None)
+                if paired is not None and self._by_incident.get(paired) == insurance_case_id:
+                    self._by_incident.pop(paired, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_incident.clear()
+            self._by_insurance.clear()
+
+
+_cache = _IdentityCache()
+
+
+def _store_link(cursor, incident_case_id: int, insurance_case_id: int) -> bool:
+    """Set ``cases.insurance_case_id`` unless either side is already linked."""
+    cursor.execute(
+        """
+        UPDATE cases
+        SET insurance_case_id = %s
+        WHERE id = %s
+          AND insurance_case_id IS NULL
+          AND NOT EXISTS (SELECT 1 FROM cases WHERE insurance_case_id = %s)
+        """,
+        [insurance_case_id, incident_case_id, insurance_case_id],
+    )
+    return cursor.rowcount > 0
+
+
+def link_case_identity(incident_case_id: int, insurance_case_id: int) -> None:
+    """Record that the two rows are the same case (called right after the dual write)."""
+    try:
+        with connections['default'].cursor() as cursor:
+            _store_link(cursor, incident_case_id, insurance_case_id)
+        _cache.put(incident_case_id, insurance_case_id)
+    except Exception as exc:
+        logger.warning(
+            "Failed to link case %s to insurance_case %s: %s",
+            incident_case_id, insurance_case_id, exc,
+        )
+
+
+def get_insurance_case_id(incident_case_id: int) -> Optional[int]:
+    """Return the ``insurance_case.id`` paired with a ``cases.id``, or None."""
+    cached = _cache.get_insurance(incident_case_id)
+    if cached is not None:
+        return cached
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            "SELECT insurance_case_id, case_number FROM cases WHERE id = %s",
+            [incident_case_id],
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        insurance_case_id, case_number = row
+
+        if insurance_case_id is None and case_number:
+            cursor.execute(
+                """
+                SELECT ic.id
+                FROM insurance_case ic
+                WHERE ic.case_number = %s
+                  AND NOT EXISTS (SELECT 1 FROM cases c WHERE c.insurance_case_id = ic.id)
+                ORDER BY ic.id
+                LIMIT 1
+                """,
+                [case_number],
+            )
+            match = cursor.fetchone()
+            if match and _store_link(cursor, incident_case_id, match[0]):
+                insurance_case_id = match[0]
+
+    if insurance_case_id is not None:
+        _cache.put(incident_case_id, insurance_case_id)
+    return insurance_case_id
+
+
+def get_incident_case_id(insurance_case_id: int) -> Optional[int]:
+    """Return the ``cases.id`` paired with an ``insurance_case.id``, or None."""
+    cached = _cache.get_incident(insurance_case_id)
+    if cached is not None:
+        return cached
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT id FROM cases WHERE insurance_case_id = %s", [insurance_case_id])
+        row = cursor.fetchone()
+        incident_case_id = row[0] if row else None
+
+        if incident_case_id is None:
+            cursor.execute(
+                """
+                SELECT c.id
+                FROM cases c
+                JOIN insurance_case ic ON ic.case_number = c.case_number
+                WHERE ic.id = %s AND c.insurance_case_id IS NULL
+                ORDER BY c.id
+                LIMIT 1
+                """,
+                [insurance_case_id],
+            )
+            match = cursor.fetchone()
+            if match and _store_link(cursor, match[0], insurance_case_id):
+                incident_case_id = match[0]
+
+    if incident_case_id is not None:
+        _cache.put(incident_case_id, insurance_case_id)
+    return incident_case_id
+
+
+def forget_case_identity(incident_case_id: Optional[int] = None, insurance_case_id: Optional[int] = None) -> None:
+    """Drop cached pairs for a deleted case."""
+    _cache.discard(incident_case_id=incident_case_id, insurance_case_id=insurance_case_id)
+
+
+def clear_case_identity_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,379 @@
+"""Precomputed statistics snapshot for the Super Admin dashboard.
+
+The dashboard used to run more than a dozen independent counts and several
+activity-log queries on every load. ``refresh_dashboard_snapshot`` now
+computes everything with a few grouped queries and stores the result as one
+JSONB row in ``dashboard_snapshots`` (migration 0073) with its
+``computed_at`` timestamp. ``get_dashboard_snapshot`` reads that row.
+
+A snapshot is recomputed on the next read once it is older than
+``DASHBOARD_SNAPSHOT_MAX_AGE`` seconds or marked stale. Statement-level
+triggers mark it stale whenever users or clients change. Super admins can
+force a refresh, and the ``refresh_dashboard_snapshot`` management command
+refreshes it from cron. Concurrent readers of an expired snapshot do not
+pile up: one refreshes under an advisory lock while the rest keep serving
+the previous row.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from users.models import ActivityLog, CaseDeletionRequest, Client, Report
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+SUPER_ADMIN_SNAPSHOT = 'super_admin'
+DASHBOARD_SNAPSHOT_MAX_AGE = int(os.environ.get('DASHBOARD_SNAPSHOT_MAX_AGE', '300'))
+
+# Arbitrary constant identifying the snapshot refresh advisory lock. It is a
+# session lock so the payload can be computed outside any transaction.
+_REFRESH_LOCK_KEY = 7_302_114
+
+
+def _user_statistics() -> Dict[str, Any]:
+    """User, vendor and client statistics from one grouped users query plus one clients query."""
+    now = timezone.now()
+    rows = (
+        User.objects.order_by()
+        .values('role', 'sub_role', 'is_active')
+        .annotate(
+            count=Count('id'),
+            new_30=Count('id', filter=Q(date_joined__gte=now - timedelta(days=30))),
+            new_7=Count('id', filter=Q(date_joined__gte=now - timedelta(days=7))),
+        )
+    )
+
+    total_users = active_users = new_users_30 = new_users_7 = 0
+    users_by_role: Dict[str, int] = {}
+    users_by_sub_role: Dict[str, int] = {}
+    active_by_role: Dict[str, int] = {}
+    for row in rows:
+        count = row['count']
+        total_users += count
+        new_users_30 += row['new_30']
+        new_users_7 += row['new_7']
+        users_by_role[row['role']] = users_by_role.get(row['role'], 0) + count
+        if row['is_active']:
+            active_users += count
+            active_by_role[row['role']] = active_by_role.get(row['role'], 0) + count
+        if row['role'] == 'CASE_MANAGER' and row['sub_role'] is not None:
+            users_by_sub_role[row['sub_role']] = users_by_sub_role.get(row['sub_role'], 0) + count
+
+    clients = Client.objects.aggregate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+    total_clients = clients['total'] or users_by_role.get('CLIENT', 0)
+    active_clients = clients['active'] if clients['total'] else active_by_role.get('CLIENT', 0)
+
+    total_vendors = users_by_role.get('VENDOR', 0)
+    active_vendors = active_by_role.get('VENDOR', 0)
+
+    return {
+        'user_statistics': {
+            'total_users': total_users,
+            'active_users': active_users,
+            'inactive_users': total_users - active_users,
+            'users_by_role': users_by_role,
+            'users_by_sub_role': users_by_sub_role,
+            'new_users_last_30_days': new_users_30,
+            'new_users_last_7_days': new_users_7,
+            'total_clients': total_clients,
+            'active_clients': active_clients,
+        },
+        'vendor_statistics': {
+            'total_vendors': total_vendors,
+            'active_vendors': active_vendors,
+            'inactive_vendors': total_vendors - active_vendors,
+            'vendors_by_specialty': {},
+        },
+    }
+
+
+def _system_statistics() -> Dict[str, Any]:
+    total_cases = 0
+    cases_last_30_days = 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE created_at >= %s)
+                FROM insurance_case
+                """,
+                [timezone.now() - timedelta(days=30)],
+            )
+            total_cases, cases_last_30_days = cursor.fetchone()
+    except Exception as e:
+        logger.error(f"Failed to get case statistics: {e}")
+
+    return {
+        'total_cases': total_cases,
+        'cases_last_30_days': cases_last_30_days,
+        'total_documents': 0,
+        'total_emails_processed': 0,
+    }
+
+
+def _recent_users(limit: int = 10) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
+            'role': user.role,
+            'sub_role': user.sub_role,
+            'is_active': user.is_active,
+            'date_joined': user.date_joined.isoformat(),
+        }
+        for user in User.objects.all().order_by('-date_joined')[:limit]
+    ]
+
+
+def _dashboard_logs() -> Dict[str, Any]:
+    """Fetch real case manager activity logs, TAT logs, deletion logs, and case managers."""
+    # 1. Fetch Case Managers list
+    case_managers = list(User.objects.filter(role='CASE_MANAGER').values('id', 'first_name', 'last_name', 'email', 'sub_role'))
+    for cm in case_managers:
+        cm['name'] = f"{cm['first_name'] or ''} {cm['last_name'] or ''}".strip() or cm['email']
+
+    default_cm = case_managers[0] if case_managers else None
+
+    # 2. Case Manager Activity Logs (Exclude LOGIN, LOGOUT, FORCE_LOGOUT)
+    activity_logs = []
+    
+    # A) ActivityLog table entries (profile updates, user edits, password changes, etc.)
+    try:
+        excluded_actions = ['LOGIN', 'LOGOUT', 'FORCE_LOGOUT']
+        act_qs = ActivityLog.objects.exclude(action__in=excluded_actions).select_related('user').order_by('-created_at')[:30]
+        for act in act_qs:
+            actor_name = f"{act.user.first_name or ''} {act.user.last_name or ''}".strip() or act.user.email if act.user else "Case Manager"
+            activity_logs.append({
+                "id": f"act-{act.id}",
+                "user_id": act.user_id,
+                "actor": actor_name,
+                "role": act.user.role if act.user else "CASE_MANAGER",
+                "action": act.action,
+                "details": act.details or f"{act.action} by {actor_name}",
+                "created_at": act.created_at.isoformat() if act.created_at else None,
+            })
+    except Exception as e:
+        logger.warning(f"Failed to load ActivityLog: {e}")
+
+    # B) Report Generation & QC Assignment events from reports table
+    try:
+        reports_qs = Report.objects.select_related('created_by', 'assigned_qc').order_by('-created_at')[:20]
+        for r in reports_qs:
+            cm_user = r.created_by or default_cm
+            cm_id = cm_user.id if hasattr(cm_user, 'id') else (cm_user['id'] if isinstance(cm_user, dict) else None)
+            actor_name = (f"{r.created_by.first_name or ''} {r.created_by.last_name or ''}".strip() or r.created_by.email) if r.created_by else (default_cm['name'] if default_cm else "Case Manager")
+            
+            if r.assigned_qc:
+                qc_name = f"{r.assigned_qc.first_name or ''} {r.assigned_qc.last_name or ''}".strip() or r.assigned_qc.email
+                desc = f"Assigned Quality Analyst '{qc_name}' for case #{r.case_id}"
+                action_name = "QC_ASSIGNED"
+            else:
+                desc = f"Generated investigation report for case #{r.case_id} ({r.status})"
+                action_name = "REPORT_GENERATED"
+
+            activity_logs.append({
+                "id": f"rep-{r.id}",
+                "user_id": cm_id,
+                "actor": actor_name,
+                "role": "CASE_MANAGER",
+                "action": action_name,
+                "details": desc,
+                "created_at": r.created_at.isoformat() if r.created_at else None,
+            })
+    except Exception as e:
+        logger.warning(f"Failed to load report activity: {e}")
+
+    # C) Case creation events from cases table
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id, case_number, claim_number, client_name, created_at FROM cases ORDER BY created_at DESC LIMIT 15")
+            for c_id, case_num, claim_num, client_name, c_created_at in cursor.fetchall():
+                cm_id = default_cm['id'] if default_cm else None
+                actor_name = default_cm['name'] if default_cm else "Case Manager"
+                clean_client = (client_name or "").split(" - ")[0].strip() or "Client"
+                activity_logs.append({
+                    "id": f"case-create-{c_id}",
+                    "user_id": cm_id,
+                    "actor": actor_name,
+                    "role": "CASE_MANAGER",
+                    "action": "CASE_CREATED",
+                    "details": f"Created case #{case_num or c_id} (Claim: {claim_num or 'N/A'}) for {clean_client}",
+                    "created_at": c_created_at.isoformat() if c_created_at else None,
+                })
+    except Exception as e:
+        logger.warning(f"Failed to load case creation activity: {e}")
+
+    # D) Business Partner assignment from claimant_checks
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT cc.case_id, cc.claimant_name, u.first_name, u.last_name, u.email, cc.created_at
+                FROM claimant_checks cc
+                JOIN users_customuser u ON cc.assigned_vendor_id = u.id
+                WHERE cc.assigned_vendor_id IS NOT NULL
+                ORDER BY cc.created_at DESC LIMIT 15
+            """)
+            for case_id, claimant_name, v_first, v_last, v_email, v_created_at in cursor.fetchall():
+                cm_id = default_cm['id'] if default_cm else None
+                actor_name = default_cm['name'] if default_cm else "Case Manager"
+                v_name = f"{v_first or ''} {v_last or ''}".strip() or v_email or "Business Partner"
+                activity_logs.append({
+                    "id": f"vendor-assign-{case_id}-{v_name}",
+                    "user_id": cm_id,
+                    "actor": actor_name,
+                    "role": "CASE_MANAGER",
+                    "action": "VENDOR_ASSIGNED",
+                    "details": f"Assigned Business Partner '{v_name}' to verify claimant for case #{case_id}",
+                    "created_at": v_created_at.isoformat() if v_created_at else None,
+                })
+    except Exception as e:
+        logger.warning(f"Failed to load vendor assignment activity: {e}")
+
+    # Sort all activity logs chronologically descending
+    def _parse_time(t):
+        if not t:
+            return 0
+        try:
+            return datetime.fromisoformat(t).timestamp()
+        except Exception:
+            return 0
+
+    activity_logs.sort(key=lambda x: _parse_time(x['created_at']), reverse=True)
+
+    # TAT Change Logs removed
+
+    # 4. Case Deletion Change Logs
+    deletion_logs = []
+    try:
+        del_qs = CaseDeletionRequest.objects.select_related('requested_by', 'reviewed_by').order_by('-requested_at')[:10]
+        for dr in del_qs:
+            req_name = f"{dr.requested_by.first_name or ''} {dr.requested_by.last_name or ''}".strip() if dr.requested_by else "Case Manager"
+            rev_name = f"{dr.reviewed_by.first_name or ''} {dr.reviewed_by.last_name or ''}".strip() if dr.reviewed_by else None
+            deletion_logs.append({
+                "id": dr.id,
+                "case_id": dr.case_id,
+                "case_number": getattr(dr, 'case_number', None) or dr.case_id,
+                "requested_by": req_name,
+                "reason": dr.reason or "N/A",
+                "status": dr.status,
+                "reviewed_by": rev_name,
+                "requested_at": dr.requested_at.isoformat() if dr.requested_at else None,
+                "reviewed_at": dr.reviewed_at.isoformat() if dr.reviewed_at else None,
+            })
+    except Exception as e:
+        logger.warning(f"Failed to load deletion logs: {e}")
+
+    return {
+        "case_managers": case_managers,
+        "activity_logs": activity_logs,
+        "deletion_logs": deletion_logs,
+    }
+
+
+def compute_dashboard() -> Dict[str, Any]:
+    """Compute the full Super Admin dashboard payload from the database."""
+    statistics = _user_statistics()
+    logs_data = _dashboard_logs()
+    return {
+        'user_statistics': statistics['user_statistics'],
+        'vendor_statistics': statistics['vendor_statistics'],
+        'system_statistics': _system_statistics(),
+        'recent_users': _recent_users(),
+        'case_managers': logs_data['case_managers'],
+        'activity_logs': logs_data['activity_logs'],
+        'deletion_logs': logs_data['deletion_logs'],
+    }
+
+
+def _store_snapshot(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Upsert ``payload`` as the current snapshot and stamp it with ``snapshot_computed_at``."""
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO dashboard_snapshots (name, payload, computed_at, stale)
+            VALUES (%s, %s::jsonb, NOW(), FALSE)
+            ON CONFLICT (name) DO UPDATE
+            SET payload = EXCLUDED.payload, computed_at = EXCLUDED.computed_at, stale = FALSE
+            RETURNING computed_at
+            """,
+            [SUPER_ADMIN_SNAPSHOT, json.dumps(payload, cls=DjangoJSONEncoder)],
+        )
+        computed_at = cursor.fetchone()[0]
+    payload['snapshot_computed_at'] = computed_at
+    return payload
+
+
+def refresh_dashboard_snapshot() -> Dict[str, Any]:
+    """Recompute and store the snapshot; returns the payload with ``snapshot_computed_at``.
+
+    The payload is computed outside any transaction: its best-effort queries
+    swallow their own errors, which inside a transaction would abort it and
+    fail the upsert.
+    """
+    payload = compute_dashboard()
+    with transaction.atomic(using='default'):
+        return _store_snapshot(payload)
+
+
+def _read_snapshot(cursor) -> Optional[tuple]:
+    cursor.execute(
+        """
+        SELECT payload, computed_at, stale,
+               computed_at < NOW() - (%s * INTERVAL '1 second') AS expired
+        FROM dashboard_snapshots
+        WHERE name = %s
+        """,
+        [DASHBOARD_SNAPSHOT_MAX_AGE, SUPER_ADMIN_SNAPSHOT],
+    )
+    return cursor.fetchone()
+
+
+def _release_refresh_lock() -> None:
+    try:
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [_REFRESH_LOCK_KEY])
+    except Exception as exc:
+        # Closing the session releases the advisory lock.
+        logger.warning("Dashboard snapshot unlock failed, closing connection: %s", exc)
+        connections['default'].close()
+
+
+def get_dashboard_snapshot(force_refresh: bool = False) -> Dict[str, Any]:
+    """Return the stored dashboard snapshot, refreshing it first when stale, expired or forced."""
+    with connections['default'].cursor() as cursor:
+        row = _read_snapshot(cursor)
+    if row and not force_refresh and not row[2] and not row[3]:
+        payload = row[0] if isinstance(row[0], dict) else json.loads(row[0])
+        payload['snapshot_computed_at'] = row[1]
+        return payload
+
+    if not row:
+        return refresh_dashboard_snapshot()
+
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [_REFRESH_LOCK_KEY])
+        got_lock = cursor.fetchone()[0]
+    if got_lock:
+        try:
+            return refresh_dashboard_snapshot()
+        finally:
+            _release_refresh_lock()
+
+    # Another request is refreshing; serve the previous snapshot meanwhile.
+    payload = row[0] if isinstance(row[0], dict) else json.loads(row[0])
+    payload['snapshot_computed_at'] = row[1]
+    return payload
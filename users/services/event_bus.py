@@ -0,0 +1,226 @@
+"""Cross-process event bus built on Postgres LISTEN/NOTIFY.
+
+Writers call ``publish_event`` inside their normal request transaction; the
+``pg_notify`` payload is delivered by Postgres only on commit, so subscribers
+never see events for rolled-back writes.
+
+Every worker process runs one ``EventHub`` listener thread holding a single
+dedicated connection that LISTENs on ``EVENT_CHANNEL``. Incoming events are
+fanned out in-process to the asyncio queues of the Server-Sent Events streams
+(see ``core/event_stream.py``) whose subscriber matches the event audience.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+EVENT_CHANNEL = "portal_events"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7900
+
+# Event types pushed to clients.
+EVENT_NOTIFICATION = "notification"
+EVENT_ASSIGNMENT = "assignment"
+EVENT_CHECK_STATUS = "check_status"
+EVENT_REPORT_STATUS = "report_status"
+
+# Roles that receive every case-level event (dashboards).
+DASHBOARD_ROLES = ("CASE_MANAGER", "SUPER_ADMIN", "ADMIN")
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def publish_event(
+    event_type: str,
+    data: dict,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    vendor_ids: Optional[Iterable[int]] = None,
+    roles: Optional[Iterable[str]] = None,
+) -> None:
+    """Publish an event to every worker via ``pg_notify``.
+
+    The audience is the union of ``user_ids``, ``vendor_ids`` and ``roles``.
+    Errors are logged and swallowed: a push failure must never fail the write
+    that triggered it (clients still fall back to polling).
+    """
+    message = {
+        "type": event_type,
+        "data": data,
+        "audience": {
+            "user_ids": sorted({int(u) for u in (user_ids or []) if u}),
+            "vendor_ids": sorted({int(v) for v in (vendor_ids or []) if v}),
+            "roles": sorted(set(roles or [])),
+        },
+    }
+    payload = json.dumps(message, default=str, separators=(",", ":"))
+    if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        logger.warning("Dropping oversized %s event (%d bytes)", event_type, len(payload))
+        return
+
+    try:
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [EVENT_CHANNEL, payload])
+    except Exception as exc:
+        logger.error("Failed to publish %s event: %s", event_type, exc)
+
+
+def publish_check_status(case_id: int, check_type: str, status: str, vendor_id: Optional[int] = None) -> None:
+    """Publish a check status change to dashboards and the assigned vendor."""
+    publish_event(
+        EVENT_CHECK_STATUS,
+        {"case_id": case_id, "check_type": check_type, "status": status},
+        vendor_ids=[vendor_id] if vendor_id else None,
+        roles=DASHBOARD_ROLES,
+    )
+
+
+# =============================================================================
+# In-process fan-out
+# =============================================================================
+
+@dataclass(eq=False)
+class Subscriber:
+    """One connected event stream."""
+    user_id: int
+    role: str
+    vendor_id: Optional[int]
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+    dropped: int = 0
+
+    def matches(self, audience: dict) -> bool:
+        return (
+            self.user_id in audience.get("user_ids", ())
+            or (self.vendor_id is not None and self.vendor_id in audience.get("vendor_ids", ()))
+            or self.role in audience.get("roles", ())
+        )
+
+    def deliver(self, message: dict) -> None:
+        """Enqueue from the listener thread; drop the event if the client is too slow."""
+        def _put():
+            try:
+                self.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+        try:
+            self.loop.call_soon_threadsafe(_put)
+        except RuntimeError:
+            # Event loop already closed; the stream is being torn down.
+            pass
+
+
+class EventHub:
+    """Per-process LISTEN connection and subscriber registry."""
+
+    def __init__(self, channel: str = EVENT_CHANNEL):
+        self.channel = channel
+        self._subscribers: set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.add(subscriber)
+        self._ensure_listener()
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def dispatch(self, raw_payload: str) -> None:
+        """Fan a raw NOTIFY payload out to matching subscribers."""
+        try:
+            message = json.loads(raw_payload)
+        except ValueError:
+            logger.warning("Ignoring malformed event payload on %s", self.channel)
+            return
+
+        audience = message.pop("audience", {}) or {}
+        with self._lock:
+            targets = [s for s in self._subscribers if s.matches(audience)]
+        for subscriber in targets:
+            subscriber.deliver(message)
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._listen_forever, daemon=True, name=f"event-hub-{self.channel}"
+            )
+            self._thread.start()
+
+    def _open_listen_connection(self):
+        import psycopg
+
+        db = settings.DATABASES["default"]
+        conn = psycopg.connect(
+            dbname=db.get("NAME"),
+            user=db.get("USER"),
+            password=db.get("PASSWORD"),
+            host=db.get("HOST") or None,
+            port=db.get("PORT") or None,
+            autocommit=True,
+        )
+        conn.execute(f"LISTEN {self.channel}")
+        return conn
+
+    def _listen_forever(self) -> None:
+        """Listener thread body: reconnects with backoff until stopped."""
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._open_listen_connection()
+                backoff = 1
+                logger.info("Event hub listening on %s", self.channel)
+                while not self._stop.is_set():
+                    # Wakes at least every 5s to check for stop().
+                    for notify in conn.notifies(timeout=5):
+                        self.dispatch(notify.payload)
+            except Exception as exc:
+                logger.error("Event hub listener error on %s: %s", self.channel, exc)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_hub: Optional[EventHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_event_hub() -> EventHub:
+    """Return the process-wide event hub (created lazily)."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = EventHub()
+    return _hub
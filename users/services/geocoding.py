@@ -0,0 +1,81 @@
+"""
+Forward and reverse geocoding through the shared HTTP client (core/http_client.py).
+
+ArcGIS World Geocoding and OpenStreetMap Nominatim are called directly over
+their REST APIs on pooled keep-alive connections. The old approach built a
+new geopy geocoder, or opened a new urllib connection, per lookup. Every
+function returns None when the lookup fails, including when the provider's
+circuit is open or its concurrency limit is saturated. Callers fall back to
+raw coordinates or the next strategy without waiting on a provider that is
+down.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Tuple
+
+from core import http_client
+
+logger = logging.getLogger(__name__)
+
+ARCGIS_URL = 'https://geocode.arcgis.com/arcgis/rest/services/World/GeocodeServer'
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org'
+
+
+def _json(provider: str, url: str, params: dict, timeout=None):
+    try:
+        response = http_client.get(provider, url, params=params, timeout=timeout)
+    except http_client.OutboundHTTPError as exc:
+        logger.debug("[geocode] %s unavailable: %s", provider, exc)
+        return None
+    if response.status_code != 200:
+        logger.debug("[geocode] %s returned %s", provider, response.status_code)
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def arcgis_geocode(query: str) -> Optional[Tuple[float, float]]:
+    payload = _json('arcgis', f'{ARCGIS_URL}/findAddressCandidates', {
+        'SingleLine': query, 'f': 'json', 'maxLocations': 1,
+    })
+    candidates = (payload or {}).get('candidates') or []
+    if not candidates:
+        return None
+    location = candidates[0].get('location') or {}
+    if location.get('y') is None or location.get('x') is None:
+        return None
+    return float(location['y']), float(location['x'])
+
+
+def arcgis_reverse(latitude: float, longitude: float, timeout=None) -> Optional[str]:
+    payload = _json('arcgis', f'{ARCGIS_URL}/reverseGeocode', {
+        'location': f'{longitude},{latitude}', 'f': 'json', 'outSR': 4326,
+    }, timeout)
+    address = (payload or {}).get('address') or {}
+    label = address.get('LongLabel') or address.get('Match_addr')
+    return str(label).strip() if label else None
+
+
+def nominatim_search(query: str, country_codes: str = 'in') -> Optional[Tuple[float, float]]:
+    params = {'q': query, 'format': 'json', 'limit': 1}
+    if country_codes:
+        params['countrycodes'] = country_codes
+    results = _json('nominatim', f'{NOMINATIM_URL}/search', params)
+    if not results:
+        return None
+    return float(results[0]['lat']), float(results[0]['lon'])
+
+
+def nominatim_reverse(
+    latitude: float, longitude: float, language: Optional[str] = None, timeout=None,
+) -> Optional[str]:
+    params = {'lat': latitude, 'lon': longitude, 'format': 'jsonv2', 'zoom': 18, 'addressdetails': 1}
+    if language:
+        params['accept-language'] = language
+    payload = _json('nominatim', f'{NOMINATIM_URL}/reverse', params, timeout)
+    display_name = (payload or {}).get('display_name')
+    return str(display_name).strip() if display_name else None
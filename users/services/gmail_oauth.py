@@ -9,15 +9,20 @@ import json
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 from django.conf import settings
 from django.utils import timezone
 
+from core.lazy_imports import lazy_import
+
+# The Google client libraries are only needed by the Gmail commands; import
+# them on first use so they stay off the web workers' startup path.
+_GOOGLE_HINT = "Install google-api-python-client and google-auth-oauthlib to use Gmail polling."
+google_auth_requests = lazy_import('google.auth.transport.requests', _GOOGLE_HINT)
+google_credentials = lazy_import('google.oauth2.credentials', _GOOGLE_HINT)
+oauth_flow = lazy_import('google_auth_oauthlib.flow', _GOOGLE_HINT)
+discovery = lazy_import('googleapiclient.discovery', _GOOGLE_HINT)
+api_errors = lazy_import('googleapiclient.errors', _GOOGLE_HINT)
+
 logger = logging.getLogger(__name__)
 
 # Gmail API scopes
@@ -49,7 +54,7 @@ class GmailOAuthService:
         """
         try:
             # Create OAuth flow
-            flow = InstalledAppFlow.from_client_config(
+            flow = oauth_flow.InstalledAppFlow.from_client_config(
                 {
                     "installed": {
                         "client_id": self.client_id,
@@ -88,7 +93,7 @@ class GmailOAuthService:
         """
         try:
             # Create OAuth flow
-            flow = InstalledAppFlow.from_client_config(
+            flow = oauth_flow.InstalledAppFlow.from_client_config(
                 {
                     "installed": {
                         "client_id": self.client_id,
@@ -107,7 +112,7 @@ class GmailOAuthService:
             credentials = flow.credentials
             
             # Build Gmail service to get user email
-            service = build('gmail', 'v1', credentials=credentials)
+            service = discovery.build('gmail', 'v1', credentials=credentials)
             profile = service.users().getProfile(userId='me').execute()
             
             # Calculate expiry time
@@ -139,7 +144,7 @@ class GmailOAuthService:
             Dictionary with new access token and expiry
         """
         try:
-            credentials = Credentials(
+            credentials = google_credentials.Credentials(
                 token=None,
                 refresh_token=refresh_token,
                 token_uri='https://oauth2.googleapis.com/token',
@@ -149,7 +154,7 @@ class GmailOAuthService:
             )
             
             # Refresh the token
-            credentials.refresh(Request())
+            credentials.refresh(google_auth_requests.Request())
             
             # Calculate expiry time
             expires_at = timezone.now() + timedelta(seconds=credentials.expiry.timestamp() - datetime.now().timestamp())
@@ -172,7 +177,7 @@ class GmailOAuthService:
             refresh_token: OAuth refresh token
         """
         try:
-            credentials = Credentials(
+            credentials = google_credentials.Credentials(
                 token=access_token,
                 refresh_token=refresh_token,
                 token_uri='https://oauth2.googleapis.com/token',
@@ -182,7 +187,7 @@ class GmailOAuthService:
             )
             
             self.credentials = credentials
-            self.service = build('gmail', 'v1', credentials=credentials)
+            self.service = discovery.build('gmail', 'v1', credentials=credentials)
             
         except Exception as e:
             logger.error(f"Failed to build Gmail service: {e}")
@@ -212,7 +217,7 @@ class GmailOAuthService:
             messages = results.get('messages', [])
             return messages
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Failed to list messages: {e}")
             raise
     
@@ -238,7 +243,7 @@ class GmailOAuthService:
             
             return message
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Failed to get message {message_id}: {e}")
             raise
     
@@ -269,7 +274,7 @@ class GmailOAuthService:
             
             return file_data
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Failed to download attachment {attachment_id}: {e}")
             raise
     
@@ -292,7 +297,7 @@ class GmailOAuthService:
             
             logger.info(f"Marked message {message_id} as read")
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Failed to mark message {message_id} as read: {e}")
             raise
 
@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import logging
-import json
 from typing import Optional
-from urllib import request as urllib_request
-from urllib.error import URLError, HTTPError
 
-from django.db import connections
+from django.db import connections, transaction
+
+from core import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +34,11 @@ CHECK_TYPE_LABELS: dict[str, str] = {
 }
 
 
+EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Expo accepts at most 100 messages per push request.
+EXPO_MAX_MESSAGES_PER_REQUEST = 100
+
+
 def _build_message(notification_type: str, check_type: str, case_number: str) -> str:
     """Return a human-readable notification message.
 
@@ -82,13 +86,7 @@ def _send_expo_push_notifications(
         logger.error("Failed to fetch push tokens for vendor=%s: %s", vendor_id, exc)
         return
 
-    valid_tokens = [
-        token for token in tokens
-        if token and (
-            str(token).startswith("ExponentPushToken[")
-            or str(token).startswith("ExpoPushToken[")
-        )
-    ]
+    valid_tokens = [token for token in tokens if _is_expo_token(token)]
     if not valid_tokens:
         return
 
@@ -108,20 +106,160 @@ def _send_expo_push_notifications(
         for token in valid_tokens
     ]
 
-    try:
-        req = urllib_request.Request(
-            "https://exp.host/--/api/v2/push/send",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            },
-            method="POST",
+    _post_expo_messages(payload, context=f"vendor={vendor_id}")
+
+
+def _is_expo_token(token) -> bool:
+    return bool(token) and (
+        str(token).startswith("ExponentPushToken[")
+        or str(token).startswith("ExpoPushToken[")
+    )
+
+
+def _post_expo_messages(messages: list, context: str = "") -> None:
+    """POST push messages to Expo in chunks of EXPO_MAX_MESSAGES_PER_REQUEST (best-effort)."""
+    for offset in range(0, len(messages), EXPO_MAX_MESSAGES_PER_REQUEST):
+        chunk = messages[offset:offset + EXPO_MAX_MESSAGES_PER_REQUEST]
+        try:
+            response = http_client.post(
+                "expo",
+                EXPO_PUSH_URL,
+                json=chunk,
+                headers={"Accept": "application/json"},
+            )
+            if response.status_code >= 400:
+                logger.error("Expo push send failed for %s: HTTP %s", context, response.status_code)
+        except http_client.OutboundHTTPError as exc:
+            logger.error("Expo push send failed for %s: %s", context, exc)
+
+
+def _publish_notification_events(
+    notification_id: int,
+    vendor_id: int,
+    notification_type: str,
+    check_type: str,
+    case_id: int,
+    case_number: str,
+    message: str,
+) -> None:
+    """Push the new notification to the vendor and the assignment change to dashboards."""
+    from users.services.event_bus import (
+        DASHBOARD_ROLES,
+        EVENT_ASSIGNMENT,
+        EVENT_NOTIFICATION,
+        publish_event,
+    )
+
+    publish_event(
+        EVENT_NOTIFICATION,
+        {
+            "id": notification_id,
+            "notification_type": notification_type,
+            "check_type": check_type,
+            "case_id": case_id,
+            "case_number": case_number,
+            "message": message,
+        },
+        vendor_ids=[vendor_id],
+    )
+    publish_event(
+        EVENT_ASSIGNMENT,
+        {
+            "case_id": case_id,
+            "case_number": case_number,
+            "check_type": check_type,
+            "vendor_id": vendor_id,
+            "assigned": notification_type == "CHECK_ASSIGNED",
+        },
+        vendor_ids=[vendor_id],
+        roles=DASHBOARD_ROLES,
+    )
+
+
+def adjust_unread_count(cursor, vendor_id: int, delta: int) -> None:
+    """Apply ``delta`` to the vendor's maintained unread counter.
+
+    Must be called with the same cursor (and transaction) that inserted or
+    marked-read the notification rows so the counter never drifts from the
+    underlying table. The counter is clamped at zero.
+    """
+    cursor.execute(
+        """
+        INSERT INTO vendor_notification_counters (vendor_id, unread_count, updated_at)
+        VALUES (%s, GREATEST(%s, 0), NOW())
+        ON CONFLICT (vendor_id) DO UPDATE SET
+            unread_count = GREATEST(vendor_notification_counters.unread_count + %s, 0),
+            updated_at = NOW()
+        """,
+        [vendor_id, delta, delta],
+    )
+
+
+def reset_unread_count(cursor, vendor_id: int) -> None:
+    """Set the vendor's unread counter to zero (after a bulk mark-all-read)."""
+    cursor.execute(
+        """
+        INSERT INTO vendor_notification_counters (vendor_id, unread_count, updated_at)
+        VALUES (%s, 0, NOW())
+        ON CONFLICT (vendor_id) DO UPDATE SET unread_count = 0, updated_at = NOW()
+        """,
+        [vendor_id],
+    )
+
+
+def get_unread_count(vendor_id: int) -> int:
+    """Return the maintained unread counter for a vendor (0 if none recorded)."""
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            "SELECT unread_count FROM vendor_notification_counters WHERE vendor_id = %s",
+            [vendor_id],
         )
-        with urllib_request.urlopen(req, timeout=10) as response:
-            response.read()
-    except (HTTPError, URLError, TimeoutError, OSError) as exc:
-        logger.error("Expo push send failed for vendor=%s: %s", vendor_id, exc)
+        row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+def archive_read_notifications(older_than_days: int, batch_size: int = 5000) -> int:
+    """Move read notifications older than ``older_than_days`` to the archive table.
+
+    Rows are moved in batches of ``batch_size`` with a single
+    ``DELETE ... RETURNING`` / ``INSERT`` statement per batch so the hot table
+    is never locked for long. Unread notifications are never archived, so the
+    maintained unread counters are unaffected. Returns the number of rows moved.
+    """
+    total_moved = 0
+    while True:
+        with transaction.atomic(using="default"):
+            with connections["default"].cursor() as cursor:
+                cursor.execute(
+                    """
+                    WITH moved AS (
+                        DELETE FROM vendor_notifications
+                        WHERE id IN (
+                            SELECT id FROM vendor_notifications
+                            WHERE is_read = TRUE
+                              AND created_at < NOW() - (%s * INTERVAL '1 day')
+                            ORDER BY id
+                            LIMIT %s
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING id, vendor_id, notification_type, check_type,
+                                  case_id, case_number, message, is_read, created_at
+                    )
+                    INSERT INTO vendor_notifications_archive
+                        (id, vendor_id, notification_type, check_type,
+                         case_id, case_number, message, is_read, created_at, archived_at)
+                    SELECT id, vendor_id, notification_type, check_type,
+                           case_id, case_number, message, is_read, created_at, NOW()
+                    FROM moved
+                    ON CONFLICT (id) DO NOTHING
+                    """,
+                    [older_than_days, batch_size],
+                )
+                moved = cursor.rowcount or 0
+        total_moved += moved
+        if moved < batch_size:
+            break
+    return total_moved
 
 
 def notify_reassignment(
@@ -153,15 +291,22 @@ def notify_reassignment(
         with connections["default"].cursor() as cursor:
             for vendor_id, ntype in records:
                 msg = _build_message(ntype, check_type, case_number)
-                cursor.execute(
-                    """
-                    INSERT INTO vendor_notifications
-                        (vendor_id, notification_type, check_type,
-                         case_id, case_number, message, is_read, created_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, FALSE, NOW())
-                    """,
-                    [vendor_id, ntype, check_type, case_id, case_number, msg],
-                )
+                with transaction.atomic(using="default"):
+                    cursor.execute(
+                        """
+                        INSERT INTO vendor_notifications
+                            (vendor_id, notification_type, check_type,
+                             case_id, case_number, message, is_read, created_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, FALSE, NOW())
+                        RETURNING id
+                        """,
+                        [vendor_id, ntype, check_type, case_id, case_number, msg],
+                    )
+                    notification_id = cursor.fetchone()[0]
+                    adjust_unread_count(cursor, vendor_id, 1)
+                    _publish_notification_events(
+                        notification_id, vendor_id, ntype, check_type, case_id, case_number, msg,
+                    )
                 _send_expo_push_notifications(
                     vendor_id=vendor_id,
                     notification_type=ntype,
@@ -178,3 +323,83 @@ def notify_reassignment(
             check_type,
             exc,
         )
+
+
+def notify_assignments_bulk(assignments: list[tuple[int, str, int, str]]) -> None:
+    """Record CHECK_ASSIGNED notifications for many (vendor_id, check_type, case_id, case_number) rows.
+
+    Used by batch assignment: one INSERT over ``unnest()``ed arrays (five
+    parameters however many rows, so large batches stay under Postgres's
+    65535 bind-parameter limit), one counter UPSERT per vendor, one push-token
+    lookup and chunked Expo requests carrying a single summary message per
+    vendor. Errors are logged and swallowed like ``notify_reassignment``.
+    """
+    if not assignments:
+        return
+
+    from users.services.event_bus import DASHBOARD_ROLES, EVENT_ASSIGNMENT, EVENT_NOTIFICATION, publish_event
+
+    per_vendor: dict[int, int] = {}
+    columns: tuple[list, ...] = ([], [], [], [], [])
+    for vendor_id, check_type, case_id, case_number in assignments:
+        row = (vendor_id, check_type, case_id, case_number or "",
+               _build_message("CHECK_ASSIGNED", check_type, case_number))
+        for column, value in zip(columns, row):
+            column.append(value)
+        per_vendor[vendor_id] = per_vendor.get(vendor_id, 0) + 1
+
+    try:
+        with transaction.atomic(using="default"):
+            with connections["default"].cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO vendor_notifications
+                        (vendor_id, notification_type, check_type,
+                         case_id, case_number, message, is_read, created_at)
+                    SELECT vendor_id, 'CHECK_ASSIGNED', check_type,
+                           case_id, case_number, message, FALSE, NOW()
+                    FROM unnest(%s::integer[], %s::varchar[], %s::integer[], %s::varchar[], %s::text[])
+                        AS rows (vendor_id, check_type, case_id, case_number, message)
+                    """,
+                    list(columns),
+                )
+                for vendor_id, count in per_vendor.items():
+                    adjust_unread_count(cursor, vendor_id, count)
+                    publish_event(
+                        EVENT_NOTIFICATION,
+                        {"notification_type": "CHECK_ASSIGNED", "count": count},
+                        vendor_ids=[vendor_id],
+                    )
+                publish_event(
+                    EVENT_ASSIGNMENT,
+                    {"batch": True, "assigned": len(assignments), "vendors": len(per_vendor)},
+                    roles=DASHBOARD_ROLES,
+                )
+
+            with connections["default"].cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT vendor_id, expo_push_token
+                    FROM vendor_push_tokens
+                    WHERE vendor_id = ANY(%s) AND is_active = TRUE
+                    """,
+                    [list(per_vendor)],
+                )
+                token_rows = cursor.fetchall()
+    except Exception as exc:
+        logger.error("NotificationService failed to write %d bulk notifications: %s", len(assignments), exc)
+        return
+
+    messages = []
+    for vendor_id, token in token_rows:
+        if not _is_expo_token(token):
+            continue
+        count = per_vendor[vendor_id]
+        messages.append({
+            "to": token,
+            "title": _build_push_title("CHECK_ASSIGNED"),
+            "body": f"You have been assigned {count} new check{'s' if count != 1 else ''}.",
+            "sound": "default",
+            "data": {"notification_type": "CHECK_ASSIGNED", "count": count},
+        })
+    _post_expo_messages(messages, context=f"bulk assignment ({len(per_vendor)} vendors)")
@@ -0,0 +1,276 @@
+"""Lease-based QC review work queue on top of the ``reports`` table.
+
+A QC asks for the next report instead of waiting for a case manager to
+assign one. ``claim_next_report`` picks the oldest claimable report with
+``SELECT ... FOR UPDATE SKIP LOCKED`` inside a single UPDATE statement, so
+concurrent claimers never wait on each other's row locks and never receive
+the same report.
+
+Claimable reports are the latest report of a fully verified case (the same
+set the Legal Review page lists) that are either unclaimed ``PENDING`` or
+``ASSIGNED`` with an expired lease. Manual assignment (``assign_qc``) sets no
+lease and is never taken back by the queue.
+
+Load balancing: a QC holding ``QC_MAX_ACTIVE_LEASES`` open assigned reports
+(leased or manually assigned) gets no new work until one is reviewed or
+released, so work flows to reviewers with spare capacity.
+
+Per-reviewer throughput is counted per day in ``qc_review_throughput``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db import connections, transaction
+
+from users.services.report_analytics import LATEST_VERIFIED_REPORT_IDS_SQL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_MINUTES = int(os.environ.get('QC_LEASE_MINUTES', '30'))
+MAX_ACTIVE_LEASES_PER_QC = int(os.environ.get('QC_MAX_ACTIVE_LEASES', '3'))
+MAX_LEASE_MINUTES = 240
+
+
+class LeaseLimitReached(Exception):
+    """The QC already holds the maximum number of open reports."""
+
+
+def _lease_interval(lease_minutes: Optional[int]) -> str:
+    minutes = min(max(int(lease_minutes or DEFAULT_LEASE_MINUTES), 1), MAX_LEASE_MINUTES)
+    return f"{minutes} minutes"
+
+
+def _record_throughput(cursor, qc_id: int, *, claimed: int = 0, reviewed: int = 0,
+                       released: int = 0, expired: int = 0, review_seconds: int = 0) -> None:
+    cursor.execute(
+        """
+        INSERT INTO qc_review_throughput (qc_id, day, claimed, reviewed, released, expired, review_seconds)
+        VALUES (%s, CURRENT_DATE, %s, %s, %s, %s, %s)
+        ON CONFLICT (qc_id, day) DO UPDATE
+        SET claimed = qc_review_throughput.claimed + EXCLUDED.claimed,
+            reviewed = qc_review_throughput.reviewed + EXCLUDED.reviewed,
+            released = qc_review_throughput.released + EXCLUDED.released,
+            expired = qc_review_throughput.expired + EXCLUDED.expired,
+            review_seconds = qc_review_throughput.review_seconds + EXCLUDED.review_seconds
+        """,
+        [qc_id, claimed, reviewed, released, expired, max(int(review_seconds), 0)],
+    )
+
+
+def open_report_count(cursor, qc_id: int) -> int:
+    """Reports currently held by a QC: manual assignments plus unexpired leases."""
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM reports
+        WHERE assigned_qc_id = %s
+          AND status = 'ASSIGNED'
+          AND (lease_expires_at IS NULL OR lease_expires_at > NOW())
+        """,
+        [qc_id],
+    )
+    return cursor.fetchone()[0]
+
+
+def claim_next_report(qc_id: int, lease_minutes: Optional[int] = None) -> Optional[int]:
+    """Lease the oldest claimable report to ``qc_id``; return its id or None if the queue is empty.
+
+    Raises ``LeaseLimitReached`` when the QC already holds ``MAX_ACTIVE_LEASES_PER_QC`` reports.
+    """
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            if open_report_count(cursor, qc_id) >= MAX_ACTIVE_LEASES_PER_QC:
+                raise LeaseLimitReached(
+                    f"QC already holds {MAX_ACTIVE_LEASES_PER_QC} open reports"
+                )
+
+            cursor.execute(
+                f"""
+                WITH candidate AS (
+                    SELECT r.id, r.assigned_qc_id AS previous_qc_id
+                    FROM reports r
+                    WHERE r.id IN ({LATEST_VERIFIED_REPORT_IDS_SQL})
+                      AND (
+                          (r.status = 'PENDING' AND r.assigned_qc_id IS NULL)
+                          OR (r.status = 'ASSIGNED' AND r.lease_expires_at < NOW())
+                      )
+                    ORDER BY r.created_at, r.id
+                    LIMIT 1
+                    FOR UPDATE OF r SKIP LOCKED
+                )
+                UPDATE reports r
+                SET status = 'ASSIGNED',
+                    assigned_qc_id = %s,
+                    assigned_at = NOW(),
+                    lease_expires_at = NOW() + %s::interval,
+                    updated_at = NOW()
+                FROM candidate
+                WHERE r.id = candidate.id
+                RETURNING r.id, candidate.previous_qc_id
+                """,
+                [qc_id, _lease_interval(lease_minutes)],
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            report_id, previous_qc_id = row
+            _record_throughput(cursor, qc_id, claimed=1)
+            if previous_qc_id and previous_qc_id != qc_id:
+                _record_throughput(cursor, previous_qc_id, expired=1)
+
+    logger.info("QC %s claimed report %s from the work queue", qc_id, report_id)
+    return report_id
+
+
+def renew_lease(report_id: int, qc_id: int, lease_minutes: Optional[int] = None):
+    """Extend an unexpired lease held by ``qc_id``; return the new expiry or None."""
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE reports
+            SET lease_expires_at = NOW() + %s::interval, updated_at = NOW()
+            WHERE id = %s AND assigned_qc_id = %s AND status = 'ASSIGNED'
+              AND lease_expires_at > NOW()
+            RETURNING lease_expires_at
+            """,
+            [_lease_interval(lease_minutes), report_id, qc_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def release_lease(report_id: int, qc_id: int) -> bool:
+    """Hand a leased report back to the queue."""
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE reports
+                SET status = 'PENDING', assigned_qc_id = NULL, assigned_at = NULL,
+                    lease_expires_at = NULL, updated_at = NOW()
+                WHERE id = %s AND assigned_qc_id = %s AND status = 'ASSIGNED'
+                  AND lease_expires_at IS NOT NULL
+                """,
+                [report_id, qc_id],
+            )
+            released = cursor.rowcount > 0
+            if released:
+                _record_throughput(cursor, qc_id, released=1)
+    return released
+
+
+def record_review(qc_id: int, assigned_at, reviewed_at) -> None:
+    """Count a completed review (called by the review endpoint in its transaction)."""
+    seconds = (reviewed_at - assigned_at).total_seconds() if assigned_at and reviewed_at else 0
+    with connections['default'].cursor() as cursor:
+        _record_throughput(cursor, qc_id, reviewed=1, review_seconds=seconds)
+
+
+def expire_leases() -> int:
+    """Return every report with an expired lease to the queue; returns the number expired.
+
+    Claims already take over expired leases directly; this sweep keeps the
+    QC listings and stats honest between claims.
+    """
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                WITH expired AS (
+                    SELECT id, assigned_qc_id
+                    FROM reports
+                    WHERE status = 'ASSIGNED' AND lease_expires_at < NOW()
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE reports r
+                SET status = 'PENDING', assigned_qc_id = NULL, assigned_at = NULL,
+                    lease_expires_at = NULL, updated_at = NOW()
+                FROM expired
+                WHERE r.id = expired.id
+                RETURNING expired.assigned_qc_id
+                """
+            )
+            per_qc: Dict[int, int] = {}
+            for (qc_id,) in cursor.fetchall():
+                if qc_id:
+                    per_qc[qc_id] = per_qc.get(qc_id, 0) + 1
+            for qc_id, count in per_qc.items():
+                _record_throughput(cursor, qc_id, expired=count)
+    total = sum(per_qc.values())
+    if total:
+        logger.info("Expired %d QC report leases", total)
+    return total
+
+
+def queue_snapshot(days: int = 7) -> dict:
+    """Queue depth, current load per QC and per-reviewer throughput over ``days``."""
+    since = date.today() - timedelta(days=max(days, 1) - 1)
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT
+                COUNT(*) FILTER (WHERE r.status = 'PENDING' AND r.assigned_qc_id IS NULL),
+                COUNT(*) FILTER (WHERE r.status = 'ASSIGNED' AND r.lease_expires_at > NOW()),
+                COUNT(*) FILTER (WHERE r.status = 'ASSIGNED' AND r.lease_expires_at <= NOW())
+            FROM reports r
+            WHERE r.id IN ({LATEST_VERIFIED_REPORT_IDS_SQL})
+            """
+        )
+        queued, leased, expired = cursor.fetchone()
+
+        cursor.execute(
+            """
+            SELECT u.id,
+                   COALESCE(NULLIF(TRIM(CONCAT(u.first_name, ' ', u.last_name)), ''), u.username),
+                   COALESCE(load.open_reports, 0),
+                   COALESCE(tp.claimed, 0), COALESCE(tp.reviewed, 0),
+                   COALESCE(tp.released, 0), COALESCE(tp.expired, 0),
+                   COALESCE(tp.review_seconds, 0)
+            FROM users_customuser u
+            LEFT JOIN (
+                SELECT assigned_qc_id, COUNT(*) AS open_reports
+                FROM reports
+                WHERE status = 'ASSIGNED'
+                  AND (lease_expires_at IS NULL OR lease_expires_at > NOW())
+                GROUP BY assigned_qc_id
+            ) load ON load.assigned_qc_id = u.id
+            LEFT JOIN (
+                SELECT qc_id, SUM(claimed) AS claimed, SUM(reviewed) AS reviewed,
+                       SUM(released) AS released, SUM(expired) AS expired,
+                       SUM(review_seconds) AS review_seconds
+                FROM qc_review_throughput
+                WHERE day >= %s
+                GROUP BY qc_id
+            ) tp ON tp.qc_id = u.id
+            WHERE u.role = 'QC' AND u.is_active
+            ORDER BY 5 DESC, 2
+            """,
+            [since],
+        )
+        reviewers: List[dict] = []
+        for qc_id, name, open_reports, claimed, reviewed, released, expired_count, seconds in cursor.fetchall():
+            reviewers.append({
+                'qc_id': qc_id,
+                'name': name,
+                'open_reports': int(open_reports),
+                'claimed': int(claimed),
+                'reviewed': int(reviewed),
+                'released': int(released),
+                'expired': int(expired_count),
+                'reviews_per_day': round(int(reviewed) / max(days, 1), 2),
+                'avg_review_minutes': round(int(seconds) / int(reviewed) / 60, 1) if reviewed else None,
+            })
+
+    return {
+        'queued': queued,
+        'leased': leased,
+        'expired_leases': expired,
+        'max_open_reports_per_qc': MAX_ACTIVE_LEASES_PER_QC,
+        'window_days': max(days, 1),
+        'reviewers': reviewers,
+    }
@@ -0,0 +1,106 @@
+"""Report listing and status statistics for the Legal Review and QC pages.
+
+"Latest report per case" is read from ``case_latest_report`` (migration
+0069), a pointer maintained by a trigger on ``reports`` insert/delete, so it
+is a primary-key join instead of a ``MAX(id) GROUP BY case_id`` subquery.
+
+Status statistics are computed in a single ``COUNT(*) FILTER (WHERE ...)``
+query (Django's ``Count(..., filter=Q(...))``), and listings read only the
+columns they render via ``values()`` instead of instantiating Report, case
+and QC model objects per row.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from django.db.models import Count, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from users.models import Report
+
+# Latest report of every case whose incident case has all gating checks
+# 'Verified' (case_verification_state, migration 0068). This mirrors the AI
+# Case Review page filter so that the Legal Review page only displays cases
+# whose AI reports are genuinely generated.
+LATEST_VERIFIED_REPORT_IDS_SQL = """
+    SELECT lr.latest_report_id
+    FROM case_latest_report lr
+    JOIN cases c ON c.insurance_case_id = lr.case_id
+    JOIN case_verification_state s ON s.case_id = c.id
+    WHERE s.all_verified
+"""
+
+# ORM case ids that still have a row in the incident cases table.
+ACTIVE_INSURANCE_CASE_IDS_SQL = """
+    SELECT insurance_case_id FROM cases WHERE insurance_case_id IS NOT NULL
+"""
+
+STATUS_COUNT_AGGREGATES = {
+    'total': Count('id'),
+    'pending': Count('id', filter=Q(status=Report.Status.PENDING)),
+    'assigned': Count('id', filter=Q(status=Report.Status.ASSIGNED)),
+    'accepted': Count('id', filter=Q(status=Report.Status.ACCEPTED)),
+    'rejected': Count('id', filter=Q(status=Report.Status.REJECTED)),
+}
+
+LIST_FIELDS = (
+    'id',
+    'status',
+    'created_at',
+    'assigned_at',
+    'reviewed_at',
+    'case__case_number',
+    'case__title',
+    'case__claim_number',
+    'case__client_name',
+    'case__category',
+    'assigned_qc__username',
+    'assigned_qc__first_name',
+    'assigned_qc__last_name',
+)
+
+
+def latest_verified_reports() -> QuerySet:
+    """Latest report per fully verified case."""
+    return Report.objects.filter(id__in=RawSQL(LATEST_VERIFIED_REPORT_IDS_SQL, []))
+
+
+def active_qc_reports(qc_id: int) -> QuerySet:
+    """Reports assigned to a QC whose case is still present in the incident cases table."""
+    return Report.objects.filter(
+        assigned_qc_id=qc_id,
+        case_id__in=RawSQL(ACTIVE_INSURANCE_CASE_IDS_SQL, []),
+    )
+
+
+def status_counts(queryset: QuerySet) -> Dict[str, int]:
+    """Total and per-status counts of ``queryset`` in one query."""
+    counts = queryset.order_by().aggregate(**STATUS_COUNT_AGGREGATES)
+    return {key: value or 0 for key, value in counts.items()}
+
+
+def list_rows(queryset: QuerySet) -> List[dict]:
+    """Render ``queryset`` as ReportListSchema dicts in one query."""
+    rows = []
+    for row in queryset.values(*LIST_FIELDS):
+        username = row['assigned_qc__username']
+        if username is not None:
+            full_name = f"{row['assigned_qc__first_name'] or ''} {row['assigned_qc__last_name'] or ''}".strip()
+            qc_name = full_name or username
+        else:
+            qc_name = None
+        rows.append({
+            'id': row['id'],
+            'case_number': row['case__case_number'],
+            'case_title': row['case__title'],
+            'claim_number': row['case__claim_number'],
+            'client_name': row['case__client_name'],
+            'category': row['case__category'],
+            'status': row['status'],
+            'assigned_qc_name': qc_name,
+            'created_at': row['created_at'],
+            'assigned_at': row['assigned_at'],
+            'reviewed_at': row['reviewed_at'],
+        })
+    return rows
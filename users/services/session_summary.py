@@ -0,0 +1,119 @@
+"""Per-user session summaries for the Super Admin user-management page.
+
+A session is a live ``AuthToken``: active, unexpired and heartbeating (last
+used within ``STALE_SESSION_SECONDS``). The page used to walk every user's
+tokens one query (and one save per dead token) at a time; here dead sessions
+are closed with one UPDATE and the live ones for a whole page of users are
+loaded with one prefetch.
+
+``purge_auth_tokens`` deletes tokens that have been dead for the retention
+window, so the token table only holds recent sessions. Run it daily via the
+``purge_auth_tokens`` management command.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Iterable, Optional
+
+from django.db import connections, transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from users.models import AuthToken
+
+logger = logging.getLogger(__name__)
+
+# The frontend heartbeats every few seconds; a session silent for longer is dead.
+STALE_SESSION_SECONDS = 15
+
+
+def deactivate_dead_sessions(user_ids: Optional[Iterable[int]] = None) -> int:
+    """Mark expired and non-heartbeating active tokens inactive; returns the number closed."""
+    now = timezone.now()
+    tokens = AuthToken.objects.filter(is_active=True).filter(
+        Q(expires_at__lt=now) | Q(last_used_at__lt=now - timedelta(seconds=STALE_SESSION_SECONDS))
+    )
+    if user_ids is not None:
+        tokens = tokens.filter(user_id__in=list(user_ids))
+    return tokens.update(is_active=False)
+
+
+def with_live_sessions(users):
+    """Prefetch each user's active tokens (newest first) into ``user.live_sessions``."""
+    return users.prefetch_related(
+        Prefetch(
+            'auth_tokens',
+            queryset=AuthToken.objects.filter(is_active=True).order_by('-created_at'),
+            to_attr='live_sessions',
+        )
+    )
+
+
+def session_summary(user) -> dict:
+    """Session fields of ``AdminUserWithSessionSchema`` for a user loaded via ``with_live_sessions``."""
+    sessions = getattr(user, 'live_sessions', [])
+    if not sessions:
+        return {
+            'is_online': False,
+            'session_ip': '',
+            'session_device': '',
+            'session_created_at': None,
+            'session_last_used': None,
+            'active_sessions': [],
+        }
+
+    latest = sessions[0]
+    return {
+        'is_online': True,
+        'session_ip': latest.ip_address or '',
+        'session_device': latest.device_info or '',
+        'session_created_at': latest.created_at.isoformat() if latest.created_at else None,
+        'session_last_used': latest.last_used_at.isoformat() if latest.last_used_at else None,
+        'active_sessions': [
+            {
+                'session_id': token.id,
+                'token_created_at': token.created_at,
+                'last_used_at': token.last_used_at,
+                'ip_address': token.ip_address or '',
+                'device_info': token.device_info or '',
+                'device_name': token.device_name or '',
+                'is_active': token.is_active,
+            }
+            for token in sessions
+        ],
+    }
+
+
+def purge_auth_tokens(older_than_days: int, batch_size: int = 5000) -> int:
+    """Delete inactive or expired tokens whose last activity is older than ``older_than_days``.
+
+    Deletes in batches of ``batch_size`` so login traffic never waits on a
+    long lock. Returns the number of tokens deleted.
+    """
+    total_deleted = 0
+    while True:
+        with transaction.atomic(using='default'):
+            with connections['default'].cursor() as cursor:
+                cursor.execute(
+                    """
+                    DELETE FROM users_authtoken
+                    WHERE id IN (
+                        SELECT id FROM users_authtoken
+                        WHERE (NOT is_active OR expires_at < NOW())
+                          AND COALESCE(last_used_at, created_at) < NOW() - (%s * INTERVAL '1 day')
+                        ORDER BY id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    """,
+                    [older_than_days, batch_size],
+                )
+                deleted = cursor.rowcount or 0
+        total_deleted += deleted
+        if deleted < batch_size:
+            break
+    if total_deleted:
+        logger.info("Purged %d dead auth tokens", total_deleted)
+    return total_deleted
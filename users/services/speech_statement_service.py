@@ -19,9 +19,7 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from core import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -154,17 +152,6 @@ class SpeechStatementService:
         self.stt_model = config["stt_model"]
         self.translation_model = config["translation_model"]
 
-        # Configure requests session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1.0,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["POST"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-
     def validate_audio(
         self,
         audio_bytes: bytes,
@@ -251,9 +238,9 @@ class SpeechStatementService:
             if not extension:
                 extension = "m4a"  # Default fallback
 
-        logger.info(
-            f"[SpeechService] Validated audio: {len(audio_bytes)} bytes, "
-            f"type={validated_content_type}, ext={extension}"
+        logger.debug(
+            "[SpeechService] Validated audio: %d bytes, type=%s, ext=%s",
+            len(audio_bytes), validated_content_type, extension,
         )
 
         return validated_content_type, extension
@@ -276,7 +263,7 @@ class SpeechStatementService:
             raise TranscriptionError("GROQ_API_KEY is not configured")
 
         start_time = time.time()
-        logger.info(f"[SpeechService] Starting Marathi transcription with {self.stt_model}")
+        logger.debug("[SpeechService] Starting Marathi transcription with %s", self.stt_model)
 
         # Create temporary file for upload
         with tempfile.NamedTemporaryFile(suffix=f".{extension}", delete=False) as tmp:
@@ -285,7 +272,8 @@ class SpeechStatementService:
 
         try:
             with open(tmp_path, "rb") as audio_file:
-                response = self.session.post(
+                response = http_client.post(
+                    "groq",
                     self.GROQ_TRANSCRIPTION_URL,
                     headers={
                         "Authorization": f"Bearer {self.api_key}",
@@ -303,7 +291,7 @@ class SpeechStatementService:
                 )
 
             elapsed = time.time() - start_time
-            logger.info(f"[SpeechService] Transcription API responded in {elapsed:.2f}s")
+            logger.info("[SpeechService] Transcription API responded in %.2fs", elapsed)
 
             if response.status_code != 200:
                 error_msg = response.text[:500] if response.text else "Unknown error"
@@ -317,7 +305,7 @@ class SpeechStatementService:
                 raise TranscriptionError("Transcription returned empty text. Please speak clearly and try again.")
 
             # Log the transcription for debugging
-            logger.info(f"[SpeechService] Transcription result: {text[:100]}...")
+            logger.debug("[SpeechService] Transcription result: %s...", text[:100])
 
             return {
                 "text": text,
@@ -327,11 +315,11 @@ class SpeechStatementService:
                 "raw_response": result,
             }
 
-        except requests.Timeout:
+        except http_client.ProviderTimeout:
             logger.error("[SpeechService] Transcription request timed out")
             raise TranscriptionError("Transcription request timed out. Please try again.")
-        except requests.RequestException as e:
-            logger.error(f"[SpeechService] Transcription request failed: {e}")
+        except http_client.OutboundHTTPError as e:
+            logger.error("[SpeechService] Transcription request failed: %s", e)
             raise TranscriptionError(f"Transcription request failed: {str(e)}")
         finally:
             # Clean up temp file
@@ -357,7 +345,7 @@ class SpeechStatementService:
             raise TranslationError("GROQ_API_KEY is not configured")
 
         start_time = time.time()
-        logger.info(f"[SpeechService] Starting translation with {self.translation_model}")
+        logger.debug("[SpeechService] Starting translation with %s", self.translation_model)
 
         # Enhanced system prompt for accurate legal/insurance domain translation
         system_prompt = (
@@ -380,7 +368,8 @@ class SpeechStatementService:
         user_prompt = f"Translate this Marathi insurance investigation statement to English:\n\n{marathi_text}"
 
         try:
-            response = self.session.post(
+            response = http_client.post(
+                "groq",
                 self.GROQ_CHAT_URL,
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -399,7 +388,7 @@ class SpeechStatementService:
             )
 
             elapsed = time.time() - start_time
-            logger.info(f"[SpeechService] Translation API responded in {elapsed:.2f}s")
+            logger.info("[SpeechService] Translation API responded in %.2fs", elapsed)
 
             if response.status_code != 200:
                 error_msg = response.text[:500] if response.text else "Unknown error"
@@ -422,11 +411,11 @@ class SpeechStatementService:
                 "raw_response": result,
             }
 
-        except requests.Timeout:
+        except http_client.ProviderTimeout:
             logger.error("[SpeechService] Translation request timed out")
             raise TranslationError("Translation request timed out. Please try again.")
-        except requests.RequestException as e:
-            logger.error(f"[SpeechService] Translation request failed: {e}")
+        except http_client.OutboundHTTPError as e:
+            logger.error("[SpeechService] Translation request failed: %s", e)
             raise TranslationError(f"Translation request failed: {str(e)}")
 
     def process_audio(
@@ -453,8 +442,8 @@ class SpeechStatementService:
             SpeechStatementError: If any step fails
         """
         logger.info(
-            f"[SpeechService] Processing audio: {len(audio_bytes)} bytes, "
-            f"type={content_type}, file={filename}, provider={self.provider}"
+            "[SpeechService] Processing audio: %d bytes, type=%s, file=%s, provider=%s",
+            len(audio_bytes), content_type, filename, self.provider,
         )
 
         # Step 1: Validate audio
@@ -539,7 +528,8 @@ class SpeechStatementService:
 
         try:
             with open(tmp_path, "rb") as audio_file:
-                submit_response = self.session.post(
+                submit_response = http_client.post(
+                    "speechmatics",
                     f"{sm_base_url}/jobs/",
                     headers={"Authorization": f"Bearer {sm_api_key}"},
                     files={"data_file": (f"audio.{extension}", audio_file, content_type)},
@@ -568,7 +558,7 @@ class SpeechStatementService:
         if not job_id:
             raise TranscriptionError("Speechmatics returned no job ID")
 
-        logger.info(f"[SpeechService:Speechmatics] Job submitted: {job_id}")
+        logger.debug("[SpeechService:Speechmatics] Job submitted: %s", job_id)
 
         # ---- Step 2: Poll for completion ----
         job_url = f"{sm_base_url}/jobs/{job_id}"
@@ -579,17 +569,17 @@ class SpeechStatementService:
             time.sleep(poll_interval)
 
             try:
-                status_response = self.session.get(
-                    job_url, headers=headers, timeout=self.request_timeout
+                status_response = http_client.get(
+                    "speechmatics", job_url, headers=headers, timeout=self.request_timeout
                 )
-            except requests.RequestException as e:
+            except http_client.OutboundHTTPError as e:
                 logger.warning(f"[SpeechService:Speechmatics] Poll attempt {attempt} failed: {e}")
                 continue
 
             if status_response.status_code != 200:
                 logger.warning(
-                    f"[SpeechService:Speechmatics] Poll attempt {attempt}: "
-                    f"status {status_response.status_code}"
+                    "[SpeechService:Speechmatics] Poll attempt %d: status %s",
+                    attempt, status_response.status_code,
                 )
                 continue
 
@@ -598,8 +588,8 @@ class SpeechStatementService:
 
             if job_status == "done":
                 logger.info(
-                    f"[SpeechService:Speechmatics] Job {job_id} done after "
-                    f"{time.time() - start_time:.1f}s (attempt {attempt})"
+                    "[SpeechService:Speechmatics] Job %s done after %.1fs (attempt %d)",
+                    job_id, time.time() - start_time, attempt,
                 )
                 break
             elif job_status in ("rejected", "deleted"):
@@ -607,7 +597,7 @@ class SpeechStatementService:
                 raise TranscriptionError(f"Speechmatics job failed: {error_msg}")
 
             logger.debug(
-                f"[SpeechService:Speechmatics] Poll {attempt}/{max_poll_attempts}: {job_status}"
+                "[SpeechService:Speechmatics] Poll %d/%d: %s", attempt, max_poll_attempts, job_status
             )
         else:
             # Exhausted all poll attempts
@@ -617,10 +607,10 @@ class SpeechStatementService:
 
         # ---- Step 3: Retrieve transcript ----
         try:
-            transcript_response = self.session.get(
-                transcript_url, headers=headers, timeout=self.request_timeout
+            transcript_response = http_client.get(
+                "speechmatics", transcript_url, headers=headers, timeout=self.request_timeout
             )
-        except requests.RequestException as e:
+        except http_client.OutboundHTTPError as e:
             raise TranscriptionError(f"Failed to retrieve Speechmatics transcript: {e}")
 
         if transcript_response.status_code != 200:
@@ -655,9 +645,8 @@ class SpeechStatementService:
                 "Speechmatics returned empty transcript. Please speak clearly and try again."
             )
 
-        logger.info(
-            f"[SpeechService:Speechmatics] STT complete in {stt_elapsed:.1f}s: "
-            f"mr_len={len(transcript_mr)}"
+        logger.debug(
+            "[SpeechService:Speechmatics] STT complete in %.1fs: mr_len=%d", stt_elapsed, len(transcript_mr)
         )
 
         # ---- Step 5: Translate Marathi→English via Groq LLM ----
@@ -678,8 +667,8 @@ class SpeechStatementService:
             audio_duration = float(job_meta["duration"])
 
         logger.info(
-            f"[SpeechService:Speechmatics] Complete in {elapsed:.1f}s: "
-            f"mr_len={len(transcript_mr)}, en_len={len(translation_en)}"
+            "[SpeechService:Speechmatics] Complete in %.1fs: mr_len=%d, en_len=%d",
+            elapsed, len(transcript_mr), len(translation_en),
         )
 
         return TranscriptionResult(
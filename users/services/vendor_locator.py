@@ -0,0 +1,275 @@
+"""Spatial vendor index and capacity-aware vendor scoring.
+
+``VendorLocator`` keeps every active vendor with coordinates in a uniform
+lat/lng grid (``GRID_CELL_DEGREES`` per cell) held in process memory.
+k-nearest queries scan rings of cells outward from the query point and stop
+as soon as no unscanned cell can hold a closer vendor, so a query touches a
+handful of cells instead of every vendor.
+
+The index is rebuilt lazily: vendor write endpoints call
+``invalidate_vendor_locator()`` and, because other worker processes do not
+see that call, each process also rebuilds after ``LOCATOR_TTL_SECONDS``.
+
+``rank_vendors`` combines distance with each vendor's current open-check load
+(overall and for the requested check type) so assignment spreads work instead
+of always picking the geographically nearest vendor.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+
+EARTH_RADIUS_KM = 6371.0
+GRID_CELL_DEGREES = 0.5
+LOCATOR_TTL_SECONDS = 300
+
+# Candidate pool considered by the scoring function.
+DEFAULT_CANDIDATES = 25
+DEFAULT_MAX_DISTANCE_KM = 500.0
+
+# Score = distance_km + LOAD_PENALTY_KM * open checks + TYPE_LOAD_PENALTY_KM * open checks of same type.
+LOAD_PENALTY_KM = 5.0
+TYPE_LOAD_PENALTY_KM = 10.0
+
+# Check statuses that no longer count against a vendor's workload.
+CLOSED_CHECK_STATUSES = (
+    'Closed', 'Completed', 'Verified', 'Stop', 'Failed', 'Dispatched', 'not found',
+)
+
+# check_type -> table, as used by notification_service.CHECK_TABLE_MAP.
+CHECK_TABLES: Dict[str, str] = {
+    "claimant": "claimant_checks",
+    "insured": "insured_checks",
+    "driver": "driver_checks",
+    "spot": "spot_checks",
+    "chargesheet": "chargesheets",
+    "rti": "rti_checks",
+    "rto": "rto_checks",
+}
+
+# check_type -> (lat column, lng column) filled by incident_case_db._geocode_and_update.
+# rti_checks carries no coordinates.
+CHECK_COORDINATE_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "claimant": ("claimant_lat", "claimant_lng"),
+    "insured": ("insured_lat", "insured_lng"),
+    "driver": ("driver_lat", "driver_lng"),
+    "spot": ("spot_lat", "spot_lng"),
+    "chargesheet": ("chargesheet_lat", "chargesheet_lng"),
+    "rto": ("rto_lat", "rto_lng"),
+}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres between two WGS84 points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@dataclass(frozen=True)
+class VendorPoint:
+    id: int
+    company_name: str
+    latitude: float
+    longitude: float
+    city: str
+    state: str
+
+
+class VendorLocator:
+    """Uniform-grid spatial index over vendor coordinates."""
+
+    def __init__(self, vendors: List[VendorPoint], cell_degrees: float = GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.vendors = vendors
+        self.built_at = time.monotonic()
+        self._cells: Dict[Tuple[int, int], List[VendorPoint]] = {}
+        for vendor in vendors:
+            self._cells.setdefault(self._cell_of(vendor.latitude, vendor.longitude), []).append(vendor)
+        if self._cells:
+            rows = [key[0] for key in self._cells]
+            cols = [key[1] for key in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = None
+
+    def __len__(self) -> int:
+        return len(self.vendors)
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees))
+
+    def _ring(self, center: Tuple[int, int], radius: int):
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for dc in range(-radius, radius + 1):
+            yield row - radius, col + dc
+            yield row + radius, col + dc
+        for dr in range(-radius + 1, radius):
+            yield row + dr, col - radius
+            yield row + dr, col + radius
+
+    def _ring_min_distance_km(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance to any vendor in ring ``radius`` or beyond."""
+        if radius <= 0:
+            return 0.0
+        # One cell of latitude is constant; a cell of longitude shrinks with cos(lat),
+        # so bound with the smaller of the two (clamped near the poles).
+        lat_km = (radius - 1) * self.cell_degrees * 111.0
+        lng_km = lat_km * max(math.cos(math.radians(min(abs(lat) + radius * self.cell_degrees, 89.0))), 0.01)
+        return min(lat_km, lng_km)
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = DEFAULT_CANDIDATES,
+        max_distance_km: Optional[float] = None,
+    ) -> List[Tuple[float, VendorPoint]]:
+        """Return up to ``k`` (distance_km, vendor) pairs ordered by distance."""
+        if not self._cells or k <= 0:
+            return []
+        center = self._cell_of(lat, lng)
+        min_row, max_row, min_col, max_col = self._bounds
+        # Rings beyond this radius contain no occupied cells.
+        last_radius = max(
+            abs(center[0] - min_row), abs(center[0] - max_row),
+            abs(center[1] - min_col), abs(center[1] - max_col),
+        )
+        found: List[Tuple[float, VendorPoint]] = []
+        for radius in range(0, last_radius + 1):
+            bound = self._ring_min_distance_km(lat, radius)
+            if max_distance_km is not None and bound > max_distance_km:
+                break
+            if len(found) >= k and bound > found[k - 1][0]:
+                break
+            for cell in self._ring(center, radius):
+                for vendor in self._cells.get(cell, ()):
+                    distance = haversine_km(lat, lng, vendor.latitude, vendor.longitude)
+                    if max_distance_km is None or distance <= max_distance_km:
+                        found.append((distance, vendor))
+            found.sort(key=lambda item: item[0])
+        return found[:k]
+
+
+_locator: Optional[VendorLocator] = None
+_locator_lock = threading.Lock()
+
+
+def _load_vendor_points() -> List[VendorPoint]:
+    from users.models import Vendor
+
+    rows = Vendor.objects.filter(
+        is_active=True,
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).values_list('id', 'company_name', 'latitude', 'longitude', 'city', 'state')
+    return [
+        VendorPoint(vid, name or '', float(lat), float(lng), city or '', state or '')
+        for vid, name, lat, lng, city, state in rows
+    ]
+
+
+def get_vendor_locator() -> VendorLocator:
+    """Return the process-wide locator, rebuilding it when invalidated or stale."""
+    global _locator
+    locator = _locator
+    if locator is None or time.monotonic() - locator.built_at > LOCATOR_TTL_SECONDS:
+        with _locator_lock:
+            locator = _locator
+            if locator is None or time.monotonic() - locator.built_at > LOCATOR_TTL_SECONDS:
+                locator = VendorLocator(_load_vendor_points())
+                _locator = locator
+    return locator
+
+
+def invalidate_vendor_locator() -> None:
+    """Drop the cached index; the next query rebuilds it from the database."""
+    global _locator
+    with _locator_lock:
+        _locator = None
+
+
+def get_open_check_counts(vendor_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, int]]:
+    """Return ``{vendor_id: {check_type: open_count}}`` in a single UNION ALL query."""
+    placeholders = ", ".join(["%s"] * len(CLOSED_CHECK_STATUSES))
+    vendor_filter = ""
+    vendor_params: list = []
+    if vendor_ids is not None:
+        if not vendor_ids:
+            return {}
+        vendor_filter = "AND assigned_vendor_id = ANY(%s)"
+        vendor_params = [list(vendor_ids)]
+
+    parts = []
+    params: list = []
+    for check_type, table in CHECK_TABLES.items():
+        parts.append(
+            f"SELECT assigned_vendor_id, %s AS check_type, COUNT(*) FROM {table} "
+            f"WHERE assigned_vendor_id IS NOT NULL {vendor_filter} "
+            f"AND check_status NOT IN ({placeholders}) GROUP BY assigned_vendor_id"
+        )
+        params.extend([check_type, *vendor_params, *CLOSED_CHECK_STATUSES])
+
+    counts: Dict[int, Dict[str, int]] = {}
+    with connections['default'].cursor() as cursor:
+        cursor.execute(" UNION ALL ".join(parts), params)
+        for vendor_id, check_type, count in cursor.fetchall():
+            counts.setdefault(vendor_id, {})[check_type] = int(count)
+    return counts
+
+
+def score_vendor(distance_km: float, open_total: int, open_same_type: int) -> float:
+    """Lower is better: distance plus a per-open-check workload penalty."""
+    return distance_km + LOAD_PENALTY_KM * open_total + TYPE_LOAD_PENALTY_KM * open_same_type
+
+
+def rank_vendors(
+    lat: float,
+    lng: float,
+    check_type: Optional[str] = None,
+    k: int = DEFAULT_CANDIDATES,
+    max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+    max_open_checks: Optional[int] = None,
+) -> List[dict]:
+    """Rank the ``k`` nearest vendors by distance and current workload.
+
+    Vendors at or above ``max_open_checks`` open checks are excluded.
+    Each result carries ``distance_km``, ``open_checks``, ``open_checks_same_type``
+    and ``score`` alongside the vendor fields.
+    """
+    candidates = get_vendor_locator().nearest(lat, lng, k=k, max_distance_km=max_distance_km)
+    if not candidates:
+        return []
+
+    load = get_open_check_counts([vendor.id for _, vendor in candidates])
+    ranked = []
+    for distance, vendor in candidates:
+        by_type = load.get(vendor.id, {})
+        open_total = sum(by_type.values())
+        if max_open_checks is not None and open_total >= max_open_checks:
+            continue
+        open_same_type = by_type.get(check_type, 0) if check_type else 0
+        ranked.append({
+            "id": vendor.id,
+            "company_name": vendor.company_name,
+            "city": vendor.city,
+            "state": vendor.state,
+            "distance_km": round(distance, 2),
+            "open_checks": open_total,
+            "open_checks_same_type": open_same_type,
+            "score": round(score_vendor(distance, open_total, open_same_type), 3),
+        })
+    ranked.sort(key=lambda item: (item["score"], item["distance_km"]))
+    return ranked
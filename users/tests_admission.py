@@ -0,0 +1,72 @@
+"""
+Tests for admission control on expensive endpoints (core/admission.py).
+
+Tests cover:
+- Requests admitted while slots are free, with the slot released afterwards
+- 429 when the caller already holds their per-user slots
+- 503 with Retry-After once the endpoint is saturated and the wait times out
+- ``applies`` exempting cheap variants of an endpoint
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core import admission
+from core.admission import AdmissionLimit, admission_limit
+
+
+class TestAdmissionLimit(SimpleTestCase):
+
+    def setUp(self):
+        self.held = set()
+        self.unlocked = []
+        limits = dict(admission.ADMISSION_LIMITS, test=AdmissionLimit(
+            limit=1, per_user=1, queue_timeout=0.0, max_queue=1, retry_after=7,
+        ))
+        for patcher in (
+            mock.patch.object(admission, 'ADMISSION_LIMITS', limits),
+            mock.patch.object(admission, '_try_lock', side_effect=self._try_lock),
+            mock.patch.object(admission, '_unlock', side_effect=self._unlock),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.request = mock.Mock()
+        self.request.user.pk = 42
+
+    def _try_lock(self, key, slot):
+        if (key, slot) in self.held:
+            return False
+        self.held.add((key, slot))
+        return True
+
+    def _unlock(self, held):
+        self.unlocked.extend(held)
+        self.held.difference_update(held)
+
+    def test_admits_and_releases_slot(self):
+        view = admission_limit('test')(lambda request: 'ok')
+        self.assertEqual(view(self.request), 'ok')
+        self.assertEqual(view(self.request), 'ok')
+        self.assertEqual(len(self.unlocked), 4)
+        self.assertEqual(self.held, set())
+
+    def test_rejects_second_request_from_same_user(self):
+        self.held.add((admission._lock_key('admission-user', 'test', 0), 42))
+        response = admission_limit('test')(lambda request: 'ok')(self.request)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+
+    def test_returns_503_when_saturated(self):
+        self.held.add((admission._lock_key('admission', 'test'), 0))
+        response = admission_limit('test')(lambda request: 'ok')(self.request)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '7')
+        # The per-user slot taken before waiting is handed back.
+        self.assertEqual(self.unlocked, [(admission._lock_key('admission-user', 'test', 0), 42)])
+
+    def test_applies_exempts_cheap_requests(self):
+        self.held.add((admission._lock_key('admission', 'test'), 0))
+        view = admission_limit('test', applies=lambda request, bulk: bulk)(lambda request, bulk: 'ok')
+        self.assertEqual(view(self.request, bulk=False), 'ok')
+        self.assertEqual(view(self.request, bulk=True).status_code, 503)
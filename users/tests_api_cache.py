@@ -0,0 +1,124 @@
+"""
+Tests for the tiered API response cache (core/api_cache.py).
+
+Tests cover:
+- Tag versions invalidating cached entries (trigger-maintained and explicit)
+- The shared tier serving entries missing from the in-process tier
+- Endpoint opt-in on the court details lookups, with fallback results
+  served but not cached
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connections
+from django.test import Client, TestCase, override_settings
+
+from core import api_cache
+from users.models import AuthToken
+
+
+User = get_user_model()
+
+SHARED_LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'api_shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api-cache-tests'},
+}
+
+
+class ApiCacheTestCase(TestCase):
+
+    def setUp(self):
+        api_cache.reset_api_cache()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {'calls': self.calls}
+
+    def lookup(self, tags=('court_details',)):
+        return api_cache.get_or_compute('tests', 'key', self.compute, tags=tags)
+
+
+class TestTagInvalidation(ApiCacheTestCase):
+
+    def test_explicit_invalidation(self):
+        self.assertEqual(self.lookup(), {'calls': 1})
+        self.assertEqual(self.lookup(), {'calls': 1})
+
+        api_cache.invalidate_tags('court_details')
+        self.assertEqual(self.lookup(), {'calls': 2})
+        self.assertEqual(api_cache.cache_metrics()['tests']['l1_hits'], 1)
+
+    def test_case_tag_follows_data_version(self):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO cases (claim_number, client_name, category) VALUES ('CACHE-1', 'C', 'MACT') RETURNING id"
+            )
+            case_id = cursor.fetchone()[0]
+        tags = [f'case:{case_id}']
+        self.lookup(tags)
+        self.assertEqual(self.lookup(tags), {'calls': 1})
+
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO claimant_checks (case_id, check_status) VALUES (%s, 'WIP')", [case_id]
+            )
+        self.assertEqual(self.lookup(tags), {'calls': 2})
+
+    def test_court_details_write_bumps_tag(self):
+        self.lookup()
+        with connections['default'].cursor() as cursor:
+            cursor.execute("DELETE FROM court_details WHERE FALSE")
+        self.assertEqual(self.lookup(), {'calls': 2})
+
+
+@override_settings(CACHES=SHARED_LOCMEM_CACHES)
+class TestSharedTier(ApiCacheTestCase):
+
+    def test_shared_tier_hit_after_local_reset(self):
+        self.lookup()
+        api_cache.reset_api_cache()
+
+        self.assertEqual(self.lookup(), {'calls': 1})
+        self.assertEqual(api_cache.cache_metrics()['tests']['l2_hits'], 1)
+
+
+class TestCourtDetailsEndpoint(ApiCacheTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(
+            username='cachecm', email='cachecm@test.com', password='testpass123', role='CASE_MANAGER',
+        )
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AuthToken.objects.create(user=user).token}'}
+
+    def test_cities_served_from_cache_until_reload(self):
+        headers = self.headers
+        client = Client()
+
+        self.assertEqual(client.get('/api/court-details/cities', **headers).status_code, 200)
+        client.get('/api/court-details/cities', **headers)
+        metrics = api_cache.cache_metrics()['court_details']
+        self.assertEqual((metrics['misses'], metrics['l1_hits']), (1, 1))
+
+        api_cache.invalidate_tags('court_details')
+        client.get('/api/court-details/cities', **headers)
+        self.assertEqual(api_cache.cache_metrics()['court_details']['misses'], 2)
+
+    def test_fallback_after_db_error_is_not_cached(self):
+        client = Client()
+        failing = mock.MagicMock()
+        failing.__getitem__.return_value.cursor.side_effect = DatabaseError('connection lost')
+
+        with mock.patch('users.api.cases.connections', failing), self.assertLogs('users.api.cases', level='ERROR'):
+            for _ in range(2):
+                response = client.get('/api/court-details/cities', **self.headers)
+                self.assertEqual(response.json(), {'cities': []})
+        metrics = api_cache.cache_metrics()['court_details']
+        self.assertEqual((metrics['misses'], metrics['l1_hits']), (2, 0))
+
+        client.get('/api/court-details/cities', **self.headers)
+        client.get('/api/court-details/cities', **self.headers)
+        metrics = api_cache.cache_metrics()['court_details']
+        self.assertEqual((metrics['misses'], metrics['l1_hits']), (3, 1))
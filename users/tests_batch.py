@@ -0,0 +1,187 @@
+"""
+Tests for the batch endpoint (core/batch.py).
+
+Tests cover:
+- Empty and oversized batches rejected
+- Only /api/ paths, and no nested batches
+- Unknown methods rejected
+- Oversized sub-request bodies rejected
+- POST /api/batch through the router: results in request order, consecutive
+  GETs running concurrently, writes on the request thread and connection,
+  a failing sub-request not failing the others, async views rejected per
+  item, and the bearer token resolved once per batch
+"""
+
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.http import JsonResponse
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from django.utils import timezone
+
+from core import batch
+from core import urls as project_urls
+from core.batch import BatchError, BatchItem, validate_batch
+from users.models import AuthToken
+
+
+User = get_user_model()
+
+_calls = []
+_rendezvous = threading.Barrier(2, timeout=5)
+
+
+def _echo_view(request, n):
+    _calls.append(('read', n, threading.get_ident()))
+    return JsonResponse({'n': n})
+
+
+def _rendezvous_view(request, n):
+    # Both reads must be in flight at once for the barrier to open.
+    _rendezvous.wait()
+    _calls.append(('rendezvous', n, threading.get_ident()))
+    return JsonResponse({'n': n})
+
+
+def _write_view(request):
+    _calls.append(('write', connections['default'].in_atomic_block, threading.get_ident()))
+    return JsonResponse({'written': True}, status=201)
+
+
+def _failing_view(request):
+    raise RuntimeError('boom')
+
+
+urlpatterns = [
+    path('api/batch-test/echo/<int:n>', _echo_view),
+    path('api/batch-test/rendezvous/<int:n>', _rendezvous_view),
+    path('api/batch-test/write', _write_view),
+    path('api/batch-test/fail', _failing_view),
+    # The project's own routes; api.urls can only be registered once per process.
+    *project_urls.urlpatterns,
+]
+
+
+class TestValidateBatch(SimpleTestCase):
+
+    def test_accepts_reads_and_writes(self):
+        validate_batch([
+            BatchItem(path='/api/notifications?unread=true'),
+            BatchItem(method='post', path='/api/notifications/mark-read', body={'ids': [1]}),
+        ])
+
+    def test_rejects_empty_batch(self):
+        with self.assertRaises(BatchError):
+            validate_batch([])
+
+    def test_rejects_too_many_requests(self):
+        items = [BatchItem(path='/api/notifications')] * (batch.BATCH_MAX_REQUESTS + 1)
+        with self.assertRaises(BatchError):
+            validate_batch(items)
+
+    def test_rejects_non_api_and_nested_batch_paths(self):
+        for path in ('/admin/', '/api/batch', '/api/batch/?x=1'):
+            with self.subTest(path=path), self.assertRaises(BatchError):
+                validate_batch([BatchItem(path=path)])
+
+    def test_rejects_unknown_method(self):
+        with self.assertRaises(BatchError):
+            validate_batch([BatchItem(method='OPTIONS', path='/api/notifications')])
+
+    def test_rejects_oversized_body(self):
+        item = BatchItem(method='POST', path='/api/notifications/mark-read', body='x' * (batch.BATCH_MAX_BODY_BYTES + 1))
+        with self.assertRaises(BatchError):
+            batch._encode_body(item)
+
+
+@override_settings(ROOT_URLCONF='users.tests_batch')
+class TestBatchDispatch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='batchuser', email='batchuser@test.com', password='testpass123', role='CASE_MANAGER',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        token = AuthToken.objects.create(user=self.user, last_used_at=timezone.now())
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {token.token}'}
+        _calls.clear()
+        _rendezvous.reset()
+
+    def post_batch(self, requests):
+        response = self.client.post(
+            '/api/batch', {'requests': requests}, content_type='application/json', **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['responses']
+
+    def test_results_follow_request_order(self):
+        responses = self.post_batch([
+            {'id': f'r{n}', 'path': f'/api/batch-test/echo/{n}'} for n in range(5)
+        ])
+        self.assertEqual([item['id'] for item in responses], ['r0', 'r1', 'r2', 'r3', 'r4'])
+        self.assertEqual([item['body'] for item in responses], [{'n': n} for n in range(5)])
+
+    def test_consecutive_reads_run_concurrently(self):
+        responses = self.post_batch([
+            {'id': 'a', 'path': '/api/batch-test/rendezvous/1'},
+            {'id': 'b', 'path': '/api/batch-test/rendezvous/2'},
+        ])
+        self.assertEqual([item['status'] for item in responses], [200, 200])
+        threads = {ident for _, _, ident in _calls}
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_writes_run_serially_on_the_request_connection(self):
+        responses = self.post_batch([
+            {'id': 'before', 'path': '/api/batch-test/echo/1'},
+            {'id': 'write', 'method': 'POST', 'path': '/api/batch-test/write', 'body': {}},
+            {'id': 'after', 'path': '/api/batch-test/echo/2'},
+        ])
+        self.assertEqual([item['status'] for item in responses], [200, 201, 200])
+        self.assertEqual([call[:2] for call in _calls], [('read', 1), ('write', True), ('read', 2)])
+        # Same thread, and still inside the test case's transaction: the batch's own connection.
+        self.assertEqual(_calls[1][2], threading.get_ident())
+
+    def test_failing_sub_request_does_not_fail_the_batch(self):
+        with self.assertLogs('core.batch', level='ERROR'):
+            responses = self.post_batch([
+                {'id': 'ok', 'path': '/api/batch-test/echo/1'},
+                {'id': 'fail', 'path': '/api/batch-test/fail'},
+                {'id': 'write', 'method': 'POST', 'path': '/api/batch-test/write', 'body': {}},
+                {'id': 'fail-again', 'method': 'POST', 'path': '/api/batch-test/fail'},
+            ])
+        self.assertEqual([item['status'] for item in responses], [200, 500, 201, 500])
+        self.assertEqual(responses[1]['body'], {'error': 'An unexpected error occurred'})
+
+    def test_async_and_unknown_routes_rejected_per_item(self):
+        responses = self.post_batch([
+            {'id': 'stream', 'path': '/api/events/stream'},
+            {'id': 'missing', 'path': '/api/batch-test/nowhere'},
+            {'id': 'ok', 'path': '/api/batch-test/echo/1'},
+        ])
+        self.assertEqual([item['status'] for item in responses], [400, 404, 200])
+        self.assertEqual([call[:2] for call in _calls], [('read', 1)])
+
+    @mock.patch('core.batch.BATCH_MAX_CONCURRENCY', 1)
+    def test_token_resolved_once_per_batch(self):
+        table = AuthToken._meta.db_table
+        with CaptureQueriesContext(connection) as ctx:
+            responses = self.post_batch([
+                {'id': 'me', 'path': '/api/auth/me'},
+                {'id': 'validate', 'path': '/api/auth/validate'},
+                {'id': 'me-again', 'path': '/api/auth/me'},
+            ])
+        self.assertEqual([item['status'] for item in responses], [200, 200, 200])
+        self.assertEqual(responses[0]['body']['username'], 'batchuser')
+        token_lookups = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+        ]
+        self.assertEqual(len(token_lookups), 1)
@@ -0,0 +1,104 @@
+"""
+Batch vendor assignment solvers (users/services/batch_assignment.py).
+
+Tests cover:
+- The exact solver moving an earlier check to free a slot the greedy fallback
+  leaves taken
+- The exact solver matching a brute-force optimum (most checks placed, then
+  least total cost) on small random instances
+- Unknown solver names rejected
+"""
+
+import itertools
+import random
+
+from django.test import SimpleTestCase
+
+from users.services.batch_assignment import PendingCheck, solve_assignment
+from users.services.vendor_locator import VendorLocator, VendorPoint, haversine_km, score_vendor
+
+
+CHECK_TYPES = ('claimant', 'insured', 'driver')
+
+
+def _check(check_id, lat, lng, check_type='claimant'):
+    return PendingCheck(check_type, check_id, check_id, f'BA-{check_id}', lat, lng)
+
+
+def _brute_force(checks, vendors, current_load, max_open_checks, candidates_per_check, max_distance_km):
+    """(assigned, total cost) of the best plan, trying every candidate vendor or none per check."""
+    locator = VendorLocator(vendors)
+    options = [
+        [None] + [vendor.id for _, vendor in locator.nearest(
+            check.latitude, check.longitude, k=candidates_per_check, max_distance_km=max_distance_km,
+        )]
+        for check in checks
+    ]
+    by_id = {vendor.id: vendor for vendor in vendors}
+    best = None
+    for choice in itertools.product(*options):
+        total = {vid: sum(by_type.values()) for vid, by_type in current_load.items()}
+        same_type = {(vid, ct): n for vid, by_type in current_load.items() for ct, n in by_type.items()}
+        cost, assigned = 0.0, 0
+        for check, vendor_id in zip(checks, choice):
+            if vendor_id is None:
+                continue
+            if total.get(vendor_id, 0) >= max_open_checks:
+                break
+            vendor = by_id[vendor_id]
+            distance = haversine_km(check.latitude, check.longitude, vendor.latitude, vendor.longitude)
+            cost += score_vendor(distance, total.get(vendor_id, 0), same_type.get((vendor_id, check.check_type), 0))
+            total[vendor_id] = total.get(vendor_id, 0) + 1
+            same_type[(vendor_id, check.check_type)] = same_type.get((vendor_id, check.check_type), 0) + 1
+            assigned += 1
+        else:
+            if best is None or (-assigned, cost) < (-best[0], best[1]):
+                best = (assigned, cost)
+    return best
+
+
+class TestSolveAssignment(SimpleTestCase):
+
+    def test_exact_reassigns_to_free_a_slot(self):
+        locator = VendorLocator([
+            VendorPoint(1, 'Near', 19.0, 72.80, '', ''),
+            VendorPoint(2, 'Far', 19.0, 73.20, '', ''),
+        ])
+        # Check 1 sits on vendor 1 but can also reach vendor 2; check 2 can only reach vendor 1.
+        checks = [_check(1, 19.0, 72.80), _check(2, 19.0, 72.75)]
+        options = dict(max_open_checks=1, candidates_per_check=2, max_distance_km=45.0)
+
+        greedy = solve_assignment(checks, locator, {}, solver='greedy', **options)
+        exact = solve_assignment(checks, locator, {}, **options)
+
+        self.assertEqual([(item.check_id, item.vendor_id) for item in greedy.assignments], [(1, 1)])
+        self.assertEqual(
+            sorted((item.check_id, item.vendor_id) for item in exact.assignments), [(1, 2), (2, 1)],
+        )
+        self.assertEqual(exact.unassigned, [])
+
+    def test_exact_matches_brute_force(self):
+        for seed in range(60):
+            rng = random.Random(seed)
+            vendors = [
+                VendorPoint(vid, f'V{vid}', rng.uniform(19.0, 19.5), rng.uniform(72.8, 73.3), '', '')
+                for vid in range(1, rng.randint(2, 4) + 1)
+            ]
+            checks = [
+                _check(cid, rng.uniform(19.0, 19.5), rng.uniform(72.8, 73.3), rng.choice(CHECK_TYPES))
+                for cid in range(1, rng.randint(2, 6) + 1)
+            ]
+            current_load = {vendor.id: {rng.choice(CHECK_TYPES): rng.randint(0, 2)} for vendor in vendors}
+            options = dict(
+                max_open_checks=rng.randint(1, 4), candidates_per_check=rng.randint(1, 3), max_distance_km=40.0,
+            )
+            with self.subTest(seed=seed):
+                summary = solve_assignment(checks, VendorLocator(vendors), current_load, **options).summary()
+                assigned, cost = _brute_force(checks, vendors, current_load, **options)
+                self.assertEqual(summary['assigned'], assigned)
+                # Plan costs are rounded per assignment.
+                self.assertAlmostEqual(summary['total_cost'], cost, delta=0.01 * len(checks))
+
+    def test_unknown_solver_rejected(self):
+        with self.assertRaises(ValueError):
+            solve_assignment([], VendorLocator([]), {}, solver='optimal')
@@ -0,0 +1,182 @@
+"""
+Tests for sparse fieldsets (core/fieldsets.py).
+
+Tests cover:
+- No parameters: every column and every expansion (existing clients)
+- fields= selecting only the named columns plus the always-selected ones
+- include= making expansions opt-in
+- Unknown fields and expansions rejected with 400
+- The incident-db list, full case details, /cases and /vendor-cases
+  endpoints: default payloads, narrowed SQL and JSON, opt-in expansions,
+  and columns outside an endpoint's response schema rejected with 400
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from core import api_cache
+from core.fieldsets import Resource, parse_fieldset, schema_fields, table_columns
+from users.api.cases import CaseSchema
+from users.api.vendor_cases import CaseSchema as VendorCaseSchema
+from users.models import AuthToken, InsuranceCase, Vendor
+from users.services.case_identity import clear_case_identity_cache, link_case_identity
+
+User = get_user_model()
+
+CASES = Resource('cases', tables=('cases',), alias='c', always=('id', 'seq_num'), computed=('seq_num',),
+                 expansions=('sub_items',))
+
+
+class TestParseFieldset(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('core.fieldsets.table_columns',
+                             return_value=frozenset({'id', 'claim_number', 'client_name', 'full_case_status'}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_defaults_to_full_rows_and_expansions(self):
+        selection = parse_fieldset(CASES)
+        self.assertFalse(selection.sparse)
+        self.assertEqual(selection.select_sql(), 'c.*')
+        self.assertTrue(selection.expands('sub_items'))
+
+    def test_fields_select_only_named_columns(self):
+        selection = parse_fieldset(CASES, 'claim_number, full_case_status')
+        self.assertEqual(selection.select_sql(), 'c."claim_number", c."full_case_status", c."id"')
+        self.assertFalse(selection.expands('sub_items'))
+        row = {'id': 1, 'seq_num': 3, 'claim_number': 'CL-1', 'full_case_status': 'WIP', 'client_name': 'X'}
+        self.assertEqual(selection.project(row), {'id': 1, 'seq_num': 3, 'claim_number': 'CL-1', 'full_case_status': 'WIP'})
+
+    def test_include_is_opt_in(self):
+        selection = parse_fieldset(CASES, None, 'sub_items')
+        self.assertFalse(selection.sparse)
+        self.assertTrue(selection.expands('sub_items'))
+
+    def test_unknown_names_rejected(self):
+        with self.assertRaises(HttpError) as raised:
+            parse_fieldset(CASES, 'claim_number,password')
+        self.assertEqual(raised.exception.status_code, 400)
+        with self.assertRaises(HttpError):
+            parse_fieldset(CASES, None, 'media')
+
+    def test_allowed_limits_requestable_fields(self):
+        resource = Resource('cases', tables=('cases',), allowed=('id', 'claim_number'))
+        self.assertTrue(parse_fieldset(resource, 'claim_number').wants('claim_number'))
+        with self.assertRaises(HttpError) as raised:
+            parse_fieldset(resource, 'claim_number,client_name')
+        self.assertEqual(raised.exception.status_code, 400)
+
+
+class TestFieldsetEndpoints(TestCase):
+    """Sparse fieldsets through the case endpoints, on one case with a claimant check."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.case_manager = User.objects.create_user(
+            username='fieldscm', email='fieldscm@test.com', password='testpass123', role='CASE_MANAGER',
+        )
+        cls.vendor_user = User.objects.create_user(
+            username='fieldsvendor', email='fieldsvendor@test.com', password='testpass123', role='VENDOR',
+        )
+        vendor = Vendor.objects.create(user=cls.vendor_user, company_name='Fields Vendor')
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO cases (claim_number, client_name, category, case_number, policy_document) "
+                "VALUES ('FIELDS-CLAIM', 'Fields Client', 'MACT', 'FIELDS-1', 'docs/policy.pdf') RETURNING id",
+            )
+            cls.case_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT INTO claimant_checks (case_id, claimant_name, check_status, assigned_vendor_id, vendor_evidence) "
+                "VALUES (%s, 'Fields Claimant', 'WIP', %s, %s)",
+                [cls.case_id, vendor.id, '[{"filename": "a.jpg", "url": "/media/a.jpg"}]'],
+            )
+        insurance_case = InsuranceCase.objects.create(
+            case_number='FIELDS-1', title='Fields case', claim_number='FIELDS-CLAIM',
+            client_name='Fields Client', special_instructions='Internal only',
+        )
+        link_case_identity(cls.case_id, insurance_case.id)
+
+    def setUp(self):
+        self.client = Client()
+        api_cache.reset_api_cache()
+        clear_case_identity_cache()
+
+    def get(self, user, path, status=200):
+        token = AuthToken.objects.create(user=user, last_used_at=timezone.now())
+        response = self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token.token}')
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def test_incident_list_default_payload_unchanged(self):
+        row = self.get(self.case_manager, '/api/cases/incident-db')['cases'][0]
+        self.assertLessEqual(table_columns('cases') | {'seq_num', 'sub_items'}, set(row))
+        self.assertEqual([item['type'] for item in row['sub_items']], ['Claimant Check'])
+
+    def test_incident_list_fields_narrow_sql_and_json(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.get(self.case_manager, '/api/cases/incident-db?fields=claim_number')
+        self.assertEqual(data['cases'], [{'id': self.case_id, 'seq_num': 1, 'claim_number': 'FIELDS-CLAIM'}])
+        row_query = next(q['sql'] for q in ctx.captured_queries if 'ROW_NUMBER()' in q['sql'])
+        self.assertIn('c."claim_number"', row_query)
+        self.assertNotIn('c.*', row_query)
+        self.assertFalse(any('FROM claimant_checks' in q['sql'] for q in ctx.captured_queries))
+
+    def test_incident_list_include_adds_sub_items(self):
+        row = self.get(self.case_manager, '/api/cases/incident-db?fields=claim_number&include=sub_items')['cases'][0]
+        self.assertEqual(set(row), {'id', 'seq_num', 'claim_number', 'sub_items'})
+        self.assertEqual(len(row['sub_items']), 1)
+
+    def test_full_details_default_payload_unchanged(self):
+        data = self.get(self.case_manager, f'/api/cases/incident-db/{self.case_id}/full-details')
+        self.assertLessEqual(table_columns('cases'), set(data['case']))
+        self.assertTrue(data['case']['policy_document_url'].endswith('/media/docs/policy.pdf'))
+        self.assertEqual([check['slug'] for check in data['checks']], ['claimant'])
+        self.assertIn('evidence_photos', data['checks'][0]['check'])
+
+    def test_full_details_fields_and_include(self):
+        path = f'/api/cases/incident-db/{self.case_id}/full-details'
+        data = self.get(self.case_manager, f'{path}?fields=claim_number')
+        self.assertEqual(data, {'case': {'id': self.case_id, 'claim_number': 'FIELDS-CLAIM'}})
+
+        data = self.get(self.case_manager, f'{path}?fields=claim_number&include=checks&check_fields=check_status')
+        self.assertEqual(data['checks'][0]['check'], {'id': data['checks'][0]['check']['id'], 'check_status': 'WIP'})
+
+        data = self.get(self.case_manager, f'{path}?include=checks,media')
+        self.assertIn('policy_document_url', data['case'])
+        self.assertIn('evidence_photos', data['checks'][0]['check'])
+
+    def test_unknown_fields_and_includes_rejected(self):
+        for path in (
+            '/api/cases/incident-db?fields=claim_number,nope',
+            '/api/cases/incident-db?include=media',
+            f'/api/cases/incident-db/{self.case_id}/full-details?check_fields=nope',
+            '/api/cases?fields=nope',
+        ):
+            with self.subTest(path=path):
+                self.get(self.case_manager, path, status=400)
+
+    def test_cases_fields_limited_to_case_schema(self):
+        data = self.get(self.case_manager, '/api/cases?fields=case_number,client_name')
+        self.assertEqual(set(data['cases'][0]), {'id', 'case_number', 'client_name'})
+        withheld = sorted(table_columns('insurance_case') - set(schema_fields(CaseSchema)))
+        self.assertIn('source_email_id', withheld)
+        for column in withheld:
+            with self.subTest(column=column):
+                self.get(self.case_manager, f'/api/cases?fields={column}', status=400)
+
+    def test_vendor_cases_fields_limited_to_case_schema(self):
+        data = self.get(self.vendor_user, '/api/vendor-cases?fields=case_number,status')
+        self.assertEqual(set(data['cases'][0]), {'id', 'case_number', 'status'})
+        withheld = sorted(table_columns('insurance_case') - set(schema_fields(VendorCaseSchema)))
+        for column in ('client_name', 'special_instructions', 'tat_days', 'closure_date', 'chk_spot'):
+            self.assertIn(column, withheld)
+        for column in withheld:
+            with self.subTest(column=column):
+                self.get(self.vendor_user, f'/api/vendor-cases?fields={column}', status=400)
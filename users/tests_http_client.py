@@ -0,0 +1,97 @@
+"""
+Tests for the shared outbound HTTP client (core/http_client.py).
+
+Tests cover:
+- Circuit breaker opening after consecutive failures and the half-open trial
+- Transport errors surfacing as OutboundHTTPError and failing fast once open
+- Unexpected exceptions counted as failures, never leaving a trial in flight
+- Concurrency limit rejecting callers when every slot is taken
+"""
+
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from core import http_client
+from core.http_client import CircuitBreaker, CircuitOpen, Provider
+
+
+class TestCircuitBreaker(SimpleTestCase):
+
+    def test_opens_after_threshold_and_closes_after_successful_trial(self):
+        breaker = CircuitBreaker(Provider('test', failure_threshold=2, reset_seconds=30))
+        with mock.patch('core.http_client.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            breaker.before_call()
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            with self.assertRaises(CircuitOpen):
+                breaker.before_call()
+
+        with mock.patch('core.http_client.time.monotonic', return_value=131.0):
+            breaker.before_call()
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            with self.assertRaises(CircuitOpen):
+                breaker.before_call()
+            breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestHttpRequest(SimpleTestCase):
+
+    def setUp(self):
+        http_client.reset_http_clients()
+        self.addCleanup(http_client.reset_http_clients)
+        providers = dict(http_client.PROVIDERS, flaky=Provider('flaky', failure_threshold=2, max_concurrency=1,
+                                                               queue_timeout=0.01))
+        patcher = mock.patch.object(http_client, 'PROVIDERS', providers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fails_fast_once_circuit_is_open(self):
+        state = http_client._state_for('flaky')
+        state.session = mock.Mock()
+        state.session.request.side_effect = requests.ConnectionError('refused')
+
+        for _ in range(2):
+            with self.assertRaises(http_client.ProviderConnectionError):
+                http_client.get('flaky', 'https://example.invalid/')
+        with self.assertRaises(CircuitOpen):
+            http_client.get('flaky', 'https://example.invalid/')
+        self.assertEqual(state.session.request.call_count, 2)
+
+    def test_unexpected_error_during_trial_reopens_circuit(self):
+        state = http_client._state_for('flaky')
+        state.session = mock.Mock()
+        state.session.request.side_effect = ValueError('unexpected')
+        with mock.patch('core.http_client.time.monotonic', return_value=100.0):
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    http_client.get('flaky', 'https://example.invalid/')
+        self.assertEqual(state.breaker.state, CircuitBreaker.OPEN)
+
+        reopened_at = 100.0 + state.provider.reset_seconds + 1
+        with mock.patch('core.http_client.time.monotonic', return_value=reopened_at):
+            with self.assertRaises(ValueError):
+                http_client.get('flaky', 'https://example.invalid/')
+        self.assertEqual(state.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(state.breaker._trial_in_flight)
+        self.assertTrue(state.slots.acquire(blocking=False))
+        state.slots.release()
+
+    def test_interrupted_trial_is_released(self):
+        state = http_client._state_for('flaky')
+        state.breaker.state = CircuitBreaker.HALF_OPEN
+        state.session = mock.Mock()
+        state.session.request.side_effect = KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            http_client.get('flaky', 'https://example.invalid/')
+        self.assertFalse(state.breaker._trial_in_flight)
+
+    def test_busy_when_all_slots_taken(self):
+        state = http_client._state_for('flaky')
+        state.slots.acquire()
+        self.addCleanup(state.slots.release)
+        with self.assertRaises(http_client.ProviderBusy):
+            http_client.get('flaky', 'https://example.invalid/')
@@ -0,0 +1,37 @@
+"""
+Startup import-time budget (core/import_budget.py, users/import_budget.json).
+
+Tests cover:
+- Heavy optional libraries staying off the startup path
+- Startup module count against the recorded budget
+- core.wsgi / core.urls import time against the recorded budget, only with
+  IMPORT_BUDGET_TIMING=1 (timings are noisy on shared machines; see also
+  ``manage.py bench_import_time``)
+"""
+
+import os
+import unittest
+
+from django.test import SimpleTestCase
+
+from core.import_budget import check_budget, eager_lazy_modules, measure_median
+
+
+class TestStartupImportBudget(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.summary = measure_median(runs=3)
+
+    def test_heavy_modules_load_lazily(self):
+        self.assertEqual(eager_lazy_modules(self.summary['modules']), [])
+
+    def test_startup_module_count_within_budget(self):
+        failures = check_budget(self.summary, timing=False)
+        self.assertFalse(failures, '\n'.join(failures))
+
+    @unittest.skipUnless(os.environ.get('IMPORT_BUDGET_TIMING') == '1', 'set IMPORT_BUDGET_TIMING=1 to check timings')
+    def test_startup_time_within_budget(self):
+        failures = check_budget(self.summary)
+        self.assertFalse(failures, '\n'.join(failures))
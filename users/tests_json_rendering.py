@@ -0,0 +1,76 @@
+"""
+Tests for the orjson renderer (core/renderers.py) and response compression
+(core/compression.py).
+
+Tests cover:
+- Datetimes, Decimals, UUIDs and integer keys rendered without manual conversion
+- gzip negotiated for large JSON responses, with Vary: Accept-Encoding
+- Small, non-JSON and exempt responses left uncompressed
+"""
+
+import datetime
+import decimal
+import gzip
+import json
+import uuid
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core import compression, renderers
+from core.compression import CompressionMiddleware
+
+
+class TestORJSONRenderer(SimpleTestCase):
+
+    def test_renders_database_types(self):
+        value = datetime.datetime(2026, 3, 1, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc)
+        identifier = uuid.uuid4()
+        body = renderers.dumps({
+            'created_at': value,
+            'due': datetime.date(2026, 3, 9),
+            'amount': decimal.Decimal('12.50'),
+            'id': identifier,
+            'by_id': {7: 'x'},
+        })
+        self.assertEqual(json.loads(body), {
+            'created_at': value.isoformat(),
+            'due': '2026-03-09',
+            'amount': '12.50',
+            'id': str(identifier),
+            'by_id': {'7': 'x'},
+        })
+
+
+class TestCompressionMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.payload = {'cases': [{'id': index, 'status': 'WIP'} for index in range(200)]}
+
+    def respond(self, path, response, encoding='gzip'):
+        request = self.factory.get(path, HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzips_large_json(self):
+        original = JsonResponse(self.payload)
+        expected = original.content
+        response = self.respond('/api/cases/incident-db', original)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), expected)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_prefers_brotli_when_available(self):
+        if compression.brotli is None:
+            self.skipTest('brotli is not installed')
+        response = self.respond('/api/cases/incident-db', JsonResponse(self.payload), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_leaves_small_binary_and_exempt_responses_alone(self):
+        self.assertFalse(self.respond('/api/health', JsonResponse({'ok': True})).has_header('Content-Encoding'))
+        image = HttpResponse(b'\0' * 4096, content_type='image/jpeg')
+        self.assertFalse(self.respond('/api/media/a.jpg', image).has_header('Content-Encoding'))
+        login = JsonResponse(self.payload)
+        self.assertFalse(self.respond('/api/auth/login', login).has_header('Content-Encoding'))
+        refused = JsonResponse(self.payload)
+        self.assertFalse(self.respond('/api/cases', refused, 'gzip;q=0').has_header('Content-Encoding'))
@@ -0,0 +1,59 @@
+"""
+Tests for per-route request instrumentation (core/metrics.py).
+
+Tests cover:
+- SQL normalization for the slow-query log
+- Per-route request and SQL metrics recorded by the middleware
+- Access control on the /api/metrics endpoint
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+
+from core import metrics
+from users.models import AuthToken
+
+
+User = get_user_model()
+
+
+class TestNormalizeSql(TestCase):
+
+    def test_literals_and_value_lists_collapse(self):
+        self.assertEqual(
+            metrics.normalize_sql("SELECT *  FROM cases\n WHERE id IN (%s, %s, %s) AND status = 'Open' LIMIT 10"),
+            "SELECT * FROM cases WHERE id IN (...) AND status = ? LIMIT ?",
+        )
+
+    def test_savepoint_names_collapse(self):
+        self.assertEqual(
+            metrics.normalize_sql('ROLLBACK TO SAVEPOINT "s139779302435712_x6"'),
+            'ROLLBACK TO SAVEPOINT ?',
+        )
+
+
+class TestMetricsEndpoint(TestCase):
+
+    def setUp(self):
+        metrics.reset_metrics()
+        self.client = Client()
+
+    def headers_for(self, role):
+        user = User.objects.create_user(
+            username=f'metrics_{role.lower()}', email=f'metrics_{role.lower()}@test.com',
+            password='testpass123', role=role,
+        )
+        return {'HTTP_AUTHORIZATION': f'Bearer {AuthToken.objects.create(user=user).token}'}
+
+    def test_requests_are_recorded_per_route(self):
+        headers = self.headers_for('SUPER_ADMIN')
+        self.client.get('/api/health')
+
+        body = self.client.get('/api/metrics', **headers).content.decode()
+        self.assertIn('api_requests_total{route="api/health",method="GET",status="200"} 1', body)
+        self.assertIn('api_request_duration_seconds_count{route="api/health",method="GET"} 1', body)
+        self.assertIn('api_db_queries_per_request_bucket{route="api/health",method="GET",le="1"} 1', body)
+
+    def test_non_admins_are_rejected(self):
+        response = self.client.get('/api/metrics', **self.headers_for('VENDOR'))
+        self.assertEqual(response.status_code, 403)
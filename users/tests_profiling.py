@@ -0,0 +1,58 @@
+"""
+Tests for on-demand request profiling (core/profiling.py).
+
+Tests cover:
+- Tokens bound to a single path
+- A profiled request storing its profile and SQL breakdown
+- Downloading the stored pstats dump
+"""
+
+import marshal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+
+from core import profiling
+from users.models import AuthToken
+
+
+User = get_user_model()
+
+
+class TestProfileTokens(TestCase):
+
+    def test_token_only_valid_for_its_path(self):
+        token = profiling.make_profile_token('/api/health', 7)
+        self.assertEqual(profiling.verify_profile_token(token, '/api/health'), 7)
+        self.assertIsNone(profiling.verify_profile_token(token, '/api/cases'))
+        self.assertIsNone(profiling.verify_profile_token(token + 'x', '/api/health'))
+
+
+@mock.patch.object(profiling, 'PROFILING_ENABLED', True)
+class TestProfiledRequest(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create_user(
+            username='profileadmin', email='profileadmin@test.com', password='testpass123', role='SUPER_ADMIN',
+        )
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AuthToken.objects.create(user=admin).token}'}
+        self.client = Client()
+
+    def test_profile_is_stored_and_downloadable(self):
+        response = self.client.post(
+            '/api/super-admin/profiles/token', {'path': '/api/super-admin/profiles'},
+            content_type='application/json', **self.headers,
+        )
+        token = response.json()['token']
+
+        profiled = self.client.get('/api/super-admin/profiles', HTTP_X_PROFILE_TOKEN=token, **self.headers)
+        profile_id = profiled['X-Profile-Id']
+
+        detail = self.client.get(f'/api/super-admin/profiles/{profile_id}', **self.headers).json()
+        self.assertEqual(detail['path'], '/api/super-admin/profiles')
+        self.assertGreater(detail['query_count'], 0)
+        self.assertTrue(any('request_profiles' in row['sql'] for row in detail['sql_breakdown']))
+
+        download = self.client.get(f'/api/super-admin/profiles/{profile_id}/download', **self.headers)
+        self.assertIsInstance(marshal.loads(download.content), dict)
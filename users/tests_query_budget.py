@@ -0,0 +1,111 @@
+"""
+Query budgets for hot API endpoints (core/query_budget.py, users/query_budgets.json).
+
+Tests cover:
+- The harness reporting repeated statements when a budget is exceeded
+- Per-endpoint budgets under a fixed dataset of six cases, each with
+  claimant and insured checks assigned to one vendor and a report, so any
+  per-row query pattern exceeds its budget
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from core import api_cache
+from core.query_budget import QueryBudgetExceeded, query_budget
+from users.models import AuthToken, InsuranceCase, Report, Vendor
+from users.services.case_identity import clear_case_identity_cache, link_case_identity
+
+
+User = get_user_model()
+
+CASE_COUNT = 6
+
+
+class TestQueryBudgetHarness(TestCase):
+
+    def test_repeated_statements_are_reported(self):
+        for index in range(3):
+            User.objects.create_user(username=f'budget{index}', password='testpass123')
+
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget('n_plus_one', max_queries=10, max_duplicates=0):
+                for user in User.objects.all():
+                    User.objects.get(pk=user.pk)
+
+        message = str(ctx.exception)
+        self.assertIn("2 duplicates (budget 0)", message)
+        self.assertIn('3x SELECT', message)
+
+
+class EndpointQueryBudgets(TestCase):
+    """Fixed dataset shared by all endpoint budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.super_admin = User.objects.create_user(
+            username='budgetadmin', email='budgetadmin@test.com', password='testpass123', role='SUPER_ADMIN',
+        )
+        cls.case_manager = User.objects.create_user(
+            username='budgetcm', email='budgetcm@test.com', password='testpass123', role='CASE_MANAGER',
+        )
+        vendor_user = User.objects.create_user(
+            username='budgetvendor', email='budgetvendor@test.com', password='testpass123', role='VENDOR',
+        )
+        cls.vendor_user = vendor_user
+        vendor = Vendor.objects.create(user=vendor_user, company_name='Budget Vendor')
+
+        cls.case_ids = []
+        cls.report_ids = []
+        for index in range(CASE_COUNT):
+            case_number = f'BUDGET-{index}'
+            with connections['default'].cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO cases (claim_number, client_name, category, case_number) "
+                    "VALUES (%s, 'Budget Client', 'MACT', %s) RETURNING id",
+                    [f'BUDGET-CLAIM-{index}', case_number],
+                )
+                case_id = cursor.fetchone()[0]
+                for table, name_column in (('claimant_checks', 'claimant_name'), ('insured_checks', 'insured_name')):
+                    cursor.execute(
+                        f"INSERT INTO {table} (case_id, {name_column}, check_status, assigned_vendor_id, vendor_evidence) "
+                        "VALUES (%s, 'Budget', 'Verified', %s, %s)",
+                        [case_id, vendor.id, '[{"filename": "a.jpg", "url": "/media/a.jpg"}]'],
+                    )
+            insurance_case = InsuranceCase.objects.create(case_number=case_number, title=f'Budget case {index}')
+            link_case_identity(case_id, insurance_case.id)
+            report = Report.objects.create(case=insurance_case, report_content='Budget report')
+            cls.case_ids.append(case_id)
+            cls.report_ids.append(report.id)
+
+    def setUp(self):
+        self.client = Client()
+        api_cache.reset_api_cache()
+        clear_case_identity_cache()
+
+    def get(self, budget, user, path):
+        token = AuthToken.objects.create(user=user, last_used_at=timezone.now())
+        with query_budget(budget):
+            response = self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token.token}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_full_case_details(self):
+        self.get('full_case_details', self.case_manager, f'/api/cases/incident-db/{self.case_ids[0]}/full-details')
+
+    def test_incident_case_list(self):
+        self.get('incident_case_list', self.case_manager, '/api/cases/incident-db')
+
+    def test_list_users(self):
+        self.get('list_users', self.super_admin, '/api/users')
+
+    def test_report_list(self):
+        self.get('report_list', self.case_manager, '/api/reports')
+
+    def test_report_detail(self):
+        self.get('report_detail', self.case_manager, f'/api/reports/{self.report_ids[0]}')
+
+    def test_vendor_assigned_checks(self):
+        self.get('vendor_assigned_checks', self.vendor_user, '/api/vendor-assigned-checks')
@@ -0,0 +1,215 @@
+"""
+Tests for report listings and statistics on the Legal Review and QC pages.
+
+Tests cover:
+- Latest-report pointer maintenance (case_latest_report)
+- Verification rollup gating of the Legal Review listing
+- Single-query status statistics and listings (query-count assertions)
+- ETag / If-None-Match handling on report detail
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import AuthToken, InsuranceCase, Report
+from users.services import report_analytics
+from users.services.case_identity import clear_case_identity_cache, link_case_identity
+
+
+User = get_user_model()
+
+
+class ReportAnalyticsTestCase(TestCase):
+    """Base test case creating linked incident/ORM cases with reports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.case_manager = User.objects.create_user(
+            username='reportcm',
+            email='reportcm@test.com',
+            password='testpass123',
+            role='CASE_MANAGER',
+        )
+        cls.qc_user = User.objects.create_user(
+            username='reportqc',
+            email='reportqc@test.com',
+            password='testpass123',
+            role='QC',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        clear_case_identity_cache()
+
+    def create_case(self, suffix, check_status='Verified'):
+        """Create a raw incident case, its ORM row and one claimant check."""
+        case_number = f'RPT-TEST-{suffix}'
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO cases (claim_number, client_name, category, full_case_status, case_number)
+                VALUES (%s, 'Test Client', 'MACT', 'WIP', %s)
+                RETURNING id
+                """,
+                [f'RPT-CLAIM-{suffix}', case_number],
+            )
+            incident_case_id = cursor.fetchone()[0]
+            cursor.execute(
+                """
+                INSERT INTO claimant_checks (case_id, check_status, claimant_name)
+                VALUES (%s, %s, 'Test Claimant')
+                """,
+                [incident_case_id, check_status],
+            )
+        case = InsuranceCase.objects.create(case_number=case_number, title=f'Case {suffix}')
+        link_case_identity(incident_case_id, case.id)
+        return case
+
+    def create_report(self, case, status=Report.Status.PENDING):
+        return Report.objects.create(
+            case=case,
+            report_content='Generated report',
+            status=status,
+            assigned_qc=self.qc_user if status != Report.Status.PENDING else None,
+        )
+
+    def latest_pointer(self, case):
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT latest_report_id FROM case_latest_report WHERE case_id = %s", [case.id])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def auth_header(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {AuthToken.objects.create(user=user).token}'}
+
+
+class TestLatestReportPointer(ReportAnalyticsTestCase):
+    """case_latest_report follows report inserts and deletes."""
+
+    def test_pointer_advances_on_insert(self):
+        case = self.create_case('P1')
+        first = self.create_report(case)
+        self.assertEqual(self.latest_pointer(case), first.id)
+        second = self.create_report(case)
+        self.assertEqual(self.latest_pointer(case), second.id)
+
+    def test_pointer_falls_back_on_delete(self):
+        case = self.create_case('P2')
+        first = self.create_report(case)
+        second = self.create_report(case)
+        second.delete()
+        self.assertEqual(self.latest_pointer(case), first.id)
+        first.delete()
+        self.assertIsNone(self.latest_pointer(case))
+
+
+class TestReportStatistics(ReportAnalyticsTestCase):
+    """Statistics and listings use a constant number of queries."""
+
+    def test_only_latest_report_of_verified_cases_is_listed(self):
+        verified = self.create_case('V1')
+        pending = self.create_case('V2', check_status='WIP')
+        self.create_report(verified, Report.Status.REJECTED)
+        latest = self.create_report(verified, Report.Status.ASSIGNED)
+        self.create_report(pending)
+
+        ids = list(report_analytics.latest_verified_reports().values_list('id', flat=True))
+        self.assertEqual(ids, [latest.id])
+
+    def test_status_counts_single_query(self):
+        statuses = [
+            Report.Status.PENDING,
+            Report.Status.ASSIGNED,
+            Report.Status.ACCEPTED,
+            Report.Status.ACCEPTED,
+            Report.Status.REJECTED,
+        ]
+        for index, status in enumerate(statuses):
+            self.create_report(self.create_case(f'S{index}'), status)
+
+        with self.assertNumQueries(1):
+            counts = report_analytics.status_counts(report_analytics.latest_verified_reports())
+
+        self.assertEqual(counts, {'total': 5, 'pending': 1, 'assigned': 1, 'accepted': 2, 'rejected': 1})
+
+    def test_list_rows_single_query(self):
+        for index in range(3):
+            self.create_report(self.create_case(f'L{index}'), Report.Status.ASSIGNED)
+
+        with self.assertNumQueries(1):
+            rows = report_analytics.list_rows(report_analytics.latest_verified_reports())
+
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row['assigned_qc_name'] == 'reportqc' for row in rows))
+
+    def test_report_endpoints_query_count_independent_of_volume(self):
+        headers = self.auth_header(self.case_manager)
+        self.create_report(self.create_case('E0'))
+
+        def _queries(path):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(path, **headers)
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        small_stats = _queries('/api/reports/stats')
+        small_list = _queries('/api/reports')
+
+        for index in range(1, 6):
+            self.create_report(self.create_case(f'E{index}'), Report.Status.ACCEPTED)
+
+        self.assertEqual(_queries('/api/reports/stats'), small_stats)
+        self.assertEqual(_queries('/api/reports'), small_list)
+
+    def test_qc_stats_query_count_independent_of_volume(self):
+        headers = self.auth_header(self.qc_user)
+        self.create_report(self.create_case('Q0'), Report.Status.ASSIGNED)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/qc/reports/stats', **headers)
+        baseline = len(ctx.captured_queries)
+        self.assertEqual(response.json()['pending'], 1)
+
+        for index in range(1, 6):
+            self.create_report(self.create_case(f'Q{index}'), Report.Status.ACCEPTED)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/qc/reports/stats', **headers)
+        self.assertEqual(len(ctx.captured_queries), baseline)
+        self.assertEqual(response.json()['accepted'], 5)
+
+
+class TestReportDetailETag(ReportAnalyticsTestCase):
+    """Report detail answers If-None-Match from report and case versions."""
+
+    def test_not_modified_until_report_or_case_changes(self):
+        headers = self.auth_header(self.case_manager)
+        case = self.create_case('ET')
+        report = self.create_report(case)
+        path = f'/api/reports/{report.id}'
+
+        response = self.client.get(path, **headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "UPDATE claimant_checks SET check_status = 'WIP' "
+                "WHERE case_id = (SELECT id FROM cases WHERE insurance_case_id = %s)",
+                [case.id],
+            )
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_no_etag_for_unassigned_qc(self):
+        report = self.create_report(self.create_case('EQ'))
+        response = self.client.get(f'/api/reports/{report.id}', **self.auth_header(self.qc_user))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.has_header('ETag'))
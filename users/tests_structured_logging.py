@@ -0,0 +1,83 @@
+"""
+Tests for the structured logging pipeline (core/structured_logging.py).
+
+Tests cover:
+- Request ids taken from X-Request-ID or generated, and echoed on responses
+- Per-logger sampling of DEBUG records
+- JSON lines written through the queue handler, with request id and traceback
+"""
+
+import json
+import logging
+import os
+import tempfile
+from unittest import mock
+
+from django.test import Client, TestCase
+
+from core.structured_logging import (
+    AsyncQueueHandler,
+    JsonFormatter,
+    RequestContextFilter,
+    SamplingFilter,
+    _request_id,
+)
+
+
+class TestRequestId(TestCase):
+
+    def test_incoming_request_id_is_echoed(self):
+        response = Client().get('/api/health', HTTP_X_REQUEST_ID='abc123')
+        self.assertEqual(response['X-Request-ID'], 'abc123')
+
+    def test_request_id_generated_when_missing(self):
+        response = Client().get('/api/health')
+        self.assertEqual(len(response['X-Request-ID']), 32)
+
+
+class TestSamplingFilter(TestCase):
+
+    def record(self, name, level):
+        return logging.LogRecord(name, level, __file__, 1, 'message', None, None)
+
+    def test_most_specific_prefix_wins_and_warnings_are_kept(self):
+        sampling = SamplingFilter('users=1.0, users.auth=0.0')
+        self.assertFalse(sampling.filter(self.record('users.auth', logging.DEBUG)))
+        self.assertTrue(sampling.filter(self.record('users.auth', logging.WARNING)))
+        self.assertTrue(sampling.filter(self.record('users.api.cases', logging.DEBUG)))
+
+    def test_partial_rate(self):
+        sampling = SamplingFilter({'users.auth': 0.25})
+        with mock.patch('core.structured_logging.random.random', side_effect=[0.1, 0.9]):
+            self.assertTrue(sampling.filter(self.record('users.auth', logging.DEBUG)))
+            self.assertFalse(sampling.filter(self.record('users.auth', logging.DEBUG)))
+
+
+class TestAsyncQueueHandler(TestCase):
+
+    def test_json_lines_written_by_listener(self):
+        path = os.path.join(tempfile.mkdtemp(), 'app.log')
+        handler = AsyncQueueHandler(stream=False, filename=path, max_bytes=1024 * 1024)
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(RequestContextFilter())
+        logger = logging.getLogger('users.tests_structured_logging')
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        token = _request_id.set('req-1')
+        try:
+            logger.info("checks for vendor %s: %d", 'v1', 3)
+            try:
+                raise ValueError('boom')
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            _request_id.reset(token)
+            logger.removeHandler(handler)
+            handler.close()
+
+        with open(path) as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertEqual(lines[0]['message'], 'checks for vendor v1: 3')
+        self.assertEqual(lines[0]['request_id'], 'req-1')
+        self.assertIn('ValueError: boom', lines[1]['exception'])
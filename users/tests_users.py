@@ -0,0 +1,154 @@
+"""
+Tests for the Super Admin user-management listing.
+
+Tests cover:
+- Constant query count regardless of users and sessions
+- Dead session deactivation and live session summaries
+- Pagination and role filtering
+- Purging dead auth tokens
+- Super Admin dashboard statistics snapshot
+- Snapshot payload computed outside the refresh transaction
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from users.models import AuthToken
+from users.services.dashboard_snapshot import compute_dashboard, get_dashboard_snapshot
+from users.services.session_summary import purge_auth_tokens
+
+
+User = get_user_model()
+
+
+class UserListingTestCase(TestCase):
+    """Base test case with a super admin and a helper to add vendors with sessions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.super_admin = User.objects.create_user(
+            username='listadmin',
+            email='listadmin@test.com',
+            password='testpass123',
+            role='SUPER_ADMIN',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        token = AuthToken.objects.create(user=self.super_admin, last_used_at=timezone.now())
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {token.token}'}
+
+    def create_vendor(self, index, sessions=1):
+        user = User.objects.create_user(
+            username=f'listvendor{index}',
+            email=f'listvendor{index}@test.com',
+            password='testpass123',
+            role='VENDOR',
+        )
+        for _ in range(sessions):
+            AuthToken.objects.create(user=user, last_used_at=timezone.now())
+        return user
+
+    def list_users(self, query=''):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/users{query}', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+
+class TestListUsers(UserListingTestCase):
+
+    def test_query_count_independent_of_users_and_sessions(self):
+        self.create_vendor(0)
+        _, baseline = self.list_users()
+
+        for index in range(1, 8):
+            self.create_vendor(index, sessions=2)
+
+        response, queries = self.list_users()
+        self.assertEqual(queries, baseline)
+        self.assertEqual(len(response.json()), 9)
+
+    def test_dead_sessions_closed_and_live_sessions_summarised(self):
+        vendor = self.create_vendor(0)
+        stale = AuthToken.objects.create(
+            user=vendor, last_used_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        response, _ = self.list_users('?role=vendor')
+        [row] = response.json()
+        self.assertTrue(row['is_online'])
+        self.assertEqual(len(row['active_sessions']), 1)
+        stale.refresh_from_db()
+        self.assertFalse(stale.is_active)
+
+    def test_pagination_reports_total(self):
+        for index in range(5):
+            self.create_vendor(index)
+
+        response, _ = self.list_users('?role=VENDOR&page=2&page_size=2')
+        self.assertEqual(response['X-Total-Count'], '5')
+        self.assertEqual(len(response.json()), 2)
+
+
+class TestPurgeAuthTokens(UserListingTestCase):
+
+    def test_only_old_dead_tokens_are_deleted(self):
+        vendor = self.create_vendor(0)
+        old = timezone.now() - timedelta(days=30)
+        dead = AuthToken.objects.create(user=vendor, is_active=False, last_used_at=old)
+        expired = AuthToken.objects.create(user=vendor, expires_at=old, last_used_at=old)
+        recent_dead = AuthToken.objects.create(user=vendor, is_active=False, last_used_at=timezone.now())
+
+        self.assertEqual(purge_auth_tokens(older_than_days=7), 2)
+        remaining = set(AuthToken.objects.filter(user=vendor).values_list('id', flat=True))
+        self.assertNotIn(dead.id, remaining)
+        self.assertNotIn(expired.id, remaining)
+        self.assertIn(recent_dead.id, remaining)
+
+
+class TestDashboardSnapshot(UserListingTestCase):
+
+    def test_snapshot_is_reused_until_users_change(self):
+        self.create_vendor(0)
+        first = get_dashboard_snapshot()
+        self.assertEqual(first['vendor_statistics']['total_vendors'], 1)
+
+        with self.assertNumQueries(1):
+            cached = get_dashboard_snapshot()
+        self.assertEqual(cached['snapshot_computed_at'], first['snapshot_computed_at'])
+
+        self.create_vendor(1)
+        refreshed = get_dashboard_snapshot()
+        self.assertEqual(refreshed['vendor_statistics']['total_vendors'], 2)
+        self.assertEqual(refreshed['user_statistics']['users_by_role']['VENDOR'], 2)
+
+    def test_dashboard_endpoint_reads_snapshot(self):
+        get_dashboard_snapshot()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/super-admin/dashboard', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('snapshot_computed_at', response.json())
+        snapshot_reads = [q for q in ctx.captured_queries if 'dashboard_snapshots' in q['sql']]
+        self.assertEqual(len(snapshot_reads), 1)
+
+    def test_payload_is_computed_outside_the_refresh_transaction(self):
+        # Its best-effort queries swallow errors, which would abort an enclosing transaction.
+        get_dashboard_snapshot()
+        depth = len(connection.atomic_blocks)
+        depths = []
+
+        def compute():
+            depths.append(len(connection.atomic_blocks))
+            return compute_dashboard()
+
+        with mock.patch('users.services.dashboard_snapshot.compute_dashboard', side_effect=compute):
+            refreshed = get_dashboard_snapshot(force_refresh=True)
+        self.assertEqual(depths, [depth])
+        self.assertIn('snapshot_computed_at', refreshed)
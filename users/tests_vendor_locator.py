@@ -0,0 +1,135 @@
+"""
+Vendor ranking for case and check assignment (users/services/vendor_locator.py).
+
+Tests cover:
+- auto_assign_vendor assigning a case beyond DEFAULT_MAX_DISTANCE_KM
+- auto_assign_vendor preferring a less loaded vendor over a slightly nearer one
+- Check candidates falling back to the linked insurance case location, not
+  the insurance_case row that shares the cases.id
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client, TestCase
+
+from users.models import AuthToken, InsuranceCase, Vendor
+from users.services.case_identity import clear_case_identity_cache, link_case_identity
+from users.services.vendor_locator import DEFAULT_MAX_DISTANCE_KM, invalidate_vendor_locator
+
+
+User = get_user_model()
+
+
+class VendorLocatorTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='locatoradmin', email='locatoradmin@test.com', password='testpass123', role='SUPER_ADMIN',
+        )
+
+    def setUp(self):
+        invalidate_vendor_locator()
+        self.addCleanup(invalidate_vendor_locator)
+        clear_case_identity_cache()
+        self.client = Client()
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AuthToken.objects.create(user=self.admin).token}'}
+
+    def create_vendor(self, name, lat, lng):
+        user = User.objects.create_user(
+            username=name.lower(), email=f'{name.lower()}@test.com', password='testpass123', role='VENDOR',
+        )
+        return Vendor.objects.create(user=user, company_name=name, latitude=lat, longitude=lng, is_active=True)
+
+    def auto_assign(self, insurance_case):
+        response = self.client.post(f'/api/cases/{insurance_case.id}/auto-assign-vendor', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class TestAutoAssignVendor(VendorLocatorTestCase):
+
+    def test_assigns_vendor_beyond_default_distance_cap(self):
+        self.create_vendor('Remote', 40.0, 10.0)
+        insurance_case = InsuranceCase.objects.create(
+            case_number='LOC-1', title='Remote case', claim_number='LOC-1', client_name='Client',
+            latitude=10.0, longitude=10.0,
+        )
+
+        result = self.auto_assign(insurance_case)
+
+        self.assertTrue(result['success'], result)
+        self.assertEqual(result['assigned_vendor']['company_name'], 'Remote')
+        self.assertGreater(result['assigned_vendor']['distance_km'], DEFAULT_MAX_DISTANCE_KM)
+
+    def test_prefers_less_loaded_vendor(self):
+        busy = self.create_vendor('Busy', 19.00, 72.80)
+        self.create_vendor('Idle', 19.02, 72.80)
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO cases (claim_number, client_name, category, case_number, policy_document) "
+                "VALUES ('LOC-LOAD', 'Client', 'MACT', 'LOC-LOAD', 'docs/policy.pdf') RETURNING id",
+            )
+            load_case_id = cursor.fetchone()[0]
+            for table in ('claimant_checks', 'insured_checks', 'driver_checks'):
+                cursor.execute(
+                    f"INSERT INTO {table} (case_id, check_status, assigned_vendor_id) VALUES (%s, 'WIP', %s)",
+                    [load_case_id, busy.id],
+                )
+        insurance_case = InsuranceCase.objects.create(
+            case_number='LOC-2', title='Nearby case', claim_number='LOC-2', client_name='Client',
+            latitude=19.00, longitude=72.80,
+        )
+
+        result = self.auto_assign(insurance_case)
+
+        self.assertTrue(result['success'], result)
+        self.assertEqual(result['assigned_vendor']['company_name'], 'Idle')
+        self.assertEqual(result['assigned_vendor']['open_checks'], 0)
+
+
+class TestCheckVendorCandidates(VendorLocatorTestCase):
+
+    def create_incident_case(self, case_id, case_number):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO cases (id, claim_number, client_name, category, case_number, policy_document) "
+                "VALUES (%s, %s, 'Client', 'MACT', %s, 'docs/policy.pdf') RETURNING id",
+                [case_id, case_number, case_number],
+            )
+            return cursor.fetchone()[0]
+
+    def test_fallback_uses_linked_insurance_case_location(self):
+        self.create_vendor('Mumbai', 19.0, 72.8)
+        self.create_vendor('Delhi', 28.6, 77.2)
+        other = InsuranceCase.objects.create(
+            case_number='OTHER', title='Other', claim_number='OTHER', client_name='Other',
+            latitude=28.6, longitude=77.2,
+        )
+        linked = InsuranceCase.objects.create(
+            case_number='LOC-3', title='Linked', claim_number='LOC-3', client_name='Client',
+            latitude=19.0, longitude=72.8,
+        )
+        # The incident case shares its id with the unrelated insurance case.
+        case_id = self.create_incident_case(other.id, 'LOC-3')
+        link_case_identity(case_id, linked.id)
+
+        response = self.client.get(f'/api/cases/incident-db/{case_id}/check/rti/vendor-candidates', **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['latitude'], body['longitude']), (19.0, 72.8))
+        self.assertEqual(body['candidates'][0]['company_name'], 'Mumbai')
+
+    def test_no_fallback_without_linked_insurance_case(self):
+        self.create_vendor('Delhi', 28.6, 77.2)
+        other = InsuranceCase.objects.create(
+            case_number='OTHER-4', title='Other', claim_number='OTHER-4', client_name='Other',
+            latitude=28.6, longitude=77.2,
+        )
+        case_id = self.create_incident_case(other.id, 'LOC-4')
+
+        response = self.client.get(f'/api/cases/incident-db/{case_id}/check/rti/vendor-candidates', **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['candidates'], [])